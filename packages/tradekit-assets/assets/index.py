@@ -0,0 +1,126 @@
+"""Defines the asset index, which looks assets up without scanning an AssetDataFrame."""
+
+from enum import Enum
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from prices.core.asset import ASSET_COLUMNS, Asset, AssetDataFrame
+
+_FILTER_COLUMNS = ("broker", "exchange", "asset_class", "status", "tradable")
+"""The columns assets can be filtered by."""
+
+
+def _key(value: Any) -> Any:
+    """Returns the value of an enum, so enums and their values are the same key."""
+    return value.value if isinstance(value, Enum) else value
+
+
+def _sorted_prefixes(values: List[str]) -> Tuple[np.ndarray, np.ndarray]:
+    """Returns values casefolded and sorted, with the rows they belong to."""
+    folded = np.array([value.casefold() for value in values], dtype=str)
+    order = np.argsort(folded, kind="stable")
+    return folded[order], order
+
+
+class AssetIndex:
+    """
+    In-memory index of assets, built once from an AssetDataFrame. Its columns are kept as arrays,
+    and assets are looked up through hash maps of their rows: by symbol, by broker and symbol, or
+    by the values of their broker, exchange, asset class, status and tradable flag, which are
+    intersected when combined. Prefixes of symbols and names are searched in sorted arrays, for
+    autocompletion. Each lookup takes O(1), or O(log N) for prefixes, plus the assets returned.
+    """
+
+    def __init__(self, assets: AssetDataFrame) -> None:
+        self._columns = {c: assets[c].tolist() for c in ASSET_COLUMNS}
+        self._columns["tradable"] = [bool(value) for value in self._columns["tradable"]]
+        symbols = self._columns["symbol"]
+        brokers = [_key(broker) for broker in self._columns["broker"]]
+
+        # A symbol listed by many brokers is found by its first row.
+        self._by_symbol: Dict[str, int] = {}
+        for i, symbol in enumerate(symbols):
+            self._by_symbol.setdefault(symbol, i)
+        self._by_broker_symbol = {key: i for i, key in enumerate(zip(brokers, symbols))}
+
+        self._rows: Dict[str, Dict[Any, np.ndarray]] = {}
+        for column in _FILTER_COLUMNS:
+            codes, uniques = pd.factorize(np.array(self._columns[column], dtype=object))
+            order = np.argsort(codes, kind="stable")
+            groups = np.split(order, np.cumsum(np.bincount(codes, minlength=len(uniques)))[:-1])
+            self._rows[column] = {_key(u): rows for u, rows in zip(uniques, groups)}
+
+        self._symbol_prefixes = _sorted_prefixes(symbols)
+        self._name_prefixes = _sorted_prefixes([name or "" for name in self._columns["name"]])
+
+    def __len__(self) -> int:
+        return len(self._columns["symbol"])
+
+    def __contains__(self, symbol: str) -> bool:
+        return symbol in self._by_symbol
+
+    def _asset(self, row: int) -> Asset:
+        """Returns the asset of a row."""
+        return Asset(*(self._columns[c][row] for c in ASSET_COLUMNS))
+
+    def get(self, symbol: str, broker: Optional[str] = None) -> Optional[Asset]:
+        """
+        Returns the asset of a symbol, or None if there is none. If `broker` is None and many
+        brokers list the symbol, the first one listed is returned.
+        """
+        if broker is None:
+            row = self._by_symbol.get(symbol)
+        else:
+            row = self._by_broker_symbol.get((_key(broker), symbol))
+        return self._asset(row) if row is not None else None
+
+    def filter(
+        self,
+        broker: Optional[str] = None,
+        exchange: Optional[str] = None,
+        asset_class: Optional[str] = None,
+        status: Optional[str] = None,
+        tradable: Optional[bool] = None,
+    ) -> List[Asset]:
+        """
+        Returns the assets with all the values given, in the order they were indexed. Without any
+        value, all the assets are returned.
+        """
+        values = {
+            "broker": broker,
+            "exchange": exchange,
+            "asset_class": asset_class,
+            "status": status,
+            "tradable": tradable,
+        }
+        groups = [
+            self._rows[column].get(_key(value), np.empty(0, dtype=np.intp))
+            for column, value in values.items()
+            if value is not None
+        ]
+        if not groups:
+            return [self._asset(row) for row in range(len(self))]
+
+        rows = min(groups, key=len)
+        for group in groups:
+            if group is not rows:
+                rows = np.intersect1d(rows, group, assume_unique=True)
+        return [self._asset(row) for row in rows.tolist()]
+
+    def search(self, prefix: str, limit: int = 10) -> List[Asset]:
+        """
+        Returns up to `limit` assets whose symbol or name starts with `prefix`, ignoring case. The
+        assets matched by their symbol come first, in the order of their symbols, then the ones
+        matched by their name.
+        """
+        prefix = prefix.casefold()
+        rows: Dict[int, None] = {}
+        for values, order in (self._symbol_prefixes, self._name_prefixes):
+            lo = int(np.searchsorted(values, prefix, side="left"))
+            hi = int(np.searchsorted(values, prefix + "\U0010ffff", side="left"))
+            for row in order[lo:min(hi, lo + limit)].tolist():
+                rows.setdefault(row, None)
+
+        return [self._asset(row) for row in list(rows)[:limit]]
@@ -0,0 +1,99 @@
+import pandas as pd
+import pytest
+
+from assets.index import AssetIndex
+from prices.core.asset import Asset, AssetDataFrame, AssetStatus
+from prices.core.broker import Broker
+
+
+def make_asset(symbol: str, name: str, **values) -> dict:
+    return {
+        "name": name,
+        "symbol": symbol,
+        "exchange": "NASDAQ",
+        "broker": "Alpaca",
+        "asset_class": "Equity",
+        "tradable": True,
+        "status": "Active",
+        "url_logo": None,
+        "pairs": None,
+        **values,
+    }
+
+
+class TestAssetIndex:
+    @pytest.fixture
+    def index(self) -> AssetIndex:
+        df = pd.DataFrame(
+            [
+                make_asset("AAPL", "Apple Inc."),
+                make_asset("AMZN", "Amazon.com Inc."),
+                make_asset("AMD", "Advanced Micro Devices Inc.", tradable=False),
+                make_asset("IBM", "International Business Machines", exchange="NYSE"),
+                make_asset("GOOG", "Alphabet Inc.", status="Inactive"),
+                make_asset("BTC/USD", "Bitcoin", exchange="CRYPTO", asset_class="Crypto"),
+                make_asset("AAPL", "Apple", broker="Binance", exchange="OTC"),
+                make_asset("XYZ", ""),
+            ]
+        )
+        return AssetIndex(AssetDataFrame(df))
+
+    def test_get(self, index: AssetIndex):
+        assert len(index) == 8
+        assert "IBM" in index
+        assert "MSFT" not in index
+        assert index.get("IBM") == Asset(
+            "International Business Machines",
+            "IBM",
+            "NYSE",
+            "Alpaca",
+            "Equity",
+            True,
+            "Active",
+            None,
+            None,
+        )
+        assert index.get("MSFT") is None
+
+    def test_get_by_broker(self, index: AssetIndex):
+        assert index.get("AAPL").exchange == "NASDAQ"
+        assert index.get("AAPL", broker="Binance").exchange == "OTC"
+        assert index.get("AAPL", broker=Broker.ALPACA).exchange == "NASDAQ"
+        assert index.get("IBM", broker="Binance") is None
+
+    def test_filter(self, index: AssetIndex):
+        def symbols(**values) -> list:
+            return [asset.symbol for asset in index.filter(**values)]
+
+        assert symbols() == ["AAPL", "AMZN", "AMD", "IBM", "GOOG", "BTC/USD", "AAPL", "XYZ"]
+        assert symbols(exchange="NYSE") == ["IBM"]
+        assert symbols(asset_class="Crypto") == ["BTC/USD"]
+        assert symbols(status=AssetStatus.INACTIVE) == ["GOOG"]
+        assert symbols(tradable=False) == ["AMD"]
+        assert symbols(broker="Alpaca", exchange="NASDAQ", status="Active", tradable=True) == [
+            "AAPL",
+            "AMZN",
+            "XYZ",
+        ]
+        assert symbols(exchange="NYSE", asset_class="Crypto") == []
+        assert symbols(exchange="LSE") == []
+
+    def test_search(self, index: AssetIndex):
+        def symbols(prefix: str, limit: int = 10) -> list:
+            return [asset.symbol for asset in index.search(prefix, limit)]
+
+        assert symbols("a") == ["AAPL", "AAPL", "AMD", "AMZN", "GOOG"]
+        assert symbols("am") == ["AMD", "AMZN"]
+        assert symbols("AA", limit=1) == ["AAPL"]
+        assert symbols("bit") == ["BTC/USD"]
+        assert symbols("international b") == ["IBM"]
+        assert symbols("q") == []
+
+    def test_empty(self):
+        index = AssetIndex(AssetDataFrame(pd.DataFrame([make_asset("AAPL", "Apple")]).iloc[:0]))
+
+        assert len(index) == 0
+        assert index.get("AAPL") is None
+        assert index.filter() == []
+        assert index.filter(exchange="NASDAQ") == []
+        assert index.search("a") == []
@@ -0,0 +1,209 @@
+"""Alpaca async broker implementation, on the REST API of Alpaca."""
+
+import asyncio
+from datetime import datetime
+from typing import Any, Dict, List, Optional, final
+
+import aiohttp
+import pandas as pd
+
+from brokers.common.asset import AssetDataFrame
+from brokers.common.bar import BarDataFrame
+from brokers.common.broker import AsyncMarketData, MarketDataBarsManyParams, MarketDataBarsParams
+from brokers.common.enums import AssetClass, AssetStatus, Brokers
+from brokers.common.timeframe import TimeFrame
+from brokers.config import ApiKeys
+
+DATA_URL = "https://data.alpaca.markets"
+"""The URL of the Alpaca market data API."""
+
+TRADING_URL = "https://paper-api.alpaca.markets"
+"""The URL of the Alpaca trading API, which lists the assets."""
+
+_MAX_PAGE_SIZE = 10_000
+"""The maximum number of bars returned by the Alpaca API in a single page."""
+
+_BAR_COLUMNS = {
+    "t": "timestamp",
+    "o": "open",
+    "h": "high",
+    "l": "low",
+    "c": "close",
+    "v": "volume",
+    "n": "trade_count",
+    "vw": "vwap",
+}
+"""The names of the bar fields in the Alpaca API responses, mapped to the BarDataFrame columns."""
+
+
+@final
+class AsyncAlpacaMarketData(AsyncMarketData):
+    """
+    Alpaca async broker implementation for fetching market data. All the requests share one HTTP
+    session, whose connections are kept alive and reused, up to `max_concurrency` of them at once.
+    """
+
+    symbols_per_request = 200
+    """The maximum number of symbols sent in a single bars request."""
+
+    def __init__(
+        self,
+        max_concurrency: int = 8,
+        data_url: str = DATA_URL,
+        trading_url: str = TRADING_URL,
+        keepalive_timeout: float = 30.0,
+    ) -> None:
+        super().__init__(max_concurrency)
+        self.data_url = data_url.rstrip("/")
+        self.trading_url = trading_url.rstrip("/")
+        self.keepalive_timeout = keepalive_timeout
+        self._session: Optional[aiohttp.ClientSession] = None
+
+    @property
+    def session(self) -> aiohttp.ClientSession:
+        """The HTTP session, created in the running event loop when first used."""
+        if self._session is None or self._session.closed:
+            headers = {
+                "APCA-API-KEY-ID": ApiKeys.ALPACA_MARKET_DATA_KEY,
+                "APCA-API-SECRET-KEY": ApiKeys.ALPACA_MARKET_DATA_SECRET,
+            }
+            self._session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(
+                    limit=self.max_concurrency, keepalive_timeout=self.keepalive_timeout
+                ),
+                headers={name: value for name, value in headers.items() if value is not None},
+                raise_for_status=True,
+            )
+        return self._session
+
+    async def close(self) -> None:
+        """Closes the HTTP session and its connections."""
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
+
+    async def _get(self, url: str, params: Dict[str, Any]) -> Any:
+        """Sends a GET request and returns its JSON body. Parameters set to None are omitted."""
+        query = {name: value for name, value in params.items() if value is not None}
+        async with self.session.get(url, params=query) as response:
+            return await response.json()
+
+    async def assets(self) -> AssetDataFrame:
+        """Fetches assets from the Alpaca API."""
+        items = await self._get(f"{self.trading_url}/v2/assets", {"asset_class": "us_equity"})
+
+        df = pd.DataFrame(
+            {
+                "name": [item.get("name") or "" for item in items],
+                "symbol": [item["symbol"] for item in items],
+                "exchange": [item["exchange"] for item in items],
+                "broker": Brokers.ALPACA.value,
+                "tradable": [bool(item["tradable"]) for item in items],
+                "asset_class": AssetClass.EQUITY.value,
+                "status": [
+                    AssetStatus.ACTIVE.value
+                    if item["status"] == "active"
+                    else AssetStatus.INACTIVE.value
+                    for item in items
+                ],
+                "url_logo": None,
+                "pairs": None,
+            }
+        )
+        return AssetDataFrame(df)
+
+    async def bars(self, params: MarketDataBarsParams) -> BarDataFrame:
+        """Fetches bars from the Alpaca API, one page after the other."""
+        url = f"{self.data_url}/v2/stocks/{params.symbol}/bars"
+        query = _bars_query(params.timeframe, params.start, params.end)
+
+        bars: List[dict] = []
+        remaining = params.limit
+        page_token = None
+        while remaining is None or remaining > 0:
+            page_size = min(_MAX_PAGE_SIZE, remaining or _MAX_PAGE_SIZE)
+            response = await self._get(
+                url, {**query, "limit": page_size, "page_token": page_token}
+            )
+
+            page = response.get("bars") or []
+            bars.extend(page)
+            if remaining is not None:
+                remaining -= len(page)
+
+            page_token = response.get("next_page_token")
+            if page_token is None:
+                break
+
+        return BarDataFrame(_normalize_bars({params.symbol: bars}))
+
+    async def bars_many(self, params: MarketDataBarsManyParams) -> BarDataFrame:
+        """
+        Fetches bars of many symbols from the Alpaca API, in batches of symbols per request. The
+        batches are fetched concurrently, and the pages of each batch one after the other.
+        """
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+        query = _bars_query(params.timeframe, params.start, params.end)
+        size = self.symbols_per_request
+
+        async def batch(symbols: List[str]) -> Dict[str, List[dict]]:
+            async with semaphore:
+                return await self._bars_batch(query, symbols)
+
+        batches = await asyncio.gather(
+            *(batch(params.symbols[i:i + size]) for i in range(0, len(params.symbols), size))
+        )
+        bars = {symbol: b for result in batches for symbol, b in result.items()}
+        return BarDataFrame(_normalize_bars(bars))
+
+    async def _bars_batch(self, query: Dict[str, Any], symbols: List[str]) -> Dict[str, List[dict]]:
+        """Fetches all the pages of bars of a batch of symbols, returning the bars of each."""
+        url = f"{self.data_url}/v2/stocks/bars"
+        bars: Dict[str, List[dict]] = {symbol: [] for symbol in symbols}
+
+        page_token = None
+        while True:
+            response = await self._get(
+                url,
+                {
+                    **query,
+                    "symbols": ",".join(symbols),
+                    "limit": _MAX_PAGE_SIZE,
+                    "page_token": page_token,
+                },
+            )
+            for symbol, page in (response.get("bars") or {}).items():
+                bars.setdefault(symbol, []).extend(page)
+
+            page_token = response.get("next_page_token")
+            if page_token is None:
+                return bars
+
+
+def _bars_query(timeframe: TimeFrame, start: datetime, end: Optional[datetime]) -> Dict[str, Any]:
+    """Returns the query of a bars request. Naive datetimes are taken as UTC."""
+    return {
+        "timeframe": f"{timeframe.amount_value}{timeframe.unit_value.value}",
+        "start": _to_rfc3339(start),
+        "end": _to_rfc3339(end) if end else None,
+    }
+
+
+def _to_rfc3339(dt: datetime) -> str:
+    """Formats a datetime as the RFC 3339 timestamp in UTC expected by the Alpaca API."""
+    ts = pd.Timestamp(dt)
+    ts = ts.tz_localize("UTC") if ts.tzinfo is None else ts.tz_convert("UTC")
+    return ts.tz_localize(None).isoformat() + "Z"
+
+
+def _normalize_bars(bars: Dict[str, List[dict]]) -> pd.DataFrame:
+    """Normalizes the bars of each symbol of an Alpaca API response to the BarDataFrame format."""
+    rows = [bar for symbol_bars in bars.values() for bar in symbol_bars]
+    df = pd.DataFrame(rows, columns=list(_BAR_COLUMNS)).rename(columns=_BAR_COLUMNS)
+    df.insert(0, "symbol", [symbol for symbol, b in bars.items() for _ in b])
+    df["timestamp"] = pd.to_datetime(df["timestamp"], utc=True)
+
+    # Prices and volumes without decimals are sent as integers.
+    values = ["open", "high", "low", "close", "volume", "vwap"]
+    df[values] = df[values].astype(float)
+    return df
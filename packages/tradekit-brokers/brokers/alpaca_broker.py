@@ -1,48 +1,66 @@
 """Alpaca broker implementation."""
 
 import pandas as pd
-from typing import List, cast, final
-from alpaca.data.historical import StockHistoricalDataClient
-from alpaca.data.requests import StockBarsRequest
-from alpaca.data.timeframe import TimeFrame as AlpacaTimeFrame
-from alpaca.data.models import BarSet
-from alpaca.trading.client import TradingClient
-from alpaca.trading.models import Asset as AlpacaAsset
-from alpaca.trading.requests import GetAssetsRequest
-from alpaca.trading.enums import AssetClass as AlpacaAssetClass, AssetStatus as AlpacaAssetStatus
+from functools import cached_property
+from typing import TYPE_CHECKING, Any, Callable, List, cast, final
 
 from brokers.common.asset import AssetDataFrame, AssetDict
-from brokers.common.broker import MarketData, MarketDataBarsParams
-from brokers.common.bar import BarDataFrame
+from brokers.common.broker import MarketData, MarketDataBarsManyParams, MarketDataBarsParams
+from brokers.common.bar import BarDataFrame, empty_bars
 from brokers.common.enums import AssetClass, AssetStatus, Brokers
 from brokers.config import ApiKeys
 
+# alpaca-py and pydantic are slow to import, so they are only imported when the API is first called.
+if TYPE_CHECKING:
+    from alpaca.data.historical import StockHistoricalDataClient
+    from alpaca.trading.client import TradingClient
+
 
 @final
 class AlpacaMarketData(MarketData):
     """Alpaca broker implementation for fetching market data."""
 
-    def __init__(self):
-        """Initializes the Alpaca broker"""
+    symbols_per_request = 200
+    """The maximum number of symbols sent in a single bars request."""
+
+    @cached_property
+    def _historical_data_client(self) -> "StockHistoricalDataClient":
+        """The client of the market data API, created when first used."""
+        from alpaca.data.historical import StockHistoricalDataClient
 
-        historical_data_client = StockHistoricalDataClient(
+        return StockHistoricalDataClient(
             api_key=ApiKeys.ALPACA_MARKET_DATA_KEY,
             secret_key=ApiKeys.ALPACA_MARKET_DATA_SECRET,
             raw_data=False,
         )
 
-        trading_client = TradingClient(
+    @cached_property
+    def _trading_client(self) -> "TradingClient":
+        """The client of the trading API, created when first used."""
+        from alpaca.trading.client import TradingClient
+
+        return TradingClient(
             api_key=ApiKeys.ALPACA_MARKET_DATA_KEY,
             secret_key=ApiKeys.ALPACA_MARKET_DATA_SECRET,
             raw_data=False,
         )
 
-        # Mapping only necessary methods to avoid exposing the entire client.
-        self._get_all_assets = trading_client.get_all_assets
-        self._get_stock_bars = historical_data_client.get_stock_bars
+    # Mapping only necessary methods to avoid exposing the entire client.
+    @cached_property
+    def _get_all_assets(self) -> Callable[..., Any]:
+        return self._trading_client.get_all_assets
+
+    @cached_property
+    def _get_stock_bars(self) -> Callable[..., Any]:
+        return self._historical_data_client.get_stock_bars
 
     def assets(self) -> AssetDataFrame:
         """Fetches assets from the Alpaca API."""
+        from alpaca.trading.enums import AssetClass as AlpacaAssetClass
+        from alpaca.trading.enums import AssetStatus as AlpacaAssetStatus
+        from alpaca.trading.models import Asset as AlpacaAsset
+        from alpaca.trading.requests import GetAssetsRequest
+
         request = GetAssetsRequest(asset_class=AlpacaAssetClass.US_EQUITY)
         assets_list = cast(List[AlpacaAsset], self._get_all_assets(request))
 
@@ -73,6 +91,10 @@ class AlpacaMarketData(MarketData):
 
     def bars(self, params: MarketDataBarsParams) -> BarDataFrame:
         """Fetches bars from the Alpaca API."""
+        from alpaca.data.models import BarSet
+        from alpaca.data.requests import StockBarsRequest
+        from alpaca.data.timeframe import TimeFrame as AlpacaTimeFrame
+
         request = StockBarsRequest(
             symbol_or_symbols=params.symbol,
             timeframe=AlpacaTimeFrame(
@@ -87,3 +109,32 @@ class AlpacaMarketData(MarketData):
         df = df.reset_index()
         df["timestamp"] = df["timestamp"].dt.tz_convert("UTC")
         return BarDataFrame(df)
+
+    def bars_many(self, params: MarketDataBarsManyParams) -> BarDataFrame:
+        """Fetches bars of many symbols from the Alpaca API, in batches of symbols per request."""
+        from alpaca.data.models import BarSet
+        from alpaca.data.requests import StockBarsRequest
+        from alpaca.data.timeframe import TimeFrame as AlpacaTimeFrame
+
+        frames = []
+        size = self.symbols_per_request
+        for i in range(0, len(params.symbols), size):
+            request = StockBarsRequest(
+                symbol_or_symbols=params.symbols[i:i + size],
+                timeframe=AlpacaTimeFrame(
+                    params.timeframe.amount_value,
+                    params.timeframe.unit_value,
+                ),
+                start=params.start,
+                end=params.end,
+            )
+            df = cast(BarSet, self._get_stock_bars(request)).df
+            if not df.empty:
+                frames.append(df.reset_index())
+
+        if not frames:
+            return empty_bars()
+
+        df = pd.concat(frames, ignore_index=True)
+        df["timestamp"] = df["timestamp"].dt.tz_convert("UTC")
+        return BarDataFrame(df)
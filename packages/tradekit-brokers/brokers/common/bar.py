@@ -46,3 +46,18 @@ class _BarModel(DataFrameModel):
 
 BarDataFrame = DataFrame[_BarModel]
 """A DataFrame type that contains bars."""
+
+
+def empty_bars() -> BarDataFrame:
+    """Returns a BarDataFrame without rows."""
+    df = pd.DataFrame(
+        {
+            "symbol": pd.Series(dtype=str),
+            "timestamp": pd.Series(dtype=BarTimestamp()),
+            **{
+                c: pd.Series(dtype=float)
+                for c in ["open", "high", "low", "close", "volume", "vwap"]
+            },
+        }
+    )
+    return BarDataFrame(df)
@@ -1,9 +1,12 @@
 """Defines all interfaces related to brokers."""
 
+import asyncio
 from abc import ABC, abstractmethod
 from dataclasses import dataclass
 from datetime import datetime
-from typing import Optional
+from typing import List, Optional
+
+import pandas as pd
 
 
 from brokers.common.asset import AssetDataFrame
@@ -58,6 +61,50 @@ class MarketDataBarsParams:
             raise ValueError("End date must be later than start date")
 
 
+@dataclass
+class MarketDataBarsManyParams:
+    """Defines the parameters for fetching bars of many symbols from the broker."""
+
+    symbols: List[str]
+    """The symbols of the assets to fetch data for."""
+
+    timeframe: TimeFrame
+    """The time interval to fetch data for."""
+
+    start: datetime
+    """The start timestamp for the data to be fetched."""
+
+    end: datetime | None
+    """The end timestamp for the data to be fetched. If None, fetch data up to the current time."""
+
+    def __init__(
+        self,
+        symbols: List[str],
+        timeframe: TimeFrame,
+        start: datetime,
+        end: Optional[datetime] = None,
+    ):
+        self.symbols = symbols
+        self.timeframe = timeframe
+        self.start = start
+        self.end = end
+        self._validate_params()
+
+    def _validate_params(self):
+        """Validates the fetch parameters. If the parameters are invalid, it raises a ValueError."""
+        if not self.symbols:
+            raise ValueError("At least one symbol is required")
+
+        if self.start >= datetime.now():
+            raise ValueError("Start date cannot be in the future")
+
+        if self.end and self.end >= datetime.now():
+            raise ValueError("End date cannot be in the future")
+
+        if self.end and self.end <= self.start:
+            raise ValueError("End date must be later than start date")
+
+
 class MarketData(ABC):
     """Defines all methods exposed by a broker for fetching market data."""
 
@@ -71,12 +118,76 @@ class MarketData(ABC):
         """Returns data bars for a specific asset, time window and timeframe."""
         pass
 
+    def bars_many(self, params: MarketDataBarsManyParams) -> BarDataFrame:
+        """
+        Returns data bars for many assets in long format, with one row per symbol and timestamp.
+        Brokers should override it when they can fetch many symbols in one request.
+        """
+        frames = [
+            self.bars(MarketDataBarsParams(symbol, params.timeframe, params.start, params.end))
+            for symbol in params.symbols
+        ]
+        return BarDataFrame(pd.concat(frames, ignore_index=True))
+
     # @abstractmethod
     # def snapshot(self, symbol: str) -> Snapshoot:
     #     """Returns a snapshot of the asset."""
     #     pass
 
 
+class AsyncMarketData(ABC):
+    """
+    Defines all coroutines exposed by a broker for fetching market data, for the services that
+    run in an event loop. The requests of `bars_many` are sent concurrently, up to
+    `max_concurrency` at once. Brokers hold an HTTP session, so they should be used with
+    `async with`, or closed once done.
+    """
+
+    def __init__(self, max_concurrency: int = 8) -> None:
+        if max_concurrency <= 0:
+            raise ValueError("At least one request must be allowed at once")
+
+        self.max_concurrency = max_concurrency
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self.close()
+
+    async def close(self) -> None:
+        """Releases the resources held by the broker. It can still be used afterwards."""
+        pass
+
+    @abstractmethod
+    async def assets(self) -> AssetDataFrame:
+        """Returns a list of assets available for trading on the broker."""
+        pass
+
+    @abstractmethod
+    async def bars(self, params: MarketDataBarsParams) -> BarDataFrame:
+        """Returns data bars for a specific asset, time window and timeframe."""
+        pass
+
+    async def bars_many(self, params: MarketDataBarsManyParams) -> BarDataFrame:
+        """
+        Returns data bars for many assets in long format, with one row per symbol and timestamp.
+        Brokers should override it when they can fetch many symbols in one request.
+        """
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+
+        async def bars(symbol: str) -> BarDataFrame:
+            async with semaphore:
+                return await self.bars(
+                    MarketDataBarsParams(symbol, params.timeframe, params.start, params.end)
+                )
+
+        frames = await asyncio.gather(*(bars(symbol) for symbol in params.symbols))
+        # Symbols without bars are left out, unless none has any.
+        frames = [df for df in frames if not df.empty] or frames[:1]
+        return BarDataFrame(pd.concat(frames, ignore_index=True))
+
+
 class Account(ABC):
     """Defines all methods exposed by a broker for fetching account information."""
 
@@ -35,6 +35,16 @@ class MarketDataRepository(ABC):
     def __init__(self, broker: Brokers) -> None:
         self.broker = broker
 
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """Release the resources held by the repository. It can still be used afterwards."""
+        ...
+
     @abstractmethod
     def save_assets(self, assets: AssetDataFrame) -> SaveResult: ...
 
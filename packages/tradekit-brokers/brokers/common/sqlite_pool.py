@@ -0,0 +1,99 @@
+"""Defines a pool that keeps SQLite connections open between repository calls."""
+
+import os
+import sqlite3
+import threading
+from collections import OrderedDict
+from contextlib import contextmanager
+from typing import Dict, Iterator, Tuple
+
+
+class SQLiteConnectionPool:
+    """
+    Keeps one open connection per thread and database file, since a connection runs one
+    transaction at a time. Connections are checked out with `connection`, and are only closed once
+    no user holds them, so a lazy reader never sees its connection closed. When more than
+    `max_connections` connections are open, the least recently used idle ones are closed, and the
+    ones in use are closed when they are given back.
+    """
+
+    PRAGMAS = (
+        "PRAGMA journal_mode = WAL",
+        "PRAGMA synchronous = NORMAL",
+        "PRAGMA mmap_size = 268435456",
+        "PRAGMA cache_size = -8000",
+    )
+    """The PRAGMAs set once, when a connection is opened."""
+
+    def __init__(self, max_connections: int = 64) -> None:
+        if max_connections <= 0:
+            raise ValueError("The pool must allow at least one connection.")
+
+        self.max_connections = max_connections
+        self._connections: OrderedDict[Tuple[int, str], sqlite3.Connection] = OrderedDict()
+        self._users: Dict[sqlite3.Connection, int] = {}
+        """The number of users of each connection checked out."""
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._connections)
+
+    @contextmanager
+    def connection(self, path: str, filename: str) -> Iterator[sqlite3.Connection]:
+        """
+        Checks out the open connection of the current thread to `path/filename`, opening it if
+        needed.
+        """
+        key = (threading.get_ident(), f"{path}/{filename}")
+        con = self._acquire(path, key)
+        try:
+            yield con
+        finally:
+            self._release(key, con)
+
+    def _acquire(self, path: str, key: Tuple[int, str]) -> sqlite3.Connection:
+        """Returns the connection of a thread to a database, counting one more user of it."""
+        with self._lock:
+            con = self._connections.get(key)
+            if con is None:
+                os.makedirs(path, exist_ok=True)
+                # The pool may close the connection from another thread.
+                con = sqlite3.connect(key[1], check_same_thread=False)
+                for pragma in self.PRAGMAS:
+                    con.execute(pragma)
+                self._connections[key] = con
+            else:
+                self._connections.move_to_end(key)
+
+            self._users[con] = self._users.get(con, 0) + 1
+            self._evict()
+            return con
+
+    def _release(self, key: Tuple[int, str], con: sqlite3.Connection) -> None:
+        """Counts one less user of a connection, closing it if it left the pool and is idle."""
+        with self._lock:
+            users = self._users.pop(con) - 1
+            if users > 0:
+                self._users[con] = users
+            elif self._connections.get(key) is not con:
+                con.close()
+            else:
+                self._evict()
+
+    def _evict(self) -> None:
+        """Closes the least recently used idle connections over `max_connections`."""
+        excess = len(self._connections) - self.max_connections
+        if excess <= 0:
+            return
+
+        idle = [key for key, con in self._connections.items() if con not in self._users]
+        for key in idle[:excess]:
+            self._connections.pop(key).close()
+
+    def close(self) -> None:
+        """Closes all the idle connections, and the ones in use once they are given back."""
+        with self._lock:
+            while self._connections:
+                _, con = self._connections.popitem()
+                if con not in self._users:
+                    con.close()
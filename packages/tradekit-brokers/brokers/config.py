@@ -1,20 +1,37 @@
 """Contains the configuration for all brokers implementations."""
 
 import os
-from dotenv import load_dotenv
+from functools import lru_cache
+from typing import Any, Optional
 
-# Get the environment variables from the .env file (or .env.test).
-load_dotenv()
+
+@lru_cache(maxsize=None)
+def load_env():
+    """Gets the environment variables from the .env file (or .env.test), the first time only."""
+    from dotenv import load_dotenv
+
+    load_dotenv()
+
+
+class _Env:
+    """A setting read from an environment variable when accessed, after loading the .env file."""
+
+    def __init__(self, name: str) -> None:
+        self.name = name
+
+    def __get__(self, instance: Any, owner: Any) -> Optional[str]:
+        load_env()
+        return os.environ.get(self.name)
 
 
 class ApiKeys:
     """Contains the API keys for the Alpaca Broker."""
 
-    ALPACA_MARKET_DATA_KEY = os.environ.get("ALPACA_MARKET_DATA_KEY")
-    ALPACA_MARKET_DATA_SECRET = os.environ.get("ALPACA_MARKET_DATA_SECRET")
+    ALPACA_MARKET_DATA_KEY = _Env("ALPACA_MARKET_DATA_KEY")
+    ALPACA_MARKET_DATA_SECRET = _Env("ALPACA_MARKET_DATA_SECRET")
 
 
 class SqlLiteConfig:
     """Contains the path to the SQL Lite database."""
 
-    SQLITE_PATH = os.environ.get("SQLITE_PATH")
+    SQLITE_PATH = _Env("SQLITE_PATH")
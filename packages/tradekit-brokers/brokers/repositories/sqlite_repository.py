@@ -1,6 +1,5 @@
 import sqlite3
-import os
-from typing import final
+from typing import ContextManager, final
 import pandas as pd
 
 from brokers.common.asset import AssetDataFrame
@@ -11,36 +10,42 @@ from brokers.common.repository import (
     SaveResult,
     SaveBarsParams,
 )
+from brokers.common.enums import Brokers
+from brokers.common.sqlite_pool import SQLiteConnectionPool
 from brokers.config import SqlLiteConfig
 
 
 @final
 class SQLiteMarketDataRepository(MarketDataRepository):
-    def _connect_for_assets(self):
-        """create a database connection to an SQLite database"""
-        path = f"{SqlLiteConfig.SQLITE_PATH}"
-        filename = "assets.db"
-        os.makedirs(path, exist_ok=True)
-        return sqlite3.connect(f"{path}/{filename}")
+    """SQLite market data repository. Connections are reused until the repository is closed."""
 
-    def _connect_for_bars(self, symbol: str):
-        """create a database connection to an SQLite database"""
+    def __init__(self, broker: Brokers, max_connections: int = 64) -> None:
+        super().__init__(broker)
+        self._pool = SQLiteConnectionPool(max_connections)
+
+    def close(self) -> None:
+        """Close all the open connections."""
+        self._pool.close()
+
+    def _connect_for_assets(self) -> ContextManager[sqlite3.Connection]:
+        """Checks out the connection to the SQLite database of the assets."""
+        return self._pool.connection(f"{SqlLiteConfig.SQLITE_PATH}", "assets.db")
+
+    def _connect_for_bars(self, symbol: str) -> ContextManager[sqlite3.Connection]:
+        """Checks out the connection to the SQLite database of a symbol."""
         path = f"{SqlLiteConfig.SQLITE_PATH}/{self.broker.value}"
-        filename = f"{symbol}.db"
-        os.makedirs(path, exist_ok=True)
-        return sqlite3.connect(f"{path}/{filename}")
+        return self._pool.connection(path, f"{symbol}.db")
 
     def save_assets(self, assets: AssetDataFrame) -> SaveResult:
-        con = self._connect_for_assets()
-
         try:
-            n = assets.to_sql(  # type: ignore
-                name=self.broker.value,
-                con=con,
-                if_exists="replace",
-                index=False,
-                chunksize=1000,
-            )
+            with self._connect_for_assets() as con:
+                n = assets.to_sql(  # type: ignore
+                    name=self.broker.value,
+                    con=con,
+                    if_exists="replace",
+                    index=False,
+                    chunksize=1000,
+                )
             return SaveResult(
                 status="success",
                 message=None,
@@ -48,27 +53,24 @@ class SQLiteMarketDataRepository(MarketDataRepository):
             )
         except Exception as e:
             return SaveResult(status="error", message=str(e), rows_affected=0)
-        finally:
-            con.close()
 
     def load_assets(self) -> AssetDataFrame:
-        con = self._connect_for_assets()
         query = f"SELECT * FROM {self.broker.value}"
-        df = pd.read_sql(query, con=con)  # type: ignore
+        with self._connect_for_assets() as con:
+            df = pd.read_sql(query, con=con)  # type: ignore
         # Transform to boolean because it is stored as integer in SQLite.
         df["tradable"] = df["tradable"].astype(bool)
         return AssetDataFrame(df)
 
     def save_bars(self, params: SaveBarsParams) -> SaveResult:
-        con = self._connect_for_bars(symbol=params.symbol)
-
         try:
-            n = params.bars.to_sql(  # type: ignore
-                name=f"tf_{params.timeframe.name_value}",
-                con=con,
-                if_exists="replace",
-                index=False,
-            )
+            with self._connect_for_bars(symbol=params.symbol) as con:
+                n = params.bars.to_sql(  # type: ignore
+                    name=f"tf_{params.timeframe.name_value}",
+                    con=con,
+                    if_exists="replace",
+                    index=False,
+                )
             return SaveResult(
                 status="success",
                 message=None,
@@ -76,23 +78,18 @@ class SQLiteMarketDataRepository(MarketDataRepository):
             )
         except Exception as e:
             return SaveResult(status="error", message=str(e), rows_affected=0)
-        finally:
-            con.close()
 
     def load_bars(self, params: LoadBarsParams) -> BarDataFrame:
-        con = self._connect_for_bars(symbol=params.symbol)
-        try:
-            table = f"tf_{params.timeframe.name_value}"
+        table = f"tf_{params.timeframe.name_value}"
 
-            query = f"SELECT * FROM {table}"
-            if params.start_date is not None:
-                query += f" WHERE timestamp >= '{params.start_date}'"
-            if params.end_date is not None:
-                query += f" AND timestamp <= '{params.end_date}'"
+        query = f"SELECT * FROM {table}"
+        if params.start_date is not None:
+            query += f" WHERE timestamp >= '{params.start_date}'"
+        if params.end_date is not None:
+            query += f" AND timestamp <= '{params.end_date}'"
 
+        with self._connect_for_bars(symbol=params.symbol) as con:
             df = pd.read_sql(query, con)  # type: ignore
-            df["timestamp"] = pd.to_datetime(df["timestamp"], utc=True)  # type: ignore
+        df["timestamp"] = pd.to_datetime(df["timestamp"], utc=True)  # type: ignore
 
-            return BarDataFrame(df)
-        finally:
-            con.close()
+        return BarDataFrame(df)
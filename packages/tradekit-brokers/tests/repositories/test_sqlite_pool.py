@@ -0,0 +1,104 @@
+import sqlite3
+import threading
+
+import pytest
+
+from brokers.common.enums import Brokers
+from brokers.common.sqlite_pool import SQLiteConnectionPool
+from brokers.config import SqlLiteConfig
+from brokers.repositories.sqlite_repository import SQLiteMarketDataRepository
+
+
+class TestSQLiteConnectionPool:
+    @pytest.fixture
+    def pool(self):
+        pool = SQLiteConnectionPool(max_connections=2)
+        yield pool
+        pool.close()
+
+    def test_reuses_connections(self, pool: SQLiteConnectionPool, tmp_path):
+        with pool.connection(str(tmp_path), "AAPL.db") as con:
+            with pool.connection(str(tmp_path), "AAPL.db") as same:
+                assert same is con
+        with pool.connection(str(tmp_path), "AAPL.db") as again:
+            assert again is con
+
+        assert len(pool) == 1
+
+    def test_sets_pragmas(self, pool: SQLiteConnectionPool, tmp_path):
+        with pool.connection(str(tmp_path / "Alpaca"), "AAPL.db") as con:
+            assert con.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+            assert con.execute("PRAGMA synchronous").fetchone()[0] == 1
+
+    def test_closes_least_recently_used(self, pool: SQLiteConnectionPool, tmp_path):
+        for filename in ["AAPL.db", "META.db", "AAPL.db", "MSFT.db"]:
+            with pool.connection(str(tmp_path), filename) as con:
+                if filename == "AAPL.db":
+                    aapl = con
+
+        assert len(pool) == 2
+        with pool.connection(str(tmp_path), "AAPL.db") as con:
+            assert con is aapl
+
+    def test_keeps_connections_in_use(self, pool: SQLiteConnectionPool, tmp_path):
+        with pool.connection(str(tmp_path), "AAPL.db") as aapl:
+            with pool.connection(str(tmp_path), "META.db"):
+                with pool.connection(str(tmp_path), "MSFT.db"):
+                    # All the connections are in use, so none of them is closed.
+                    assert len(pool) == 3
+                assert len(pool) == 2
+            with pool.connection(str(tmp_path), "NVDA.db"):
+                pass
+
+            # The idle connection to META was closed instead.
+            assert aapl.execute("SELECT 1").fetchone() == (1,)
+            assert len(pool) == 2
+
+    def test_close(self, pool: SQLiteConnectionPool, tmp_path):
+        with pool.connection(str(tmp_path), "AAPL.db"):
+            pass
+        pool.close()
+
+        assert len(pool) == 0
+
+    def test_close_while_in_use(self, pool: SQLiteConnectionPool, tmp_path):
+        with pool.connection(str(tmp_path), "AAPL.db") as con:
+            pool.close()
+            assert con.execute("SELECT 1").fetchone() == (1,)
+
+            with pool.connection(str(tmp_path), "AAPL.db") as reopened:
+                assert reopened is not con
+
+        with pytest.raises(sqlite3.ProgrammingError):
+            con.execute("SELECT 1")
+        assert len(pool) == 1
+
+    def test_invalid_max_connections(self):
+        with pytest.raises(ValueError):
+            SQLiteConnectionPool(max_connections=0)
+
+    def test_threads_use_their_own_connections(self, pool: SQLiteConnectionPool, tmp_path):
+        connections = []
+
+        def connect():
+            with pool.connection(str(tmp_path), "AAPL.db") as con:
+                connections.append(con)
+
+        thread = threading.Thread(target=connect)
+        thread.start()
+        thread.join()
+        connect()
+
+        assert connections[0] is not connections[1]
+        assert len(pool) == 2
+
+    def test_repository_context_manager(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(SqlLiteConfig, "SQLITE_PATH", str(tmp_path))
+
+        with SQLiteMarketDataRepository(Brokers.ALPACA) as repository:
+            with repository._connect_for_bars("AAPL") as con:
+                assert con.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+            with repository._connect_for_bars("AAPL") as same:
+                assert same is con
+
+        assert len(repository._pool) == 0
@@ -2,9 +2,10 @@
 
 from datetime import datetime
 import pytest
+from alpaca.data.models import BarSet
 
 from brokers.alpaca_broker import AlpacaMarketData
-from brokers.common.broker import MarketDataBarsParams
+from brokers.common.broker import MarketDataBarsManyParams, MarketDataBarsParams
 from brokers.common.timeframe import TimeFramePresets
 
 
@@ -55,3 +56,37 @@ class TestAlpacaMarketData:
         )
 
         assert bars.shape[0] == 5
+
+    def test_alpaca_bars_many(self, alpaca: AlpacaMarketData):
+        bars = alpaca.bars_many(
+            MarketDataBarsManyParams(
+                symbols=["AAPL", "META"],
+                timeframe=TimeFramePresets.TimeframeDaily,
+                start=datetime(2024, 8, 26),
+                end=datetime(2024, 8, 31),
+            )
+        )
+
+        assert bars.shape[0] == 10
+        assert set(bars["symbol"]) == {"AAPL", "META"}
+
+
+class TestAlpacaMarketDataBatches:
+    """Test the batched requests of Alpaca Market Data, without calling the API."""
+
+    def test_bars_many_without_bars(self, alpaca: AlpacaMarketData):
+        requests = []
+        alpaca.symbols_per_request = 1
+        alpaca._get_stock_bars = lambda request: requests.append(request) or BarSet({})
+
+        bars = alpaca.bars_many(
+            MarketDataBarsManyParams(
+                symbols=["AAPL", "META"],
+                timeframe=TimeFramePresets.TimeframeDaily,
+                start=datetime(2024, 8, 26),
+            )
+        )
+
+        assert len(requests) == 2
+        assert bars.shape[0] == 0
+        assert str(bars["timestamp"].dtype) == "datetime64[ns, UTC]"
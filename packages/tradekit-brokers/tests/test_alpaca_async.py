@@ -0,0 +1,188 @@
+"""Test for the Alpaca async broker, against a local server."""
+
+import asyncio
+from datetime import datetime
+from typing import Any, Awaitable, Callable, List, Set
+
+import pandas as pd
+import pytest
+from aiohttp import web
+
+from brokers.alpaca_async_broker import AsyncAlpacaMarketData
+from brokers.common.broker import AsyncMarketData, MarketDataBarsManyParams, MarketDataBarsParams
+from brokers.common.timeframe import TimeFramePresets
+from brokers.config import ApiKeys
+
+
+def raw_bars(start: str, periods: int) -> List[dict]:
+    """Builds bars in the format of the Alpaca API, with integer prices as sent by the API."""
+    return [
+        {
+            "t": timestamp.strftime("%Y-%m-%dT%H:%M:%SZ"),
+            "o": 100 + i,
+            "h": 101 + i,
+            "l": 99 + i,
+            "c": 100 + i,
+            "v": 1000,
+            "n": 10,
+            "vw": 100.5 + i,
+        }
+        for i, timestamp in enumerate(pd.date_range(start, periods=periods, freq="1D"))
+    ]
+
+
+BARS = {"AAPL": raw_bars("2024-01-01", 5), "MSFT": raw_bars("2024-01-03", 3), "TSLA": []}
+
+
+class FakeAlpaca:
+    """A local server answering the requests of the Alpaca REST API, two bars per page."""
+
+    def __init__(self) -> None:
+        self.requests: List[web.Request] = []
+        self.connections: Set[Any] = set()
+        self.app = web.Application()
+        self.app.router.add_get("/v2/assets", self.assets)
+        self.app.router.add_get("/v2/stocks/bars", self.bars_many)
+        self.app.router.add_get("/v2/stocks/{symbol}/bars", self.bars)
+
+    def page(self, request: web.Request, bars: List[Any]):
+        assert request.headers["APCA-API-KEY-ID"] == "key"
+        self.requests.append(request)
+        self.connections.add(request.transport)
+        offset = int(request.query.get("page_token", 0))
+        next_offset = offset + min(int(request.query["limit"]), 2)
+        return bars[offset:next_offset], str(next_offset) if next_offset < len(bars) else None
+
+    async def assets(self, request: web.Request):
+        return web.json_response(
+            [
+                {
+                    "symbol": "AAPL",
+                    "name": "Apple",
+                    "exchange": "NASDAQ",
+                    "status": "active",
+                    "tradable": True,
+                },
+                {
+                    "symbol": "OLD",
+                    "name": None,
+                    "exchange": "NYSE",
+                    "status": "inactive",
+                    "tradable": False,
+                },
+            ]
+        )
+
+    async def bars(self, request: web.Request):
+        bars, token = self.page(request, BARS[request.match_info["symbol"]])
+        return web.json_response({"bars": bars, "next_page_token": token})
+
+    async def bars_many(self, request: web.Request):
+        rows = [(s, bar) for s in sorted(request.query["symbols"].split(",")) for bar in BARS[s]]
+        rows, token = self.page(request, rows)
+        bars: dict = {}
+        for symbol, bar in rows:
+            bars.setdefault(symbol, []).append(bar)
+        return web.json_response({"bars": bars, "next_page_token": token})
+
+
+def run(fake: FakeAlpaca, test: Callable[[AsyncAlpacaMarketData], Awaitable[Any]], **kwargs):
+    """Runs a test coroutine with a broker of the local server, in a new event loop."""
+
+    async def main():
+        runner = web.AppRunner(fake.app)
+        await runner.setup()
+        await web.TCPSite(runner, "127.0.0.1", 0).start()
+        url = f"http://127.0.0.1:{runner.addresses[0][1]}"
+        try:
+            async with AsyncAlpacaMarketData(data_url=url, trading_url=url, **kwargs) as alpaca:
+                return await test(alpaca)
+        finally:
+            await runner.cleanup()
+
+    return asyncio.run(main())
+
+
+@pytest.fixture(autouse=True)
+def keys(monkeypatch: pytest.MonkeyPatch):
+    monkeypatch.setattr(ApiKeys, "ALPACA_MARKET_DATA_KEY", "key")
+    monkeypatch.setattr(ApiKeys, "ALPACA_MARKET_DATA_SECRET", "secret")
+
+
+@pytest.fixture
+def fake() -> FakeAlpaca:
+    return FakeAlpaca()
+
+
+class TestAsyncAlpacaMarketData:
+    """Test Alpaca async Market Data implementation."""
+
+    def test_assets(self, fake: FakeAlpaca):
+        assets = run(fake, lambda alpaca: alpaca.assets())
+
+        assert list(assets["symbol"]) == ["AAPL", "OLD"]
+        assert list(assets["status"]) == ["Active", "Inactive"]
+
+    def test_bars(self, fake: FakeAlpaca):
+        params = MarketDataBarsParams(
+            "AAPL", TimeFramePresets.TimeframeDaily, datetime(2024, 1, 1), datetime(2024, 2, 1)
+        )
+        bars = run(fake, lambda alpaca: alpaca.bars(params))
+
+        assert list(bars["close"]) == [100.0, 101.0, 102.0, 103.0, 104.0]
+        assert str(bars["timestamp"].dtype) == "datetime64[ns, UTC]"
+        assert fake.requests[0].query["timeframe"] == "1Day"
+        assert fake.requests[0].query["end"] == "2024-02-01T00:00:00Z"
+        assert len(fake.requests) == 3
+        assert len(fake.connections) == 1
+
+    def test_bars_limit(self, fake: FakeAlpaca):
+        params = MarketDataBarsParams(
+            "AAPL", TimeFramePresets.TimeframeDaily, datetime(2024, 1, 1), limit=3
+        )
+        bars = run(fake, lambda alpaca: alpaca.bars(params))
+
+        assert bars.shape[0] == 3
+        assert [r.query["limit"] for r in fake.requests] == ["3", "1"]
+
+    def test_bars_many(self, fake: FakeAlpaca):
+        params = MarketDataBarsManyParams(
+            ["MSFT", "TSLA", "AAPL"], TimeFramePresets.TimeframeDaily, datetime(2024, 1, 1)
+        )
+
+        async def test(alpaca: AsyncAlpacaMarketData):
+            alpaca.symbols_per_request = 2
+            return (
+                await alpaca.bars_many(params),
+                await AsyncMarketData.bars_many(alpaca, params),
+            )
+
+        batched, gathered = run(fake, test)
+
+        assert batched.groupby("symbol").size().to_dict() == {"AAPL": 5, "MSFT": 3}
+        pd.testing.assert_frame_equal(batched, gathered)
+        assert sorted(r.query["symbols"] for r in fake.requests[:5]) == (
+            ["AAPL"] * 3 + ["MSFT,TSLA"] * 2
+        )
+
+    def test_bars_empty(self, fake: FakeAlpaca):
+        params = MarketDataBarsManyParams(
+            ["TSLA"], TimeFramePresets.TimeframeDaily, datetime(2024, 1, 1)
+        )
+        bars = run(fake, lambda alpaca: AsyncMarketData.bars_many(alpaca, params))
+
+        assert bars.empty
+        assert list(bars.columns[:2]) == ["symbol", "timestamp"]
+
+    def test_reopens_after_close(self, fake: FakeAlpaca):
+        async def test(alpaca: AsyncAlpacaMarketData):
+            await alpaca.assets()
+            await alpaca.close()
+            await alpaca.close()
+            return await alpaca.assets()
+
+        assert run(fake, test).shape[0] == 2
+
+    def test_invalid(self):
+        with pytest.raises(ValueError):
+            AsyncAlpacaMarketData(max_concurrency=0)
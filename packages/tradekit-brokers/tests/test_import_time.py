@@ -0,0 +1,28 @@
+"""Test the modules imported with the Alpaca broker, which short-lived jobs import on every run."""
+
+import os
+import subprocess
+import sys
+
+
+def imported_modules(module: str) -> list:
+    """Imports a module in a new interpreter, returning the names of all the modules loaded."""
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    paths = [root, os.environ.get("PYTHONPATH", "")]
+    env = {**os.environ, "PYTHONPATH": os.pathsep.join(path for path in paths if path)}
+    result = subprocess.run(
+        [sys.executable, "-c", f"import sys, {module}; print('\\n'.join(sys.modules))"],
+        capture_output=True,
+        text=True,
+        check=True,
+        env=env,
+    )
+    return result.stdout.splitlines()
+
+
+class TestImportTime:
+    def test_defers_alpaca_and_dotenv(self):
+        modules = imported_modules("brokers.alpaca_broker")
+
+        assert "brokers.alpaca_broker" in modules
+        assert [name for name in modules if name.split(".")[0] in ("alpaca", "dotenv")] == []
@@ -0,0 +1,207 @@
+"""Alpaca async price fetcher implementation, on the REST API of Alpaca."""
+
+from typing import Any, Dict, List, Optional, final
+
+import aiohttp
+import numpy as np
+import pandas as pd
+
+from prices.adapters.alpaca_fetcher import (
+    _MAX_PAGE_SIZE,
+    _bars_query,
+    _normalize_raw_bars,
+    _to_bar,
+)
+from prices.adapters.config import AlpacaApiKeys
+from prices.core.asset import AssetClass, AssetDataFrame, AssetStatus, validate_assets
+from prices.core.bar import Bar, BarDataFrame, empty_bars, validate_bars
+from prices.core.broker import Broker
+from prices.ports.async_price_fetcher import AsyncPriceFetcher
+from prices.ports.price_fetcher import HistoricalManyPriceParams, HistoricalPriceParams
+
+DATA_URL = "https://data.alpaca.markets"
+"""The URL of the Alpaca market data API."""
+
+TRADING_URL = "https://paper-api.alpaca.markets"
+"""The URL of the Alpaca trading API, which lists the assets."""
+
+
+@final
+class AsyncAlpacaPriceFetcher(AsyncPriceFetcher):
+    """
+    Alpaca async price fetcher adapter. All the requests share one HTTP session, whose connections
+    are kept alive and reused, up to `max_concurrency` of them at once.
+    """
+
+    symbols_per_request = 200
+    """The maximum number of symbols sent in a single bars request."""
+
+    requests_per_minute = 200
+    """The request quota of the Alpaca market data API (free plan)."""
+
+    def __init__(
+        self,
+        max_concurrency: int = 8,
+        data_url: str = DATA_URL,
+        trading_url: str = TRADING_URL,
+        keepalive_timeout: float = 30.0,
+    ):
+        super().__init__(Broker.ALPACA, max_concurrency)
+        self.data_url = data_url.rstrip("/")
+        self.trading_url = trading_url.rstrip("/")
+        self.keepalive_timeout = keepalive_timeout
+        self._session: Optional[aiohttp.ClientSession] = None
+
+    @property
+    def session(self) -> aiohttp.ClientSession:
+        """The HTTP session, created in the running event loop when first used."""
+        if self._session is None or self._session.closed:
+            headers = {
+                "APCA-API-KEY-ID": AlpacaApiKeys.ALPACA_MARKET_DATA_KEY,
+                "APCA-API-SECRET-KEY": AlpacaApiKeys.ALPACA_MARKET_DATA_SECRET,
+            }
+            self._session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(
+                    limit=self.max_concurrency, keepalive_timeout=self.keepalive_timeout
+                ),
+                headers={name: value for name, value in headers.items() if value is not None},
+                raise_for_status=True,
+            )
+        return self._session
+
+    async def close(self) -> None:
+        """Closes the HTTP session and its connections."""
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
+
+    async def _get(self, url: str, params: Dict[str, Any]) -> Any:
+        """Sends a GET request and returns its JSON body. Parameters set to None are omitted."""
+        query = {name: value for name, value in params.items() if value is not None}
+        async with self.session.get(url, params=query) as response:
+            return await response.json()
+
+    async def assets(self) -> AssetDataFrame:
+        """Fetches assets from the Alpaca API."""
+        items = await self._get(f"{self.trading_url}/v2/assets", {"asset_class": "us_equity"})
+
+        df = pd.DataFrame(
+            {
+                "name": [item.get("name") or "" for item in items],
+                "symbol": [item["symbol"] for item in items],
+                "exchange": [item["exchange"] for item in items],
+                "broker": Broker.ALPACA.value,
+                "tradable": np.array([item["tradable"] for item in items], dtype=bool),
+                "asset_class": AssetClass.EQUITY.value,
+                "status": [
+                    AssetStatus.ACTIVE.value
+                    if item["status"] == "active"
+                    else AssetStatus.INACTIVE.value
+                    for item in items
+                ],
+                "url_logo": None,
+                "pairs": None,
+            }
+        )
+        return validate_assets(df)
+
+    async def historical(self, params: HistoricalPriceParams) -> BarDataFrame:
+        """Fetches bars from the Alpaca API, one page after the other."""
+        url = f"{self.data_url}/v2/stocks/{params.symbol}/bars"
+        query = _bars_query(params.timeframe, params.start, params.end)
+
+        bars: List[dict] = []
+        remaining = params.limit
+        page_token = None
+        while remaining is None or remaining > 0:
+            page_size = min(_MAX_PAGE_SIZE, remaining or _MAX_PAGE_SIZE)
+            response = await self._get(
+                url, {**query, "limit": page_size, "page_token": page_token}
+            )
+
+            page = response.get("bars") or []
+            bars.extend(page)
+            if remaining is not None:
+                remaining -= len(page)
+
+            page_token = response.get("next_page_token")
+            if page_token is None:
+                break
+
+        if not bars:
+            return empty_bars()
+
+        return validate_bars(_normalize_raw_bars(params.symbol, bars))
+
+    async def historical_many(self, params: HistoricalManyPriceParams) -> BarDataFrame:
+        """
+        Fetches bars of many symbols from the Alpaca API, in batches of symbols per request. The
+        batches are fetched concurrently, and the pages of each batch one after the other.
+        """
+        query = _bars_query(params.timeframe, params.start, params.end)
+        batches = await self.gather(
+            self._fetch_batch(query, batch) for batch in self._batches(params.symbols)
+        )
+
+        frames = [
+            _normalize_raw_bars(symbol, bars)
+            for batch in batches
+            for symbol, bars in batch.items()
+            if bars
+        ]
+        if not frames:
+            return empty_bars()
+
+        return validate_bars(pd.concat(frames, ignore_index=True))
+
+    async def _fetch_batch(self, query: Dict[str, Any], symbols: List[str]) -> Dict[str, list]:
+        """Fetches all the pages of bars of a batch of symbols, returning the bars of each."""
+        url = f"{self.data_url}/v2/stocks/bars"
+        bars: Dict[str, list] = {symbol: [] for symbol in symbols}
+
+        page_token = None
+        while True:
+            response = await self._get(
+                url,
+                {
+                    **query,
+                    "symbols": ",".join(symbols),
+                    "limit": _MAX_PAGE_SIZE,
+                    "page_token": page_token,
+                },
+            )
+            for symbol, page in (response.get("bars") or {}).items():
+                bars.setdefault(symbol, []).extend(page)
+
+            page_token = response.get("next_page_token")
+            if page_token is None:
+                return bars
+
+    async def latest(self, symbol: str) -> BarDataFrame:
+        """Fetches the latest bar from the Alpaca API."""
+        response = await self._get(f"{self.data_url}/v2/stocks/{symbol}/bars/latest", {})
+
+        return validate_bars(_normalize_raw_bars(symbol, [response["bar"]]))
+
+    async def latest_many(self, symbols: List[str]) -> Dict[str, Bar]:
+        """
+        Fetches the latest bar of many symbols from the Alpaca API, in batches of symbols. The
+        bars of the responses are read as records, without any DataFrame.
+        """
+        symbols = list(dict.fromkeys(symbols))
+        url = f"{self.data_url}/v2/stocks/bars/latest"
+        responses = await self.gather(
+            self._get(url, {"symbols": ",".join(batch)}) for batch in self._batches(symbols)
+        )
+
+        latest = {
+            symbol: _to_bar(symbol, bar)
+            for response in responses
+            for symbol, bar in (response.get("bars") or {}).items()
+        }
+        return {symbol: latest[symbol] for symbol in symbols if symbol in latest}
+
+    def _batches(self, symbols: List[str]) -> List[List[str]]:
+        """Splits symbols into the batches sent in a single request."""
+        size = self.symbols_per_request
+        return [symbols[i:i + size] for i in range(0, len(symbols), size)]
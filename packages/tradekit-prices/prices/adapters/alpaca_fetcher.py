@@ -1,103 +1,217 @@
 """Alpaca price fetcher implementation."""
 
-from typing import List, cast, final
+from datetime import datetime
+from functools import cached_property
+from typing import TYPE_CHECKING, Any, Callable, Dict, Iterator, List, Optional, cast, final
 
+import numpy as np
 import pandas as pd
-from alpaca.data.historical import StockHistoricalDataClient
-from alpaca.data.models import BarSet
-from alpaca.data.requests import StockBarsRequest, StockLatestBarRequest
-from alpaca.data.timeframe import TimeFrame as AlpacaTimeFrame
-from alpaca.trading.client import TradingClient
-from alpaca.trading.enums import AssetClass as AlpacaAssetClass
-from alpaca.trading.enums import AssetStatus as AlpacaAssetStatus
-from alpaca.trading.models import Asset as AlpacaAsset
-from alpaca.trading.requests import GetAssetsRequest
 
 from prices.adapters.config import AlpacaApiKeys
-from prices.core.asset import AssetClass, AssetDataFrame, AssetStatus
-from prices.core.bar import BarDataFrame
+from prices.core.asset import AssetClass, AssetDataFrame, AssetStatus, validate_assets
+from prices.core.bar import Bar, BarDataFrame, empty_bars, validate_bars
 from prices.core.broker import Broker
-from prices.ports.price_fetcher import HistoricalPriceParams, PriceFetcher
+from prices.core.timeframe import TimeFrame
+from prices.core.timestamp import to_naive_utc
+from prices.ports.price_fetcher import (
+    HistoricalManyPriceParams,
+    HistoricalPriceParams,
+    PriceFetcher,
+)
+
+# alpaca-py and pydantic take longer to import than the rest of the package, so they are only
+# imported when the API is first called.
+if TYPE_CHECKING:
+    from alpaca.data.historical import StockHistoricalDataClient
+    from alpaca.data.models import BarSet
+    from alpaca.data.timeframe import TimeFrame as AlpacaTimeFrame
+    from alpaca.trading.client import TradingClient
+    from alpaca.trading.enums import AssetStatus as AlpacaAssetStatus
+
+_MAX_PAGE_SIZE = 10_000
+"""The maximum number of bars returned by the Alpaca API in a single page."""
+
+_RAW_BAR_COLUMNS = {
+    "t": "timestamp",
+    "o": "open",
+    "h": "high",
+    "l": "low",
+    "c": "close",
+    "v": "volume",
+    "n": "trade_count",
+    "vw": "vwap",
+}
+"""The names of the bar fields in the Alpaca API responses, mapped to the BarDataFrame columns."""
 
 
 @final
 class AlpacaPriceFetcher(PriceFetcher):
     """Alpaca price fetcher adapter."""
 
+    symbols_per_request = 200
+    """The maximum number of symbols sent in a single bars request."""
+
+    requests_per_minute = 200
+    """The request quota of the Alpaca market data API (free plan)."""
+
     def __init__(self):
         super().__init__(broker=Broker.ALPACA)
 
-        historical_data_client = StockHistoricalDataClient(
+    @cached_property
+    def _historical_data_client(self) -> "StockHistoricalDataClient":
+        """The client of the market data API, created when first used."""
+        from alpaca.data.historical import StockHistoricalDataClient
+
+        return StockHistoricalDataClient(
             api_key=AlpacaApiKeys.ALPACA_MARKET_DATA_KEY,
             secret_key=AlpacaApiKeys.ALPACA_MARKET_DATA_SECRET,
             raw_data=False,
         )
 
-        trading_client = TradingClient(
+    @cached_property
+    def _trading_client(self) -> "TradingClient":
+        """The client of the trading API, created when first used."""
+        from alpaca.trading.client import TradingClient
+
+        return TradingClient(
             api_key=AlpacaApiKeys.ALPACA_MARKET_DATA_KEY,
             secret_key=AlpacaApiKeys.ALPACA_MARKET_DATA_SECRET,
             raw_data=False,
         )
 
-        self._get_all_assets = trading_client.get_all_assets
-        self._get_stock_bars = historical_data_client.get_stock_bars
-        self._get_stock_latest_bar = historical_data_client.get_stock_latest_bar
+    @cached_property
+    def _get_all_assets(self) -> Callable[..., Any]:
+        return self._trading_client.get_all_assets
+
+    @cached_property
+    def _get_market_data(self) -> Callable[..., Any]:
+        return self._historical_data_client.get
+
+    @cached_property
+    def _get_stock_bars(self) -> Callable[..., Any]:
+        return self._historical_data_client.get_stock_bars
+
+    @cached_property
+    def _get_stock_latest_bar(self) -> Callable[..., Any]:
+        return self._historical_data_client.get_stock_latest_bar
 
     def assets(self) -> AssetDataFrame:
         """Fetches assets from the Alpaca API."""
+        from alpaca.trading.enums import AssetClass as AlpacaAssetClass
+        from alpaca.trading.models import Asset as AlpacaAsset
+        from alpaca.trading.requests import GetAssetsRequest
 
         request = GetAssetsRequest(asset_class=AlpacaAssetClass.US_EQUITY)
         assets_list = cast(List[AlpacaAsset], self._get_all_assets(request))
 
-        # Normalize the data to the AssetDataFrame format.
-        assets = [
+        # Normalize the data to the AssetDataFrame format, one column at a time. The enums have few
+        # distinct values, so they are converted once per value instead of once per asset.
+        rows = [(a.name or "", a.symbol, a.exchange, a.tradable, a.status) for a in assets_list]
+        names, symbols, exchanges, tradable, statuses = (
+            (np.array(column, dtype=object) for column in zip(*rows))
+            if rows
+            else (np.empty(0, dtype=object) for _ in range(5))
+        )
+
+        df = pd.DataFrame(
             {
-                "name": asset.name if asset.name else "",
-                "symbol": asset.symbol,
-                "exchange": asset.exchange.value,
-                "broker": Broker.ALPACA,
-                "tradable": asset.tradable,
-                "asset_class": AssetClass.EQUITY,
-                "status": (
-                    AssetStatus.ACTIVE
-                    if asset.status == AlpacaAssetStatus.ACTIVE
-                    else AssetStatus.INACTIVE
-                ),
+                "name": names,
+                "symbol": symbols,
+                "exchange": _map_values(exchanges, lambda exchange: exchange.value),
+                "broker": Broker.ALPACA.value,
+                "tradable": tradable.astype(bool),
+                "asset_class": AssetClass.EQUITY.value,
+                "status": _map_values(statuses, _to_asset_status),
                 # TODO: In the future, we can add a logo URL here (alpaca broker API).
                 # Ref: https://docs.alpaca.markets/reference/get-v1beta1-logos-symbol-1
                 "url_logo": None,
                 "pairs": None,
             }
-            for asset in assets_list
-        ]
-
-        df = pd.DataFrame(assets)
-        return AssetDataFrame(df)
+        )
+        return validate_assets(df)
 
     def historical(self, params: HistoricalPriceParams) -> BarDataFrame:
         """Fetches bars from the Alpaca API."""
+        from alpaca.data.requests import StockBarsRequest
 
         request = StockBarsRequest(
             symbol_or_symbols=params.symbol,
-            timeframe=AlpacaTimeFrame(
-                params.timeframe.amount_value,
-                params.timeframe.unit_value,
-            ),
+            timeframe=_to_alpaca_timeframe(params.timeframe),
             start=params.start,
             end=params.end,
             limit=params.limit,
         )
         response = self._get_stock_bars(request)
 
-        # Normalize the data to the BarDataFrame format.
-        df = cast(BarSet, response).df
-        df = df.reset_index()
-        df["timestamp"] = df["timestamp"].dt.tz_convert("UTC")
+        return validate_bars(_normalize_bars(cast("BarSet", response)))
+
+    def iter_historical(
+        self, params: HistoricalPriceParams, chunk_rows: int = 10_000
+    ) -> Iterator[BarDataFrame]:
+        """
+        Fetches bars from the Alpaca API one page at a time, yielding each page as soon as it
+        arrives. Pages are requested with up to `chunk_rows` bars (at most 10,000).
+        """
+        if chunk_rows <= 0:
+            raise ValueError("Chunks must have at least one row.")
+
+        query = _bars_query(params.timeframe, params.start, params.end)
+
+        remaining = params.limit
+        page_token = None
+        while remaining is None or remaining > 0:
+            page_size = min(chunk_rows, _MAX_PAGE_SIZE, remaining or _MAX_PAGE_SIZE)
+            response = self._get_market_data(
+                f"/stocks/{params.symbol}/bars",
+                {**query, "limit": page_size, "page_token": page_token},
+            )
+
+            bars = response.get("bars") or []
+            if bars:
+                yield validate_bars(_normalize_raw_bars(params.symbol, bars))
+            if remaining is not None:
+                remaining -= len(bars)
+
+            page_token = response.get("next_page_token")
+            if page_token is None:
+                break
+
+    def historical_many(self, params: HistoricalManyPriceParams) -> BarDataFrame:
+        """Fetches bars of many symbols from the Alpaca API, in batches of symbols per request."""
+        frames = [df for df in self._fetch_batches(params) if not df.empty]
+        if not frames:
+            return empty_bars()
+
+        return validate_bars(pd.concat(frames, ignore_index=True))
+
+    def iter_historical_many(self, params: HistoricalManyPriceParams) -> Iterator[BarDataFrame]:
+        """Fetches bars of many symbols from the Alpaca API, yielding the bars of each symbol."""
+        for df in self._fetch_batches(params):
+            # A batch without bars has no columns at all.
+            if df.empty:
+                continue
+            for _, bars in df.groupby("symbol", sort=False):
+                yield validate_bars(bars.reset_index(drop=True))
+
+    def _fetch_batches(self, params: HistoricalManyPriceParams) -> Iterator[pd.DataFrame]:
+        """Yields the normalized bars of each batch of symbols, one request per batch."""
+        from alpaca.data.requests import StockBarsRequest
 
-        return BarDataFrame(df)
+        size = self.symbols_per_request
+        for i in range(0, len(params.symbols), size):
+            request = StockBarsRequest(
+                symbol_or_symbols=params.symbols[i:i + size],
+                timeframe=_to_alpaca_timeframe(params.timeframe),
+                start=params.start,
+                end=params.end,
+            )
+            response = self._get_stock_bars(request)
+            yield _normalize_bars(cast("BarSet", response))
 
     def latest(self, symbol: str) -> BarDataFrame:
         """Fetches the latest bar from the Alpaca API."""
+        from alpaca.data.requests import StockLatestBarRequest
+
         request = StockLatestBarRequest(symbol_or_symbols=symbol)
         response = self._get_stock_latest_bar(request)
 
@@ -106,4 +220,94 @@ class AlpacaPriceFetcher(PriceFetcher):
         df = pd.DataFrame([vars(bar)])
         df["timestamp"] = df["timestamp"].dt.tz_convert("UTC")
 
-        return BarDataFrame(df)
+        return validate_bars(df)
+
+    def latest_many(self, symbols: List[str]) -> Dict[str, Bar]:
+        """
+        Fetches the latest bar of many symbols from the Alpaca API, in batches of symbols per
+        request. The bars of the responses are read as records, without any DataFrame.
+        """
+        symbols = list(dict.fromkeys(symbols))
+        size = self.symbols_per_request
+
+        latest = {}
+        for i in range(0, len(symbols), size):
+            response = self._get_market_data(
+                "/stocks/bars/latest", {"symbols": ",".join(symbols[i:i + size])}
+            )
+            for symbol, bar in (response.get("bars") or {}).items():
+                latest[symbol] = _to_bar(symbol, bar)
+
+        return {symbol: latest[symbol] for symbol in symbols if symbol in latest}
+
+
+def _map_values(values: np.ndarray, convert: Callable[[Any], str]) -> np.ndarray:
+    """Converts each value of an array, calling `convert` only once per distinct value."""
+    codes, uniques = pd.factorize(values, use_na_sentinel=False)
+    return np.array([convert(u) for u in uniques], dtype=object)[codes]
+
+
+def _to_asset_status(status: "AlpacaAssetStatus") -> str:
+    """Converts an Alpaca asset status to an AssetStatus value."""
+    from alpaca.trading.enums import AssetStatus as AlpacaAssetStatus
+
+    active = status == AlpacaAssetStatus.ACTIVE
+    return AssetStatus.ACTIVE.value if active else AssetStatus.INACTIVE.value
+
+
+def _to_alpaca_timeframe(timeframe: TimeFrame) -> "AlpacaTimeFrame":
+    """Converts a TimeFrame to the Alpaca TimeFrame."""
+    from alpaca.data.timeframe import TimeFrame as AlpacaTimeFrame
+
+    return AlpacaTimeFrame(timeframe.amount_value, timeframe.unit_value)
+
+
+def _bars_query(timeframe: TimeFrame, start: datetime, end: Optional[datetime]) -> Dict[str, Any]:
+    """Returns the query of a bars request. Naive datetimes are taken as UTC."""
+    return {
+        "timeframe": f"{timeframe.amount_value}{timeframe.unit_value.value}",
+        "start": _to_rfc3339(start),
+        "end": _to_rfc3339(end) if end else None,
+    }
+
+
+def _to_rfc3339(dt: datetime) -> str:
+    """Formats a datetime as the RFC 3339 timestamp in UTC expected by the Alpaca API."""
+    return to_naive_utc(dt).isoformat() + "Z"
+
+
+def _normalize_bars(bar_set: "BarSet") -> pd.DataFrame:
+    """Normalizes the bars of a BarSet to the BarDataFrame format."""
+    df = bar_set.df
+    if df.empty:
+        return df
+
+    df = df.reset_index()
+    df["timestamp"] = df["timestamp"].dt.tz_convert("UTC")
+    return df
+
+
+def _normalize_raw_bars(symbol: str, bars: List[dict]) -> pd.DataFrame:
+    """Normalizes the bars of an Alpaca API response to the BarDataFrame format."""
+    df = pd.DataFrame(bars).rename(columns=_RAW_BAR_COLUMNS)
+    df.insert(0, "symbol", symbol)
+    df["timestamp"] = pd.to_datetime(df["timestamp"], utc=True)
+
+    # Prices and volumes without decimals are sent as integers.
+    values = ["open", "high", "low", "close", "volume", "vwap"]
+    df[values] = df[values].astype(float)
+    return df
+
+
+def _to_bar(symbol: str, bar: dict) -> Bar:
+    """Converts a bar of an Alpaca API response to a Bar record."""
+    return Bar(
+        symbol=symbol,
+        timestamp=pd.Timestamp(bar["t"]).tz_convert("UTC"),
+        open=float(bar["o"]),
+        high=float(bar["h"]),
+        low=float(bar["l"]),
+        close=float(bar["c"]),
+        volume=float(bar["v"]),
+        vwap=float(bar["vw"]),
+    )
@@ -0,0 +1,105 @@
+"""Alpaca market stream implementation."""
+
+import asyncio
+import json
+from typing import Any, AsyncIterator, Dict, Iterator, Optional, final
+
+import pandas as pd
+import websockets
+
+from prices.adapters.config import AlpacaApiKeys
+from prices.core.bar import Bar
+from prices.core.broker import Broker
+from prices.core.trade import Trade
+from prices.ports.market_stream import MarketStream, StreamEvent
+
+_STREAM_URL = "wss://stream.data.alpaca.markets/v2/{feed}"
+"""The URL of the Alpaca market data stream, for a data feed such as 'iex' or 'sip'."""
+
+
+def _to_event(message: Dict[str, Any]) -> Optional[StreamEvent]:
+    """Returns the bar or the trade of a stream message, or None for the other messages."""
+    match message.get("T"):
+        case "b":
+            return Bar(
+                symbol=message["S"],
+                timestamp=pd.Timestamp(message["t"]),
+                open=float(message["o"]),
+                high=float(message["h"]),
+                low=float(message["l"]),
+                close=float(message["c"]),
+                volume=float(message["v"]),
+                vwap=float(message["vw"]),
+            )
+        case "t":
+            return Trade(
+                symbol=message["S"],
+                timestamp=pd.Timestamp(message["t"]),
+                price=float(message["p"]),
+                size=float(message["s"]),
+            )
+        case "error":
+            raise ValueError(f"Alpaca stream error {message.get('code')}: {message.get('msg')}.")
+    return None
+
+
+def _parse(data: str) -> Iterator[StreamEvent]:
+    """Yields the bars and trades of a frame of the stream, which holds a list of messages."""
+    for message in json.loads(data):
+        event = _to_event(message)
+        if event is not None:
+            yield event
+
+
+@final
+class AlpacaMarketStream(MarketStream):
+    """
+    Alpaca market stream adapter. It streams the bars and trades of the subscribed symbols from
+    the Alpaca websocket, and reconnects when the connection drops or the handshake fails, waiting
+    from `reconnect_delay` up to `max_reconnect_delay` seconds, doubled after each failed attempt.
+    Errors sent by Alpaca, such as rejected credentials, are raised as a ValueError.
+    """
+
+    def __init__(
+        self,
+        feed: str = "iex",
+        url: Optional[str] = None,
+        reconnect_delay: float = 1.0,
+        max_reconnect_delay: float = 30.0,
+    ) -> None:
+        super().__init__(broker=Broker.ALPACA)
+        self.url = url or _STREAM_URL.format(feed=feed)
+        self.reconnect_delay = reconnect_delay
+        self.max_reconnect_delay = max_reconnect_delay
+
+    async def _connect(self, connection: Any):
+        """Authenticates a new connection, and subscribes to the symbols."""
+        # The welcome and the authentication replies only hold errors, raised when parsed.
+        list(_parse(await connection.recv()))
+        auth = {
+            "action": "auth",
+            "key": AlpacaApiKeys.ALPACA_MARKET_DATA_KEY,
+            "secret": AlpacaApiKeys.ALPACA_MARKET_DATA_SECRET,
+        }
+        await connection.send(json.dumps(auth))
+        list(_parse(await connection.recv()))
+
+        subscribe = {"action": "subscribe", "bars": self.bar_symbols, "trades": self.trade_symbols}
+        await connection.send(json.dumps(subscribe))
+
+    async def _events(self) -> AsyncIterator[StreamEvent]:
+        delay = self.reconnect_delay
+        while True:
+            try:
+                async with websockets.connect(self.url) as connection:
+                    await self._connect(connection)
+                    delay = self.reconnect_delay
+                    async for data in connection:
+                        for event in _parse(data):
+                            yield event
+            except (websockets.WebSocketException, OSError, asyncio.TimeoutError):
+                # Only the errors sent by Alpaca are raised, when their messages are parsed.
+                pass
+
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, self.max_reconnect_delay)
@@ -0,0 +1,165 @@
+"""Defines a repository that caches the bars loaded from another repository in memory."""
+
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from prices.core.asset import AssetDataFrame
+from prices.core.bar import BarDataFrame, bar_columns, validate_bars
+from prices.core.timeframe import TimeFrame
+from prices.core.timestamp import to_epoch_ns
+from prices.ports.price_repository import (
+    Coverage,
+    LoadCoverageParams,
+    LoadHistoricalParams,
+    PriceRepository,
+    SaveHistoricalParams,
+    SaveResult,
+)
+
+
+@dataclass
+class _CachedSeries:
+    """The bars of a symbol and timeframe loaded over a range of time."""
+
+    start: Optional[int]
+    """The start of the range loaded, in nanoseconds since the Unix epoch, or None if unbounded."""
+
+    end: Optional[int]
+    """The end of the range loaded, in nanoseconds since the Unix epoch, or None if unbounded."""
+
+    timestamps: np.ndarray
+    """The timestamps of the bars, in nanoseconds since the Unix epoch."""
+
+    bars: BarDataFrame
+
+    size: int
+    """The memory used by the bars, in bytes."""
+
+    def covers(self, start: Optional[int], end: Optional[int]) -> bool:
+        """Whether the range loaded contains the range from `start` to `end`."""
+        return (self.start is None or (start is not None and start >= self.start)) and (
+            self.end is None or (end is not None and end <= self.end)
+        )
+
+    def overlaps(self, start: Optional[int], end: Optional[int]) -> bool:
+        """Whether the range loaded shares some time with the range from `start` to `end`."""
+        return (self.start is None or end is None or end >= self.start) and (
+            self.end is None or start is None or start <= self.end
+        )
+
+
+class CachedPriceRepository(PriceRepository):
+    """
+    Read-through cache of the bars loaded from another repository. The bars of the most recently
+    loaded symbols and timeframes are kept, with all their columns, up to `max_bytes` of memory,
+    and any load within the range of time already loaded is sliced from them. A load that overlaps
+    it loads the union of both ranges, so overlapping requests grow the cached range. Saving the
+    bars of a symbol and timeframe through the cache removes them from it, but saving them to the
+    wrapped repository directly does not, so they must be invalidated.
+    """
+
+    def __init__(self, repository: PriceRepository, max_bytes: int = 256 * 1024**2) -> None:
+        if max_bytes <= 0:
+            raise ValueError("The cache must hold a positive number of bytes.")
+
+        super().__init__(repository.broker)
+        self.repository = repository
+        self.max_bytes = max_bytes
+        self.size = 0
+        """The memory used by the cached bars, in bytes."""
+        self.hits = 0
+        self.misses = 0
+        self._series: OrderedDict[Tuple[str, str], _CachedSeries] = OrderedDict()
+
+    def close(self) -> None:
+        self.clear()
+        self.repository.close()
+
+    def save_assets(self, assets: AssetDataFrame) -> SaveResult:
+        return self.repository.save_assets(assets)
+
+    def save_historical(self, params: SaveHistoricalParams) -> SaveResult:
+        self.invalidate(params.symbol, params.timeframe)
+        return self.repository.save_historical(params)
+
+    def load_assets(self) -> AssetDataFrame:
+        return self.repository.load_assets()
+
+    def load_historical(self, params: LoadHistoricalParams) -> BarDataFrame:
+        start = to_epoch_ns(params.start) if params.start is not None else None
+        end = to_epoch_ns(params.end) if params.end is not None else None
+
+        key = (params.symbol, params.timeframe.value)
+        series = self._series.get(key)
+        if series is not None and series.covers(start, end):
+            self.hits += 1
+            self._series.move_to_end(key)
+        else:
+            self.misses += 1
+            if series is not None and series.overlaps(start, end):
+                start = None if start is None or series.start is None else min(start, series.start)
+                end = None if end is None or series.end is None else max(end, series.end)
+            series = self._load(params.symbol, params.timeframe, start, end)
+
+        return self._slice(series, params)
+
+    def load_coverage(self, params: LoadCoverageParams) -> Coverage:
+        return self.repository.load_coverage(params)
+
+    def _load(
+        self, symbol: str, timeframe: TimeFrame, start: Optional[int], end: Optional[int]
+    ) -> _CachedSeries:
+        """Loads the bars of a range from the wrapped repository, caching them if they fit."""
+        params = LoadHistoricalParams(symbol, timeframe, _to_timestamp(start), _to_timestamp(end))
+        bars = self.repository.load_historical(params)
+        size = int(bars.memory_usage(index=True, deep=True).sum())
+        timestamps = bars["timestamp"].astype("int64").to_numpy()
+        series = _CachedSeries(start, end, timestamps, bars, size)
+
+        self.invalidate(symbol, timeframe)
+        if size <= self.max_bytes:
+            self._series[(symbol, timeframe.value)] = series
+            self.size += size
+            while self.size > self.max_bytes:
+                self.size -= self._series.popitem(last=False)[1].size
+
+        return series
+
+    @staticmethod
+    def _slice(series: _CachedSeries, params: LoadHistoricalParams) -> BarDataFrame:
+        """Returns the bars of a series requested by `params`."""
+        timestamps = series.timestamps
+        lo, hi = 0, len(timestamps)
+        if params.start is not None:
+            lo = int(np.searchsorted(timestamps, to_epoch_ns(params.start), side="left"))
+        if params.end is not None:
+            hi = int(np.searchsorted(timestamps, to_epoch_ns(params.end), side="right"))
+        if params.limit is not None:
+            hi = min(hi, lo + params.limit)
+
+        df = series.bars.iloc[lo:max(lo, hi)][bar_columns(params.columns)].reset_index(drop=True)
+        return validate_bars(df, trusted=True)
+
+    def invalidate(self, symbol: str, timeframe: Optional[TimeFrame] = None):
+        """Removes the cached bars of a symbol, for one timeframe or for all of them."""
+        keys = [
+            key
+            for key in self._series
+            if key[0] == symbol and (timeframe is None or key[1] == timeframe.value)
+        ]
+        for key in keys:
+            self.size -= self._series.pop(key).size
+
+    def clear(self):
+        """Removes all the cached bars."""
+        self._series.clear()
+        self.size = 0
+
+
+def _to_timestamp(ns: Optional[int]) -> Optional[pd.Timestamp]:
+    """Returns nanoseconds since the Unix epoch as a UTC Timestamp, keeping None as is."""
+    return pd.Timestamp(ns, unit="ns", tz="UTC") if ns is not None else None
@@ -0,0 +1,316 @@
+"""
+Defines a price repository that stores bars as Parquet files. It requires the `parquet` extra of
+the package, which installs pyarrow.
+"""
+
+import os
+import re
+import shutil
+from typing import Iterator, Optional, final
+
+import numpy as np
+import pandas as pd
+
+try:
+    import pyarrow as pa
+    import pyarrow.compute as pc
+    import pyarrow.parquet as pq
+except ImportError as e:  # pragma: no cover
+    raise ImportError(
+        "The Parquet repository requires pyarrow. Install tradekit-prices[parquet]."
+    ) from e
+
+from prices.adapters.config import ParquetConfig
+from prices.core.asset import AssetDataFrame, diff_assets, validate_assets
+from prices.core.bar import BAR_VALUE_COLUMNS, BarDataFrame, bar_columns, empty_bars, validate_bars
+from prices.core.broker import Broker
+from prices.core.timeframe import TimeFrame
+from prices.core.timestamp import to_epoch_ns
+from prices.ports.price_repository import (
+    Coverage,
+    LoadCoverageParams,
+    LoadHistoricalParams,
+    PriceRepository,
+    SaveHistoricalParams,
+    SaveResult,
+    coverage_of,
+)
+
+_BARS_SCHEMA = pa.schema(
+    [
+        ("timestamp", pa.timestamp("ns", tz="UTC")),
+        *((c, pa.float64()) for c in BAR_VALUE_COLUMNS),
+    ]
+)
+"""The schema of a bars file. The symbol is not stored, because it is part of the file path."""
+
+_YEAR_DIR = re.compile(r"^year=(\d{4})$")
+"""The name of the directory that holds the bars of a year."""
+
+
+def _year_range(params: LoadHistoricalParams) -> tuple[int, int]:
+    """Returns the first and last years that may hold the bars requested by `params`."""
+    first = 0 if params.start is None else pd.Timestamp(to_epoch_ns(params.start)).year
+    last = 9999 if params.end is None else pd.Timestamp(to_epoch_ns(params.end)).year
+    return first, last
+
+
+def _row_groups(
+    file: pq.ParquetFile, start: Optional[int], end: Optional[int]
+) -> list[int]:
+    """
+    Returns the row groups of a bars file whose timestamp statistics overlap the range
+    [`start`, `end`], given in nanoseconds since the Unix epoch.
+    """
+    column = _BARS_SCHEMA.get_field_index("timestamp")
+    groups = []
+    for i in range(file.metadata.num_row_groups):
+        stats = file.metadata.row_group(i).column(column).statistics
+        if stats is not None and stats.has_min_max:
+            if start is not None and stats.max.value < start:
+                continue
+            if end is not None and stats.min.value > end:
+                continue
+        groups.append(i)
+    return groups
+
+
+def _between(table: pa.Table, start: Optional[int], end: Optional[int]) -> pa.Table:
+    """Returns the rows of `table` whose timestamp is in the range [`start`, `end`]."""
+    if start is None and end is None:
+        return table
+
+    timestamps = table.column("timestamp")
+    mask = pa.scalar(True)
+    if start is not None:
+        mask = pc.and_(mask, pc.greater_equal(timestamps, pa.scalar(start, _BARS_SCHEMA[0].type)))
+    if end is not None:
+        mask = pc.and_(mask, pc.less_equal(timestamps, pa.scalar(end, _BARS_SCHEMA[0].type)))
+    return table.filter(mask)
+
+
+def _to_bars(table: pa.Table, symbol: str) -> BarDataFrame:
+    """Converts the rows read from a bars file to the BarDataFrame format."""
+    df = table.to_pandas()
+    df.insert(0, "symbol", symbol)
+    return validate_bars(df, trusted=True)
+
+
+def _changed_rows(stored: pd.DataFrame, bars: pd.DataFrame) -> np.ndarray:
+    """Returns a mask of the `bars` that are missing from `stored`, or whose values differ."""
+    old = stored.set_index("timestamp")[BAR_VALUE_COLUMNS].reindex(bars["timestamp"])
+    new = bars.set_index("timestamp")[BAR_VALUE_COLUMNS]
+    # Missing values are equal to each other, as in the SQLite adapter.
+    same = ((old == new) | (old.isna() & new.isna())).all(axis=1).to_numpy()
+    inserted = ~bars["timestamp"].isin(stored["timestamp"]).to_numpy()
+    return inserted | ~same
+
+
+@final
+class ParquetPriceRepository(PriceRepository):
+    """
+    Parquet adapter for price repository. Bars are stored in one file per symbol and year, under
+    `PARQUET_PATH/<broker>/tf_<timeframe>/symbol=<symbol>/year=<year>/bars.parquet`. Files are
+    sorted by timestamp and split in row groups, so a range of timestamps only reads the row
+    groups whose statistics overlap it, and only the columns requested.
+    """
+
+    def __init__(self, broker: Broker, row_group_rows: int = 50_000) -> None:
+        super().__init__(broker)
+        if row_group_rows <= 0:
+            raise ValueError("Row groups must have at least one row.")
+
+        self.row_group_rows = row_group_rows
+
+    def _symbol_path(self, symbol: str, timeframe: TimeFrame) -> str:
+        """Returns the directory with the bars of a symbol and timeframe."""
+        return (
+            f"{ParquetConfig.PARQUET_PATH}/{self.broker.value}/"
+            f"tf_{timeframe.name_value}/symbol={symbol}"
+        )
+
+    @staticmethod
+    def _years(path: str) -> list[int]:
+        """Returns the sorted years that have stored bars under `path`."""
+        if not os.path.isdir(path):
+            return []
+
+        matches = (_YEAR_DIR.match(name) for name in os.listdir(path))
+        return sorted(int(m.group(1)) for m in matches if m)
+
+    @staticmethod
+    def _year_file(path: str, year: int) -> str:
+        """Returns the file with the bars of a year."""
+        return f"{path}/year={year}/bars.parquet"
+
+    def _files(self, params: LoadHistoricalParams) -> Iterator[str]:
+        """Yields, in order, the files that may hold the bars requested by `params`."""
+        path = self._symbol_path(params.symbol, params.timeframe)
+        first, last = _year_range(params)
+        for year in self._years(path):
+            if first <= year <= last:
+                yield self._year_file(path, year)
+
+    def _write(self, file: str, bars: pd.DataFrame):
+        """Writes sorted bars to a file, replacing it atomically."""
+        os.makedirs(os.path.dirname(file), exist_ok=True)
+        table = pa.Table.from_pandas(
+            bars[_BARS_SCHEMA.names], schema=_BARS_SCHEMA, preserve_index=False
+        )
+        pq.write_table(
+            table,
+            f"{file}.tmp",
+            row_group_size=self.row_group_rows,
+            compression="zstd",
+            write_statistics=True,
+        )
+        os.replace(f"{file}.tmp", file)
+
+    def save_assets(self, assets: AssetDataFrame) -> SaveResult:
+        """
+        Save assets data. The file is only rewritten when some assets were inserted, removed or
+        changed since the last save, and only they are counted.
+        """
+        try:
+            file = f"{ParquetConfig.PARQUET_PATH}/{self.broker.value}/assets.parquet"
+            if os.path.exists(file):
+                diff = diff_assets(pq.read_table(file).to_pandas(), assets)
+                if diff.rows_affected == 0:
+                    return SaveResult(status="success", message=None, rows_affected=0)
+                rows = diff.rows_affected
+            else:
+                rows = assets["symbol"].nunique()
+
+            os.makedirs(os.path.dirname(file), exist_ok=True)
+            assets = assets.drop_duplicates("symbol", keep="last")
+            pq.write_table(pa.Table.from_pandas(assets, preserve_index=False), f"{file}.tmp")
+            os.replace(f"{file}.tmp", file)
+            return SaveResult(status="success", message=None, rows_affected=rows)
+        except Exception as e:
+            return SaveResult(status="error", message=str(e), rows_affected=0)
+
+    def save_historical(self, params: SaveHistoricalParams) -> SaveResult:
+        """
+        Save historical price data. Only the files of the years present in the bars are rewritten,
+        and in 'upsert' mode, only when some of their bars were inserted or changed.
+        """
+        path = self._symbol_path(params.symbol, params.timeframe)
+
+        try:
+            bars = params.bars.drop_duplicates("timestamp", keep="last")
+            stored_years = self._years(path)
+            n = 0
+
+            for year, year_bars in bars.groupby(bars["timestamp"].dt.year, sort=True):
+                file = self._year_file(path, int(year))
+                if params.mode == "upsert" and int(year) in stored_years:
+                    stored = pq.read_table(file).to_pandas()
+                    changed = int(_changed_rows(stored, year_bars).sum())
+                    if changed == 0:
+                        continue
+                    kept = stored[~stored["timestamp"].isin(year_bars["timestamp"])]
+                    year_bars = pd.concat([kept, year_bars], ignore_index=True)
+                else:
+                    changed = year_bars.shape[0]
+
+                self._write(file, year_bars.sort_values("timestamp"))
+                n += changed
+
+            if params.mode == "replace":
+                saved = set(bars["timestamp"].dt.year)
+                for year in stored_years:
+                    if year not in saved:
+                        shutil.rmtree(f"{path}/year={year}")
+
+            return SaveResult(status="success", message=None, rows_affected=n)
+        except Exception as e:
+            return SaveResult(status="error", message=str(e), rows_affected=0)
+
+    def load_assets(self) -> AssetDataFrame:
+        file = f"{ParquetConfig.PARQUET_PATH}/{self.broker.value}/assets.parquet"
+        return validate_assets(pq.read_table(file).to_pandas(), trusted=True)
+
+    def load_historical(self, params: LoadHistoricalParams) -> BarDataFrame:
+        columns = bar_columns(params.columns)[1:]
+        start = None if params.start is None else to_epoch_ns(params.start)
+        end = None if params.end is None else to_epoch_ns(params.end)
+
+        tables = []
+        rows = 0
+        for file in self._files(params):
+            parquet = pq.ParquetFile(file)
+            table = parquet.read_row_groups(_row_groups(parquet, start, end), columns=columns)
+            table = _between(table, start, end)
+            tables.append(table)
+            rows += table.num_rows
+            if params.limit is not None and rows >= params.limit:
+                break
+
+        if not tables:
+            return validate_bars(empty_bars()[bar_columns(params.columns)], trusted=True)
+
+        table = pa.concat_tables(tables)
+        if params.limit is not None:
+            table = table.slice(0, params.limit)
+        return _to_bars(table, params.symbol)
+
+    def iter_historical(
+        self, params: LoadHistoricalParams, chunk_rows: int = 10_000
+    ) -> Iterator[BarDataFrame]:
+        """Load historical price data, reading up to `chunk_rows` bars at a time."""
+        if chunk_rows <= 0:
+            raise ValueError("Chunks must have at least one row.")
+
+        columns = bar_columns(params.columns)[1:]
+        start = None if params.start is None else to_epoch_ns(params.start)
+        end = None if params.end is None else to_epoch_ns(params.end)
+        remaining = params.limit
+
+        for file in self._files(params):
+            parquet = pq.ParquetFile(file)
+            groups = _row_groups(parquet, start, end)
+            for batch in parquet.iter_batches(chunk_rows, row_groups=groups, columns=columns):
+                table = _between(pa.Table.from_batches([batch]), start, end)
+                if remaining is not None:
+                    table = table.slice(0, remaining)
+                    remaining -= table.num_rows
+                if table.num_rows > 0:
+                    yield _to_bars(table, params.symbol)
+                if remaining == 0:
+                    return
+
+    def load_coverage(self, params: LoadCoverageParams) -> Coverage:
+        """
+        Load the time span covered by the stored bars. It is read from the file statistics, and
+        only the timestamps are read when gaps are requested or a file has no statistics.
+        """
+        files = list(self._files(LoadHistoricalParams(params.symbol, params.timeframe)))
+        if params.max_gap is not None:
+            timestamps = [pq.read_table(file, columns=["timestamp"]) for file in files]
+            if not timestamps:
+                return Coverage(first=None, last=None, rows=0)
+            series = pa.concat_tables(timestamps).column("timestamp").to_pandas()
+            return coverage_of(series, params.max_gap)
+
+        column = _BARS_SCHEMA.get_field_index("timestamp")
+        first, last, rows = None, None, 0
+        for file in files:
+            parquet = pq.ParquetFile(file)
+            for i in range(parquet.metadata.num_row_groups):
+                stats = parquet.metadata.row_group(i).column(column).statistics
+                if stats is not None and stats.has_min_max:
+                    low, high = stats.min, stats.max
+                else:
+                    # The files written without statistics have their timestamps read instead.
+                    timestamps = parquet.read_row_group(i, columns=["timestamp"])
+                    bounds = pc.min_max(timestamps.column("timestamp"))
+                    low, high = bounds["min"].as_py(), bounds["max"].as_py()
+                    if low is None:
+                        continue
+                first = low if first is None else min(first, low)
+                last = high if last is None else max(last, high)
+            rows += parquet.metadata.num_rows
+
+        if rows == 0:
+            return Coverage(first=None, last=None, rows=0)
+        return Coverage(first=first, last=last, rows=rows)
@@ -0,0 +1,54 @@
+"""Replay market stream implementation, which streams stored bars and trades."""
+
+import asyncio
+from typing import AsyncIterator, Iterable, Optional
+
+from prices.core.bar import BarDataFrame, to_records
+from prices.core.broker import Broker
+from prices.core.trade import Trade
+from prices.ports.market_stream import MarketStream, StreamEvent
+
+
+class ReplayMarketStream(MarketStream):
+    """
+    Replays stored bars and trades as a market stream, in timestamp order, as a stand-in for a
+    live stream in tests and simulations. With a `speed`, the events are spaced out by the time
+    between their timestamps, divided by it, so 60 streams an hour of bars in a minute. Without
+    one, they are streamed as fast as the event loop runs, yielding to it after each event.
+    """
+
+    def __init__(
+        self,
+        bars: BarDataFrame,
+        trades: Iterable[Trade] = (),
+        speed: Optional[float] = None,
+        broker: Broker = Broker.ALPACA,
+    ) -> None:
+        if speed is not None and speed <= 0:
+            raise ValueError("The replay speed must be positive.")
+
+        super().__init__(broker)
+        self.bars = bars
+        self.trades = list(trades)
+        self.speed = speed
+
+    async def _events(self) -> AsyncIterator[StreamEvent]:
+        bar_symbols = set(self.bar_symbols)
+        trade_symbols = set(self.trade_symbols)
+
+        bars = self.bars[self.bars["symbol"].isin(bar_symbols)]
+        events = [
+            *to_records(bars),
+            *(trade for trade in self.trades if trade.symbol in trade_symbols),
+        ]
+        events.sort(key=lambda event: event.timestamp)
+
+        previous = None
+        for event in events:
+            delay = 0.0
+            if self.speed is not None and previous is not None:
+                delay = (event.timestamp - previous).total_seconds() / self.speed
+            previous = event.timestamp
+
+            await asyncio.sleep(delay)
+            yield event
@@ -1,13 +1,17 @@
-import os
 import sqlite3
-from typing import final
+from typing import ContextManager, Iterator, Optional, final
 
 import pandas as pd
 
 from prices.adapters.config import SqlLiteConfig
-from prices.core.asset import AssetDataFrame
-from prices.core.bar import BarDataFrame
+from prices.adapters.sqlite_pool import SQLiteConnectionPool
+from prices.core.asset import ASSET_COLUMNS, AssetDataFrame, diff_assets, validate_assets
+from prices.core.bar import BarDataFrame, bar_columns, empty_bars, validate_bars
+from prices.core.broker import Broker
+from prices.core.timestamp import to_epoch_ns
 from prices.ports.price_repository import (
+    Coverage,
+    LoadCoverageParams,
     LoadHistoricalParams,
     PriceRepository,
     SaveHistoricalParams,
@@ -15,94 +19,285 @@ from prices.ports.price_repository import (
 )
 
 
+_BAR_COLUMNS = ["symbol", "timestamp", "open", "high", "low", "close", "volume", "vwap"]
+"""The columns of a bar in the order they are stored."""
+
+_BAR_KEY = ["symbol", "timestamp"]
+"""The columns that identify a bar in a bars table, which are also its primary key."""
+
+
+def _upsert_bars_query(table: str) -> str:
+    """Returns the query that inserts a bar, or updates it only when any of its values changed."""
+    values = [c for c in _BAR_COLUMNS if c not in _BAR_KEY]
+    return (
+        f'INSERT INTO "{table}" ({", ".join(_BAR_COLUMNS)}) '
+        f'VALUES ({", ".join("?" for _ in _BAR_COLUMNS)}) '
+        f'ON CONFLICT ({", ".join(_BAR_KEY)}) DO UPDATE SET '
+        f'{", ".join(f"{c} = excluded.{c}" for c in values)} '
+        f'WHERE {" OR ".join(f"{c} IS NOT excluded.{c}" for c in values)}'
+    )
+
+
+def _upsert_assets_query(table: str) -> str:
+    """Returns the query that inserts an asset, or updates the asset stored with its symbol."""
+    values = [c for c in ASSET_COLUMNS if c != "symbol"]
+    return (
+        f'INSERT INTO "{table}" ({", ".join(ASSET_COLUMNS)}) '
+        f'VALUES ({", ".join("?" for _ in ASSET_COLUMNS)}) '
+        f'ON CONFLICT (symbol) DO UPDATE SET {", ".join(f"{c} = excluded.{c}" for c in values)}'
+    )
+
+
+def _bars_to_rows(bars: BarDataFrame):
+    """Returns the bars as rows of values in the order of `_BAR_COLUMNS`."""
+    df = bars[_BAR_COLUMNS].copy()
+    # Timestamps are stored as nanoseconds since the Unix epoch.
+    df["timestamp"] = df["timestamp"].astype("int64")
+    return df.itertuples(index=False, name=None)
+
+
+def _rows_to_bars(df: pd.DataFrame) -> BarDataFrame:
+    """Converts the rows read from a bars table to the BarDataFrame format."""
+    if df.empty:
+        # Without rows, the columns read have no dtype.
+        return validate_bars(empty_bars()[list(df.columns)], trusted=True)
+
+    df["timestamp"] = pd.to_datetime(df["timestamp"], unit="ns", utc=True)
+    return validate_bars(df, trusted=True)
+
+
 @final
 class SQLitePriceRepository(PriceRepository):
-    """SQLite adapter for price repository."""
+    """
+    SQLite adapter for price repository. Connections are kept open and reused between calls, until
+    the repository is closed.
+    """
+
+    def __init__(self, broker: Broker, max_connections: int = 64) -> None:
+        super().__init__(broker)
+        self._pool = SQLiteConnectionPool(max_connections)
+        self._migrated_tables: set[tuple[str, str]] = set()
 
-    def _connect_for_bars(self, symbol: str):
-        """Create a database connection to an SQLite database"""
+    def close(self) -> None:
+        """Close all the open connections."""
+        self._pool.close()
+
+    def _connect_for_bars(self, symbol: str) -> ContextManager[sqlite3.Connection]:
+        """Checks out the connection to the SQLite database of a symbol."""
         path = f"{SqlLiteConfig.SQLITE_PATH}/{self.broker.value}"
-        filename = f"{symbol}.db"
-        os.makedirs(path, exist_ok=True)
-        return sqlite3.connect(f"{path}/{filename}")
+        return self._pool.connection(path, f"{symbol}.db")
+
+    def _connect_for_assets(self) -> ContextManager[sqlite3.Connection]:
+        """Checks out the connection to the SQLite database of the assets."""
+        return self._pool.connection(f"{SqlLiteConfig.SQLITE_PATH}", "assets.db")
+
+    @staticmethod
+    def _create_bars_table(con: sqlite3.Connection, table: str):
+        """
+        Creates the bars table if missing. Bars are clustered by their primary key, so a range of
+        timestamps is read with an index seek.
+        """
+        con.execute(
+            f'CREATE TABLE IF NOT EXISTS "{table}" ('
+            "symbol TEXT NOT NULL, timestamp INTEGER NOT NULL, open REAL, high REAL, low REAL, "
+            f"close REAL, volume REAL, vwap REAL, PRIMARY KEY ({', '.join(_BAR_KEY)})"
+            ") WITHOUT ROWID"
+        )
+
+    @staticmethod
+    def _table_sql(con: sqlite3.Connection, table: str) -> Optional[str]:
+        """Returns the statement that created a table, or None if the table does not exist."""
+        row = con.execute(
+            "SELECT sql FROM sqlite_master WHERE type = 'table' AND name = ?", (table,)
+        ).fetchone()
+        return row[0] if row else None
+
+    @staticmethod
+    def _migrate_bars_table(con: sqlite3.Connection, table: str):
+        """
+        Rebuilds a bars table created by previous versions, which stored timestamps as text and
+        had no primary key. It does nothing if the table is missing or already migrated.
+        """
+        sql = SQLitePriceRepository._table_sql(con, table)
+        if sql is None or "WITHOUT ROWID" in sql.upper():
+            return
+
+        legacy = f"{table}_legacy"
+        con.execute(f'ALTER TABLE "{table}" RENAME TO "{legacy}"')
+        SQLitePriceRepository._create_bars_table(con, table)
+        con.execute(
+            f'INSERT OR REPLACE INTO "{table}" ({", ".join(_BAR_COLUMNS)}) '
+            "SELECT symbol, CAST(strftime('%s', timestamp) AS INTEGER) * 1000000000, "
+            f'open, high, low, close, volume, vwap FROM "{legacy}"'
+        )
+        con.execute(f'DROP TABLE "{legacy}"')
 
-    def _connect_for_assets(self):
-        """create a database connection to an SQLite database"""
-        path = f"{SqlLiteConfig.SQLITE_PATH}"
-        filename = "assets.db"
-        os.makedirs(path, exist_ok=True)
-        return sqlite3.connect(f"{path}/{filename}")
+    @staticmethod
+    def _create_assets_table(con: sqlite3.Connection, table: str):
+        """
+        Creates the assets table if missing, and the unique index on its symbol, which the tables
+        created by previous versions lack.
+        """
+        con.execute(
+            f'CREATE TABLE IF NOT EXISTS "{table}" ('
+            "name TEXT, symbol TEXT NOT NULL, exchange TEXT, broker TEXT, asset_class TEXT, "
+            "tradable INTEGER, status TEXT, url_logo TEXT, pairs TEXT)"
+        )
+        con.execute(f'CREATE UNIQUE INDEX IF NOT EXISTS "{table}_symbol" ON "{table}" (symbol)')
+
+    def _migrate_once(self, con: sqlite3.Connection, symbol: str, table: str):
+        """Migrates a bars table the first time it is used by this repository."""
+        if (symbol, table) in self._migrated_tables:
+            return
+
+        with con:
+            con.execute("BEGIN IMMEDIATE")
+            self._migrate_bars_table(con, table)
+        self._migrated_tables.add((symbol, table))
 
     def save_assets(self, assets: AssetDataFrame) -> SaveResult:
-        """Save assets data."""
-        con = self._connect_for_assets()
+        """
+        Save assets data. Only the assets inserted, removed or changed since the last save are
+        written, and only they are counted.
+        """
+        table = self.broker.value
 
         try:
-            n = assets.to_sql(  # type: ignore
-                name=self.broker.value,
-                con=con,
-                if_exists="replace",
-                index=False,
-                chunksize=1000,
-            )
-            return SaveResult(
-                status="success",
-                message=None,
-                rows_affected=n if n else assets.shape[0],
-            )
+            with self._connect_for_assets() as con:
+                with con:
+                    con.execute("BEGIN IMMEDIATE")
+                    self._create_assets_table(con, table)
+                    diff = diff_assets(pd.read_sql(f'SELECT * FROM "{table}"', con=con), assets)
+
+                    con.executemany(
+                        f'DELETE FROM "{table}" WHERE symbol = ?', [(s,) for s in diff.removed]
+                    )
+                    rows = pd.concat([diff.inserted, diff.updated])[ASSET_COLUMNS].astype(object)
+                    con.executemany(
+                        _upsert_assets_query(table),
+                        rows.where(rows.notna(), None).itertuples(index=False, name=None),
+                    )
+
+            return SaveResult(status="success", message=None, rows_affected=diff.rows_affected)
         except Exception as e:
             return SaveResult(status="error", message=str(e), rows_affected=0)
-        finally:
-            con.close()
 
     def save_historical(self, params: SaveHistoricalParams) -> SaveResult:
         """Save historical price data."""
-        con = self._connect_for_bars(symbol=params.symbol)
+        table = f"tf_{params.timeframe.name_value}"
 
         try:
-            n = params.bars.to_sql(  # type: ignore
-                name=f"tf_{params.timeframe.name_value}",
-                con=con,
-                if_exists="replace",
-                index=False,
-            )
-            return SaveResult(
-                status="success",
-                message=None,
-                rows_affected=n if n else params.bars.shape[0],
-            )
+            with self._connect_for_bars(symbol=params.symbol) as con:
+                self._migrate_once(con, params.symbol, table)
+                with con:
+                    # The write lock is taken first, so the writers of other threads wait for it
+                    # instead of failing to upgrade their read lock.
+                    con.execute("BEGIN IMMEDIATE")
+                    if params.mode == "replace":
+                        con.execute(f'DROP TABLE IF EXISTS "{table}"')
+                    self._create_bars_table(con, table)
+
+                    # Only the inserted rows and the rows whose values changed are counted.
+                    changes = con.total_changes
+                    con.executemany(_upsert_bars_query(table), _bars_to_rows(params.bars))
+                    n = con.total_changes - changes
+
+            return SaveResult(status="success", message=None, rows_affected=n)
         except Exception as e:
             return SaveResult(status="error", message=str(e), rows_affected=0)
-        finally:
-            con.close()
 
     def load_assets(self) -> AssetDataFrame:
-        con = self._connect_for_assets()
-        try:
-            query = f"SELECT * FROM {self.broker.value}"
+        query = f'SELECT * FROM "{self.broker.value}"'
+        with self._connect_for_assets() as con:
             df = pd.read_sql(query, con=con)  # type: ignore
-            # Transform to boolean because it is stored as integer in SQLite.
-            df["tradable"] = df["tradable"].astype(bool)
-            return AssetDataFrame(df)
-        finally:
-            con.close()
+        # Transform to boolean because it is stored as integer in SQLite.
+        df["tradable"] = df["tradable"].astype(bool)
+        return validate_assets(df, trusted=True)
 
     def load_historical(self, params: LoadHistoricalParams) -> BarDataFrame:
-        con = self._connect_for_bars(symbol=params.symbol)
-        try:
-            table = f"tf_{params.timeframe.name_value}"
-
-            query = f"SELECT * FROM {table}"
-            if params.start is not None:
-                query += f" WHERE timestamp >= '{params.start}'"
-            if params.end is not None:
-                query += f" AND timestamp <= '{params.end}'"
-            if params.limit is not None:
-                query += f" LIMIT {params.limit}"
-
-            df = pd.read_sql(query, con)  # type: ignore
-            df["timestamp"] = pd.to_datetime(df["timestamp"], utc=True)  # type: ignore
-
-            return BarDataFrame(df)
-        finally:
-            con.close()
+        with self._connect_for_bars(symbol=params.symbol) as con:
+            query, args = self._historical_query(con, params)
+            if query is None:
+                return _rows_to_bars(pd.DataFrame(columns=bar_columns(params.columns)))
+
+            df = pd.read_sql(query, con, params=args)  # type: ignore
+        return _rows_to_bars(df)
+
+    def iter_historical(
+        self, params: LoadHistoricalParams, chunk_rows: int = 10_000
+    ) -> Iterator[BarDataFrame]:
+        """Load historical price data, reading up to `chunk_rows` bars at a time."""
+        if chunk_rows <= 0:
+            raise ValueError("Chunks must have at least one row.")
+
+        # The connection is held until the last chunk is read, or the iterator is closed.
+        with self._connect_for_bars(symbol=params.symbol) as con:
+            query, args = self._historical_query(con, params)
+            if query is None:
+                return
+
+            for df in pd.read_sql(query, con, params=args, chunksize=chunk_rows):  # type: ignore
+                yield _rows_to_bars(df)
+
+    def _historical_query(
+        self, con: sqlite3.Connection, params: LoadHistoricalParams
+    ) -> tuple[Optional[str], list]:
+        """
+        Returns the query, and its arguments, that selects the bars requested by `params`. The
+        query is None if the symbol has no bars table yet.
+        """
+        table = f"tf_{params.timeframe.name_value}"
+        self._migrate_once(con, params.symbol, table)
+        if self._table_sql(con, table) is None:
+            return None, []
+
+        # The symbol is part of the primary key, so the range below is an index seek.
+        columns = bar_columns(params.columns)
+        query = f'SELECT {", ".join(columns)} FROM "{table}" WHERE symbol = ?'
+        args: list = [params.symbol]
+        if params.start is not None:
+            query += " AND timestamp >= ?"
+            args.append(to_epoch_ns(params.start))
+        if params.end is not None:
+            query += " AND timestamp <= ?"
+            args.append(to_epoch_ns(params.end))
+        query += " ORDER BY timestamp"
+        if params.limit is not None:
+            query += " LIMIT ?"
+            args.append(params.limit)
+
+        return query, args
+
+    def load_coverage(self, params: LoadCoverageParams) -> Coverage:
+        table = f"tf_{params.timeframe.name_value}"
+        with self._connect_for_bars(symbol=params.symbol) as con:
+            self._migrate_once(con, params.symbol, table)
+            if self._table_sql(con, table) is None:
+                return Coverage(first=None, last=None, rows=0)
+
+            first, last, rows = con.execute(
+                f'SELECT MIN(timestamp), MAX(timestamp), COUNT(*) FROM "{table}" WHERE symbol = ?',
+                (params.symbol,),
+            ).fetchone()
+            if rows == 0:
+                return Coverage(first=None, last=None, rows=0)
+
+            gaps = []
+            if params.max_gap is not None:
+                gaps = con.execute(
+                    "SELECT previous, timestamp FROM ("
+                    "SELECT timestamp, LAG(timestamp) OVER (ORDER BY timestamp) AS previous "
+                    f'FROM "{table}" WHERE symbol = ?'
+                    ") WHERE timestamp - previous > ?",
+                    (params.symbol, pd.Timedelta(params.max_gap).value),
+                ).fetchall()
+
+        return Coverage(
+            first=pd.Timestamp(first, unit="ns", tz="UTC"),
+            last=pd.Timestamp(last, unit="ns", tz="UTC"),
+            rows=rows,
+            gaps=[
+                (pd.Timestamp(a, unit="ns", tz="UTC"), pd.Timestamp(b, unit="ns", tz="UTC"))
+                for a, b in gaps
+            ],
+        )
@@ -0,0 +1,315 @@
+import sqlite3
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple, final
+
+import numpy as np
+import pandas as pd
+
+from prices.adapters.config import SqlLiteConfig
+from prices.adapters.sqlite_pool import SQLiteConnectionPool
+from prices.adapters.sqlite_repository import SQLitePriceRepository, _rows_to_bars
+from prices.core.asset import AssetDataFrame
+from prices.core.bar import BAR_VALUE_COLUMNS, BarDataFrame, bar_columns
+from prices.core.broker import Broker
+from prices.core.panel import Panel, align_panel, panel_fields
+from prices.core.timeframe import TimeFrame
+from prices.core.timestamp import to_epoch_ns
+from prices.ports.price_repository import (
+    Coverage,
+    LoadCoverageParams,
+    LoadHistoricalParams,
+    LoadPanelParams,
+    PriceRepository,
+    SaveHistoricalParams,
+    SaveResult,
+)
+
+_ROW_COLUMNS = ["symbol_id", "timestamp", *BAR_VALUE_COLUMNS]
+"""The columns of a bar in the order they are stored."""
+
+_UPSERT_BARS_QUERY = (
+    f'INSERT INTO bars ({", ".join(_ROW_COLUMNS)}) '
+    f'VALUES ({", ".join("?" for _ in _ROW_COLUMNS)}) '
+    "ON CONFLICT (symbol_id, timestamp) DO UPDATE SET "
+    f'{", ".join(f"{c} = excluded.{c}" for c in BAR_VALUE_COLUMNS)} '
+    f'WHERE {" OR ".join(f"{c} IS NOT excluded.{c}" for c in BAR_VALUE_COLUMNS)}'
+)
+"""The query that inserts a bar, or updates it only when any of its values changed."""
+
+
+def _bars_to_rows(bars: pd.DataFrame, symbol_ids: Dict[str, int]):
+    """Returns the bars as rows of values in the order of `_ROW_COLUMNS`."""
+    df = bars[["symbol", "timestamp", *BAR_VALUE_COLUMNS]].copy()
+    df["symbol"] = df["symbol"].map(symbol_ids)
+    # Timestamps are stored as nanoseconds since the Unix epoch.
+    df["timestamp"] = df["timestamp"].astype("int64")
+    return df.itertuples(index=False, name=None)
+
+
+def _select(columns: Sequence[str]) -> str:
+    """Returns the selected expressions of bar `columns`, read from the bars joined to symbols."""
+    return ", ".join("s.symbol" if c == "symbol" else f"b.{c}" for c in columns)
+
+
+@final
+class SQLiteUniversePriceRepository(PriceRepository):
+    """
+    SQLite adapter for price repository that stores the bars of all the symbols of a timeframe in
+    a single database, `SQLITE_PATH/<broker>/tf_<timeframe>.db`, instead of one database per
+    symbol. Bars are clustered by (symbol_id, timestamp), so the bars of a symbol are read with an
+    index seek as before, while an index on the timestamp serves cross-sectional queries across
+    all the symbols. The assets are stored as in SQLitePriceRepository.
+    """
+
+    def __init__(self, broker: Broker, max_connections: int = 16) -> None:
+        super().__init__(broker)
+        self._pool = SQLiteConnectionPool(max_connections)
+        self._assets = SQLitePriceRepository(broker, max_connections=1)
+        self._symbol_ids: Dict[Tuple[str, str], int] = {}
+        self._created: set[str] = set()
+
+    def close(self) -> None:
+        """Close all the open connections."""
+        self._pool.close()
+        self._assets.close()
+
+    @contextmanager
+    def _connect(self, timeframe: TimeFrame) -> Iterator[sqlite3.Connection]:
+        """Checks out the connection to the SQLite database of a timeframe, creating its tables."""
+        name = timeframe.name_value
+        path = f"{SqlLiteConfig.SQLITE_PATH}/{self.broker.value}"
+        with self._pool.connection(path, f"tf_{name}.db") as con:
+            if name not in self._created:
+                with con:
+                    con.execute(
+                        "CREATE TABLE IF NOT EXISTS symbols "
+                        "(id INTEGER PRIMARY KEY, symbol TEXT NOT NULL UNIQUE)"
+                    )
+                    con.execute(
+                        "CREATE TABLE IF NOT EXISTS bars ("
+                        "symbol_id INTEGER NOT NULL, timestamp INTEGER NOT NULL, open REAL, "
+                        "high REAL, low REAL, close REAL, volume REAL, vwap REAL, "
+                        "PRIMARY KEY (symbol_id, timestamp)) WITHOUT ROWID"
+                    )
+                    con.execute("CREATE INDEX IF NOT EXISTS bars_timestamp ON bars (timestamp)")
+                self._created.add(name)
+            yield con
+
+    def _symbol_id(
+        self, con: sqlite3.Connection, timeframe: TimeFrame, symbol: str, create: bool = False
+    ) -> Optional[int]:
+        """
+        Returns the id of a symbol in the database of a timeframe, or None if it has no id yet.
+        With `create`, a missing id is inserted, in the transaction of the caller.
+        """
+        key = (timeframe.name_value, symbol)
+        if key in self._symbol_ids:
+            return self._symbol_ids[key]
+
+        if create:
+            con.execute("INSERT OR IGNORE INTO symbols (symbol) VALUES (?)", (symbol,))
+        row = con.execute("SELECT id FROM symbols WHERE symbol = ?", (symbol,)).fetchone()
+        if row is None:
+            return None
+
+        self._symbol_ids[key] = row[0]
+        return row[0]
+
+    def save_assets(self, assets: AssetDataFrame) -> SaveResult:
+        """Save assets data, as SQLitePriceRepository does."""
+        return self._assets.save_assets(assets)
+
+    def load_assets(self) -> AssetDataFrame:
+        return self._assets.load_assets()
+
+    def save_historical(self, params: SaveHistoricalParams) -> SaveResult:
+        """Save historical price data."""
+        try:
+            with self._connect(params.timeframe) as con:
+                with con:
+                    con.execute("BEGIN IMMEDIATE")
+                    symbol_id = self._symbol_id(con, params.timeframe, params.symbol, create=True)
+                    if params.mode == "replace":
+                        con.execute("DELETE FROM bars WHERE symbol_id = ?", (symbol_id,))
+
+                    # Only the inserted rows and the rows whose values changed are counted.
+                    changes = con.total_changes
+                    bars = params.bars.assign(symbol=params.symbol)
+                    rows = _bars_to_rows(bars, {params.symbol: symbol_id})
+                    con.executemany(_UPSERT_BARS_QUERY, rows)
+                    n = con.total_changes - changes
+
+            return SaveResult(status="success", message=None, rows_affected=n)
+        except Exception as e:
+            # The ids inserted by the transaction were rolled back with it.
+            self._symbol_ids.clear()
+            return SaveResult(status="error", message=str(e), rows_affected=0)
+
+    def save_historical_many(self, timeframe: TimeFrame, bars: BarDataFrame) -> SaveResult:
+        """
+        Upserts the bars of many symbols in long format, such as the ones returned by
+        `PriceFetcher.historical_many`, in a single transaction.
+        """
+        try:
+            with self._connect(timeframe) as con:
+                with con:
+                    con.execute("BEGIN IMMEDIATE")
+                    symbols = bars["symbol"].unique().tolist()
+                    symbol_ids = {
+                        s: self._symbol_id(con, timeframe, s, create=True) for s in symbols
+                    }
+
+                    changes = con.total_changes
+                    con.executemany(_UPSERT_BARS_QUERY, _bars_to_rows(bars, symbol_ids))
+                    n = con.total_changes - changes
+
+            return SaveResult(status="success", message=None, rows_affected=n)
+        except Exception as e:
+            # The ids inserted by the transaction were rolled back with it.
+            self._symbol_ids.clear()
+            return SaveResult(status="error", message=str(e), rows_affected=0)
+
+    def load_historical(self, params: LoadHistoricalParams) -> BarDataFrame:
+        with self._connect(params.timeframe) as con:
+            query, args = self._historical_query(con, params)
+            df = pd.read_sql(query, con, params=args)  # type: ignore
+        return _rows_to_bars(df)
+
+    def iter_historical(
+        self, params: LoadHistoricalParams, chunk_rows: int = 10_000
+    ) -> Iterator[BarDataFrame]:
+        """Load historical price data, reading up to `chunk_rows` bars at a time."""
+        if chunk_rows <= 0:
+            raise ValueError("Chunks must have at least one row.")
+
+        # The connection is held until the last chunk is read, or the iterator is closed.
+        with self._connect(params.timeframe) as con:
+            query, args = self._historical_query(con, params)
+            for df in pd.read_sql(query, con, params=args, chunksize=chunk_rows):  # type: ignore
+                yield _rows_to_bars(df)
+
+    def _historical_query(
+        self, con: sqlite3.Connection, params: LoadHistoricalParams
+    ) -> tuple[str, list]:
+        """Returns the query, and its arguments, that selects the bars requested by `params`."""
+        symbol_id = self._symbol_id(con, params.timeframe, params.symbol)
+
+        # The symbol id is the first column of the primary key, so the range is an index seek.
+        columns = bar_columns(params.columns)
+        query = (
+            f"SELECT {_select(columns)} FROM bars AS b JOIN symbols AS s ON s.id = b.symbol_id "
+            "WHERE b.symbol_id = ?"
+        )
+        args: list = [symbol_id]
+        if params.start is not None:
+            query += " AND b.timestamp >= ?"
+            args.append(to_epoch_ns(params.start))
+        if params.end is not None:
+            query += " AND b.timestamp <= ?"
+            args.append(to_epoch_ns(params.end))
+        query += " ORDER BY b.timestamp"
+        if params.limit is not None:
+            query += " LIMIT ?"
+            args.append(params.limit)
+
+        return query, args
+
+    def load_cross_section(
+        self, timeframe: TimeFrame, timestamp: datetime, columns: Optional[List[str]] = None
+    ) -> BarDataFrame:
+        """
+        Load the bars of all the symbols at one timestamp, ordered by symbol. Naive timestamps are
+        taken as UTC.
+        """
+        query = (
+            f"SELECT {_select(bar_columns(columns))} "
+            "FROM bars AS b JOIN symbols AS s ON s.id = b.symbol_id "
+            "WHERE b.timestamp = ? ORDER BY s.symbol"
+        )
+
+        with self._connect(timeframe) as con:
+            df = pd.read_sql(query, con, params=[to_epoch_ns(timestamp)])  # type: ignore
+        return _rows_to_bars(df)
+
+    def load_panel(self, params: LoadPanelParams) -> Panel:
+        """
+        Load the values of many symbols, aligned on the union of their timestamps. The bars of all
+        the symbols are read with a single query, straight into arrays.
+        """
+        fields = panel_fields(params.fields)
+
+        with self._connect(params.timeframe) as con:
+            ids = {}
+            for code, symbol in enumerate(params.symbols):
+                symbol_id = self._symbol_id(con, params.timeframe, symbol)
+                if symbol_id is not None:
+                    ids[symbol_id] = code
+
+            query = (
+                f'SELECT {", ".join(["symbol_id", "timestamp", *fields])} FROM bars '
+                f'WHERE symbol_id IN ({", ".join("?" for _ in ids)})'
+            )
+            args: list = list(ids)
+            if params.start is not None:
+                query += " AND timestamp >= ?"
+                args.append(to_epoch_ns(params.start))
+            if params.end is not None:
+                query += " AND timestamp <= ?"
+                args.append(to_epoch_ns(params.end))
+
+            rows = con.execute(query, args).fetchall()
+
+        # The rows are read into a structured array, with a column per field and NaN for NULL.
+        dtype = [("symbol_id", np.int64), ("timestamp", np.int64)]
+        table = np.array(rows, dtype=dtype + [(f, np.float64) for f in fields])
+
+        codes = np.zeros(max(ids, default=0) + 1, dtype=np.intp)
+        codes[list(ids)] = list(ids.values())
+        return align_panel(
+            params.symbols,
+            codes[table["symbol_id"]],
+            table["timestamp"],
+            {field: table[field] for field in fields},
+            params.fill,
+        )
+
+    def load_symbols(self, timeframe: TimeFrame) -> List[str]:
+        """Load the symbols that have bars of a timeframe, in alphabetical order."""
+        with self._connect(timeframe) as con:
+            rows = con.execute(
+                "SELECT symbol FROM symbols AS s "
+                "WHERE EXISTS (SELECT 1 FROM bars WHERE symbol_id = s.id) ORDER BY symbol"
+            ).fetchall()
+        return [symbol for symbol, in rows]
+
+    def load_coverage(self, params: LoadCoverageParams) -> Coverage:
+        with self._connect(params.timeframe) as con:
+            symbol_id = self._symbol_id(con, params.timeframe, params.symbol)
+
+            first, last, rows = con.execute(
+                "SELECT MIN(timestamp), MAX(timestamp), COUNT(*) FROM bars WHERE symbol_id = ?",
+                (symbol_id,),
+            ).fetchone()
+            if rows == 0:
+                return Coverage(first=None, last=None, rows=0)
+
+            gaps = []
+            if params.max_gap is not None:
+                gaps = con.execute(
+                    "SELECT previous, timestamp FROM ("
+                    "SELECT timestamp, LAG(timestamp) OVER (ORDER BY timestamp) AS previous "
+                    "FROM bars WHERE symbol_id = ?"
+                    ") WHERE timestamp - previous > ?",
+                    (symbol_id, pd.Timedelta(params.max_gap).value),
+                ).fetchall()
+
+            return Coverage(
+                first=pd.Timestamp(first, unit="ns", tz="UTC"),
+                last=pd.Timestamp(last, unit="ns", tz="UTC"),
+                rows=rows,
+                gaps=[
+                    (pd.Timestamp(a, unit="ns", tz="UTC"), pd.Timestamp(b, unit="ns", tz="UTC"))
+                    for a, b in gaps
+                ],
+            )
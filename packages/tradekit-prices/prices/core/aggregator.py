@@ -0,0 +1,163 @@
+"""Defines the incremental aggregation of a stream of bars into bars of coarser timeframes."""
+
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import pandas as pd
+
+from prices.core.bar import Bar, BarDataFrame, to_records
+from prices.core.resample import UTC_SESSION, Session, bucket_bounds
+from prices.core.timeframe import TFPreset, TimeFrame, _TimeFrameUnit
+from prices.core.timestamp import to_epoch_ns
+
+_UNIT_MINUTES = {_TimeFrameUnit.Minute: 1, _TimeFrameUnit.Hour: 60, _TimeFrameUnit.Day: 24 * 60}
+"""The minutes of the units with a fixed width."""
+
+
+@dataclass
+class _PartialBar:
+    """The state of a bar that is being aggregated."""
+
+    start: int
+    """The start of the bar, in nanoseconds since the Unix epoch."""
+
+    end: int
+    """The start of the next bar, in nanoseconds since the Unix epoch."""
+
+    last: int
+    """The timestamp of the last source bar added, in nanoseconds since the Unix epoch."""
+
+    open: float
+    high: float
+    low: float
+    close: float
+    volume: float
+
+    weighted_vwap: float
+    """The sum of the vwap of the source bars, weighted by their volume."""
+
+    vwap_sum: float
+    """The sum of the vwap of the source bars, for the bars without volume."""
+
+    count: int
+    """The number of source bars added."""
+
+    emitted: bool = False
+    """Whether the bar was already emitted as complete."""
+
+    @classmethod
+    def first(cls, bar: Bar, timestamp: int, start: int, end: int) -> "_PartialBar":
+        return cls(
+            start=start,
+            end=end,
+            last=timestamp,
+            open=bar.open,
+            high=bar.high,
+            low=bar.low,
+            close=bar.close,
+            volume=bar.volume,
+            weighted_vwap=bar.vwap * bar.volume,
+            vwap_sum=bar.vwap,
+            count=1,
+        )
+
+    def add(self, bar: Bar, timestamp: int):
+        self.last = timestamp
+        self.high = max(self.high, bar.high)
+        self.low = min(self.low, bar.low)
+        self.close = bar.close
+        self.volume += bar.volume
+        self.weighted_vwap += bar.vwap * bar.volume
+        self.vwap_sum += bar.vwap
+        self.count += 1
+
+    def to_bar(self, symbol: str) -> Bar:
+        vwap = self.weighted_vwap / self.volume if self.volume > 0 else self.vwap_sum / self.count
+        return Bar(
+            symbol=symbol,
+            timestamp=pd.Timestamp(self.start, unit="ns", tz="UTC"),
+            open=self.open,
+            high=self.high,
+            low=self.low,
+            close=self.close,
+            volume=self.volume,
+            vwap=vwap,
+        )
+
+
+class BarAggregator:
+    """
+    Aggregates a stream of `source` bars, one at a time, into bars of coarser `timeframes`, with
+    the same alignment and values as `resample_bars`. Each update takes constant time, whatever
+    the length of the stream. A bar is emitted as complete as soon as its last source bar is
+    added, or else when the first source bar of a later bar arrives. Source bars older than, or
+    as old as, the last one added for a symbol are ignored, so polling the same latest bar many
+    times is counted once.
+    """
+
+    def __init__(
+        self,
+        timeframes: Iterable[TimeFrame],
+        session: Session = UTC_SESSION,
+        source: TimeFrame = TFPreset.Tf_1m,
+    ) -> None:
+        if source.unit_value not in _UNIT_MINUTES:
+            raise ValueError("The source bars must have a timeframe of minutes, hours or days.")
+
+        self.timeframes = list(timeframes)
+        self.session = session
+        self.source = source
+        self._source_width = source.amount_value * _UNIT_MINUTES[source.unit_value] * 60 * 10**9
+        self._partials: Dict[Tuple[str, str], _PartialBar] = {}
+
+    def update(self, bar: Bar) -> List[Tuple[TimeFrame, Bar]]:
+        """Adds a source bar, returning the bars completed by it, with their timeframe."""
+        timestamp = to_epoch_ns(bar.timestamp)
+        completed = []
+
+        for timeframe in self.timeframes:
+            key = (bar.symbol, timeframe.value)
+            partial = self._partials.get(key)
+
+            if partial is not None and timestamp <= partial.last:
+                continue
+
+            if partial is not None and timestamp < partial.end:
+                partial.add(bar, timestamp)
+            else:
+                if partial is not None and not partial.emitted:
+                    completed.append((timeframe, partial.to_bar(bar.symbol)))
+                start, end = bucket_bounds(timestamp, timeframe, self.session)
+                partial = self._partials[key] = _PartialBar.first(bar, timestamp, start, end)
+
+            if timestamp + self._source_width >= partial.end:
+                partial.emitted = True
+                completed.append((timeframe, partial.to_bar(bar.symbol)))
+
+        return completed
+
+    def update_bars(self, bars: BarDataFrame) -> List[Tuple[TimeFrame, Bar]]:
+        """
+        Adds many source bars, such as the ones returned by `PriceFetcher.latest`, in timestamp
+        order. Returns the bars completed by them, with their timeframe.
+        """
+        ordered = bars.sort_values("timestamp", kind="stable")
+        return [completed for bar in to_records(ordered) for completed in self.update(bar)]
+
+    def partial(self, symbol: str, timeframe: TimeFrame) -> Optional[Bar]:
+        """Returns the bar of a symbol that is still incomplete, or None if there is none."""
+        partial = self._partials.get((symbol, timeframe.value))
+        if partial is None or partial.emitted:
+            return None
+        return partial.to_bar(symbol)
+
+    def flush(self) -> List[Tuple[TimeFrame, Bar]]:
+        """Returns the incomplete bars, as if they were complete, and clears the state."""
+        flushed = [
+            (timeframe, partial.to_bar(symbol))
+            for timeframe in self.timeframes
+            for (symbol, value), partial in self._partials.items()
+            if value == timeframe.value and not partial.emitted
+        ]
+        self._partials.clear()
+        return flushed
@@ -1,11 +1,16 @@
 """Defines the Asset dataframe model."""
 
+from dataclasses import dataclass, field
 from enum import Enum
+from typing import List, Optional, cast
 
+import numpy as np
+import pandas as pd
 from pandera import DataFrameModel, Field  # type: ignore
 from pandera.typing import DataFrame, Series
 
 from prices.core.broker import Broker
+from prices.core.validation import validate
 
 
 class AssetClass(str, Enum):
@@ -65,3 +70,83 @@ class _AssetModel(DataFrameModel):
 
 AssetDataFrame = DataFrame[_AssetModel]
 """A DataFrame type that contains assets."""
+
+ASSET_COLUMNS = [
+    "name",
+    "symbol",
+    "exchange",
+    "broker",
+    "asset_class",
+    "tradable",
+    "status",
+    "url_logo",
+    "pairs",
+]
+"""The columns of an asset."""
+
+
+@dataclass
+class Asset:
+    """A single asset, as a record instead of a row of an AssetDataFrame."""
+
+    name: str
+    symbol: str
+    exchange: str
+    broker: str
+    asset_class: str
+    tradable: bool
+    status: str
+    url_logo: Optional[str]
+    pairs: Optional[str]
+
+
+@dataclass
+class AssetDiff:
+    """The changes between the stored assets of a broker and a new list of them."""
+
+    inserted: pd.DataFrame
+    """The new assets whose symbol is not stored."""
+
+    updated: pd.DataFrame
+    """The new assets whose symbol is stored, with some values changed, such as their status."""
+
+    removed: List[str] = field(default_factory=list)
+    """The symbols of the stored assets that are no longer listed."""
+
+    @property
+    def rows_affected(self) -> int:
+        """The number of stored rows that must be written or deleted."""
+        return len(self.inserted) + len(self.updated) + len(self.removed)
+
+
+def validate_assets(df: pd.DataFrame, trusted: bool = False) -> AssetDataFrame:
+    """
+    Validates assets with the current validation policy, or with the policy for trusted data if
+    `trusted`.
+    """
+    return cast(AssetDataFrame, validate(_AssetModel.to_schema(), df, trusted))
+
+
+def diff_assets(stored: pd.DataFrame, assets: pd.DataFrame) -> AssetDiff:
+    """
+    Compares the stored assets with a new list of them, keyed on their symbol, so only the assets
+    inserted, updated or removed need to be written. If a symbol is listed more than once, its
+    last asset is kept. Missing values are equal to each other.
+    """
+    assets = assets.drop_duplicates("symbol", keep="last")
+    known = assets["symbol"].isin(stored["symbol"]).to_numpy()
+
+    new = assets[known].set_index("symbol")
+    old = stored.set_index("symbol").reindex(new.index)
+    columns = [c for c in ASSET_COLUMNS if c != "symbol"]
+    changed = np.zeros(len(new), dtype=bool)
+    for c in columns:
+        a, b = new[c].to_numpy(dtype=object), old[c].to_numpy(dtype=object)
+        changed |= (a != b) & ~(pd.isna(a) & pd.isna(b))
+
+    removed = ~stored["symbol"].isin(assets["symbol"]).to_numpy()
+    return AssetDiff(
+        inserted=assets[~known].reset_index(drop=True),
+        updated=assets[known][changed].reset_index(drop=True),
+        removed=stored["symbol"][removed].tolist(),
+    )
@@ -1,9 +1,16 @@
 """Defines the Bar Dataframe for OHLCV data."""
 
+from dataclasses import astuple, dataclass
+from functools import lru_cache
+from typing import Iterable, Iterator, List, Optional, Sequence, cast
+
+import pandas as pd
+from pandera import DataFrameSchema
 from pandera import DataFrameModel
 from pandera.typing import DataFrame, Series
 
 from prices.core.timestamp import Timestamp
+from prices.core.validation import validate
 
 
 class _BarDataFrameModel(DataFrameModel):
@@ -37,3 +44,104 @@ class _BarDataFrameModel(DataFrameModel):
 
 BarDataFrame = DataFrame[_BarDataFrameModel]
 """A DataFrame type that contains bars."""
+
+BAR_VALUE_COLUMNS = ["open", "high", "low", "close", "volume", "vwap"]
+"""The numeric columns of a bar."""
+
+
+@dataclass
+class Bar:
+    """A single bar, as a record instead of a row of a BarDataFrame."""
+
+    symbol: str
+    """The asset symbol of the bar."""
+
+    timestamp: pd.Timestamp
+    """The timestamp of the bar, in UTC."""
+
+    open: float
+    """The opening price of the bar."""
+
+    high: float
+    """The highest price of the bar."""
+
+    low: float
+    """The lowest price of the bar."""
+
+    close: float
+    """The closing price of the bar."""
+
+    volume: float
+    """The volume of the bar."""
+
+    vwap: float
+    """The volume-weighted average price of the bar."""
+
+
+def to_records(bars: BarDataFrame) -> List[Bar]:
+    """Returns the rows of a BarDataFrame as Bar records."""
+    rows = bars[["symbol", "timestamp", *BAR_VALUE_COLUMNS]].itertuples(index=False, name=None)
+    return [Bar(*row) for row in rows]
+
+
+def from_records(records: Iterable[Bar]) -> BarDataFrame:
+    """Returns Bar records as a BarDataFrame."""
+    rows = [astuple(record) for record in records]
+    if not rows:
+        return empty_bars()
+
+    df = pd.DataFrame(rows, columns=["symbol", "timestamp", *BAR_VALUE_COLUMNS])
+    df["timestamp"] = pd.to_datetime(df["timestamp"], utc=True)
+    return validate_bars(df)
+
+
+def empty_bars() -> BarDataFrame:
+    """Returns a BarDataFrame without rows."""
+    df = pd.DataFrame(
+        {
+            "symbol": pd.Series(dtype=str),
+            "timestamp": pd.Series(dtype=Timestamp()),
+            **{c: pd.Series(dtype=float) for c in BAR_VALUE_COLUMNS},
+        }
+    )
+    return validate_bars(df, trusted=True)
+
+
+def bar_columns(columns: Optional[Sequence[str]] = None) -> list[str]:
+    """
+    Returns the columns of a bar projected on the value `columns` requested, in their stored
+    order. The symbol and timestamp are always kept. If `columns` is None, all are returned.
+    """
+    if columns is None:
+        return ["symbol", "timestamp", *BAR_VALUE_COLUMNS]
+
+    unknown = set(columns) - set(BAR_VALUE_COLUMNS) - {"symbol", "timestamp"}
+    if unknown:
+        raise ValueError(f"Unknown bar columns: {', '.join(sorted(unknown))}.")
+
+    return ["symbol", "timestamp", *(c for c in BAR_VALUE_COLUMNS if c in columns)]
+
+
+@lru_cache(maxsize=None)
+def _schema(columns: Optional[tuple[str, ...]] = None) -> DataFrameSchema:
+    """Returns the schema of the bars, restricted to `columns` if given."""
+    schema = _BarDataFrameModel.to_schema()
+    return schema if columns is None else schema.select_columns(list(columns))
+
+
+def validate_bars(df: pd.DataFrame, trusted: bool = False) -> BarDataFrame:
+    """
+    Validates bars with the current validation policy, or with the policy for trusted data if
+    `trusted`. The bars may hold only some of the value columns, as loaded with a projection.
+    """
+    columns = None if set(BAR_VALUE_COLUMNS) <= set(df.columns) else tuple(df.columns)
+    return cast(BarDataFrame, validate(_schema(columns), df, trusted))
+
+
+def iter_chunks(bars: BarDataFrame, chunk_rows: int) -> Iterator[BarDataFrame]:
+    """Yields consecutive chunks of up to `chunk_rows` bars."""
+    if chunk_rows <= 0:
+        raise ValueError("Chunks must have at least one row.")
+
+    for i in range(0, bars.shape[0], chunk_rows):
+        yield validate_bars(bars.iloc[i:i + chunk_rows].reset_index(drop=True), trusted=True)
@@ -0,0 +1,112 @@
+"""Defines the panel of bars, with the values of many symbols aligned on shared timestamps."""
+
+from dataclasses import dataclass
+from typing import Dict, List, Literal, Mapping, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+from prices.core.bar import BarDataFrame, bar_columns
+
+FillPolicy = Literal["nan", "ffill", "drop"]
+"""How the missing bars of a panel are filled. With 'nan', their values are NaN. With 'ffill',
+they take the values of the last bar of their symbol, except the volume, which is 0, and stay NaN
+before its first bar. With 'drop', only the timestamps where every symbol has a bar are kept."""
+
+
+@dataclass
+class Panel:
+    """The values of many symbols, as arrays with a row per timestamp and a column per symbol."""
+
+    timestamps: pd.DatetimeIndex
+    """The timestamps of the rows, in UTC, shared by all the symbols."""
+
+    symbols: List[str]
+    """The symbols of the columns."""
+
+    values: Dict[str, np.ndarray]
+    """The float64 array of each field, such as 'close', of shape (timestamps, symbols)."""
+
+    def __getitem__(self, field: str) -> np.ndarray:
+        return self.values[field]
+
+    def to_frame(self, field: str) -> pd.DataFrame:
+        """Returns the values of a field as a DataFrame of timestamps by symbols."""
+        return pd.DataFrame(self.values[field], index=self.timestamps, columns=self.symbols)
+
+
+def panel_fields(fields: Optional[Sequence[str]] = None) -> List[str]:
+    """Returns the value columns of a panel, in their stored order. If None, all are returned."""
+    return bar_columns(fields)[2:]
+
+
+def align_panel(
+    symbols: Sequence[str],
+    codes: np.ndarray,
+    timestamps: np.ndarray,
+    columns: Mapping[str, np.ndarray],
+    fill: FillPolicy = "nan",
+) -> Panel:
+    """
+    Aligns the bars of many symbols, given as flat arrays, on the union of their timestamps. Each
+    bar is the position `codes` of its symbol in `symbols`, its timestamp in nanoseconds since the
+    Unix epoch, and its value in each of `columns`. Bars are scattered into the panel at once,
+    without sorting or merging the series of the symbols one by one. When a symbol has many bars
+    at the same timestamp, the last one is kept.
+    """
+    times, rows = np.unique(np.asarray(timestamps, dtype=np.int64), return_inverse=True)
+    codes = np.asarray(codes, dtype=np.intp)
+    shape = (len(times), len(symbols))
+
+    present = np.zeros(shape, dtype=bool)
+    present[rows, codes] = True
+    values = {}
+    for field, column in columns.items():
+        array = np.full(shape, np.nan)
+        array[rows, codes] = column
+        values[field] = array
+
+    if fill == "ffill":
+        # The row of the last bar of each symbol, at or before each row.
+        last = np.where(present, np.arange(shape[0])[:, None], -1)
+        np.maximum.accumulate(last, axis=0, out=last)
+        started = last >= 0
+        for field, array in values.items():
+            if field == "volume":
+                array[~present & started] = 0.0
+            else:
+                filled = array[np.maximum(last, 0), np.arange(shape[1])]
+                array[:] = np.where(started, filled, np.nan)
+    elif fill == "drop":
+        complete = present.all(axis=1)
+        times = times[complete]
+        values = {field: array[complete] for field, array in values.items()}
+    elif fill != "nan":
+        raise ValueError(f"Unknown fill policy: {fill}.")
+
+    return Panel(
+        timestamps=pd.DatetimeIndex(times.view("M8[ns]"), tz="UTC"),
+        symbols=list(symbols),
+        values=values,
+    )
+
+
+def panel_from_bars(
+    bars: BarDataFrame,
+    symbols: Sequence[str],
+    fields: Optional[Sequence[str]] = None,
+    fill: FillPolicy = "nan",
+) -> Panel:
+    """
+    Aligns bars in long format, of one or many symbols, into a panel of `symbols`, which must be
+    unique. The bars of other symbols are ignored.
+    """
+    codes = pd.Index(symbols).get_indexer(bars["symbol"])
+    known = codes >= 0
+    return align_panel(
+        symbols,
+        codes[known],
+        bars["timestamp"].astype("int64").to_numpy()[known],
+        {field: bars[field].to_numpy(dtype=np.float64)[known] for field in panel_fields(fields)},
+        fill,
+    )
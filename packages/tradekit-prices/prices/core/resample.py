@@ -0,0 +1,174 @@
+"""Defines the vectorized resampling of bars to a coarser timeframe."""
+
+from dataclasses import dataclass
+from datetime import time
+from typing import Tuple
+
+import numpy as np
+import pandas as pd
+
+from prices.core.bar import BarDataFrame, empty_bars, validate_bars
+from prices.core.timeframe import TimeFrame, _TimeFrameUnit
+
+_NS_PER_MINUTE = 60 * 10**9
+_NS_PER_DAY = 24 * 60 * _NS_PER_MINUTE
+
+
+@dataclass(frozen=True)
+class Session:
+    """Defines how bars are aligned to the trading session of a market."""
+
+    tz: str = "UTC"
+    """The time zone of the market, in which days, weeks and months start."""
+
+    open: time = time(0, 0)
+    """The time the session opens, in the market time zone. Intraday bars are aligned to it, so
+    with an open at 9:30, hourly bars start at 9:30, 10:30, etc."""
+
+
+UTC_SESSION = Session()
+"""A session that follows the UTC calendar, with intraday bars aligned to the hour."""
+
+NYSE_SESSION = Session("America/New_York", time(9, 30))
+"""The regular trading session of the New York Stock Exchange."""
+
+
+def _to_local(timestamps: np.ndarray, tz: str) -> np.ndarray:
+    """Returns the wall-clock times in `tz` of timestamps in nanoseconds since the Unix epoch."""
+    if tz == "UTC":
+        return timestamps
+
+    index = pd.DatetimeIndex(timestamps.view("M8[ns]"), tz="UTC")
+    return index.tz_convert(tz).tz_localize(None).asi8
+
+
+def _to_utc(local: np.ndarray, tz: str) -> pd.DatetimeIndex:
+    """Returns the UTC timestamps of wall-clock times in `tz`."""
+    index = pd.DatetimeIndex(local.view("M8[ns]"))
+    if tz == "UTC":
+        return index.tz_localize("UTC")
+
+    # Ambiguous times are taken as the first of the two, so a bar never starts after its bars.
+    index = index.tz_localize(
+        tz, ambiguous=np.ones(len(index), dtype=bool), nonexistent="shift_forward"
+    )
+    return index.tz_convert("UTC")
+
+
+def bucket_keys(
+    timestamps: np.ndarray, timeframe: TimeFrame, session: Session = UTC_SESSION
+) -> np.ndarray:
+    """
+    Returns, for each timestamp in nanoseconds since the Unix epoch, the start of the bar of
+    `timeframe` that contains it, as a wall-clock time in the session time zone. Weeks start on
+    Monday, and months are grouped from January, so 3-month bars are calendar quarters.
+    """
+    local = _to_local(np.asarray(timestamps, dtype=np.int64), session.tz)
+    amount = timeframe.amount_value
+
+    match timeframe.unit_value:
+        case _TimeFrameUnit.Minute | _TimeFrameUnit.Hour:
+            minutes = amount * (60 if timeframe.unit_value == _TimeFrameUnit.Hour else 1)
+            width = minutes * _NS_PER_MINUTE
+            anchor = (session.open.hour * 60 + session.open.minute) * _NS_PER_MINUTE
+            return (local - anchor) // width * width + anchor
+        case _TimeFrameUnit.Day:
+            return local // _NS_PER_DAY * _NS_PER_DAY
+        case _TimeFrameUnit.Week:
+            days = local // _NS_PER_DAY
+            # The Unix epoch was a Thursday, 3 days after the Monday that starts its week.
+            return (days - (days + 3) % 7) * _NS_PER_DAY
+        case _TimeFrameUnit.Month:
+            months = local.view("M8[ns]").astype("M8[M]").astype(np.int64)
+            months -= months % amount
+            return months.astype("M8[M]").astype("M8[ns]").astype(np.int64)
+
+    raise ValueError(f"Unsupported timeframe: {timeframe.value}.")  # pragma: no cover
+
+
+def bucket_bounds(
+    timestamp: int, timeframe: TimeFrame, session: Session = UTC_SESSION
+) -> Tuple[int, int]:
+    """
+    Returns the start and the end, in nanoseconds since the Unix epoch, of the bar of `timeframe`
+    that contains `timestamp`. The end is the start of the next bar.
+    """
+    start = int(bucket_keys(np.array([timestamp]), timeframe, session)[0])
+    amount = timeframe.amount_value
+
+    match timeframe.unit_value:
+        case _TimeFrameUnit.Minute:
+            end = start + amount * _NS_PER_MINUTE
+        case _TimeFrameUnit.Hour:
+            end = start + amount * 60 * _NS_PER_MINUTE
+        case _TimeFrameUnit.Day:
+            end = start + _NS_PER_DAY
+        case _TimeFrameUnit.Week:
+            end = start + 7 * _NS_PER_DAY
+        case _TimeFrameUnit.Month:
+            month = np.datetime64(start, "ns").astype("M8[M]") + amount
+            end = int(month.astype("M8[ns]").astype(np.int64))
+
+    bounds = _to_utc(np.array([start, end], dtype=np.int64), session.tz).asi8
+    return int(bounds[0]), int(bounds[1])
+
+
+def resample_bars(
+    bars: BarDataFrame, timeframe: TimeFrame, session: Session = UTC_SESSION
+) -> BarDataFrame:
+    """
+    Aggregates bars, of one or many symbols, into bars of a coarser `timeframe`: the first open,
+    the highest high, the lowest low, the last close, the summed volume and the volume-weighted
+    vwap. Each bar is labeled with its start, and only the bars that have source bars are
+    returned. The last bar of a symbol may be partial, if its source bars are still incomplete.
+    """
+    if bars.empty:
+        return empty_bars()
+
+    timestamps = bars["timestamp"].astype("int64").to_numpy()
+    codes, symbols = pd.factorize(bars["symbol"])
+    keys = bucket_keys(timestamps, timeframe, session)
+
+    # Bars are grouped by runs of the same symbol and key, so they must be sorted first.
+    order = None
+    if len(codes) > 1:
+        code_steps = np.diff(codes)
+        time_steps = np.diff(timestamps)
+        if not np.all((code_steps > 0) | ((code_steps == 0) & (time_steps >= 0))):
+            order = np.lexsort((timestamps, codes))
+            codes, keys = codes[order], keys[order]
+
+    def column(name: str) -> np.ndarray:
+        values = bars[name].to_numpy(dtype=np.float64)
+        return values if order is None else values[order]
+
+    changes = (codes[1:] != codes[:-1]) | (keys[1:] != keys[:-1])
+    starts = np.flatnonzero(np.concatenate(([True], changes)))
+    ends = np.concatenate((starts[1:], [len(keys)])) - 1
+
+    volume = column("volume")
+    vwap = column("vwap")
+    total_volume = np.add.reduceat(volume, starts)
+    # Bars without volume take the mean vwap of their source bars.
+    mean_vwap = np.add.reduceat(vwap, starts) / np.diff(np.concatenate((starts, [len(keys)])))
+    weighted_vwap = np.divide(
+        np.add.reduceat(vwap * volume, starts),
+        total_volume,
+        out=mean_vwap,
+        where=total_volume > 0,
+    )
+
+    df = pd.DataFrame(
+        {
+            "symbol": symbols.to_numpy()[codes[starts]],
+            "timestamp": _to_utc(keys[starts], session.tz),
+            "open": column("open")[starts],
+            "high": np.fmax.reduceat(column("high"), starts),
+            "low": np.fmin.reduceat(column("low"), starts),
+            "close": column("close")[ends],
+            "volume": total_volume,
+            "vwap": weighted_vwap,
+        }
+    )
+    # The bars are derived from validated bars.
+    return validate_bars(df, trusted=True)
@@ -1,5 +1,7 @@
 """Defines the class to represent a timestamp which is a datetime with a UTC timezone."""
 
+from datetime import datetime
+
 import pandas as pd
 
 
@@ -11,3 +13,20 @@ class Timestamp(pd.DatetimeTZDtype):
 
     def __str__(self):
         return "Timestamp(datetime64[ns, UTC])"
+
+
+def to_epoch_ns(dt: datetime) -> int:
+    """Returns the nanoseconds since the Unix epoch of `dt`. Naive datetimes are taken as UTC."""
+    ts = pd.Timestamp(dt)
+    ts = ts.tz_localize("UTC") if ts.tzinfo is None else ts.tz_convert("UTC")
+    return ts.value
+
+
+def to_utc(dt: datetime) -> datetime:
+    """Returns `dt` as a timezone-aware datetime in UTC. Naive datetimes are taken as UTC."""
+    return pd.Timestamp(to_epoch_ns(dt), unit="ns", tz="UTC").to_pydatetime()
+
+
+def to_naive_utc(dt: datetime) -> datetime:
+    """Returns `dt` as a naive datetime in UTC. Naive datetimes are taken as UTC already."""
+    return pd.Timestamp(to_epoch_ns(dt), unit="ns").to_pydatetime()
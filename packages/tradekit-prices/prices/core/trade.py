@@ -0,0 +1,22 @@
+"""Defines the trade record, a single execution of an asset streamed by a broker."""
+
+from dataclasses import dataclass
+
+import pandas as pd
+
+
+@dataclass
+class Trade:
+    """A single trade of an asset."""
+
+    symbol: str
+    """The asset symbol of the trade."""
+
+    timestamp: pd.Timestamp
+    """The timestamp of the trade, in UTC."""
+
+    price: float
+    """The price of the trade."""
+
+    size: float
+    """The quantity traded."""
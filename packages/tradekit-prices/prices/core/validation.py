@@ -0,0 +1,107 @@
+"""Defines the policy that decides how thoroughly the DataFrames of the package are validated."""
+
+from contextlib import contextmanager
+from contextvars import ContextVar
+from enum import Enum
+from typing import Dict, Iterator, Optional, Tuple
+
+import pandas as pd
+from pandera import DataFrameSchema
+from pandera.typing import DataFrame
+
+
+class ValidationPolicy(str, Enum):
+    """How thoroughly a DataFrame is validated against its schema."""
+
+    FULL = "full"
+    """Check the columns, the dtypes and every row."""
+
+    SAMPLE = "sample"
+    """Check the columns and the dtypes, and only the first `SAMPLE_ROWS` rows."""
+
+    SCHEMA_ONLY = "schema_only"
+    """Check the columns and the dtypes, but no rows."""
+
+    OFF = "off"
+    """Do not validate."""
+
+
+SAMPLE_ROWS = 100
+"""The number of rows checked by the SAMPLE policy."""
+
+_policies = {False: ValidationPolicy.FULL, True: ValidationPolicy.SCHEMA_ONLY}
+"""The policies of the process for untrusted and trusted DataFrames."""
+
+_context_policies: ContextVar[Optional[Dict[bool, ValidationPolicy]]] = ContextVar(
+    "validation_policies", default=None
+)
+"""The policies set by `validation_policy` in the current context, which override the ones of the
+process. Each thread and asyncio task has its own."""
+
+_unchecked_schemas: Dict[int, Tuple[DataFrameSchema, DataFrameSchema]] = {}
+"""The schemas validated, by id, with their copies without checks."""
+
+
+def get_validation_policy(trusted: bool = False) -> ValidationPolicy:
+    """Returns the policy for untrusted DataFrames, or for trusted ones if `trusted`."""
+    return (_context_policies.get() or _policies)[trusted]
+
+
+def set_validation_policy(
+    policy: Optional[ValidationPolicy] = None, trusted: Optional[ValidationPolicy] = None
+):
+    """
+    Sets the policy of the whole process for untrusted DataFrames, such as the ones downloaded
+    from brokers, and for trusted ones, such as the ones read by a repository that only stores
+    validated data. A policy that is None is left unchanged.
+    """
+    if policy is not None:
+        _policies[False] = policy
+    if trusted is not None:
+        _policies[True] = trusted
+
+
+@contextmanager
+def validation_policy(
+    policy: Optional[ValidationPolicy] = None, trusted: Optional[ValidationPolicy] = None
+) -> Iterator[None]:
+    """
+    Sets the validation policies within a `with` block, restoring the previous ones after. They
+    only apply to the current thread or asyncio task, so concurrent blocks don't see each other's.
+    """
+    current = _context_policies.get() or _policies
+    token = _context_policies.set({False: policy or current[False], True: trusted or current[True]})
+    try:
+        yield
+    finally:
+        _context_policies.reset(token)
+
+
+def _without_checks(schema: DataFrameSchema) -> DataFrameSchema:
+    """
+    Returns a copy of a schema without the checks of its columns, such as `isin`, which run on
+    every row. Pandera counts them as schema checks, so its SCHEMA_ONLY depth still runs them.
+    """
+    cached = _unchecked_schemas.get(id(schema))
+    if cached is None or cached[0] is not schema:
+        unchecked = schema.update_columns({c: {"checks": []} for c in schema.columns})
+        unchecked.checks = []
+        cached = _unchecked_schemas[id(schema)] = (schema, unchecked)
+    return cached[1]
+
+
+def validate(schema: DataFrameSchema, df: pd.DataFrame, trusted: bool = False) -> DataFrame:
+    """
+    Validates a DataFrame against a schema with the current policy, without copying it. Trusted
+    DataFrames are validated with the policy for trusted ones.
+    """
+    match get_validation_policy(trusted):
+        case ValidationPolicy.FULL:
+            schema.validate(df, inplace=True)
+        case ValidationPolicy.SAMPLE:
+            schema.validate(df, head=SAMPLE_ROWS, inplace=True)
+        case ValidationPolicy.SCHEMA_ONLY:
+            _without_checks(schema).validate(df, inplace=True)
+
+    # The frame is typed as a pandera DataFrame, without validating it again.
+    return DataFrame(df)
@@ -0,0 +1,94 @@
+import asyncio
+from abc import ABC, abstractmethod
+from typing import Awaitable, Dict, Iterable, List, Optional, TypeVar
+
+import pandas as pd
+
+from prices.core.asset import AssetDataFrame
+from prices.core.bar import Bar, BarDataFrame, empty_bars, to_records, validate_bars
+from prices.core.broker import Broker
+from prices.ports.price_fetcher import HistoricalManyPriceParams, HistoricalPriceParams
+
+T = TypeVar("T")
+
+
+class AsyncPriceFetcher(ABC):
+    """
+    Defines all coroutines for fetching price data, for the services that run in an event loop,
+    which a PriceFetcher would block. The requests of the batch coroutines are sent concurrently,
+    up to `max_concurrency` at once. Fetchers hold an HTTP session, so they should be used with
+    `async with`, or closed once done.
+    """
+
+    requests_per_minute: Optional[int] = None
+    """The request quota of the broker API. If None, the broker does not limit the requests."""
+
+    def __init__(self, broker: Broker, max_concurrency: int = 8):
+        if max_concurrency <= 0:
+            raise ValueError("At least one request must be allowed at once.")
+
+        self.broker = broker
+        self.max_concurrency = max_concurrency
+
+    def __str__(self):
+        return f"<{self.__class__.__name__}, {self.broker.value}>"
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self.close()
+
+    async def close(self) -> None:
+        """Release the resources held by the fetcher. It can still be used afterwards."""
+        ...
+
+    async def gather(self, coroutines: Iterable[Awaitable[T]]) -> List[T]:
+        """Awaits coroutines concurrently, up to `max_concurrency` at once, in order."""
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+
+        async def bounded(coroutine: Awaitable[T]) -> T:
+            async with semaphore:
+                return await coroutine
+
+        return list(await asyncio.gather(*(bounded(c) for c in coroutines)))
+
+    @abstractmethod
+    async def assets(self) -> AssetDataFrame:
+        """Returns a list of assets available for fetching price data."""
+        ...
+
+    @abstractmethod
+    async def historical(self, params: HistoricalPriceParams) -> BarDataFrame:
+        """Returns data bars for a specific asset, time window and timeframe."""
+        ...
+
+    async def historical_many(self, params: HistoricalManyPriceParams) -> BarDataFrame:
+        """
+        Returns data bars for many assets in long format, with one row per symbol and timestamp.
+        Adapters should override it when the broker can fetch many symbols in one request.
+        """
+        frames = await self.gather(self.historical(params.for_symbol(s)) for s in params.symbols)
+        return _concat([df for df in frames if not df.empty])
+
+    @abstractmethod
+    async def latest(self, symbol: str) -> BarDataFrame:
+        """Returns the most recent data bar for a specific symbol."""
+        ...
+
+    async def latest_many(self, symbols: List[str]) -> Dict[str, Bar]:
+        """
+        Returns the most recent data bar of many symbols, as records by symbol. Symbols without
+        any bar are left out. Adapters should override it when the broker can fetch many symbols
+        in one request.
+        """
+        frames = await self.gather(self.latest(symbol) for symbol in dict.fromkeys(symbols))
+        return {bar.symbol: bar for df in frames for bar in to_records(df)}
+
+
+def _concat(frames: List[BarDataFrame]) -> BarDataFrame:
+    """Concatenates frames of validated bars."""
+    if not frames:
+        return empty_bars()
+
+    return validate_bars(pd.concat(frames, ignore_index=True), trusted=True)
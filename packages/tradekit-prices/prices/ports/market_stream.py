@@ -0,0 +1,178 @@
+import asyncio
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from enum import Enum
+from itertools import count
+from typing import AsyncIterator, Dict, Hashable, Iterable, List, Tuple, Type, Union
+
+from prices.core.bar import Bar
+from prices.core.broker import Broker
+from prices.core.trade import Trade
+
+StreamEvent = Union[Bar, Trade]
+"""An event delivered by a market stream."""
+
+
+class BackpressurePolicy(str, Enum):
+    """Defines what a subscription does with the events it receives faster than they are read."""
+
+    DROP_OLDEST = "drop_oldest"
+    """Every event is queued, and when the queue is full, the oldest one is dropped."""
+
+    COALESCE = "coalesce"
+    """An event replaces the queued event of the same kind and symbol, if any, so only the latest
+    one is kept. When the queue is full of other symbols, the oldest one is dropped."""
+
+
+class Subscription:
+    """
+    A bounded queue of the events of some symbols, read by a single consumer with `async for`.
+    Events are never awaited by the stream, so a slow consumer drops events, following its
+    `policy`, instead of slowing down the stream and the other consumers. The iteration ends
+    once the subscription is closed and its queued events are read.
+    """
+
+    def __init__(
+        self,
+        symbols: Iterable[str],
+        bars: bool = True,
+        trades: bool = False,
+        maxsize: int = 1_000,
+        policy: BackpressurePolicy = BackpressurePolicy.DROP_OLDEST,
+    ) -> None:
+        if not bars and not trades:
+            raise ValueError("A subscription must receive bars, trades or both.")
+        if maxsize <= 0:
+            raise ValueError("The queue must hold at least one event.")
+
+        self.symbols = frozenset(symbols)
+        self.bars = bars
+        self.trades = trades
+        self.maxsize = maxsize
+        self.policy = policy
+        self.dropped = 0
+        """The number of events dropped or replaced because the queue was full."""
+
+        self._events: OrderedDict[Hashable, StreamEvent] = OrderedDict()
+        self._sequence = count()
+        self._ready = asyncio.Event()
+        self._closed = False
+
+    def __len__(self) -> int:
+        return len(self._events)
+
+    @property
+    def closed(self) -> bool:
+        return self._closed
+
+    def put(self, event: StreamEvent):
+        """Queues an event without waiting, dropping an older one if needed."""
+        if self._closed:
+            return
+
+        if self.policy == BackpressurePolicy.COALESCE:
+            key: Hashable = (type(event), event.symbol)
+            if key in self._events:
+                self.dropped += 1
+        else:
+            key = next(self._sequence)
+
+        self._events[key] = event
+        if len(self._events) > self.maxsize:
+            self._events.popitem(last=False)
+            self.dropped += 1
+        self._ready.set()
+
+    def close(self):
+        """Stops queuing events. The events already queued can still be read."""
+        self._closed = True
+        self._ready.set()
+
+    def __aiter__(self) -> "Subscription":
+        return self
+
+    async def __anext__(self) -> StreamEvent:
+        while not self._events:
+            if self._closed:
+                raise StopAsyncIteration
+            self._ready.clear()
+            await self._ready.wait()
+
+        return self._events.popitem(last=False)[1]
+
+
+class MarketStream(ABC):
+    """
+    Defines a stream of the bars and trades of a broker, pushed as soon as they are published
+    instead of polled. Consumers subscribe to some symbols before the stream runs, and each event
+    is fanned out to the subscriptions of its symbol, in O(1) per subscription.
+    """
+
+    def __init__(self, broker: Broker):
+        self.broker = broker
+        self._routes: Dict[Tuple[Type, str], List[Subscription]] = {}
+
+    def __str__(self):
+        return f"<{self.__class__.__name__}, {self.broker.value}>"
+
+    @property
+    def bar_symbols(self) -> List[str]:
+        """The symbols whose bars are streamed."""
+        return sorted(symbol for kind, symbol in self._routes if kind is Bar)
+
+    @property
+    def trade_symbols(self) -> List[str]:
+        """The symbols whose trades are streamed."""
+        return sorted(symbol for kind, symbol in self._routes if kind is Trade)
+
+    def subscribe(
+        self,
+        symbols: Iterable[str],
+        bars: bool = True,
+        trades: bool = False,
+        maxsize: int = 1_000,
+        policy: BackpressurePolicy = BackpressurePolicy.DROP_OLDEST,
+    ) -> Subscription:
+        """
+        Returns a new subscription to the bars and/or trades of some symbols. The symbols are sent
+        to the broker when the stream connects, so the ones subscribed to while it runs are only
+        streamed once it reconnects.
+        """
+        subscription = Subscription(symbols, bars, trades, maxsize, policy)
+        kinds = [kind for kind, wanted in ((Bar, bars), (Trade, trades)) if wanted]
+        for kind in kinds:
+            for symbol in subscription.symbols:
+                self._routes.setdefault((kind, symbol), []).append(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription):
+        """Removes a subscription, and closes it."""
+        for key, subscriptions in list(self._routes.items()):
+            if subscription in subscriptions:
+                subscriptions.remove(subscription)
+                if not subscriptions:
+                    del self._routes[key]
+        subscription.close()
+
+    def publish(self, event: StreamEvent):
+        """Queues an event in the subscriptions of its symbol."""
+        for subscription in self._routes.get((type(event), event.symbol), ()):
+            subscription.put(event)
+
+    async def run(self):
+        """
+        Streams the events to the subscriptions, until the source ends or the task running it is
+        cancelled. The subscriptions are closed then, so their consumers stop.
+        """
+        try:
+            async for event in self._events():
+                self.publish(event)
+        finally:
+            for subscriptions in list(self._routes.values()):
+                for subscription in subscriptions:
+                    subscription.close()
+
+    @abstractmethod
+    def _events(self) -> AsyncIterator[StreamEvent]:
+        """Yields the bars of `bar_symbols` and the trades of `trade_symbols`, as they arrive."""
+        ...
@@ -1,12 +1,15 @@
 from abc import ABC, abstractmethod
 from dataclasses import dataclass
-from datetime import datetime
-from typing import Optional
+from datetime import datetime, timezone
+from typing import Dict, Iterator, List, Optional
+
+import pandas as pd
 
 from prices.core.asset import AssetDataFrame
-from prices.core.bar import BarDataFrame
+from prices.core.bar import Bar, BarDataFrame, empty_bars, iter_chunks, to_records, validate_bars
 from prices.core.broker import Broker
 from prices.core.timeframe import TimeFrame
+from prices.core.timestamp import to_utc
 
 
 @dataclass
@@ -45,19 +48,80 @@ class HistoricalPriceParams:
 
     def _validate_params(self):
         """Validates the fetch parameters. If the parameters are invalid, it raises a ValueError."""
-        if self.start >= datetime.now():
-            raise ValueError("Start date cannot be in the future.")
+        _validate_time_window(self.start, self.end)
+
+
+@dataclass
+class HistoricalManyPriceParams:
+    """Defines the parameters for fetching prices for many symbols at once."""
+
+    symbols: List[str]
+    """The symbols of the assets to fetch data for."""
+
+    timeframe: TimeFrame
+    """The time interval to fetch data for."""
+
+    start: datetime
+    """The start timestamp for the data to be fetched."""
+
+    end: datetime | None
+    """The end timestamp for the data to be fetched. If None, fetch data up to the current time."""
+
+    def __init__(
+        self,
+        symbols: List[str],
+        timeframe: TimeFrame,
+        start: datetime,
+        end: Optional[datetime] = None,
+    ):
+        self.symbols = symbols
+        self.timeframe = timeframe
+        self.start = start
+        self.end = end
+        self._validate_params()
+
+    def _validate_params(self):
+        """Validates the fetch parameters. If the parameters are invalid, it raises a ValueError."""
+        if not self.symbols:
+            raise ValueError("At least one symbol is required.")
+
+        _validate_time_window(self.start, self.end)
+
+    def for_symbol(self, symbol: str) -> HistoricalPriceParams:
+        """Returns the parameters for fetching the prices of only one of the symbols."""
+        return HistoricalPriceParams(
+            symbol=symbol,
+            timeframe=self.timeframe,
+            start=self.start,
+            end=self.end,
+        )
+
+
+def _validate_time_window(start: datetime, end: Optional[datetime]):
+    """
+    Validates a time window to fetch data for. If it is invalid, it raises a ValueError. The
+    window is compared in UTC, whatever the local time zone, and naive datetimes are taken as UTC.
+    """
+    now = datetime.now(timezone.utc)
+    start = to_utc(start)
+    end = to_utc(end) if end else None
 
-        if self.end and self.end >= datetime.now():
-            raise ValueError("End date cannot be in the future.")
+    if start >= now:
+        raise ValueError("Start date cannot be in the future.")
 
-        if self.end and self.end <= self.start:
-            raise ValueError("End date must be later than start date.")
+    if end and end >= now:
+        raise ValueError("End date cannot be in the future.")
+
+    if end and end <= start:
+        raise ValueError("End date must be later than start date.")
 
 
 class PriceFetcher(ABC):
     """Defines all methods for fetching price data."""
 
+    requests_per_minute: Optional[int] = None
+    """The request quota of the broker API. If None, the broker does not limit the requests."""
+
     def __init__(self, broker: Broker):
         self.broker = broker
 
@@ -74,7 +138,45 @@ class PriceFetcher(ABC):
         """Returns data bars for a specific asset, time window and timeframe."""
         ...
 
+    def iter_historical(
+        self, params: HistoricalPriceParams, chunk_rows: int = 10_000
+    ) -> Iterator[BarDataFrame]:
+        """
+        Yields data bars for a specific asset, time window and timeframe, in chunks of up to
+        `chunk_rows` bars. Adapters should override it to fetch the chunks as pages, instead of
+        fetching all the bars at once.
+        """
+        yield from iter_chunks(self.historical(params), chunk_rows)
+
+    def historical_many(self, params: HistoricalManyPriceParams) -> BarDataFrame:
+        """
+        Returns data bars for many assets in long format, with one row per symbol and timestamp.
+        Adapters should override it when the broker can fetch many symbols in one request.
+        """
+        frames = list(self.iter_historical_many(params))
+        if not frames:
+            return empty_bars()
+
+        return validate_bars(pd.concat(frames, ignore_index=True), trusted=True)
+
+    def iter_historical_many(self, params: HistoricalManyPriceParams) -> Iterator[BarDataFrame]:
+        """Yields the data bars of each of the assets, as soon as they are fetched."""
+        for symbol in params.symbols:
+            yield self.historical(params.for_symbol(symbol))
+
     @abstractmethod
     def latest(self, symbol: str) -> BarDataFrame:
         """Returns the most recent data bar for a specific symbol."""
         ...
+
+    def latest_many(self, symbols: List[str]) -> Dict[str, Bar]:
+        """
+        Returns the most recent data bar of many symbols, as records by symbol. Symbols without
+        any bar are left out. Adapters should override it when the broker can fetch many symbols
+        in one request.
+        """
+        return {
+            bar.symbol: bar
+            for symbol in dict.fromkeys(symbols)
+            for bar in to_records(self.latest(symbol))
+        }
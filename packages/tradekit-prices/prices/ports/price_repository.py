@@ -1,11 +1,14 @@
 from abc import ABC, abstractmethod
-from dataclasses import dataclass
-from datetime import datetime
-from typing import Literal, Optional
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from typing import Iterator, List, Literal, Optional, Tuple
+
+import pandas as pd
 
 from prices.core.asset import AssetDataFrame
-from prices.core.bar import BarDataFrame
+from prices.core.bar import BarDataFrame, iter_chunks
 from prices.core.broker import Broker
+from prices.core.panel import FillPolicy, Panel, panel_fields, panel_from_bars
 from prices.core.timeframe import TimeFrame
 
 
@@ -16,6 +19,9 @@ class SaveHistoricalParams:
     symbol: str
     timeframe: TimeFrame
     bars: BarDataFrame
+    mode: Literal["replace", "upsert"] = "replace"
+    """How the bars are written. 'replace' rewrites the stored series with `bars`, while 'upsert'
+    inserts new bars and updates the changed ones, keyed on (symbol, timestamp)."""
 
 
 @dataclass
@@ -27,6 +33,61 @@ class LoadHistoricalParams:
     start: Optional[datetime] = None
     end: Optional[datetime] = None
     limit: Optional[int] = None
+    columns: Optional[List[str]] = None
+    """The value columns to load, such as ['close']. The symbol and timestamp are always loaded.
+    If None, all the columns are loaded."""
+
+
+@dataclass
+class LoadPanelParams:
+    """Defines the parameters for loading the aligned values of many symbols."""
+
+    symbols: List[str]
+    """The symbols of the columns of the panel. Repeated symbols are only loaded once."""
+
+    timeframe: TimeFrame
+    start: Optional[datetime] = None
+    end: Optional[datetime] = None
+    fields: Optional[List[str]] = None
+    """The value columns to load, such as ['close']. If None, all the columns are loaded."""
+
+    fill: FillPolicy = "nan"
+    """How the timestamps without a bar of some of the symbols are filled."""
+
+    def __post_init__(self):
+        if not self.symbols:
+            raise ValueError("At least one symbol is required.")
+
+        self.symbols = list(dict.fromkeys(self.symbols))
+        panel_fields(self.fields)
+
+
+@dataclass
+class LoadCoverageParams:
+    """Defines the parameters for loading the coverage of the stored historical price data."""
+
+    symbol: str
+    timeframe: TimeFrame
+    max_gap: Optional[timedelta] = None
+    """Consecutive bars further apart than this are reported as a gap. If None, gaps are not
+    looked for."""
+
+
+@dataclass
+class Coverage:
+    """Defines the time span covered by the stored bars of a symbol and timeframe."""
+
+    first: Optional[pd.Timestamp]
+    """The timestamp of the first stored bar. None if there are no bars."""
+
+    last: Optional[pd.Timestamp]
+    """The timestamp of the last stored bar. None if there are no bars."""
+
+    rows: int
+    """The number of stored bars."""
+
+    gaps: List[Tuple[pd.Timestamp, pd.Timestamp]] = field(default_factory=list)
+    """The pairs of consecutive bars that are further apart than the `max_gap` requested."""
 
 
 @dataclass
@@ -47,6 +108,16 @@ class PriceRepository(ABC):
     def __init__(self, broker: Broker) -> None:
         self.broker = broker
 
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """Release the resources held by the repository. It can still be used afterwards."""
+        ...
+
     @abstractmethod
     def save_assets(self, assets: AssetDataFrame) -> SaveResult:
         """Save assets data."""
@@ -66,3 +137,58 @@ class PriceRepository(ABC):
     def load_historical(self, params: LoadHistoricalParams) -> BarDataFrame:
         """Load historical price data."""
         ...
+
+    def iter_historical(
+        self, params: LoadHistoricalParams, chunk_rows: int = 10_000
+    ) -> Iterator[BarDataFrame]:
+        """
+        Load historical price data in chunks of up to `chunk_rows` bars. Adapters should override
+        it to read the chunks one at a time, instead of loading all the bars at once.
+        """
+        yield from iter_chunks(self.load_historical(params), chunk_rows)
+
+    def load_panel(self, params: LoadPanelParams) -> Panel:
+        """
+        Load the values of many symbols, aligned on the union of their timestamps. The bars of
+        each symbol are loaded once, and aligned all at once. Adapters should override it when
+        they can read the bars of all the symbols in a single query.
+        """
+        frames = [
+            self.load_historical(
+                LoadHistoricalParams(
+                    symbol, params.timeframe, params.start, params.end, columns=params.fields
+                )
+            )
+            for symbol in params.symbols
+        ]
+        bars = pd.concat(frames, ignore_index=True)
+        return panel_from_bars(bars, params.symbols, params.fields, params.fill)
+
+    def load_coverage(self, params: LoadCoverageParams) -> Coverage:
+        """
+        Load the time span covered by the stored bars, and the gaps between them. Adapters should
+        override it when they can compute it without loading the bars.
+        """
+        bars = self.load_historical(
+            LoadHistoricalParams(params.symbol, params.timeframe, columns=[])
+        )
+        return coverage_of(bars["timestamp"], params.max_gap)
+
+
+def coverage_of(timestamps: pd.Series, max_gap: Optional[timedelta] = None) -> Coverage:
+    """Returns the coverage of a sorted series of bar timestamps."""
+    if timestamps.empty:
+        return Coverage(first=None, last=None, rows=0)
+
+    gaps = []
+    if max_gap is not None:
+        after = timestamps.diff() > max_gap
+        before = after.shift(-1, fill_value=False)
+        gaps = list(zip(timestamps[before], timestamps[after]))
+
+    return Coverage(
+        first=timestamps.iloc[0],
+        last=timestamps.iloc[-1],
+        rows=len(timestamps),
+        gaps=gaps,
+    )
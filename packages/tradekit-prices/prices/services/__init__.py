@@ -0,0 +1 @@
+"""Provides the services of the prices package, built on top of its ports."""
@@ -0,0 +1,69 @@
+"""Defines the asset cache service, which keeps the assets of a repository in memory."""
+
+import time
+from datetime import timedelta
+from typing import Dict, Optional
+
+from prices.core.asset import ASSET_COLUMNS, Asset, AssetDataFrame, validate_assets
+from prices.ports.price_fetcher import PriceFetcher
+from prices.ports.price_repository import PriceRepository, SaveResult
+
+
+class AssetCache:
+    """
+    Keeps the assets of a repository in memory for `ttl`, with an index of their symbols, so an
+    asset is looked up in O(1) without reloading them. The assets are reloaded the first time they
+    are used after they expire. Saving or refreshing assets through the cache updates it.
+    """
+
+    def __init__(self, repository: PriceRepository, ttl: timedelta = timedelta(minutes=15)) -> None:
+        self.repository = repository
+        self.ttl = ttl
+        self._assets: Optional[AssetDataFrame] = None
+        self._records: Dict[str, Asset] = {}
+        self._loaded_at = 0.0
+
+    @property
+    def expired(self) -> bool:
+        """Whether the assets must be reloaded before they are used."""
+        age = time.monotonic() - self._loaded_at
+        return self._assets is None or age >= self.ttl.total_seconds()
+
+    def _set(self, assets: AssetDataFrame):
+        """Caches assets, indexing them by symbol. If a symbol is listed twice, the last wins."""
+        columns = [assets[c].tolist() for c in ASSET_COLUMNS]
+        self._records = {record.symbol: record for record in map(Asset, *columns)}
+        self._assets = assets
+        self._loaded_at = time.monotonic()
+
+    def assets(self) -> AssetDataFrame:
+        """Returns the assets, loading them from the repository if they expired."""
+        if self.expired:
+            self._set(self.repository.load_assets())
+        return self._assets
+
+    def get(self, symbol: str) -> Optional[Asset]:
+        """Returns the asset of a symbol, or None if there is none."""
+        if self.expired:
+            self.assets()
+        return self._records.get(symbol)
+
+    def __contains__(self, symbol: str) -> bool:
+        return self.get(symbol) is not None
+
+    def save(self, assets: AssetDataFrame) -> SaveResult:
+        """Saves assets to the repository, caching them if they were saved."""
+        result = self.repository.save_assets(assets)
+        if result.status == "success":
+            assets = assets.drop_duplicates("symbol", keep="last").reset_index(drop=True)
+            self._set(validate_assets(assets, trusted=True))
+        return result
+
+    def refresh(self, fetcher: PriceFetcher) -> SaveResult:
+        """Fetches the assets of a broker and saves them, writing only the ones that changed."""
+        return self.save(fetcher.assets())
+
+    def invalidate(self):
+        """Removes the cached assets, so they are reloaded when used."""
+        self._assets = None
+        self._records = {}
@@ -0,0 +1,188 @@
+"""Defines the backfill service, which downloads historical bars into a price repository."""
+
+import random
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Dict, Iterable, Iterator, List, Literal, Optional
+
+from prices.core.bar import BarDataFrame
+from prices.core.timeframe import TimeFrame
+from prices.ports.price_fetcher import HistoricalPriceParams, PriceFetcher
+from prices.ports.price_repository import PriceRepository, SaveHistoricalParams
+from prices.services.rate_limiter import TokenBucket
+
+_RETRYABLE_STATUS_CODES = {429, 500, 502, 503, 504}
+"""The HTTP status codes of the errors that are worth retrying."""
+
+
+@dataclass
+class BackfillParams:
+    """Defines the parameters for backfilling the historical bars of many symbols."""
+
+    symbols: List[str]
+    """The symbols of the assets to backfill."""
+
+    timeframe: TimeFrame
+    """The time interval of the bars."""
+
+    start: datetime
+    """The start timestamp of the bars to backfill."""
+
+    end: Optional[datetime] = None
+    """The end timestamp of the bars to backfill. If None, backfill up to the current time."""
+
+    mode: Literal["replace", "upsert"] = "upsert"
+    """How the bars are written to the repository. See `SaveHistoricalParams.mode`."""
+
+
+@dataclass
+class BackfillResult:
+    """Defines the result of backfilling the historical bars of a symbol."""
+
+    symbol: str
+    status: Literal["success", "error"]
+    message: Optional[str]
+    rows_affected: int
+    attempts: int
+    """The number of times the bars were requested to the broker."""
+
+
+@dataclass
+class _Download:
+    """The outcome of downloading the bars of a symbol."""
+
+    bars: Optional[BarDataFrame]
+    error: Optional[Exception]
+    attempts: int
+
+
+class Backfill:
+    """
+    Downloads historical bars with a pool of threads, and saves them into a repository as soon as
+    they arrive. The requests are spaced to match the quota of the broker, and the ones that fail
+    with a rate limit or server error are retried with an exponential backoff.
+
+    The repository is only used from the thread that iterates over `run`.
+    """
+
+    def __init__(
+        self,
+        fetcher: PriceFetcher,
+        repository: PriceRepository,
+        max_workers: int = 8,
+        requests_per_minute: Optional[int] = None,
+        max_retries: int = 5,
+        backoff: float = 1.0,
+    ) -> None:
+        self.fetcher = fetcher
+        self.repository = repository
+        self.max_workers = max_workers
+        self.max_retries = max_retries
+        self.backoff = backoff
+
+        quota = requests_per_minute or fetcher.requests_per_minute
+        self._limiter = TokenBucket.per_minute(quota) if quota else None
+
+    def run(self, params: BackfillParams) -> Iterator[BackfillResult]:
+        """Backfills the symbols, yielding the result of each one as soon as it is saved."""
+        requests = (
+            HistoricalPriceParams(
+                symbol=symbol,
+                timeframe=params.timeframe,
+                start=params.start,
+                end=params.end,
+            )
+            for symbol in params.symbols
+        )
+        return self.run_requests(requests, mode=params.mode)
+
+    def run_requests(
+        self,
+        requests: Iterable[HistoricalPriceParams],
+        mode: Literal["replace", "upsert"] = "upsert",
+    ) -> Iterator[BackfillResult]:
+        """Downloads and saves the bars of each request, yielding the results as they are saved."""
+        requests = iter(requests)
+        pending: Dict[Future[_Download], HistoricalPriceParams] = {}
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            # Only a few downloads are kept ahead of the writes, to bound the memory in use.
+            def submit_next() -> None:
+                request = next(requests, None)
+                if request is not None:
+                    pending[executor.submit(self._fetch, request)] = request
+
+            for _ in range(self.max_workers * 2):
+                submit_next()
+
+            while pending:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    request = pending.pop(future)
+                    yield self._save(request, mode, future.result())
+                    submit_next()
+
+    def _fetch(self, request: HistoricalPriceParams) -> _Download:
+        """Fetches the bars of a request, retrying on transient errors."""
+        attempt = 0
+        while True:
+            attempt += 1
+            if self._limiter:
+                self._limiter.acquire()
+
+            try:
+                bars = self.fetcher.historical(request)
+                return _Download(bars=bars, error=None, attempts=attempt)
+            except Exception as e:
+                if attempt > self.max_retries or not _is_retryable(e):
+                    return _Download(bars=None, error=e, attempts=attempt)
+
+            # Full jitter, so that the workers do not retry all at the same time.
+            time.sleep(random.uniform(0, self.backoff * 2 ** (attempt - 1)))
+
+    def _save(
+        self,
+        request: HistoricalPriceParams,
+        mode: Literal["replace", "upsert"],
+        download: _Download,
+    ) -> BackfillResult:
+        """Saves the downloaded bars of a request into the repository."""
+        if download.bars is None:
+            return BackfillResult(
+                symbol=request.symbol,
+                status="error",
+                message=str(download.error),
+                rows_affected=0,
+                attempts=download.attempts,
+            )
+
+        result = self.repository.save_historical(
+            SaveHistoricalParams(
+                symbol=request.symbol,
+                timeframe=request.timeframe,
+                bars=download.bars,
+                mode=mode,
+            )
+        )
+        return BackfillResult(
+            symbol=request.symbol,
+            status=result.status,
+            message=result.message,
+            rows_affected=result.rows_affected,
+            attempts=download.attempts,
+        )
+
+
+def _is_retryable(error: Exception) -> bool:
+    """Returns whether an error is transient, like a rate limit, a server or a network error."""
+    if isinstance(error, (ConnectionError, TimeoutError)):
+        return True
+
+    # Alpaca errors expose the HTTP status code, while `requests` errors keep the response.
+    status_code = getattr(error, "status_code", None)
+    if status_code is None:
+        status_code = getattr(getattr(error, "response", None), "status_code", None)
+
+    return status_code in _RETRYABLE_STATUS_CODES
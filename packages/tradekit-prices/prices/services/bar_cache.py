@@ -0,0 +1,148 @@
+"""
+Defines a cache of bars in a binary file format that is memory-mapped when loaded, so reloading
+the same history is served from the OS page cache, without parsing or copying.
+"""
+
+import os
+import struct
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from prices.core.bar import BAR_VALUE_COLUMNS, BarDataFrame, bar_columns, empty_bars, validate_bars
+from prices.core.timeframe import TimeFrame
+from prices.core.timestamp import Timestamp, to_epoch_ns
+from prices.ports.price_repository import LoadHistoricalParams, PriceRepository
+
+_MAGIC = b"TKBARS\x00\x00"
+"""The first bytes of a bar file."""
+
+_VERSION = 1
+"""The version of the bar file format."""
+
+_HEADER = struct.Struct("<8sIIQ")
+"""The header of a bar file: the magic bytes, the version, the number of value columns and the
+number of bars."""
+
+_HEADER_SIZE = 64
+"""The size of the header, padded so the arrays that follow it are aligned."""
+
+
+def write_bar_file(file: str, bars: BarDataFrame):
+    """
+    Writes sorted bars to a bar file, replacing it atomically. The file has a header, followed by
+    the int64 timestamps in nanoseconds and then each value column as a float64 array, in the
+    order of `BAR_VALUE_COLUMNS`.
+    """
+    timestamps = bars["timestamp"].astype("int64").to_numpy()
+    values = np.ascontiguousarray(bars[BAR_VALUE_COLUMNS].to_numpy(dtype=np.float64).T)
+
+    os.makedirs(os.path.dirname(file), exist_ok=True)
+    with open(f"{file}.tmp", "wb") as f:
+        header = _HEADER.pack(_MAGIC, _VERSION, len(BAR_VALUE_COLUMNS), len(timestamps))
+        f.write(header.ljust(_HEADER_SIZE, b"\x00"))
+        timestamps.tofile(f)
+        values.tofile(f)
+    os.replace(f"{file}.tmp", file)
+
+
+def map_bar_file(file: str) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Memory-maps a bar file, returning its timestamps and its values with a row per value column.
+    The arrays are copy-on-write: changes to them are never written back to the file.
+    """
+    with open(file, "rb") as f:
+        magic, version, columns, rows = _HEADER.unpack(f.read(_HEADER.size))
+
+    if magic != _MAGIC:
+        raise ValueError(f"{file} is not a bar file.")
+    if version != _VERSION or columns != len(BAR_VALUE_COLUMNS):
+        raise ValueError(f"{file} has an unsupported bar file format (version {version}).")
+
+    if rows == 0:
+        return np.empty(0, dtype=np.int64), np.empty((columns, 0), dtype=np.float64)
+
+    timestamps = np.memmap(file, np.int64, "c", _HEADER_SIZE, (rows,))
+    values = np.memmap(file, np.float64, "c", _HEADER_SIZE + rows * 8, (columns, rows))
+    return timestamps, values
+
+
+class BarCache:
+    """
+    Cache of the full bar history of each symbol and timeframe of a repository, stored as bar
+    files under `path/<broker>/tf_<timeframe>/<symbol>.bars`. The first load of a history reads
+    it from the repository and writes its file, later loads map the file and wrap its arrays as a
+    BarDataFrame without copying or validating them again. Saving new bars to the repository does
+    not update the cache, so the histories changed must be invalidated.
+    """
+
+    def __init__(self, repository: PriceRepository, path: str) -> None:
+        self.repository = repository
+        self.path = path
+        self._maps: Dict[str, Tuple[np.ndarray, np.ndarray]] = {}
+
+    def _file(self, symbol: str, timeframe: TimeFrame) -> str:
+        """Returns the bar file of a symbol and timeframe."""
+        return f"{self._broker_path}/tf_{timeframe.name_value}/{symbol}.bars"
+
+    @property
+    def _broker_path(self) -> str:
+        """Returns the directory with the bar files of the repository broker."""
+        return f"{self.path}/{self.repository.broker.value}"
+
+    def _map(self, symbol: str, timeframe: TimeFrame) -> Tuple[np.ndarray, np.ndarray]:
+        """Returns the mapped arrays of a history, writing its file first if it is missing."""
+        file = self._file(symbol, timeframe)
+        if file in self._maps:
+            return self._maps[file]
+
+        if not os.path.exists(file):
+            bars = self.repository.load_historical(LoadHistoricalParams(symbol, timeframe))
+            write_bar_file(file, bars)
+
+        self._maps[file] = map_bar_file(file)
+        return self._maps[file]
+
+    def load(self, params: LoadHistoricalParams) -> BarDataFrame:
+        """Load historical price data from the cache. The columns are views of the bar file."""
+        timestamps, values = self._map(params.symbol, params.timeframe)
+
+        lo, hi = 0, len(timestamps)
+        if params.start is not None:
+            lo = int(np.searchsorted(timestamps, to_epoch_ns(params.start), side="left"))
+        if params.end is not None:
+            hi = int(np.searchsorted(timestamps, to_epoch_ns(params.end), side="right"))
+        if params.limit is not None:
+            hi = min(hi, lo + params.limit)
+        hi = max(lo, hi)
+
+        columns = bar_columns(params.columns)
+        if hi == lo:
+            return validate_bars(empty_bars()[columns], trusted=True)
+
+        # The DatetimeArray and the float columns are views of the mapped arrays.
+        data = {
+            "symbol": np.full(hi - lo, params.symbol, dtype=object),
+            "timestamp": pd.array(timestamps[lo:hi].view("M8[ns]"), copy=False).view(Timestamp()),
+        }
+        for c in columns[2:]:
+            data[c] = values[BAR_VALUE_COLUMNS.index(c), lo:hi]
+
+        # The bars were validated when they were loaded from the repository.
+        return validate_bars(pd.DataFrame(data, copy=False), trusted=True)
+
+    def invalidate(self, symbol: str, timeframe: Optional[TimeFrame] = None):
+        """Removes the cached history of a symbol, for one timeframe or for all of them."""
+        if timeframe is not None:
+            files = [self._file(symbol, timeframe)]
+        elif os.path.isdir(self._broker_path):
+            path = self._broker_path
+            files = [f"{path}/{d}/{symbol}.bars" for d in os.listdir(path)]
+        else:
+            files = []
+
+        for file in files:
+            self._maps.pop(file, None)
+            if os.path.exists(file):
+                os.remove(file)
@@ -0,0 +1,68 @@
+"""Defines the latest bar cache service, which keeps the latest bar of many symbols in memory."""
+
+import time
+from datetime import timedelta
+from typing import Dict, Iterable, Optional
+
+from prices.core.bar import Bar
+from prices.ports.price_fetcher import PriceFetcher
+
+
+class LatestBarCache:
+    """
+    Keeps the latest bar of each symbol fetched from a broker in memory, so refreshing many symbols
+    every few seconds only requests the symbols whose bar expired, all in one call of
+    `latest_many`. A bar expires at the end of the `ttl` interval, counted from the Unix epoch,
+    in which it was fetched. With the default of one minute, the interval of the latest bars, the
+    bars expire together when the next bar may be available, instead of a minute after each was
+    fetched. Symbols without any bar are cached as well, so they are not requested again before
+    they expire.
+    """
+
+    def __init__(self, fetcher: PriceFetcher, ttl: timedelta = timedelta(minutes=1)) -> None:
+        if ttl <= timedelta(0):
+            raise ValueError("The TTL must be positive.")
+
+        self.fetcher = fetcher
+        self.ttl = ttl
+        self._bars: Dict[str, Bar] = {}
+        self._expires_at: Dict[str, float] = {}
+
+    def _expiry(self, now: float) -> float:
+        """Returns the end of the TTL interval that contains `now`, in seconds since the epoch."""
+        ttl = self.ttl.total_seconds()
+        return (now // ttl + 1) * ttl
+
+    def latest_many(self, symbols: Iterable[str]) -> Dict[str, Bar]:
+        """
+        Returns the latest bar of many symbols by symbol, fetching the ones that expired in a
+        single call. Symbols without any bar are left out.
+        """
+        symbols = list(dict.fromkeys(symbols))
+        now = time.time()
+        expired = [s for s in symbols if self._expires_at.get(s, 0.0) <= now]
+
+        if expired:
+            bars = self.fetcher.latest_many(expired)
+            expires_at = self._expiry(now)
+            for symbol in expired:
+                self._expires_at[symbol] = expires_at
+                if symbol in bars:
+                    self._bars[symbol] = bars[symbol]
+                else:
+                    self._bars.pop(symbol, None)
+
+        return {symbol: self._bars[symbol] for symbol in symbols if symbol in self._bars}
+
+    def latest(self, symbol: str) -> Optional[Bar]:
+        """Returns the latest bar of a symbol, or None if there is none."""
+        return self.latest_many([symbol]).get(symbol)
+
+    def invalidate(self, symbol: Optional[str] = None):
+        """Removes the cached bar of a symbol, or of all of them, so it is fetched when used."""
+        if symbol is None:
+            self._bars.clear()
+            self._expires_at.clear()
+        else:
+            self._bars.pop(symbol, None)
+            self._expires_at.pop(symbol, None)
@@ -0,0 +1,42 @@
+"""Defines a token bucket to limit the rate of requests sent to a broker."""
+
+import threading
+import time
+from typing import Optional
+
+
+class TokenBucket:
+    """
+    Limits the rate of an action to `rate` per second, allowing bursts of up to `capacity` actions.
+    It is safe to share a bucket between threads.
+    """
+
+    def __init__(self, rate: float, capacity: Optional[float] = None) -> None:
+        if rate <= 0:
+            raise ValueError("Rate must be a positive value.")
+
+        self.rate = rate
+        self.capacity = capacity if capacity is not None else 1.0
+        self._tokens = self.capacity
+        self._updated_at = time.monotonic()
+        self._lock = threading.Lock()
+
+    @classmethod
+    def per_minute(cls, requests: int) -> "TokenBucket":
+        """Returns a bucket that allows up to `requests` actions per minute, without bursts."""
+        return cls(rate=requests / 60)
+
+    def acquire(self) -> float:
+        """Takes a token, waiting until one is available. Returns the seconds waited."""
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.capacity, self._tokens + (now - self._updated_at) * self.rate)
+            self._updated_at = now
+
+            # The token is taken right away, so the waiting callers are served in order.
+            self._tokens -= 1
+            wait = -self._tokens / self.rate if self._tokens < 0 else 0.0
+
+        if wait > 0:
+            time.sleep(wait)
+        return wait
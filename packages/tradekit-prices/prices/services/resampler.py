@@ -0,0 +1,79 @@
+"""Defines the resampler service, which derives the bars of any timeframe from the 1m bars."""
+
+from collections import OrderedDict
+from typing import Tuple
+
+import numpy as np
+
+from prices.core.bar import BarDataFrame, bar_columns, validate_bars
+from prices.core.resample import UTC_SESSION, Session, resample_bars
+from prices.core.timeframe import TFPreset, TimeFrame
+from prices.core.timestamp import to_epoch_ns
+from prices.ports.price_repository import LoadHistoricalParams, PriceRepository
+
+
+class BarResampler:
+    """
+    Loads bars of any timeframe from a repository that only stores the bars of the `source`
+    timeframe, usually 1m. The full history of a symbol is resampled the first time a timeframe
+    is loaded, and the derived series are cached, up to `max_series`, until they are invalidated.
+    """
+
+    def __init__(
+        self,
+        repository: PriceRepository,
+        session: Session = UTC_SESSION,
+        source: TimeFrame = TFPreset.Tf_1m,
+        max_series: int = 64,
+    ) -> None:
+        if max_series <= 0:
+            raise ValueError("The cache must hold at least one series.")
+
+        self.repository = repository
+        self.session = session
+        self.source = source
+        self.max_series = max_series
+        self._series: OrderedDict[Tuple[str, str], Tuple[np.ndarray, BarDataFrame]] = (
+            OrderedDict()
+        )
+
+    def _derived(self, symbol: str, timeframe: TimeFrame) -> Tuple[np.ndarray, BarDataFrame]:
+        """Returns the timestamps, in nanoseconds, and the bars of a derived series."""
+        key = (symbol, timeframe.value)
+        if key in self._series:
+            self._series.move_to_end(key)
+            return self._series[key]
+
+        bars = self.repository.load_historical(LoadHistoricalParams(symbol, self.source))
+        derived = resample_bars(bars, timeframe, self.session)
+        self._series[key] = (derived["timestamp"].astype("int64").to_numpy(), derived)
+        if len(self._series) > self.max_series:
+            self._series.popitem(last=False)
+
+        return self._series[key]
+
+    def load(self, params: LoadHistoricalParams) -> BarDataFrame:
+        """
+        Load historical price data of any timeframe. The bars of the source timeframe are loaded
+        from the repository, while the others are derived from them.
+        """
+        if params.timeframe.value == self.source.value:
+            return self.repository.load_historical(params)
+
+        timestamps, bars = self._derived(params.symbol, params.timeframe)
+
+        lo, hi = 0, len(timestamps)
+        if params.start is not None:
+            lo = int(np.searchsorted(timestamps, to_epoch_ns(params.start), side="left"))
+        if params.end is not None:
+            hi = int(np.searchsorted(timestamps, to_epoch_ns(params.end), side="right"))
+        if params.limit is not None:
+            hi = min(hi, lo + params.limit)
+
+        df = bars.iloc[lo:max(lo, hi)][bar_columns(params.columns)].reset_index(drop=True)
+        return validate_bars(df, trusted=True)
+
+    def invalidate(self, symbol: str):
+        """Removes the derived series of a symbol, so they are resampled again when loaded."""
+        for key in [key for key in self._series if key[0] == symbol]:
+            del self._series[key]
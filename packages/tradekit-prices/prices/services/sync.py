@@ -0,0 +1,82 @@
+"""Defines the sync service, which downloads only the bars missing from a price repository."""
+
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from typing import Iterator, List, Optional
+
+from prices.core.timeframe import TimeFrame
+from prices.core.timestamp import to_utc
+from prices.ports.price_fetcher import HistoricalPriceParams
+from prices.ports.price_repository import LoadCoverageParams
+from prices.services.backfill import Backfill, BackfillResult
+
+
+@dataclass
+class SyncParams:
+    """Defines the parameters for syncing the historical bars of many symbols."""
+
+    symbols: List[str]
+    """The symbols of the assets to sync."""
+
+    timeframe: TimeFrame
+    """The time interval of the bars."""
+
+    start: datetime
+    """The start timestamp of the bars wanted. Symbols without bars are fetched from here."""
+
+    end: Optional[datetime] = None
+    """The end timestamp of the bars wanted. If None, sync up to the current time."""
+
+    max_gap: Optional[timedelta] = None
+    """Stored bars further apart than this are refetched. If None, only the bars before the first
+    and after the last stored bar are fetched."""
+
+
+class PriceSync:
+    """
+    Brings the bars of a repository up to date, fetching only the time windows that are missing
+    from it within the requested range: the head before its first bar, the gaps between its bars,
+    and the tail after its last bar. The downloads and writes are done by a `Backfill`, always in
+    upsert mode.
+    """
+
+    def __init__(self, backfill: Backfill) -> None:
+        self.backfill = backfill
+
+    def run(self, params: SyncParams) -> Iterator[BackfillResult]:
+        """Syncs the symbols, yielding the result of each missing window as soon as it is saved."""
+        requests = (
+            request for symbol in params.symbols for request in self.missing(symbol, params)
+        )
+        return self.backfill.run_requests(requests, mode="upsert")
+
+    def missing(self, symbol: str, params: SyncParams) -> List[HistoricalPriceParams]:
+        """Returns the requests that fetch the bars of a symbol missing from the repository."""
+        coverage = self.backfill.repository.load_coverage(
+            LoadCoverageParams(symbol, params.timeframe, params.max_gap)
+        )
+
+        # The windows are compared in UTC, and never end after the current time.
+        now = datetime.now(timezone.utc)
+        start = to_utc(params.start)
+        end = min(to_utc(params.end), now) if params.end else None
+        if coverage.first is None or coverage.last is None:
+            return [HistoricalPriceParams(symbol, params.timeframe, start, end)]
+
+        # The windows are clipped to the requested range, so no bar outside of it is fetched.
+        windows = []
+        first = to_utc(coverage.first)
+        if start < first and (end is None or start < end):
+            windows.append((start, min(first, end) if end else first))
+
+        for before, after in coverage.gaps:
+            before, after = to_utc(before), to_utc(after)
+            if after > start and (end is None or before < end):
+                windows.append((max(before, start), min(after, end) if end else after))
+
+        # The last bar is fetched again, since it may have been saved before it was complete.
+        last = to_utc(coverage.last)
+        if end is None or last < end:
+            windows.append((max(last, start), end))
+
+        return [HistoricalPriceParams(symbol, params.timeframe, a, b) for a, b in windows]
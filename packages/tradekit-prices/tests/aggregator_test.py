@@ -0,0 +1,116 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from prices.core.aggregator import BarAggregator
+from prices.core.bar import BarDataFrame, from_records, to_records
+from prices.core.resample import NYSE_SESSION, resample_bars
+from prices.core.timeframe import TFPreset
+from tests.helpers import make_bars
+
+
+class TestBarAggregator:
+    """Test the incremental Bar Aggregator."""
+
+    @pytest.fixture
+    def bars(self) -> BarDataFrame:
+        bars = make_bars("META", "2024-01-02 14:30", 390, freq="1min")
+        bars["volume"] = np.arange(1.0, 391.0)
+        return bars
+
+    def test_matches_resample(self, bars: BarDataFrame):
+        timeframes = [TFPreset.Tf_5m, TFPreset.Tf_1h, TFPreset.Tf_D]
+        aggregator = BarAggregator(timeframes, NYSE_SESSION)
+
+        completed = [c for bar in to_records(bars) for c in aggregator.update(bar)]
+        completed += aggregator.flush()
+
+        for timeframe in timeframes:
+            streamed = from_records(bar for tf, bar in completed if tf is timeframe)
+            expected = resample_bars(bars, timeframe, NYSE_SESSION)
+            pd.testing.assert_frame_equal(streamed, expected, check_frame_type=False)
+
+    def test_emits_when_last_source_bar_arrives(self, bars: BarDataFrame):
+        aggregator = BarAggregator([TFPreset.Tf_15m])
+        records = to_records(bars)
+
+        assert all(aggregator.update(bar) == [] for bar in records[:14])
+        [(timeframe, bar)] = aggregator.update(records[14])
+
+        assert timeframe is TFPreset.Tf_15m
+        assert bar.timestamp == pd.Timestamp("2024-01-02 14:30", tz="UTC")
+        assert bar.close == records[14].close
+        assert aggregator.partial("META", TFPreset.Tf_15m) is None
+
+    def test_emits_when_later_bar_arrives(self, bars: BarDataFrame):
+        aggregator = BarAggregator([TFPreset.Tf_15m])
+        records = to_records(bars)
+        for bar in records[:10]:
+            aggregator.update(bar)
+
+        [(_, bar)] = aggregator.update(records[20])
+
+        assert bar.close == records[9].close
+        assert aggregator.partial("META", TFPreset.Tf_15m).open == records[20].open
+
+    def test_partial(self, bars: BarDataFrame):
+        aggregator = BarAggregator([TFPreset.Tf_1h])
+        records = to_records(bars)
+        for bar in records[:3]:
+            aggregator.update(bar)
+
+        partial = aggregator.partial("META", TFPreset.Tf_1h)
+
+        assert partial.timestamp == pd.Timestamp("2024-01-02 14:00", tz="UTC")
+        assert (partial.open, partial.high, partial.close) == (100.0, 103.0, 102.0)
+        assert partial.volume == 6.0
+        assert aggregator.partial("AAPL", TFPreset.Tf_1h) is None
+
+    def test_ignores_repeated_and_late_bars(self, bars: BarDataFrame):
+        aggregator = BarAggregator([TFPreset.Tf_1h])
+        records = to_records(bars)
+
+        for bar in [records[1], records[1], records[0]]:
+            aggregator.update(bar)
+
+        assert aggregator.partial("META", TFPreset.Tf_1h).volume == 2.0
+
+    def test_update_bars_latest(self, bars: BarDataFrame):
+        aggregator = BarAggregator([TFPreset.Tf_5m])
+        other = make_bars("AAPL", "2024-01-02 14:30", 5, freq="1min")
+
+        completed = []
+        for i in range(5):
+            # The latest bars of many symbols, as returned by `PriceFetcher.latest`.
+            latest = pd.concat([bars.iloc[[i]], other.iloc[[i]]], ignore_index=True)
+            completed += aggregator.update_bars(BarDataFrame(latest))
+
+        assert sorted(bar.symbol for _, bar in completed) == ["AAPL", "META"]
+
+    def test_vwap_without_volume(self, bars: BarDataFrame):
+        bars["volume"] = 0.0
+        aggregator = BarAggregator([TFPreset.Tf_5m])
+
+        [(_, bar)] = [c for bar in to_records(bars.iloc[:5]) for c in aggregator.update(bar)]
+
+        assert bar.vwap == 102.0
+
+    def test_invalid_source(self):
+        with pytest.raises(ValueError):
+            BarAggregator([TFPreset.Tf_M], source=TFPreset.Tf_W)
+
+
+class TestBarRecords:
+    """Test the conversion between bar records and BarDataFrames."""
+
+    def test_round_trip(self):
+        bars = make_bars("META", "2024-01-02", 3)
+
+        records = to_records(bars)
+
+        assert records[1].close == 101.0
+        assert records[1].timestamp == pd.Timestamp("2024-01-03", tz="UTC")
+        pd.testing.assert_frame_equal(from_records(records), bars, check_frame_type=False)
+
+    def test_empty(self):
+        assert from_records([]).shape[0] == 0
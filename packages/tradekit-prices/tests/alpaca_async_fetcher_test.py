@@ -0,0 +1,271 @@
+import asyncio
+from datetime import datetime
+from typing import Any, Awaitable, Callable, List, Set
+
+import pandas as pd
+import pytest
+from aiohttp import ClientResponseError, web
+
+from prices.adapters.alpaca_async_fetcher import AsyncAlpacaPriceFetcher
+from prices.adapters.config import AlpacaApiKeys
+from prices.core.timeframe import TFPreset
+from prices.ports.async_price_fetcher import AsyncPriceFetcher
+from prices.ports.price_fetcher import HistoricalManyPriceParams, HistoricalPriceParams
+
+
+def raw_bars(start: str, periods: int) -> List[dict]:
+    """Builds bars in the format of the Alpaca API, with integer prices as sent by the API."""
+    return [
+        {
+            "t": timestamp.strftime("%Y-%m-%dT%H:%M:%SZ"),
+            "o": 100 + i,
+            "h": 101 + i,
+            "l": 99 + i,
+            "c": 100 + i,
+            "v": 1000,
+            "n": 10,
+            "vw": 100.5 + i,
+        }
+        for i, timestamp in enumerate(pd.date_range(start, periods=periods, freq="1D"))
+    ]
+
+
+SYMBOLS = ["MSFT", "TSLA", "AAPL"]
+BARS = {"AAPL": raw_bars("2024-01-01", 5), "MSFT": raw_bars("2024-01-03", 3), "TSLA": []}
+
+
+class FakeAlpaca:
+    """A local server answering the requests of the Alpaca REST API, two bars per page."""
+
+    def __init__(self) -> None:
+        self.requests: List[web.Request] = []
+        self.connections: Set[Any] = set()
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+        self.app = web.Application(middlewares=[self.record])
+        self.app.router.add_get("/v2/assets", self.assets)
+        self.app.router.add_get("/v2/stocks/bars", self.bars_many)
+        self.app.router.add_get("/v2/stocks/bars/latest", self.latest_many)
+        self.app.router.add_get("/v2/stocks/{symbol}/bars", self.bars)
+        self.app.router.add_get("/v2/stocks/{symbol}/bars/latest", self.latest)
+
+    @web.middleware
+    async def record(self, request: web.Request, handler: Callable[..., Awaitable[Any]]):
+        if request.headers.get("APCA-API-KEY-ID") != "key":
+            raise web.HTTPForbidden()
+        self.requests.append(request)
+        self.connections.add(request.transport)
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            await asyncio.sleep(0.01)
+            return await handler(request)
+        finally:
+            self.in_flight -= 1
+
+    @staticmethod
+    def page(request: web.Request, bars: List[dict]):
+        offset = int(request.query.get("page_token", 0))
+        limit = min(int(request.query.get("limit", 10_000)), 2)
+        next_offset = offset + limit
+        return bars[offset:next_offset], str(next_offset) if next_offset < len(bars) else None
+
+    async def assets(self, request: web.Request):
+        return web.json_response(
+            [
+                {
+                    "symbol": "AAPL",
+                    "name": "Apple",
+                    "exchange": "NASDAQ",
+                    "status": "active",
+                    "tradable": True,
+                },
+                {
+                    "symbol": "OLD",
+                    "name": None,
+                    "exchange": "NYSE",
+                    "status": "inactive",
+                    "tradable": False,
+                },
+            ]
+        )
+
+    async def bars(self, request: web.Request):
+        symbol = request.match_info["symbol"]
+        if symbol not in BARS:
+            raise web.HTTPNotFound()
+        bars, token = self.page(request, BARS[symbol])
+        return web.json_response({"bars": bars, "symbol": symbol, "next_page_token": token})
+
+    async def bars_many(self, request: web.Request):
+        # Pages hold the bars of all the symbols, sorted by symbol, as in the Alpaca API.
+        rows = [(s, bar) for s in sorted(request.query["symbols"].split(",")) for bar in BARS[s]]
+        rows, token = self.page(request, rows)
+        bars: dict = {}
+        for symbol, bar in rows:
+            bars.setdefault(symbol, []).append(bar)
+        return web.json_response({"bars": bars, "next_page_token": token})
+
+    async def latest(self, request: web.Request):
+        symbol = request.match_info["symbol"]
+        return web.json_response({"symbol": symbol, "bar": BARS[symbol][-1]})
+
+    async def latest_many(self, request: web.Request):
+        symbols = request.query["symbols"].split(",")
+        return web.json_response({"bars": {s: BARS[s][-1] for s in symbols if BARS[s]}})
+
+
+def run(fake: FakeAlpaca, test: Callable[[AsyncAlpacaPriceFetcher], Awaitable[Any]], **kwargs):
+    """Runs a test coroutine with a fetcher of the local server, in a new event loop."""
+
+    async def main():
+        runner = web.AppRunner(fake.app)
+        await runner.setup()
+        site = web.TCPSite(runner, "127.0.0.1", 0)
+        await site.start()
+        url = f"http://127.0.0.1:{runner.addresses[0][1]}"
+        try:
+            async with AsyncAlpacaPriceFetcher(data_url=url, trading_url=url, **kwargs) as alpaca:
+                return await test(alpaca)
+        finally:
+            await runner.cleanup()
+
+    return asyncio.run(main())
+
+
+class TestAsyncAlpacaPriceFetcher:
+    """Test the Alpaca async Price Fetcher Adapter against a local server."""
+
+    @pytest.fixture(autouse=True)
+    def keys(self, monkeypatch: pytest.MonkeyPatch):
+        monkeypatch.setattr(AlpacaApiKeys, "ALPACA_MARKET_DATA_KEY", "key")
+        monkeypatch.setattr(AlpacaApiKeys, "ALPACA_MARKET_DATA_SECRET", "secret")
+
+    @pytest.fixture
+    def fake(self) -> FakeAlpaca:
+        return FakeAlpaca()
+
+    def test_assets(self, fake: FakeAlpaca):
+        assets = run(fake, lambda alpaca: alpaca.assets())
+
+        assert list(assets["symbol"]) == ["AAPL", "OLD"]
+        assert list(assets["status"]) == ["Active", "Inactive"]
+        assert list(assets["name"]) == ["Apple", ""]
+        assert fake.requests[0].query["asset_class"] == "us_equity"
+
+    def test_historical_pages(self, fake: FakeAlpaca):
+        params = HistoricalPriceParams("AAPL", TFPreset.Tf_D, datetime(2024, 1, 1))
+        bars = run(fake, lambda alpaca: alpaca.historical(params))
+
+        assert list(bars["close"]) == [100.0, 101.0, 102.0, 103.0, 104.0]
+        assert bars["timestamp"].iloc[0] == pd.Timestamp("2024-01-01", tz="UTC")
+        assert str(bars["timestamp"].dtype) == "datetime64[ns, UTC]"
+        assert len(fake.requests) == 3
+        assert fake.requests[0].query["timeframe"] == "1Day"
+        assert fake.requests[0].query["start"] == "2024-01-01T00:00:00Z"
+        assert "end" not in fake.requests[0].query
+
+    def test_historical_limit(self, fake: FakeAlpaca):
+        params = HistoricalPriceParams(
+            "AAPL", TFPreset.Tf_D, datetime(2024, 1, 1), end=datetime(2024, 1, 31), limit=3
+        )
+        bars = run(fake, lambda alpaca: alpaca.historical(params))
+
+        assert bars.shape[0] == 3
+        assert [r.query["limit"] for r in fake.requests] == ["3", "1"]
+        assert fake.requests[0].query["end"] == "2024-01-31T00:00:00Z"
+
+    def test_historical_empty(self, fake: FakeAlpaca):
+        params = HistoricalPriceParams("TSLA", TFPreset.Tf_D, datetime(2024, 1, 1))
+        bars = run(fake, lambda alpaca: alpaca.historical(params))
+
+        assert bars.empty
+
+    def test_historical_error(self, fake: FakeAlpaca):
+        params = HistoricalPriceParams("NOPE", TFPreset.Tf_D, datetime(2024, 1, 1))
+
+        with pytest.raises(ClientResponseError):
+            run(fake, lambda alpaca: alpaca.historical(params))
+
+    def test_historical_many_batches(self, fake: FakeAlpaca):
+        params = HistoricalManyPriceParams(SYMBOLS, TFPreset.Tf_D, datetime(2024, 1, 1))
+        empty = HistoricalManyPriceParams(["TSLA"], TFPreset.Tf_D, datetime(2024, 1, 1))
+
+        async def test(alpaca: AsyncAlpacaPriceFetcher):
+            alpaca.symbols_per_request = 2
+            return await alpaca.historical_many(params), await alpaca.historical_many(empty)
+
+        bars, no_bars = run(fake, test)
+
+        assert bars.groupby("symbol").size().to_dict() == {"AAPL": 5, "MSFT": 3}
+        assert no_bars.empty
+        assert sorted(r.query["symbols"] for r in fake.requests[:5]) == (
+            ["AAPL"] * 3 + ["MSFT,TSLA"] * 2
+        )
+
+    def test_historical_many_default(self, fake: FakeAlpaca):
+        params = HistoricalManyPriceParams(SYMBOLS, TFPreset.Tf_D, datetime(2024, 1, 1))
+        empty = HistoricalManyPriceParams(["TSLA"], TFPreset.Tf_D, datetime(2024, 1, 1))
+
+        async def test(alpaca: AsyncAlpacaPriceFetcher):
+            return (
+                await AsyncPriceFetcher.historical_many(alpaca, params),
+                await AsyncPriceFetcher.historical_many(alpaca, empty),
+            )
+
+        bars, no_bars = run(fake, test)
+
+        assert list(bars["symbol"].drop_duplicates()) == ["MSFT", "AAPL"]
+        assert bars.shape[0] == 8
+        assert no_bars.empty
+
+    def test_latest(self, fake: FakeAlpaca):
+        bars = run(fake, lambda alpaca: alpaca.latest("MSFT"))
+
+        assert bars.shape[0] == 1
+        assert bars["timestamp"].iloc[0] == pd.Timestamp("2024-01-05", tz="UTC")
+
+    def test_latest_many(self, fake: FakeAlpaca):
+        async def test(alpaca: AsyncAlpacaPriceFetcher):
+            return (
+                await alpaca.latest_many(SYMBOLS),
+                await alpaca.latest_many(["TSLA"]),
+                await AsyncPriceFetcher.latest_many(alpaca, ["AAPL", "MSFT"]),
+            )
+
+        batched, empty, gathered = run(fake, test)
+
+        assert list(batched) == ["MSFT", "AAPL"]
+        assert [bar.close for bar in batched.values()] == [102.0, 104.0]
+        assert batched["MSFT"].timestamp == pd.Timestamp("2024-01-05", tz="UTC")
+        assert empty == {}
+        assert gathered == {"AAPL": batched["AAPL"], "MSFT": batched["MSFT"]}
+
+    def test_connections_reused(self, fake: FakeAlpaca):
+        symbols = ["AAPL", "MSFT"] * 10
+
+        async def test(alpaca: AsyncAlpacaPriceFetcher):
+            return await alpaca.gather(alpaca.latest(symbol) for symbol in symbols)
+
+        frames = run(fake, test, max_concurrency=3)
+
+        assert [df["symbol"].iloc[0] for df in frames] == symbols
+        assert fake.max_in_flight == 3
+        assert len(fake.connections) == 3
+
+    def test_reopens_after_close(self, fake: FakeAlpaca):
+        async def test(alpaca: AsyncAlpacaPriceFetcher):
+            await alpaca.latest("AAPL")
+            await alpaca.close()
+            await alpaca.close()
+            return await alpaca.latest("AAPL")
+
+        assert run(fake, test).shape[0] == 1
+        assert len(fake.connections) == 2
+
+    def test_invalid(self):
+        with pytest.raises(ValueError):
+            AsyncAlpacaPriceFetcher(max_concurrency=0)
+
+        assert str(AsyncAlpacaPriceFetcher()) == "<AsyncAlpacaPriceFetcher, Alpaca>"
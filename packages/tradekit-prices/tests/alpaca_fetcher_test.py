@@ -1,10 +1,15 @@
 from datetime import datetime
 
+import pandas as pd
 import pytest
+from alpaca.data.models import BarSet
 
+from prices.adapters import alpaca_fetcher
 from prices.adapters.alpaca_fetcher import AlpacaPriceFetcher
+from prices.adapters.config import AlpacaApiKeys
+from prices.core.bar import Bar, validate_bars
 from prices.core.timeframe import TFPreset
-from prices.ports.price_fetcher import HistoricalPriceParams
+from prices.ports.price_fetcher import HistoricalManyPriceParams, HistoricalPriceParams
 
 
 class TestAlpacaPriceFetcher:
@@ -53,6 +58,233 @@ class TestAlpacaPriceFetcher:
 
         assert bars.shape[0] == 5
 
+    def test_historical_many(self, alpaca: AlpacaPriceFetcher):
+        bars = alpaca.historical_many(
+            HistoricalManyPriceParams(
+                symbols=["AAPL", "META"],
+                timeframe=TFPreset.Tf_D,
+                start=datetime(2024, 8, 26),
+                end=datetime(2024, 8, 31),
+            )
+        )
+
+        assert bars.shape[0] == 10
+        assert set(bars["symbol"]) == {"AAPL", "META"}
+
+    def test_iter_historical(self, alpaca: AlpacaPriceFetcher):
+        chunks = list(
+            alpaca.iter_historical(
+                HistoricalPriceParams(
+                    symbol="AAPL",
+                    timeframe=TFPreset.Tf_D,
+                    start=datetime(2024, 8, 1),
+                    end=datetime(2024, 8, 31),
+                ),
+                chunk_rows=5,
+            )
+        )
+
+        assert len(chunks) == 5
+        assert sum(c.shape[0] for c in chunks) == 22
+
     def test_latest(self, alpaca: AlpacaPriceFetcher):
         bar = alpaca.latest("AAPL")
         assert bar.shape[0] > 0
+
+
+def raw_bar(day: int) -> dict:
+    """Returns a daily bar as sent by the Alpaca API."""
+    return {
+        "t": f"2024-08-{day:02d}T04:00:00Z",
+        "o": 10.0,
+        "h": 11.0,
+        "l": 9.0,
+        "c": 10.5,
+        "v": 1000,
+        "n": 10,
+        "vw": 10.2,
+    }
+
+
+class TestAlpacaPriceFetcherBatches:
+    """Test the batched requests of the Alpaca Price Fetcher Adapter, without calling the API."""
+
+    @pytest.fixture
+    def alpaca(self, monkeypatch) -> AlpacaPriceFetcher:
+        monkeypatch.setattr(AlpacaApiKeys, "ALPACA_MARKET_DATA_KEY", "key")
+        monkeypatch.setattr(AlpacaApiKeys, "ALPACA_MARKET_DATA_SECRET", "secret")
+        alpaca = AlpacaPriceFetcher()
+        alpaca.symbols_per_request = 2
+        alpaca.requests = []
+
+        def get_stock_bars(request):
+            alpaca.requests.append(request.symbol_or_symbols)
+            return BarSet({s: [raw_bar(26), raw_bar(27)] for s in request.symbol_or_symbols})
+
+        alpaca._get_stock_bars = get_stock_bars
+        return alpaca
+
+    @pytest.fixture
+    def params(self) -> HistoricalManyPriceParams:
+        return HistoricalManyPriceParams(
+            symbols=["AAPL", "META", "MSFT"],
+            timeframe=TFPreset.Tf_D,
+            start=datetime(2024, 8, 26),
+            end=datetime(2024, 8, 31),
+        )
+
+    def test_historical_many(self, alpaca: AlpacaPriceFetcher, params: HistoricalManyPriceParams):
+        bars = alpaca.historical_many(params)
+
+        assert alpaca.requests == [["AAPL", "META"], ["MSFT"]]
+        assert bars.shape[0] == 6
+        assert str(bars["timestamp"].dtype) == "datetime64[ns, UTC]"
+
+    def test_iter_historical_many(
+        self, alpaca: AlpacaPriceFetcher, params: HistoricalManyPriceParams
+    ):
+        frames = list(alpaca.iter_historical_many(params))
+
+        assert [f["symbol"].iloc[0] for f in frames] == ["AAPL", "META", "MSFT"]
+        assert all(f.shape[0] == 2 for f in frames)
+
+    def test_iter_historical_many_untrusted(
+        self, alpaca: AlpacaPriceFetcher, params: HistoricalManyPriceParams, monkeypatch
+    ):
+        calls = []
+
+        def spy(df, trusted=False):
+            calls.append(trusted)
+            return validate_bars(df, trusted)
+
+        monkeypatch.setattr(alpaca_fetcher, "validate_bars", spy)
+        list(alpaca.iter_historical_many(params))
+
+        # The bars come from the broker, so they are validated with the policy for untrusted data.
+        assert calls == [False, False, False]
+
+    def test_historical_many_without_bars(
+        self, alpaca: AlpacaPriceFetcher, params: HistoricalManyPriceParams
+    ):
+        alpaca._get_stock_bars = lambda request: BarSet({})
+        assert alpaca.historical_many(params).shape[0] == 0
+
+    def test_iter_historical_many_without_bars(
+        self, alpaca: AlpacaPriceFetcher, params: HistoricalManyPriceParams
+    ):
+        # Only the first batch has bars.
+        alpaca._get_stock_bars = lambda request: BarSet(
+            {s: [raw_bar(26)] for s in request.symbol_or_symbols if s != "MSFT"}
+        )
+        frames = list(alpaca.iter_historical_many(params))
+
+        assert [f["symbol"].iloc[0] for f in frames] == ["AAPL", "META"]
+        alpaca._get_stock_bars = lambda request: BarSet({})
+        assert list(alpaca.iter_historical_many(params)) == []
+
+    def test_params_require_symbols(self):
+        with pytest.raises(ValueError):
+            HistoricalManyPriceParams(
+                symbols=[], timeframe=TFPreset.Tf_D, start=datetime(2024, 1, 1)
+            )
+
+
+class TestAlpacaPriceFetcherPages:
+    """Test the paginated requests of the Alpaca Price Fetcher Adapter, without calling the API."""
+
+    @pytest.fixture
+    def alpaca(self, monkeypatch) -> AlpacaPriceFetcher:
+        monkeypatch.setattr(AlpacaApiKeys, "ALPACA_MARKET_DATA_KEY", "key")
+        monkeypatch.setattr(AlpacaApiKeys, "ALPACA_MARKET_DATA_SECRET", "secret")
+        alpaca = AlpacaPriceFetcher()
+        alpaca.pages = []
+        alpaca.queries = []
+
+        # Serves the bars of 5 days, in pages of the requested size.
+        def get_market_data(path, data):
+            alpaca.pages.append((path, data["limit"], data["page_token"]))
+            alpaca.queries.append(data)
+            start = data["page_token"] or 1
+            days = range(start, min(start + data["limit"], 6))
+            next_page_token = days[-1] + 1 if days[-1] < 5 else None
+            return {
+                "bars": [raw_bar(day) for day in days],
+                "symbol": "AAPL",
+                "next_page_token": next_page_token,
+            }
+
+        alpaca._get_market_data = get_market_data
+        return alpaca
+
+    def params(self, limit=None) -> HistoricalPriceParams:
+        return HistoricalPriceParams(
+            symbol="AAPL",
+            timeframe=TFPreset.Tf_D,
+            start=datetime(2024, 8, 1),
+            end=datetime(2024, 8, 31),
+            limit=limit,
+        )
+
+    def test_iter_historical(self, alpaca: AlpacaPriceFetcher):
+        chunks = list(alpaca.iter_historical(self.params(), chunk_rows=2))
+
+        assert [c.shape[0] for c in chunks] == [2, 2, 1]
+        assert [p[2] for p in alpaca.pages] == [None, 3, 5]
+        assert alpaca.pages[0][0] == "/stocks/AAPL/bars"
+        assert alpaca.queries[0] == {
+            "timeframe": "1Day",
+            "start": "2024-08-01T00:00:00Z",
+            "end": "2024-08-31T00:00:00Z",
+            "limit": 2,
+            "page_token": None,
+        }
+        assert str(chunks[0]["timestamp"].dtype) == "datetime64[ns, UTC]"
+        assert chunks[0]["volume"].dtype == float
+
+    def test_iter_historical_limit(self, alpaca: AlpacaPriceFetcher):
+        chunks = list(alpaca.iter_historical(self.params(limit=3), chunk_rows=2))
+
+        assert [c.shape[0] for c in chunks] == [2, 1]
+        assert [p[1] for p in alpaca.pages] == [2, 1]
+
+    def test_iter_historical_without_bars(self, alpaca: AlpacaPriceFetcher):
+        alpaca._get_market_data = lambda path, data: {"bars": None, "next_page_token": None}
+        assert list(alpaca.iter_historical(self.params())) == []
+
+    def test_iter_historical_invalid_chunk_rows(self, alpaca: AlpacaPriceFetcher):
+        with pytest.raises(ValueError):
+            next(alpaca.iter_historical(self.params(), chunk_rows=0))
+
+
+class TestAlpacaPriceFetcherLatest:
+    """Test the batched latest bars of the Alpaca Price Fetcher Adapter, without calling the API."""
+
+    @pytest.fixture
+    def alpaca(self, monkeypatch) -> AlpacaPriceFetcher:
+        monkeypatch.setattr(AlpacaApiKeys, "ALPACA_MARKET_DATA_KEY", "key")
+        monkeypatch.setattr(AlpacaApiKeys, "ALPACA_MARKET_DATA_SECRET", "secret")
+        alpaca = AlpacaPriceFetcher()
+        alpaca.symbols_per_request = 2
+        alpaca.requests = []
+
+        # TSLA has no latest bar.
+        def get_market_data(path, data):
+            alpaca.requests.append((path, data["symbols"]))
+            symbols = data["symbols"].split(",")
+            return {"bars": {s: raw_bar(30) for s in symbols if s != "TSLA"}}
+
+        alpaca._get_market_data = get_market_data
+        return alpaca
+
+    def test_latest_many(self, alpaca: AlpacaPriceFetcher):
+        bars = alpaca.latest_many(["MSFT", "TSLA", "AAPL", "MSFT"])
+
+        assert alpaca.requests == [
+            ("/stocks/bars/latest", "MSFT,TSLA"),
+            ("/stocks/bars/latest", "AAPL"),
+        ]
+        assert list(bars) == ["MSFT", "AAPL"]
+        assert bars["AAPL"] == Bar(
+            "AAPL", pd.Timestamp("2024-08-30 04:00", tz="UTC"), 10.0, 11.0, 9.0, 10.5, 1000.0, 10.2
+        )
+        assert isinstance(bars["AAPL"].volume, float)
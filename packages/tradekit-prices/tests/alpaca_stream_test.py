@@ -0,0 +1,155 @@
+import asyncio
+import json
+from http import HTTPStatus
+from typing import Any, List
+
+import pytest
+from websockets.asyncio.server import serve
+
+from prices.adapters.alpaca_stream import AlpacaMarketStream
+from prices.adapters.config import AlpacaApiKeys
+from prices.core.bar import Bar
+from prices.core.trade import Trade
+
+BAR = {
+    "T": "b",
+    "S": "AAPL",
+    "o": 100,
+    "h": 102.5,
+    "l": 99.5,
+    "c": 101,
+    "v": 1200,
+    "t": "2024-01-02T14:30:00Z",
+    "n": 12,
+    "vw": 100.8,
+}
+TRADE = {"T": "t", "S": "MSFT", "i": 1, "x": "V", "p": 370.5, "s": 5, "t": "2024-01-02T14:30:01.5Z"}
+
+
+class FakeAlpaca:
+    """A local server speaking the protocol of the Alpaca stream, closing after each frame."""
+
+    def __init__(
+        self, frames: List[List[dict]], auth_error: bool = False, refusals: int = 0
+    ) -> None:
+        self.frames = frames
+        self.auth_error = auth_error
+        self.refusals = refusals
+        self.received: List[Any] = []
+
+    def process_request(self, connection, request):
+        """Refuses the first `refusals` handshakes."""
+        if self.refusals > 0:
+            self.refusals -= 1
+            return connection.respond(HTTPStatus.SERVICE_UNAVAILABLE, "Unavailable\n")
+        return None
+
+    async def handler(self, connection):
+        await connection.send(json.dumps([{"T": "success", "msg": "connected"}]))
+        self.received.append(json.loads(await connection.recv()))
+        if self.auth_error:
+            await connection.send(json.dumps([{"T": "error", "code": 402, "msg": "auth failed"}]))
+            return
+        await connection.send(json.dumps([{"T": "success", "msg": "authenticated"}]))
+        self.received.append(json.loads(await connection.recv()))
+        if self.frames:
+            await connection.send(json.dumps(self.frames.pop(0)))
+
+
+class TestAlpacaMarketStream:
+    """Test the Alpaca Market Stream against a local server."""
+
+    @pytest.fixture(autouse=True)
+    def keys(self, monkeypatch: pytest.MonkeyPatch):
+        monkeypatch.setattr(AlpacaApiKeys, "ALPACA_MARKET_DATA_KEY", "key")
+        monkeypatch.setattr(AlpacaApiKeys, "ALPACA_MARKET_DATA_SECRET", "secret")
+
+    def test_url(self):
+        assert AlpacaMarketStream().url == "wss://stream.data.alpaca.markets/v2/iex"
+        assert AlpacaMarketStream(feed="sip").url == "wss://stream.data.alpaca.markets/v2/sip"
+
+    def test_stream(self):
+        subscription_frame = {"T": "subscription", "bars": ["AAPL"], "trades": ["MSFT"]}
+        fake = FakeAlpaca([[subscription_frame, BAR], [TRADE, {**BAR, "S": "TSLA"}]])
+
+        async def main():
+            async with serve(fake.handler, "127.0.0.1", 0) as server:
+                port = server.sockets[0].getsockname()[1]
+                stream = AlpacaMarketStream(url=f"ws://127.0.0.1:{port}", reconnect_delay=0.01)
+                bars = stream.subscribe(["AAPL"])
+                trades = stream.subscribe(["MSFT"], bars=False, trades=True)
+
+                task = asyncio.create_task(stream.run())
+                events = [await anext(bars), await anext(trades)]
+                task.cancel()
+                with pytest.raises(asyncio.CancelledError):
+                    await task
+                return events, bars.closed
+
+        [bar, trade], closed = asyncio.run(main())
+
+        assert bar == Bar(
+            symbol="AAPL",
+            timestamp=bar.timestamp,
+            open=100.0,
+            high=102.5,
+            low=99.5,
+            close=101.0,
+            volume=1200.0,
+            vwap=100.8,
+        )
+        assert str(bar.timestamp) == "2024-01-02 14:30:00+00:00"
+        assert trade == Trade("MSFT", trade.timestamp, 370.5, 5.0)
+        assert trade.timestamp.microsecond == 500_000
+        assert closed
+        assert fake.received[:2] == [
+            {"action": "auth", "key": "key", "secret": "secret"},
+            {"action": "subscribe", "bars": ["AAPL"], "trades": ["MSFT"]},
+        ]
+        assert len(fake.received) >= 4
+
+    def test_reconnect_after_refused(self):
+        async def main():
+            async with serve(FakeAlpaca([]).handler, "127.0.0.1", 0) as server:
+                port = server.sockets[0].getsockname()[1]
+            stream = AlpacaMarketStream(url=f"ws://127.0.0.1:{port}", reconnect_delay=0.01)
+            stream.subscribe(["AAPL"])
+
+            task = asyncio.create_task(stream.run())
+            await asyncio.sleep(0.1)
+            assert not task.done()
+            task.cancel()
+
+        asyncio.run(main())
+
+    def test_reconnect_after_handshake_refused(self):
+        fake = FakeAlpaca([[BAR]], refusals=1)
+
+        async def main():
+            handler, process_request = fake.handler, fake.process_request
+            async with serve(handler, "127.0.0.1", 0, process_request=process_request) as server:
+                port = server.sockets[0].getsockname()[1]
+                stream = AlpacaMarketStream(url=f"ws://127.0.0.1:{port}", reconnect_delay=0.01)
+                bars = stream.subscribe(["AAPL"])
+
+                task = asyncio.create_task(stream.run())
+                bar = await asyncio.wait_for(anext(bars), timeout=5)
+                task.cancel()
+                return bar
+
+        assert asyncio.run(main()).symbol == "AAPL"
+        assert fake.refusals == 0
+
+    def test_auth_error(self):
+        fake = FakeAlpaca([], auth_error=True)
+
+        async def main():
+            async with serve(fake.handler, "127.0.0.1", 0) as server:
+                port = server.sockets[0].getsockname()[1]
+                stream = AlpacaMarketStream(url=f"ws://127.0.0.1:{port}")
+                subscription = stream.subscribe(["AAPL"])
+                with pytest.raises(ValueError, match="402"):
+                    await stream.run()
+                return subscription.closed
+
+        assert asyncio.run(main())
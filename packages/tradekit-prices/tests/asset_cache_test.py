@@ -0,0 +1,121 @@
+import time
+from datetime import timedelta
+
+import pandas as pd
+import pytest
+
+from prices.adapters.sqlite_repository import SQLitePriceRepository
+from prices.core.asset import Asset, diff_assets
+from prices.services.asset_cache import AssetCache
+from tests.helpers import make_assets
+
+
+class TestDiffAssets:
+    """Test the diff between the stored assets and a new list of them."""
+
+    def test_diff(self):
+        stored = make_assets(["AAPL", "META", "TSLA", "MSFT"])
+        assets = pd.concat(
+            [make_assets(["AAPL", "NVDA"]), make_assets(["META"], "Inactive")],
+            ignore_index=True,
+        )
+        assets.loc[0, "url_logo"] = "https://logo"
+        assets = pd.concat([assets, make_assets(["MSFT"])], ignore_index=True)
+
+        diff = diff_assets(stored, assets)
+
+        assert diff.inserted["symbol"].tolist() == ["NVDA"]
+        assert diff.updated["symbol"].tolist() == ["AAPL", "META"]
+        assert diff.removed == ["TSLA"]
+        assert diff.rows_affected == 4
+
+    def test_unchanged_and_duplicates(self):
+        stored = make_assets(["AAPL", "META"])
+        assets = pd.concat(
+            [make_assets(["META"], "Inactive"), make_assets(["AAPL", "META"])],
+            ignore_index=True,
+        )
+
+        diff = diff_assets(stored, assets)
+
+        assert diff.rows_affected == 0
+
+
+class TestAssetCache:
+    """Test the Asset Cache service."""
+
+    @pytest.fixture
+    def repository(self, repository: SQLitePriceRepository, monkeypatch) -> SQLitePriceRepository:
+        loads = []
+        load_assets = repository.load_assets
+        monkeypatch.setattr(
+            repository, "load_assets", lambda: loads.append(1) or load_assets()
+        )
+        repository.loads = loads
+        return repository
+
+    def test_save_writes_only_changes(self, repository):
+        cache = AssetCache(repository)
+
+        first = cache.save(make_assets(["AAPL", "META", "TSLA"]))
+        same = cache.save(make_assets(["AAPL", "META", "TSLA"]))
+        assets = pd.concat(
+            [make_assets(["AAPL"]), make_assets(["META"], "Inactive"), make_assets(["NVDA"])],
+            ignore_index=True,
+        )
+        changed = cache.save(assets)
+
+        assert [r.rows_affected for r in (first, same, changed)] == [3, 0, 3]
+        stored = repository.load_assets().sort_values("symbol", ignore_index=True)
+        assert stored["symbol"].tolist() == ["AAPL", "META", "NVDA"]
+        assert stored["status"].tolist() == ["Active", "Inactive", "Active"]
+        assert stored["tradable"].dtype == bool
+
+    def test_save_to_legacy_table(self, repository):
+        # Previous versions replaced the whole table, without any key.
+        with repository._connect_for_assets() as con:
+            make_assets(["AAPL", "META"]).to_sql("Alpaca", con, index=False)
+
+        result = AssetCache(repository).save(make_assets(["AAPL", "NVDA"]))
+
+        assert result.rows_affected == 2
+        assert sorted(repository.load_assets()["symbol"]) == ["AAPL", "NVDA"]
+
+    def test_lookup_and_ttl(self, repository, monkeypatch):
+        AssetCache(repository).save(make_assets(["AAPL", "META"]))
+        now = [1000.0]
+        monkeypatch.setattr(time, "monotonic", lambda: now[0])
+        cache = AssetCache(repository, ttl=timedelta(minutes=5))
+
+        assert cache.get("META") == Asset(
+            "META Inc.", "META", "NASDAQ", "Alpaca", "Equity", True, "Active", None, None
+        )
+        assert "AAPL" in cache
+        assert cache.get("NVDA") is None
+        assert len(repository.loads) == 1
+
+        now[0] += 299
+        assert cache.assets().shape[0] == 2
+        assert len(repository.loads) == 1
+
+        now[0] += 1
+        assert cache.get("AAPL").symbol == "AAPL"
+        assert len(repository.loads) == 2
+
+        cache.invalidate()
+        assert cache.expired
+        cache.save(make_assets(["TSLA"]))
+        assert cache.get("TSLA") is not None and cache.get("AAPL") is None
+        assert len(repository.loads) == 2
+
+    def test_refresh(self, repository):
+        class Fetcher:
+            def assets(self):
+                return make_assets(["AAPL"])
+
+        cache = AssetCache(repository)
+
+        assert cache.refresh(Fetcher()).rows_affected == 1
+        assert cache.refresh(Fetcher()).rows_affected == 0
+        assert cache.get("AAPL") is not None
+        assert repository.loads == []
@@ -0,0 +1,116 @@
+import time
+from datetime import datetime
+
+import pytest
+
+from prices.adapters.sqlite_repository import SQLitePriceRepository
+from prices.core.bar import BarDataFrame
+from prices.core.timeframe import TFPreset
+from prices.ports.price_fetcher import HistoricalPriceParams
+from prices.ports.price_repository import LoadHistoricalParams
+from prices.services.backfill import Backfill, BackfillParams
+from prices.services.rate_limiter import TokenBucket
+from tests.helpers import StubPriceFetcher
+
+
+class APIError(Exception):
+    """An error with an HTTP status code, like the ones raised by the Alpaca client."""
+
+    def __init__(self, status_code: int):
+        super().__init__(f"HTTP {status_code}")
+        self.status_code = status_code
+
+
+class FlakyPriceFetcher(StubPriceFetcher):
+    """A price fetcher that fails the first requests of each symbol."""
+
+    def __init__(self, errors: dict):
+        super().__init__()
+        self.errors = errors
+
+    def historical(self, params: HistoricalPriceParams) -> BarDataFrame:
+        errors = self.errors.get(params.symbol)
+        if errors:
+            raise errors.pop(0)
+        return super().historical(params)
+
+
+class TestBackfill:
+    """Test the Backfill service."""
+
+    def params(self, *symbols: str) -> BackfillParams:
+        return BackfillParams(
+            symbols=list(symbols), timeframe=TFPreset.Tf_D, start=datetime(2024, 1, 1)
+        )
+
+    def test_run(self, repository: SQLitePriceRepository):
+        symbols = [f"S{i}" for i in range(20)]
+        backfill = Backfill(StubPriceFetcher(), repository, max_workers=4)
+
+        results = list(backfill.run(self.params(*symbols)))
+
+        assert sorted(r.symbol for r in results) == sorted(symbols)
+        assert all(r.status == "success" and r.rows_affected == 3 for r in results)
+        bars = repository.load_historical(LoadHistoricalParams("S7", TFPreset.Tf_D))
+        assert bars.shape[0] == 3
+
+    def test_retries_transient_errors(self, repository: SQLitePriceRepository):
+        fetcher = FlakyPriceFetcher(
+            {"AAPL": [APIError(429), APIError(503)], "META": [ConnectionError()]}
+        )
+        backfill = Backfill(fetcher, repository, backoff=0)
+
+        results = {r.symbol: r for r in backfill.run(self.params("AAPL", "META"))}
+
+        assert results["AAPL"].status == "success"
+        assert results["AAPL"].attempts == 3
+        assert results["META"].attempts == 2
+
+    def test_does_not_retry_client_errors(self, repository: SQLitePriceRepository):
+        fetcher = FlakyPriceFetcher({"AAPL": [APIError(403)]})
+        backfill = Backfill(fetcher, repository, backoff=0)
+
+        [result] = backfill.run(self.params("AAPL"))
+
+        assert result.status == "error"
+        assert result.message == "HTTP 403"
+        assert result.attempts == 1
+
+    def test_gives_up_after_max_retries(self, repository: SQLitePriceRepository):
+        fetcher = FlakyPriceFetcher({"AAPL": [APIError(500)] * 3})
+        backfill = Backfill(fetcher, repository, max_retries=1, backoff=0)
+
+        [result] = backfill.run(self.params("AAPL"))
+
+        assert result.status == "error"
+        assert result.attempts == 2
+
+    def test_uses_broker_quota(self, repository: SQLitePriceRepository):
+        fetcher = StubPriceFetcher()
+        fetcher.requests_per_minute = 6000
+
+        backfill = Backfill(fetcher, repository)
+
+        assert backfill._limiter is not None
+        assert backfill._limiter.rate == 100
+
+
+class TestTokenBucket:
+    """Test the Token Bucket rate limiter."""
+
+    def test_acquire_spaces_requests(self):
+        bucket = TokenBucket(rate=50)
+
+        started_at = time.monotonic()
+        waits = [bucket.acquire() for _ in range(6)]
+
+        assert waits[0] == 0
+        assert time.monotonic() - started_at >= 0.09
+
+    def test_burst(self):
+        bucket = TokenBucket(rate=1, capacity=3)
+        assert [bucket.acquire() for _ in range(3)] == [0, 0, 0]
+
+    def test_invalid_rate(self):
+        with pytest.raises(ValueError):
+            TokenBucket(rate=0)
@@ -0,0 +1,122 @@
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from prices.adapters.sqlite_repository import SQLitePriceRepository
+from prices.core.bar import empty_bars
+from prices.core.timeframe import TFPreset
+from prices.ports.price_repository import LoadHistoricalParams, SaveHistoricalParams
+from prices.services.bar_cache import BarCache, map_bar_file, write_bar_file
+from tests.helpers import make_bars
+
+
+class TestBarCache:
+    """Test the memory-mapped Bar Cache service."""
+
+    @pytest.fixture
+    def repository(self, repository: SQLitePriceRepository, monkeypatch) -> SQLitePriceRepository:
+        repository.save_historical(
+            SaveHistoricalParams("META", TFPreset.Tf_D, make_bars("META", "2023-01-01", 50))
+        )
+        loads = []
+        load_historical = repository.load_historical
+        monkeypatch.setattr(
+            repository,
+            "load_historical",
+            lambda params: loads.append(params) or load_historical(params),
+        )
+        repository.loads = loads
+        return repository
+
+    @pytest.fixture
+    def cache(self, repository, tmp_path) -> BarCache:
+        return BarCache(repository, str(tmp_path / "cache"))
+
+    def test_load_populates_once(self, cache: BarCache, repository):
+        params = LoadHistoricalParams("META", TFPreset.Tf_D)
+
+        first = cache.load(params)
+        second = cache.load(params)
+
+        assert len(repository.loads) == 1
+        expected = make_bars("META", "2023-01-01", 50)
+        pd.testing.assert_frame_equal(first, expected, check_frame_type=False)
+        pd.testing.assert_frame_equal(second, first)
+
+    def test_load_does_not_copy(self, cache: BarCache):
+        bars = cache.load(LoadHistoricalParams("META", TFPreset.Tf_D))
+        timestamps, values = cache._map("META", TFPreset.Tf_D)
+
+        assert np.shares_memory(bars["close"].to_numpy(), values)
+        assert np.shares_memory(bars["timestamp"].array._ndarray, timestamps)
+
+    def test_changes_are_not_written_back(self, cache: BarCache, tmp_path):
+        bars = cache.load(LoadHistoricalParams("META", TFPreset.Tf_D))
+        bars.loc[0, "close"] = -1.0
+
+        file = tmp_path / "cache" / "Alpaca" / "tf_1d" / "META.bars"
+        assert map_bar_file(str(file))[1][3, 0] == 100.0
+
+    def test_load_range(self, cache: BarCache):
+        bars = cache.load(
+            LoadHistoricalParams(
+                "META",
+                TFPreset.Tf_D,
+                start=datetime(2023, 1, 10),
+                end=datetime(2023, 1, 19),
+                columns=["close"],
+            )
+        )
+
+        assert list(bars.columns) == ["symbol", "timestamp", "close"]
+        assert bars.shape[0] == 10
+        assert bars["timestamp"].iloc[0] == pd.Timestamp("2023-01-10", tz="UTC")
+
+    def test_load_limit(self, cache: BarCache):
+        params = LoadHistoricalParams("META", TFPreset.Tf_D, start=datetime(2023, 2, 15), limit=3)
+
+        assert cache.load(params)["close"].tolist() == [145.0, 146.0, 147.0]
+
+    def test_load_outside_history(self, cache: BarCache):
+        params = LoadHistoricalParams("META", TFPreset.Tf_D, start=datetime(2024, 1, 1))
+
+        assert cache.load(params).shape[0] == 0
+
+    def test_map_empty_file(self, tmp_path):
+        file = str(tmp_path / "bars.bars")
+        write_bar_file(file, empty_bars())
+
+        timestamps, values = map_bar_file(file)
+
+        assert timestamps.shape == (0,)
+        assert values.shape == (6, 0)
+
+    def test_invalidate(self, cache: BarCache, repository):
+        params = LoadHistoricalParams("META", TFPreset.Tf_D)
+        cache.load(params)
+
+        cache.invalidate("META", TFPreset.Tf_D)
+        cache.load(params)
+        cache.invalidate("META")
+        cache.load(params)
+
+        assert len(repository.loads) == 3
+
+    def test_map_invalid_file(self, tmp_path):
+        file = tmp_path / "bars.bars"
+        file.write_bytes(b"\x00" * 64)
+
+        with pytest.raises(ValueError):
+            map_bar_file(str(file))
+
+    def test_map_unsupported_version(self, tmp_path):
+        file = str(tmp_path / "bars.bars")
+        write_bar_file(file, make_bars("META", "2023-01-01", 1))
+        with open(file, "r+b") as f:
+            f.seek(8)
+            f.write(b"\x02")
+
+        with pytest.raises(ValueError):
+            map_bar_file(file)
@@ -0,0 +1,149 @@
+from datetime import datetime
+
+import pandas as pd
+import pytest
+
+from prices.adapters.cached_repository import CachedPriceRepository
+from prices.adapters.sqlite_repository import SQLitePriceRepository
+from prices.core.timeframe import TFPreset
+from prices.ports.price_repository import (
+    LoadCoverageParams,
+    LoadHistoricalParams,
+    SaveHistoricalParams,
+)
+from tests.helpers import make_assets, make_bars
+
+
+class TestCachedPriceRepository:
+    """Test the Cached Price Repository."""
+
+    @pytest.fixture
+    def repository(self, repository: SQLitePriceRepository, monkeypatch) -> SQLitePriceRepository:
+        for symbol in ["META", "AAPL"]:
+            repository.save_historical(
+                SaveHistoricalParams(
+                    symbol, TFPreset.Tf_1h, make_bars(symbol, "2024-01-01", 240, freq="1h")
+                )
+            )
+        loads = []
+        load_historical = repository.load_historical
+        monkeypatch.setattr(
+            repository,
+            "load_historical",
+            lambda params: loads.append(params) or load_historical(params),
+        )
+        repository.loads = loads
+        return repository
+
+    def test_slices_cached_superset(self, repository):
+        cached = CachedPriceRepository(repository)
+
+        full = cached.load_historical(LoadHistoricalParams("META", TFPreset.Tf_1h))
+        sliced = cached.load_historical(
+            LoadHistoricalParams(
+                "META",
+                TFPreset.Tf_1h,
+                start=datetime(2024, 1, 3),
+                end=datetime(2024, 1, 4),
+                limit=10,
+                columns=["close"],
+            )
+        )
+
+        assert len(repository.loads) == 1
+        assert (cached.hits, cached.misses) == (1, 1)
+        assert list(sliced.columns) == ["symbol", "timestamp", "close"]
+        assert sliced.shape[0] == 10
+        assert sliced["close"].tolist() == full["close"].iloc[48:58].tolist()
+        expected = repository.load_historical(
+            LoadHistoricalParams("META", TFPreset.Tf_1h, start=datetime(2024, 1, 3), limit=10)
+        )
+        assert sliced["timestamp"].tolist() == expected["timestamp"].tolist()
+
+    def test_overlapping_ranges_grow_the_cache(self, repository):
+        cached = CachedPriceRepository(repository)
+
+        def load(start, end):
+            return cached.load_historical(
+                LoadHistoricalParams("META", TFPreset.Tf_1h, start=start, end=end)
+            )
+
+        load(datetime(2024, 1, 2), datetime(2024, 1, 4))
+        load(datetime(2024, 1, 3), datetime(2024, 1, 5))
+        bars = load(datetime(2024, 1, 2, 12), datetime(2024, 1, 4, 12))
+        load(datetime(2024, 1, 8), datetime(2024, 1, 9))
+
+        assert [(p.start, p.end) for p in repository.loads] == [
+            (pd.Timestamp("2024-01-02", tz="UTC"), pd.Timestamp("2024-01-04", tz="UTC")),
+            (pd.Timestamp("2024-01-02", tz="UTC"), pd.Timestamp("2024-01-05", tz="UTC")),
+            (pd.Timestamp("2024-01-08", tz="UTC"), pd.Timestamp("2024-01-09", tz="UTC")),
+        ]
+        assert bars.shape[0] == 49
+
+    def test_save_invalidates(self, repository):
+        cached = CachedPriceRepository(repository)
+        params = LoadHistoricalParams("META", TFPreset.Tf_1h)
+        cached.load_historical(params)
+        cached.load_historical(LoadHistoricalParams("AAPL", TFPreset.Tf_1h))
+
+        cached.save_historical(
+            SaveHistoricalParams(
+                "META", TFPreset.Tf_1h, make_bars("META", "2024-02-01", 5, freq="1h"), "upsert"
+            )
+        )
+        bars = cached.load_historical(params)
+        cached.load_historical(LoadHistoricalParams("AAPL", TFPreset.Tf_1h))
+
+        assert len(repository.loads) == 3
+        assert bars.shape[0] == 245
+
+    def test_evicts_least_recently_used(self, repository):
+        cached = CachedPriceRepository(repository)
+        cached.load_historical(LoadHistoricalParams("META", TFPreset.Tf_1h))
+        cached.max_bytes = cached.size * 3 // 2
+
+        cached.load_historical(LoadHistoricalParams("AAPL", TFPreset.Tf_1h))
+        cached.load_historical(LoadHistoricalParams("AAPL", TFPreset.Tf_1h))
+        cached.load_historical(LoadHistoricalParams("META", TFPreset.Tf_1h))
+
+        assert len(repository.loads) == 3
+        assert cached.size <= cached.max_bytes
+
+        cached.max_bytes = 1
+        cached.invalidate("META")
+        cached.load_historical(LoadHistoricalParams("META", TFPreset.Tf_1h))
+        assert cached.size == 0
+
+    def test_delegates_assets_and_coverage(self, repository):
+        cached = CachedPriceRepository(repository)
+
+        result = cached.save_assets(make_assets(["META", "AAPL"]))
+        coverage = cached.load_coverage(LoadCoverageParams("META", TFPreset.Tf_1h))
+
+        assert result.rows_affected == 2
+        assert sorted(cached.load_assets()["symbol"]) == ["AAPL", "META"]
+        assert coverage.rows == 240
+        assert coverage.first == pd.Timestamp("2024-01-01", tz="UTC")
+
+    def test_clear_and_close(self, repository, monkeypatch):
+        cached = CachedPriceRepository(repository)
+        params = LoadHistoricalParams("META", TFPreset.Tf_1h)
+        cached.load_historical(params)
+
+        cached.clear()
+        cached.load_historical(params)
+
+        assert len(repository.loads) == 2
+        assert cached.size > 0
+
+        closed = []
+        close = repository.close
+        monkeypatch.setattr(repository, "close", lambda: closed.append(True) or close())
+        cached.close()
+
+        assert closed == [True]
+        assert cached.size == 0
+
+    def test_invalid_max_bytes(self, repository):
+        with pytest.raises(ValueError):
+            CachedPriceRepository(repository, max_bytes=0)
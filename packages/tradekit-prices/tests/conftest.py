@@ -0,0 +1,34 @@
+"""Fixtures shared by the unit tests."""
+
+import time
+from typing import Iterator
+
+import pytest
+
+from prices.adapters.config import SqlLiteConfig
+from prices.adapters.sqlite_repository import SQLitePriceRepository
+from prices.core.broker import Broker
+
+
+@pytest.fixture
+def sqlite_path(tmp_path, monkeypatch) -> str:
+    """Stores the SQLite databases of a test in its temporary directory."""
+    monkeypatch.setattr(SqlLiteConfig, "SQLITE_PATH", str(tmp_path))
+    return str(tmp_path)
+
+
+@pytest.fixture
+def repository(sqlite_path: str) -> Iterator[SQLitePriceRepository]:
+    """An empty SQLite price repository, which the tests seed with the bars they need."""
+    with SQLitePriceRepository(Broker.ALPACA) as repository:
+        yield repository
+
+
+@pytest.fixture
+def west_of_utc(monkeypatch):
+    """Runs a test in a local time zone behind UTC, restoring the previous one after it."""
+    monkeypatch.setenv("TZ", "America/New_York")
+    time.tzset()
+    yield
+    monkeypatch.undo()
+    time.tzset()
@@ -0,0 +1,64 @@
+"""Helpers shared by the unit tests."""
+
+import pandas as pd
+
+from prices.core.asset import AssetDataFrame
+from prices.core.bar import BarDataFrame, empty_bars
+from prices.core.broker import Broker
+from prices.ports.price_fetcher import HistoricalPriceParams, PriceFetcher
+
+
+def make_bars(symbol: str, start: str, periods: int, freq: str = "1D") -> BarDataFrame:
+    """Builds `periods` synthetic bars for `symbol`, starting at `start` (UTC)."""
+    prices = [100.0 + i for i in range(periods)]
+    df = pd.DataFrame(
+        {
+            "symbol": symbol,
+            "timestamp": pd.date_range(start, periods=periods, freq=freq, tz="UTC"),
+            "open": prices,
+            "high": [p + 1 for p in prices],
+            "low": [p - 1 for p in prices],
+            "close": prices,
+            "volume": 1000.0,
+            "vwap": prices,
+        }
+    )
+    return BarDataFrame(df)
+
+
+def make_assets(symbols: list[str], status: str = "Active") -> AssetDataFrame:
+    """Builds an Alpaca equity asset for each symbol, all with the same `status`."""
+    df = pd.DataFrame(
+        {
+            "name": [f"{symbol} Inc." for symbol in symbols],
+            "symbol": symbols,
+            "exchange": "NASDAQ",
+            "broker": "Alpaca",
+            "asset_class": "Equity",
+            "tradable": True,
+            "status": status,
+            "url_logo": None,
+            "pairs": None,
+        }
+    )
+    return AssetDataFrame(df)
+
+
+class StubPriceFetcher(PriceFetcher):
+    """A price fetcher that returns synthetic bars, for testing the defaults of the port."""
+
+    def __init__(self):
+        super().__init__(broker=Broker.ALPACA)
+
+    def assets(self) -> AssetDataFrame:
+        raise NotImplementedError
+
+    def historical(self, params: HistoricalPriceParams) -> BarDataFrame:
+        if params.symbol == "EMPTY":
+            return empty_bars()
+        return make_bars(params.symbol, "2024-01-02", 3)
+
+    def latest(self, symbol: str) -> BarDataFrame:
+        if symbol == "EMPTY":
+            return empty_bars()
+        return make_bars(symbol, "2024-01-02", 1)
@@ -0,0 +1,58 @@
+import os
+import subprocess
+import sys
+from typing import Dict, Tuple
+
+import pytest
+
+IMPORT_BUDGET_MS = 1_500
+"""The cold-import budget of the Alpaca fetcher, twice what it takes with pandas and pandera."""
+
+PACKAGE_BUDGET_MS = 100
+"""The budget of the modules of the package itself, without their dependencies."""
+
+
+def import_times(module: str) -> Dict[str, Tuple[int, int]]:
+    """
+    Imports a module in a new interpreter, returning the self and cumulative microseconds of every
+    module it imported.
+    """
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    paths = [root, os.environ.get("PYTHONPATH", "")]
+    env = {**os.environ, "PYTHONPATH": os.pathsep.join(path for path in paths if path)}
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True,
+        text=True,
+        check=True,
+        env=env,
+    )
+
+    times = {}
+    for line in result.stderr.splitlines()[1:]:
+        self_us, cumulative_us, name = line.removeprefix("import time:").split("|")
+        times[name.strip()] = (int(self_us), int(cumulative_us))
+    return times
+
+
+@pytest.fixture(scope="module")
+def times() -> Dict[str, Tuple[int, int]]:
+    return import_times("prices.adapters.alpaca_fetcher")
+
+
+class TestImportTime:
+    """Test the cold-import cost of the package, which short-lived jobs pay on every run."""
+
+    def test_defers_alpaca_and_dotenv(self, times: Dict[str, Tuple[int, int]]):
+        deferred = [name for name in times if name.split(".")[0] in ("alpaca", "dotenv")]
+        assert deferred == []
+
+    # Wall-clock times depend on the machine and its load, so the budgets are checked on demand.
+    @pytest.mark.skipif(
+        not os.environ.get("TRADEKIT_BENCHMARKS"), reason="Set TRADEKIT_BENCHMARKS to run it."
+    )
+    def test_budget(self, times: Dict[str, Tuple[int, int]]):
+        package = [times[name][0] for name in times if name.split(".")[0] == "prices"]
+
+        assert times["prices.adapters.alpaca_fetcher"][1] < IMPORT_BUDGET_MS * 1000
+        assert sum(package) < PACKAGE_BUDGET_MS * 1000
@@ -0,0 +1,80 @@
+import time
+from datetime import timedelta
+from typing import Dict, List
+
+import pytest
+
+from prices.core.bar import Bar
+from prices.services.latest_cache import LatestBarCache
+from tests.helpers import StubPriceFetcher
+
+
+class CountingPriceFetcher(StubPriceFetcher):
+    """A price fetcher that records the symbols of each call of `latest_many`."""
+
+    def __init__(self):
+        super().__init__()
+        self.calls: List[List[str]] = []
+
+    def latest_many(self, symbols: List[str]) -> Dict[str, Bar]:
+        self.calls.append(list(symbols))
+        return super().latest_many(symbols)
+
+
+class TestLatestBarCache:
+    """Test the Latest Bar Cache service."""
+
+    @pytest.fixture
+    def now(self, monkeypatch) -> List[float]:
+        now = [1_000_000.0]
+        monkeypatch.setattr(time, "time", lambda: now[0])
+        return now
+
+    @pytest.fixture
+    def fetcher(self) -> CountingPriceFetcher:
+        return CountingPriceFetcher()
+
+    def test_fetches_only_expired(self, fetcher: CountingPriceFetcher, now: List[float]):
+        cache = LatestBarCache(fetcher, ttl=timedelta(seconds=60))
+
+        first = cache.latest_many(["AAPL", "META", "AAPL"])
+        second = cache.latest_many(["META", "MSFT", "AAPL"])
+
+        assert list(first) == ["AAPL", "META"]
+        assert list(second) == ["META", "MSFT", "AAPL"]
+        assert second["META"] is first["META"]
+        assert fetcher.calls == [["AAPL", "META"], ["MSFT"]]
+
+    def test_expires_on_interval_boundary(self, fetcher: CountingPriceFetcher, now: List[float]):
+        cache = LatestBarCache(fetcher, ttl=timedelta(seconds=60))
+
+        # 1,000,000s is 40s into a minute, so the bars fetched then expire 20s later.
+        cache.latest("AAPL")
+        now[0] += 19
+        cache.latest("AAPL")
+        now[0] += 1
+        cache.latest("AAPL")
+
+        assert fetcher.calls == [["AAPL"], ["AAPL"]]
+
+    def test_symbols_without_bars(self, fetcher: CountingPriceFetcher, now: List[float]):
+        cache = LatestBarCache(fetcher)
+
+        assert cache.latest("EMPTY") is None
+        assert cache.latest_many(["EMPTY", "AAPL"]).keys() == {"AAPL"}
+        assert fetcher.calls == [["EMPTY"], ["AAPL"]]
+
+    def test_invalidate(self, fetcher: CountingPriceFetcher, now: List[float]):
+        cache = LatestBarCache(fetcher)
+        cache.latest_many(["AAPL", "META"])
+
+        cache.invalidate("AAPL")
+        cache.latest_many(["AAPL", "META"])
+        cache.invalidate()
+        cache.latest_many(["AAPL", "META"])
+
+        assert fetcher.calls == [["AAPL", "META"], ["AAPL"], ["AAPL", "META"]]
+
+    def test_invalid_ttl(self, fetcher: CountingPriceFetcher):
+        with pytest.raises(ValueError):
+            LatestBarCache(fetcher, ttl=timedelta(0))
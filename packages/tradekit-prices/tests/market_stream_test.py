@@ -0,0 +1,166 @@
+import asyncio
+from typing import List
+
+import pandas as pd
+import pytest
+
+from prices.adapters.replay_stream import ReplayMarketStream
+from prices.core.bar import Bar, to_records
+from prices.core.trade import Trade
+from prices.ports.market_stream import BackpressurePolicy, StreamEvent, Subscription
+from tests.helpers import make_bars
+
+
+def make_trade(symbol: str, timestamp: str, price: float) -> Trade:
+    return Trade(symbol, pd.Timestamp(timestamp, tz="UTC"), price, 10.0)
+
+
+async def drain(subscription: Subscription) -> List[StreamEvent]:
+    return [event async for event in subscription]
+
+
+class TestSubscription:
+    """Test the bounded queues of the stream subscribers."""
+
+    @pytest.fixture
+    def bars(self) -> List[Bar]:
+        bars = pd.concat([make_bars("AAPL", "2024-01-02", 3), make_bars("MSFT", "2024-01-02", 3)])
+        return to_records(bars)
+
+    def test_drop_oldest(self, bars: List[Bar]):
+        subscription = Subscription(["AAPL", "MSFT"], maxsize=2)
+        for bar in bars:
+            subscription.put(bar)
+        subscription.close()
+        subscription.put(bars[0])
+
+        assert len(subscription) == 2
+        assert subscription.dropped == 4
+        assert asyncio.run(drain(subscription)) == bars[-2:]
+
+    def test_coalesce(self, bars: List[Bar]):
+        subscription = Subscription(["AAPL", "MSFT"], policy=BackpressurePolicy.COALESCE)
+        for bar in bars:
+            subscription.put(bar)
+        subscription.put(make_trade("AAPL", "2024-01-02", 1.0))
+        subscription.close()
+
+        [aapl, msft, trade] = asyncio.run(drain(subscription))
+
+        assert aapl == bars[2] and msft == bars[5] and trade.price == 1.0
+        assert subscription.dropped == 4
+
+    def test_coalesce_full(self, bars: List[Bar]):
+        subscription = Subscription(["AAPL", "MSFT"], maxsize=1, policy="coalesce")
+        subscription.put(bars[0])
+        subscription.put(bars[3])
+        subscription.close()
+
+        assert asyncio.run(drain(subscription)) == [bars[3]]
+        assert subscription.dropped == 1
+
+    def test_waits_for_events(self, bars: List[Bar]):
+        async def main() -> List[StreamEvent]:
+            subscription = Subscription(["AAPL"])
+            consumer = asyncio.create_task(drain(subscription))
+            await asyncio.sleep(0)
+            subscription.put(bars[0])
+            await asyncio.sleep(0)
+            subscription.put(bars[1])
+            subscription.close()
+            return await consumer
+
+        assert asyncio.run(main()) == bars[:2]
+
+    def test_invalid(self):
+        with pytest.raises(ValueError):
+            Subscription(["AAPL"], bars=False)
+        with pytest.raises(ValueError):
+            Subscription(["AAPL"], maxsize=0)
+
+
+class TestReplayMarketStream:
+    """Test the fan-out of the streams, with the Replay Market Stream."""
+
+    @pytest.fixture
+    def stream(self) -> ReplayMarketStream:
+        bars = make_bars("AAPL", "2024-01-02 14:30", 3, freq="1min")
+        bars = pd.concat([bars, make_bars("MSFT", "2024-01-02 14:30", 3, freq="1min")])
+        trades = [
+            make_trade("AAPL", "2024-01-02 14:30:30", 1.0),
+            make_trade("MSFT", "2024-01-02 14:31:30", 2.0),
+        ]
+        return ReplayMarketStream(bars, trades)
+
+    def test_fan_out(self, stream: ReplayMarketStream):
+        aapl = stream.subscribe(["AAPL"], trades=True)
+        both = stream.subscribe(["AAPL", "MSFT"])
+        trades = stream.subscribe(["MSFT", "TSLA"], bars=False, trades=True)
+
+        assert stream.bar_symbols == ["AAPL", "MSFT"]
+        assert stream.trade_symbols == ["AAPL", "MSFT", "TSLA"]
+        assert str(stream) == "<ReplayMarketStream, Alpaca>"
+
+        async def main():
+            consumers = [asyncio.create_task(drain(s)) for s in (aapl, both, trades)]
+            await stream.run()
+            return await asyncio.gather(*consumers)
+
+        aapl_events, both_events, trade_events = asyncio.run(main())
+
+        assert [(type(e).__name__, e.timestamp.minute) for e in aapl_events] == [
+            ("Bar", 30),
+            ("Trade", 30),
+            ("Bar", 31),
+            ("Bar", 32),
+        ]
+        assert [(e.symbol, e.timestamp.minute) for e in both_events] == [
+            ("AAPL", 30),
+            ("MSFT", 30),
+            ("AAPL", 31),
+            ("MSFT", 31),
+            ("AAPL", 32),
+            ("MSFT", 32),
+        ]
+        assert [e.price for e in trade_events] == [2.0]
+
+    def test_unsubscribe(self, stream: ReplayMarketStream):
+        aapl = stream.subscribe(["AAPL"])
+        msft = stream.subscribe(["MSFT"], trades=True)
+        stream.unsubscribe(msft)
+        stream.unsubscribe(stream.subscribe(["AAPL"]))
+
+        assert msft.closed
+        assert stream.bar_symbols == ["AAPL"]
+        assert stream.trade_symbols == []
+
+        asyncio.run(stream.run())
+
+        assert len(aapl) == 3 and aapl.closed
+        assert len(msft) == 0
+
+    def test_slow_consumer(self, stream: ReplayMarketStream):
+        latest = stream.subscribe(["AAPL", "MSFT"], policy=BackpressurePolicy.COALESCE)
+        asyncio.run(stream.run())
+
+        assert [(e.symbol, e.timestamp.minute) for e in asyncio.run(drain(latest))] == [
+            ("AAPL", 32),
+            ("MSFT", 32),
+        ]
+
+    def test_speed(self, stream: ReplayMarketStream, monkeypatch: pytest.MonkeyPatch):
+        delays = []
+
+        async def sleep(delay: float):
+            delays.append(delay)
+
+        monkeypatch.setattr(asyncio, "sleep", sleep)
+        stream.speed = 60.0
+        stream.subscribe(["AAPL"], trades=True)
+        asyncio.run(stream.run())
+
+        assert delays == [0.0, 0.5, 0.5, 1.0]
+
+    def test_invalid_speed(self, stream: ReplayMarketStream):
+        with pytest.raises(ValueError):
+            ReplayMarketStream(stream.bars, speed=0)
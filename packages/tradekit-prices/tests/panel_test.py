@@ -0,0 +1,129 @@
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from prices.adapters.sqlite_repository import SQLitePriceRepository
+from prices.adapters.sqlite_universe_repository import SQLiteUniversePriceRepository
+from prices.core.bar import BarDataFrame
+from prices.core.broker import Broker
+from prices.core.panel import align_panel, panel_from_bars
+from prices.core.timeframe import TFPreset
+from prices.ports.price_repository import LoadPanelParams, PriceRepository, SaveHistoricalParams
+from tests.helpers import make_bars
+
+NAN = np.nan
+
+
+@pytest.fixture
+def bars() -> BarDataFrame:
+    # MSFT has no bar on 2024-01-03.
+    aapl = make_bars("AAPL", "2024-01-01", 4)
+    msft = make_bars("MSFT", "2024-01-02", 3).drop(index=1)
+    return pd.concat([msft, aapl], ignore_index=True)
+
+
+class TestPanel:
+    """Test the alignment of bars into panels."""
+
+    def test_nan(self, bars: BarDataFrame):
+        panel = panel_from_bars(bars, ["AAPL", "MSFT", "TSLA"], ["close"])
+
+        assert list(panel.timestamps) == list(pd.date_range("2024-01-01", periods=4, tz="UTC"))
+        assert list(panel.values) == ["close"]
+        np.testing.assert_array_equal(
+            panel["close"],
+            [[100, NAN, NAN], [101, 100, NAN], [102, NAN, NAN], [103, 102, NAN]],
+        )
+
+    def test_ffill(self, bars: BarDataFrame):
+        panel = panel_from_bars(bars, ["MSFT", "AAPL"], ["close", "volume"], fill="ffill")
+
+        np.testing.assert_array_equal(
+            panel["close"], [[NAN, 100], [100, 101], [100, 102], [102, 103]]
+        )
+        np.testing.assert_array_equal(
+            panel["volume"], [[NAN, 1000], [1000, 1000], [0, 1000], [1000, 1000]]
+        )
+
+    def test_drop(self, bars: BarDataFrame):
+        panel = panel_from_bars(bars, ["AAPL", "MSFT"], fill="drop")
+
+        assert list(panel.timestamps.day) == [2, 4]
+        np.testing.assert_array_equal(panel["close"], [[101, 100], [103, 102]])
+        assert list(panel.values) == ["open", "high", "low", "close", "volume", "vwap"]
+
+    def test_to_frame(self, bars: BarDataFrame):
+        frame = panel_from_bars(bars, ["AAPL", "MSFT"]).to_frame("close")
+        expected = bars.pivot(index="timestamp", columns="symbol", values="close")
+
+        pd.testing.assert_frame_equal(frame, expected, check_names=False, check_freq=False)
+
+    def test_last_duplicate_wins(self):
+        close = np.array([1.0, 2.0])
+        panel = align_panel(["A"], np.array([0, 0]), np.array([5, 5]), {"close": close})
+
+        np.testing.assert_array_equal(panel["close"], [[2.0]])
+
+    def test_empty(self):
+        empty = np.empty(0)
+        panel = align_panel(["A", "B"], empty, empty, {"close": empty}, fill="ffill")
+
+        assert panel["close"].shape == (0, 2)
+        assert len(panel.timestamps) == 0
+
+    def test_invalid(self, bars: BarDataFrame):
+        with pytest.raises(ValueError):
+            panel_from_bars(bars, ["AAPL"], fill="bfill")  # type: ignore
+        with pytest.raises(ValueError):
+            LoadPanelParams([], TFPreset.Tf_D)
+        with pytest.raises(ValueError):
+            LoadPanelParams(["AAPL"], TFPreset.Tf_D, fields=["price"])
+
+
+class TestLoadPanel:
+    """Test the panels loaded from the repositories."""
+
+    @pytest.fixture(params=[SQLitePriceRepository, SQLiteUniversePriceRepository])
+    def repository(self, request, bars: BarDataFrame, sqlite_path: str):
+        with request.param(Broker.ALPACA) as repository:
+            for symbol, symbol_bars in bars.groupby("symbol"):
+                repository.save_historical(
+                    SaveHistoricalParams(symbol, TFPreset.Tf_D, symbol_bars.reset_index(drop=True))
+                )
+            yield repository
+
+    @pytest.mark.parametrize("fill", ["nan", "ffill", "drop"])
+    def test_matches_panel_from_bars(self, repository: PriceRepository, bars, fill):
+        params = LoadPanelParams(["MSFT", "TSLA", "AAPL"], TFPreset.Tf_D, fill=fill)
+        panel = repository.load_panel(params)
+        expected = panel_from_bars(bars, ["MSFT", "TSLA", "AAPL"], fill=fill)
+
+        pd.testing.assert_index_equal(panel.timestamps, expected.timestamps)
+        assert panel.symbols == expected.symbols
+        for field, values in expected.values.items():
+            np.testing.assert_array_equal(panel[field], values)
+
+    def test_range_and_fields(self, repository: PriceRepository):
+        params = LoadPanelParams(
+            ["AAPL", "MSFT", "AAPL"],
+            TFPreset.Tf_D,
+            start=datetime(2024, 1, 2),
+            end=datetime(2024, 1, 3),
+            fields=["close"],
+        )
+        panel = repository.load_panel(params)
+
+        assert panel.symbols == ["AAPL", "MSFT"]
+        assert list(panel.values) == ["close"]
+        np.testing.assert_array_equal(panel["close"], [[101, 100], [102, NAN]])
+
+    def test_default_matches_override(self, repository: PriceRepository):
+        params = LoadPanelParams(["AAPL", "MSFT"], TFPreset.Tf_D, fields=["close", "volume"])
+
+        panel = repository.load_panel(params)
+        default = PriceRepository.load_panel(repository, params)
+
+        np.testing.assert_array_equal(panel["close"], default["close"])
+        np.testing.assert_array_equal(panel["volume"], default["volume"])
@@ -0,0 +1,203 @@
+from datetime import datetime, timedelta
+
+import pandas as pd
+import pytest
+
+# The Parquet repository requires the `parquet` extra.
+pq = pytest.importorskip("pyarrow.parquet")
+
+from prices.adapters.config import ParquetConfig  # noqa: E402
+from prices.adapters.parquet_repository import ParquetPriceRepository  # noqa: E402
+from prices.core.asset import AssetDataFrame  # noqa: E402
+from prices.core.bar import BarDataFrame  # noqa: E402
+from prices.core.broker import Broker  # noqa: E402
+from prices.core.timeframe import TFPreset  # noqa: E402
+from prices.ports.price_repository import (  # noqa: E402
+    LoadCoverageParams,
+    LoadHistoricalParams,
+    SaveHistoricalParams,
+)
+from tests.helpers import make_assets, make_bars  # noqa: E402
+
+
+class TestParquetRepository:
+    """Test Parquet Price Repository adapter."""
+
+    @pytest.fixture
+    def repository(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(ParquetConfig, "PARQUET_PATH", str(tmp_path))
+        with ParquetPriceRepository(Broker.ALPACA, row_group_rows=100) as repository:
+            yield repository
+
+    def save(self, repository: ParquetPriceRepository, bars: BarDataFrame, mode="upsert"):
+        return repository.save_historical(
+            SaveHistoricalParams(symbol="META", timeframe=TFPreset.Tf_D, bars=bars, mode=mode)
+        )
+
+    def load(self, repository: ParquetPriceRepository, **kwargs) -> BarDataFrame:
+        return repository.load_historical(
+            LoadHistoricalParams(symbol="META", timeframe=TFPreset.Tf_D, **kwargs)
+        )
+
+    def test_save_and_load_historical(self, repository: ParquetPriceRepository):
+        bars = make_bars("META", "2022-12-01", 400)
+
+        result = self.save(repository, bars, mode="replace")
+        loaded = self.load(repository)
+
+        assert result.status == "success"
+        assert result.rows_affected == 400
+        pd.testing.assert_frame_equal(loaded, bars)
+
+    def test_partitioned_by_year(self, repository: ParquetPriceRepository, tmp_path):
+        self.save(repository, make_bars("META", "2022-12-01", 400))
+
+        path = tmp_path / "Alpaca" / "tf_1d" / "symbol=META"
+        assert sorted(p.name for p in path.iterdir()) == ["year=2022", "year=2023", "year=2024"]
+        metadata = pq.ParquetFile(path / "year=2023" / "bars.parquet").metadata
+        assert metadata.num_row_groups == 4
+        assert metadata.row_group(0).column(0).statistics.has_min_max
+
+    def test_load_historical_range(self, repository: ParquetPriceRepository):
+        self.save(repository, make_bars("META", "2022-12-01", 400))
+
+        bars = self.load(repository, start=datetime(2023, 12, 25), end=datetime(2024, 1, 3))
+
+        assert bars.shape[0] == 10
+        assert bars["timestamp"].iloc[0] == pd.Timestamp("2023-12-25", tz="UTC")
+        assert bars["timestamp"].is_monotonic_increasing
+
+    def test_load_historical_until(self, repository: ParquetPriceRepository):
+        self.save(repository, make_bars("META", "2022-12-01", 400))
+
+        bars = self.load(repository, end=datetime(2023, 1, 5))
+
+        # The row groups of 2023 that start after the end are not read.
+        assert bars.shape[0] == 36
+        assert bars["timestamp"].iloc[-1] == pd.Timestamp("2023-01-05", tz="UTC")
+
+    def test_load_historical_columns(self, repository: ParquetPriceRepository):
+        self.save(repository, make_bars("META", "2022-12-01", 400))
+
+        bars = self.load(repository, columns=["close"], start=datetime(2023, 6, 1), limit=5)
+
+        assert list(bars.columns) == ["symbol", "timestamp", "close"]
+        assert bars["close"].tolist() == [282.0, 283.0, 284.0, 285.0, 286.0]
+
+    def test_load_historical_unknown_column(self, repository: ParquetPriceRepository):
+        with pytest.raises(ValueError):
+            self.load(repository, columns=["adjusted_close"])
+
+    def test_load_historical_missing(self, repository: ParquetPriceRepository):
+        bars = self.load(repository, columns=["close"])
+
+        assert bars.shape[0] == 0
+        assert list(bars.columns) == ["symbol", "timestamp", "close"]
+
+    def test_upsert_writes_only_new_and_changed_rows(self, repository: ParquetPriceRepository):
+        self.save(repository, make_bars("META", "2023-01-01", 10))
+
+        bars = make_bars("META", "2023-01-01", 12)
+        bars.loc[0, "close"] = 1.0
+        result = self.save(repository, bars)
+
+        assert result.rows_affected == 3
+        assert self.load(repository)["close"].iloc[0] == 1.0
+        assert self.save(repository, bars).rows_affected == 0
+
+    def test_replace_removes_other_years(self, repository: ParquetPriceRepository):
+        self.save(repository, make_bars("META", "2022-12-01", 400))
+
+        result = self.save(repository, make_bars("META", "2023-02-01", 3), mode="replace")
+
+        assert result.rows_affected == 3
+        assert self.load(repository).shape[0] == 3
+
+    def test_iter_historical(self, repository: ParquetPriceRepository):
+        self.save(repository, make_bars("META", "2022-12-01", 400))
+        params = LoadHistoricalParams(
+            symbol="META", timeframe=TFPreset.Tf_D, start=datetime(2022, 12, 22), limit=100
+        )
+
+        chunks = list(repository.iter_historical(params, chunk_rows=40))
+
+        assert sum(c.shape[0] for c in chunks) == 100
+        assert all(c.shape[0] <= 40 for c in chunks)
+        bars = pd.concat(chunks, ignore_index=True)
+        expected = repository.load_historical(params)
+        pd.testing.assert_frame_equal(bars, expected, check_frame_type=False)
+
+    def test_iter_historical_invalid_chunk_rows(self, repository: ParquetPriceRepository):
+        params = LoadHistoricalParams(symbol="META", timeframe=TFPreset.Tf_D)
+
+        with pytest.raises(ValueError):
+            next(repository.iter_historical(params, chunk_rows=0))
+
+    def test_load_coverage(self, repository: ParquetPriceRepository):
+        bars = make_bars("META", "2022-12-01", 400)
+        self.save(repository, bars.drop(index=range(100, 110)))
+
+        coverage = repository.load_coverage(LoadCoverageParams("META", TFPreset.Tf_D))
+        with_gaps = repository.load_coverage(
+            LoadCoverageParams("META", TFPreset.Tf_D, max_gap=timedelta(days=1))
+        )
+
+        assert coverage.first == pd.Timestamp("2022-12-01", tz="UTC")
+        assert coverage.last == bars["timestamp"].iloc[-1]
+        assert coverage.rows == 390
+        assert with_gaps.rows == 390
+        assert with_gaps.gaps == [(bars["timestamp"].iloc[99], bars["timestamp"].iloc[110])]
+
+    def test_load_coverage_without_statistics(self, repository: ParquetPriceRepository, tmp_path):
+        bars = make_bars("META", "2022-12-01", 400)
+        self.save(repository, bars)
+        for file in tmp_path.glob("Alpaca/tf_1d/symbol=META/*/bars.parquet"):
+            pq.write_table(pq.read_table(file), file, row_group_size=100, write_statistics=False)
+
+        coverage = repository.load_coverage(LoadCoverageParams("META", TFPreset.Tf_D))
+
+        assert coverage.first == bars["timestamp"].iloc[0]
+        assert coverage.last == bars["timestamp"].iloc[-1]
+        assert coverage.rows == 400
+
+    def test_load_coverage_missing(self, repository: ParquetPriceRepository):
+        params = LoadCoverageParams("META", TFPreset.Tf_D, max_gap=timedelta(days=1))
+
+        assert repository.load_coverage(params).rows == 0
+        assert repository.load_coverage(LoadCoverageParams("META", TFPreset.Tf_D)).rows == 0
+
+    def test_save_and_load_assets(self, repository: ParquetPriceRepository):
+        assets = AssetDataFrame(
+            pd.DataFrame(
+                {
+                    "name": ["Meta Platforms Inc."],
+                    "symbol": ["META"],
+                    "exchange": ["NASDAQ"],
+                    "broker": ["Alpaca"],
+                    "asset_class": ["Equity"],
+                    "tradable": [True],
+                    "status": ["Active"],
+                    "url_logo": [None],
+                    "pairs": [None],
+                }
+            )
+        )
+
+        assert repository.save_assets(assets).rows_affected == 1
+        pd.testing.assert_frame_equal(repository.load_assets(), assets)
+
+    def test_save_assets_diff(self, repository: ParquetPriceRepository):
+        assert repository.save_assets(make_assets(["AAPL", "META"])).rows_affected == 2
+        assert repository.save_assets(make_assets(["AAPL", "META"])).rows_affected == 0
+        assert repository.save_assets(make_assets(["AAPL", "NVDA"])).rows_affected == 2
+        assert repository.load_assets()["symbol"].tolist() == ["AAPL", "NVDA"]
+
+    def test_save_assets_error(self, repository: ParquetPriceRepository):
+        result = repository.save_assets(make_assets(["AAPL"]).drop(columns=["symbol"]))
+
+        assert result.status == "error"
+        assert result.rows_affected == 0
+
+    def test_invalid_row_group_rows(self):
+        with pytest.raises(ValueError):
+            ParquetPriceRepository(Broker.ALPACA, row_group_rows=0)
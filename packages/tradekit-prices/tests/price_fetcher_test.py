@@ -0,0 +1,67 @@
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from prices.core.bar import to_records
+from prices.core.timeframe import TFPreset
+from prices.ports.price_fetcher import HistoricalManyPriceParams, HistoricalPriceParams
+from tests.helpers import StubPriceFetcher
+
+
+class TestPriceFetcher:
+    """Test the default methods of the Price Fetcher port."""
+
+    @pytest.fixture
+    def fetcher(self) -> StubPriceFetcher:
+        return StubPriceFetcher()
+
+    def params(self, *symbols: str) -> HistoricalManyPriceParams:
+        return HistoricalManyPriceParams(
+            symbols=list(symbols), timeframe=TFPreset.Tf_D, start=datetime(2024, 1, 1)
+        )
+
+    def test_historical_many(self, fetcher: StubPriceFetcher):
+        bars = fetcher.historical_many(self.params("AAPL", "META", "EMPTY"))
+
+        assert bars.shape[0] == 6
+        assert list(bars["symbol"].unique()) == ["AAPL", "META"]
+
+    def test_iter_historical_many(self, fetcher: StubPriceFetcher):
+        frames = list(fetcher.iter_historical_many(self.params("AAPL", "META")))
+        assert [f["symbol"].iloc[0] for f in frames] == ["AAPL", "META"]
+
+    def test_latest_many(self, fetcher: StubPriceFetcher):
+        bars = fetcher.latest_many(["META", "EMPTY", "AAPL", "META"])
+
+        assert list(bars) == ["META", "AAPL"]
+        assert bars["AAPL"] == to_records(fetcher.latest("AAPL"))[0]
+
+    def test_iter_historical(self, fetcher: StubPriceFetcher):
+        params = HistoricalPriceParams("AAPL", TFPreset.Tf_D, start=datetime(2024, 1, 1))
+        chunks = list(fetcher.iter_historical(params, chunk_rows=2))
+
+        assert [c.shape[0] for c in chunks] == [2, 1]
+        assert chunks[1].index[0] == 0
+
+
+class TestTimeWindow:
+    """Test the validation of the time window of the fetch parameters."""
+
+    @pytest.mark.usefixtures("west_of_utc")
+    def test_compared_in_utc(self):
+        now = datetime.now(timezone.utc)
+
+        # A minute ago in UTC is hours ahead of the local wall clock, but not in the future.
+        params = HistoricalPriceParams(
+            "AAPL", TFPreset.Tf_1m, now.replace(tzinfo=None) - timedelta(minutes=2), now
+        )
+
+        assert params.end == now
+        with pytest.raises(ValueError):
+            HistoricalPriceParams("AAPL", TFPreset.Tf_1m, now + timedelta(minutes=1))
+        with pytest.raises(ValueError):
+            HistoricalPriceParams("AAPL", TFPreset.Tf_1m, now, now + timedelta(hours=1))
+        with pytest.raises(ValueError):
+            HistoricalPriceParams(
+                "AAPL", TFPreset.Tf_1m, now - timedelta(hours=1), now - timedelta(hours=2)
+            )
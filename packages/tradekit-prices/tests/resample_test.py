@@ -0,0 +1,142 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from prices.core.bar import BarDataFrame, empty_bars
+from prices.core.resample import (
+    NYSE_SESSION,
+    UTC_SESSION,
+    bucket_bounds,
+    bucket_keys,
+    resample_bars,
+)
+from prices.core.timeframe import TFPreset, TimeFrame
+from tests.helpers import make_bars
+
+
+def reference(bars: BarDataFrame, rule: str) -> pd.DataFrame:
+    """Resamples bars of a symbol with pandas, as a reference for the vectorized version."""
+    df = bars.set_index("timestamp")
+    weighted = (df["vwap"] * df["volume"]).resample(rule).sum()
+    out = df.resample(rule).agg(
+        {"open": "first", "high": "max", "low": "min", "close": "last", "volume": "sum"}
+    )
+    out["vwap"] = weighted / out["volume"]
+    return out.dropna(subset=["open"])
+
+
+class TestResampleBars:
+    """Test the vectorized resampling of bars."""
+
+    @pytest.fixture
+    def bars(self) -> BarDataFrame:
+        bars = make_bars("META", "2024-01-02 14:30", 600, freq="1min")
+        bars["volume"] = np.arange(1.0, 601.0)
+        return bars
+
+    @pytest.mark.parametrize(
+        "timeframe, rule",
+        [(TFPreset.Tf_5m, "5min"), (TFPreset.Tf_1h, "1h"), (TFPreset.Tf_4h, "4h")],
+    )
+    def test_matches_pandas(self, bars: BarDataFrame, timeframe, rule):
+        resampled = resample_bars(bars, timeframe)
+        expected = reference(bars, rule)
+
+        assert resampled["timestamp"].tolist() == expected.index.tolist()
+        for c in ["open", "high", "low", "close", "volume", "vwap"]:
+            np.testing.assert_allclose(resampled[c], expected[c])
+
+    def test_session_alignment(self, bars: BarDataFrame):
+        resampled = resample_bars(bars, TFPreset.Tf_1h, NYSE_SESSION)
+
+        # 9:30 in New York is 14:30 UTC in January.
+        assert resampled["timestamp"].iloc[0] == pd.Timestamp("2024-01-02 14:30", tz="UTC")
+        assert resampled.shape[0] == 10
+        assert (resampled["close"] - resampled["open"] == 59).all()
+
+    def test_daily_bars_in_session_time_zone(self):
+        bars = make_bars("META", "2024-03-08 14:30", 4, freq="24h")
+
+        resampled = resample_bars(bars, TFPreset.Tf_D, NYSE_SESSION)
+
+        # Days start at midnight in New York, which moves with daylight saving on March 10th.
+        assert resampled["timestamp"].dt.strftime("%m-%d %H:%M").tolist() == [
+            "03-08 05:00",
+            "03-09 05:00",
+            "03-10 05:00",
+            "03-11 04:00",
+        ]
+
+    def test_weeks_and_months(self):
+        bars = make_bars("META", "2024-01-01", 366)
+
+        weeks = resample_bars(bars, TFPreset.Tf_W)
+        months = resample_bars(bars, TFPreset.Tf_M)
+
+        assert (weeks["timestamp"].dt.dayofweek == 0).all()
+        assert weeks.shape[0] == 53
+        assert months.shape[0] == 12
+        assert months["open"].iloc[1] == bars["open"].iloc[31]
+        assert months["volume"].iloc[1] == 29 * 1000.0
+
+    def test_quarters(self):
+        keys = bucket_keys(
+            np.array([pd.Timestamp("2024-05-20").value, pd.Timestamp("2024-12-31").value]),
+            TimeFrame(3, TFPreset.Tf_M.unit_value),
+        )
+
+        assert keys.tolist() == [pd.Timestamp("2024-04-01").value, pd.Timestamp("2024-10-01").value]
+
+    def test_many_symbols_unsorted(self, bars: BarDataFrame):
+        other = make_bars("AAPL", "2024-01-02 14:30", 600, freq="1min")
+        mixed = pd.concat([bars, other]).sample(frac=1, random_state=1)
+
+        resampled = resample_bars(BarDataFrame(mixed), TFPreset.Tf_1h)
+
+        assert resampled.groupby("symbol").size().to_dict() == {"AAPL": 11, "META": 11}
+        meta = resampled[resampled["symbol"] == "META"].reset_index(drop=True)
+        expected = resample_bars(bars, TFPreset.Tf_1h)
+        pd.testing.assert_frame_equal(meta, expected, check_frame_type=False)
+
+    def test_vwap_without_volume(self, bars: BarDataFrame):
+        bars["volume"] = 0.0
+
+        resampled = resample_bars(bars.iloc[:5], TFPreset.Tf_5m)
+
+        assert resampled["vwap"].iloc[0] == 102.0
+
+    def test_empty(self):
+        assert resample_bars(empty_bars(), TFPreset.Tf_1h).shape[0] == 0
+
+
+class TestBucketBounds:
+    """Test the bounds of the bar that contains a timestamp."""
+
+    @pytest.mark.parametrize(
+        "timestamp, timeframe, session, start, end",
+        [
+            ("2024-01-02 14:37", TFPreset.Tf_5m, UTC_SESSION, "01-02 14:35", "01-02 14:40"),
+            ("2024-01-02 14:45", TFPreset.Tf_4h, UTC_SESSION, "01-02 12:00", "01-02 16:00"),
+            ("2024-01-02 14:45", TFPreset.Tf_1h, NYSE_SESSION, "01-02 14:30", "01-02 15:30"),
+            # 2:30 does not exist in New York on March 10th, so the bar of 1:30 ends at 3:00.
+            ("2024-03-10 06:45", TFPreset.Tf_1h, NYSE_SESSION, "03-10 06:30", "03-10 07:00"),
+            ("2024-03-10 07:15", TFPreset.Tf_1h, NYSE_SESSION, "03-10 07:00", "03-10 07:30"),
+            ("2024-01-02 14:45", TFPreset.Tf_D, UTC_SESSION, "01-02 00:00", "01-03 00:00"),
+            ("2024-03-10 12:00", TFPreset.Tf_D, NYSE_SESSION, "03-10 05:00", "03-11 04:00"),
+            ("2024-01-04 10:00", TFPreset.Tf_W, UTC_SESSION, "01-01 00:00", "01-08 00:00"),
+            ("2024-03-08 12:00", TFPreset.Tf_W, NYSE_SESSION, "03-04 05:00", "03-11 04:00"),
+            ("2024-02-15 10:00", TFPreset.Tf_M, UTC_SESSION, "02-01 00:00", "03-01 00:00"),
+            ("2024-03-20 12:00", TFPreset.Tf_M, NYSE_SESSION, "03-01 05:00", "04-01 04:00"),
+            (
+                "2024-05-20 10:00",
+                TimeFrame(3, TFPreset.Tf_M.unit_value),
+                UTC_SESSION,
+                "04-01 00:00",
+                "07-01 00:00",
+            ),
+        ],
+    )
+    def test_bounds(self, timestamp, timeframe, session, start, end):
+        bounds = bucket_bounds(pd.Timestamp(timestamp).value, timeframe, session)
+
+        assert [pd.Timestamp(b).strftime("%m-%d %H:%M") for b in bounds] == [start, end]
@@ -0,0 +1,95 @@
+from datetime import datetime
+
+import pytest
+
+from prices.adapters.sqlite_repository import SQLitePriceRepository
+from prices.core.resample import NYSE_SESSION
+from prices.core.timeframe import TFPreset
+from prices.ports.price_repository import LoadHistoricalParams, SaveHistoricalParams
+from prices.services.resampler import BarResampler
+from tests.helpers import make_bars
+
+
+class TestBarResampler:
+    """Test the Bar Resampler service."""
+
+    @pytest.fixture
+    def repository(self, repository: SQLitePriceRepository, monkeypatch) -> SQLitePriceRepository:
+        for symbol in ["META", "AAPL"]:
+            repository.save_historical(
+                SaveHistoricalParams(
+                    symbol,
+                    TFPreset.Tf_1m,
+                    make_bars(symbol, "2024-01-02 14:30", 780, freq="1min"),
+                )
+            )
+        loads = []
+        load_historical = repository.load_historical
+        monkeypatch.setattr(
+            repository,
+            "load_historical",
+            lambda params: loads.append(params) or load_historical(params),
+        )
+        repository.loads = loads
+        return repository
+
+    def test_load_derives_and_caches(self, repository):
+        resampler = BarResampler(repository, NYSE_SESSION)
+
+        first = resampler.load(LoadHistoricalParams("META", TFPreset.Tf_1h))
+        second = resampler.load(
+            LoadHistoricalParams("META", TFPreset.Tf_1h, start=datetime(2024, 1, 2, 16, 30))
+        )
+
+        assert len(repository.loads) == 1
+        assert first.shape[0] == 13
+        assert second.shape[0] == 11
+        assert second["open"].iloc[0] == first["open"].iloc[2]
+
+    def test_load_range_limit_and_columns(self, repository):
+        resampler = BarResampler(repository, NYSE_SESSION)
+
+        bars = resampler.load(
+            LoadHistoricalParams(
+                "META",
+                TFPreset.Tf_15m,
+                start=datetime(2024, 1, 2, 15, 0),
+                end=datetime(2024, 1, 2, 18, 0),
+                limit=4,
+                columns=["close"],
+            )
+        )
+
+        assert list(bars.columns) == ["symbol", "timestamp", "close"]
+        assert bars["close"].tolist() == [144.0, 159.0, 174.0, 189.0]
+
+    def test_load_source_timeframe(self, repository):
+        resampler = BarResampler(repository)
+
+        bars = resampler.load(LoadHistoricalParams("META", TFPreset.Tf_1m, limit=3))
+
+        assert bars.shape[0] == 3
+        assert len(repository.loads) == 1
+
+    def test_cache_is_bounded(self, repository):
+        resampler = BarResampler(repository, max_series=1)
+
+        resampler.load(LoadHistoricalParams("META", TFPreset.Tf_1h))
+        resampler.load(LoadHistoricalParams("AAPL", TFPreset.Tf_1h))
+        resampler.load(LoadHistoricalParams("META", TFPreset.Tf_1h))
+
+        assert len(repository.loads) == 3
+
+    def test_invalidate(self, repository):
+        resampler = BarResampler(repository)
+        resampler.load(LoadHistoricalParams("META", TFPreset.Tf_1h))
+        resampler.load(LoadHistoricalParams("META", TFPreset.Tf_D))
+
+        resampler.invalidate("META")
+        resampler.load(LoadHistoricalParams("META", TFPreset.Tf_1h))
+
+        assert len(repository.loads) == 3
+
+    def test_invalid_max_series(self, repository):
+        with pytest.raises(ValueError):
+            BarResampler(repository, max_series=0)
@@ -1,5 +1,6 @@
 from datetime import datetime
 
+import pandas as pd
 import pytest
 
 from prices.adapters.alpaca_fetcher import AlpacaPriceFetcher
@@ -10,6 +11,7 @@ from prices.core.broker import Broker
 from prices.core.timeframe import TFPreset
 from prices.ports.price_fetcher import HistoricalPriceParams
 from prices.ports.price_repository import LoadHistoricalParams, SaveHistoricalParams
+from tests.helpers import make_bars
 
 
 class TestSQLiteRepository:
@@ -77,3 +79,152 @@ class TestSQLiteRepository:
         )
 
         assert bars.shape[0] == 5
+
+
+class TestSQLiteRepositoryUpsert:
+    """Test the upsert mode of the SQLite Price Repository adapter."""
+
+    def save(self, repository: SQLitePriceRepository, bars: BarDataFrame, mode="upsert"):
+        return repository.save_historical(
+            SaveHistoricalParams(symbol="META", timeframe=TFPreset.Tf_D, bars=bars, mode=mode)
+        )
+
+    def load(self, repository: SQLitePriceRepository) -> BarDataFrame:
+        return repository.load_historical(
+            LoadHistoricalParams(symbol="META", timeframe=TFPreset.Tf_D)
+        )
+
+    def test_upsert_writes_only_new_rows(self, repository: SQLitePriceRepository):
+        assert self.save(repository, make_bars("META", "2023-01-01", 10)).rows_affected == 10
+
+        result = self.save(repository, make_bars("META", "2023-01-01", 12))
+
+        assert result.status == "success"
+        assert result.rows_affected == 2
+        assert self.load(repository).shape[0] == 12
+
+    def test_upsert_updates_changed_rows(self, repository: SQLitePriceRepository):
+        self.save(repository, make_bars("META", "2023-01-01", 10))
+
+        bars = make_bars("META", "2023-01-01", 10)
+        bars.loc[9, "close"] = 1.0
+        result = self.save(repository, bars)
+
+        assert result.rows_affected == 1
+        assert self.load(repository)["close"].iloc[9] == 1.0
+
+    def test_replace_rewrites_table(self, repository: SQLitePriceRepository):
+        self.save(repository, make_bars("META", "2023-01-01", 10))
+
+        result = self.save(repository, make_bars("META", "2023-02-01", 3), mode="replace")
+
+        assert result.rows_affected == 3
+        assert self.load(repository).shape[0] == 3
+
+    def test_upsert_on_legacy_table(self, repository: SQLitePriceRepository):
+        # Tables written by `DataFrame.to_sql` have text timestamps and no primary key.
+        with repository._connect_for_bars("META") as con:
+            make_bars("META", "2023-01-01", 5).to_sql(name="tf_1d", con=con, index=False)
+
+        result = self.save(repository, make_bars("META", "2023-01-01", 6))
+
+        assert result.rows_affected == 1
+        assert self.load(repository).shape[0] == 6
+
+
+class TestSQLiteRepositoryRange:
+    """Test the range queries of the SQLite Price Repository adapter."""
+
+    @pytest.fixture
+    def repository(self, repository: SQLitePriceRepository) -> SQLitePriceRepository:
+        repository.save_historical(
+            SaveHistoricalParams(
+                symbol="META",
+                timeframe=TFPreset.Tf_1m,
+                bars=make_bars("META", "2023-01-02 14:30", 120, freq="1min"),
+            )
+        )
+        return repository
+
+    def load(self, repository: SQLitePriceRepository, **kwargs) -> BarDataFrame:
+        return repository.load_historical(
+            LoadHistoricalParams(symbol="META", timeframe=TFPreset.Tf_1m, **kwargs)
+        )
+
+    def test_load_historical_range(self, repository: SQLitePriceRepository):
+        bars = self.load(
+            repository,
+            start=datetime(2023, 1, 2, 15, 0),
+            end=datetime(2023, 1, 2, 15, 9),
+        )
+
+        assert bars.shape[0] == 10
+        assert bars["timestamp"].iloc[0] == pd.Timestamp("2023-01-02 15:00", tz="UTC")
+        assert str(bars["timestamp"].dtype) == "datetime64[ns, UTC]"
+
+    def test_load_historical_empty_range(self, repository: SQLitePriceRepository):
+        bars = self.load(repository, start=datetime(2024, 1, 1), columns=["close"])
+        chunks = list(
+            repository.iter_historical(
+                LoadHistoricalParams("META", TFPreset.Tf_1m, start=datetime(2024, 1, 1))
+            )
+        )
+
+        assert bars.shape[0] == 0
+        assert list(bars.columns) == ["symbol", "timestamp", "close"]
+        assert str(bars["timestamp"].dtype) == "datetime64[ns, UTC]"
+        assert sum(len(c) for c in chunks) == 0
+
+    def test_load_historical_missing_symbol(self, repository: SQLitePriceRepository):
+        params = LoadHistoricalParams("TSLA", TFPreset.Tf_1m, columns=["close"])
+
+        bars = repository.load_historical(params)
+
+        assert list(bars.columns) == ["symbol", "timestamp", "close"]
+        assert bars.shape[0] == 0
+        assert list(repository.iter_historical(params)) == []
+
+    def test_load_historical_end_only(self, repository: SQLitePriceRepository):
+        bars = self.load(repository, end=datetime(2023, 1, 2, 14, 39))
+        assert bars.shape[0] == 10
+
+    def test_load_historical_limit_is_ordered(self, repository: SQLitePriceRepository):
+        bars = self.load(repository, start=datetime(2023, 1, 2, 16, 0), limit=5)
+
+        assert bars.shape[0] == 5
+        assert bars["timestamp"].is_monotonic_increasing
+
+    def test_load_historical_uses_index(self, repository: SQLitePriceRepository):
+        with repository._connect_for_bars("META") as con:
+            plan = con.execute(
+                "EXPLAIN QUERY PLAN SELECT * FROM tf_1m WHERE symbol = ? AND timestamp >= ?",
+                ("META", 0),
+            ).fetchall()
+
+        assert "USING PRIMARY KEY" in plan[0][-1]
+
+    def test_iter_historical(self, repository: SQLitePriceRepository):
+        params = LoadHistoricalParams(
+            symbol="META", timeframe=TFPreset.Tf_1m, start=datetime(2023, 1, 2, 15, 0)
+        )
+        chunks = list(repository.iter_historical(params, chunk_rows=40))
+
+        assert [c.shape[0] for c in chunks] == [40, 40, 10]
+        assert chunks[1]["timestamp"].iloc[0] == pd.Timestamp("2023-01-02 15:40", tz="UTC")
+
+    def test_iter_historical_default(self, repository: SQLitePriceRepository):
+        params = LoadHistoricalParams(symbol="META", timeframe=TFPreset.Tf_1m, limit=30)
+        chunks = list(super(SQLitePriceRepository, repository).iter_historical(params, 20))
+
+        assert [c.shape[0] for c in chunks] == [20, 10]
+
+    def test_iter_historical_invalid_chunk_rows(self, repository: SQLitePriceRepository):
+        params = LoadHistoricalParams(symbol="META", timeframe=TFPreset.Tf_1m)
+        with pytest.raises(ValueError):
+            next(repository.iter_historical(params, chunk_rows=0))
+
+    def test_load_historical_columns(self, repository: SQLitePriceRepository):
+        bars = self.load(repository, columns=["close"], limit=3)
+
+        assert list(bars.columns) == ["symbol", "timestamp", "close"]
+        assert bars.shape[0] == 3
@@ -0,0 +1,178 @@
+import os
+from datetime import datetime, timedelta
+
+import pandas as pd
+import pytest
+
+from prices.adapters.sqlite_repository import SQLitePriceRepository
+from prices.adapters.sqlite_universe_repository import SQLiteUniversePriceRepository
+from prices.core.bar import BarDataFrame
+from prices.core.broker import Broker
+from prices.core.timeframe import TFPreset
+from prices.ports.price_repository import (
+    LoadCoverageParams,
+    LoadHistoricalParams,
+    SaveHistoricalParams,
+)
+from tests.helpers import make_assets, make_bars
+
+SYMBOLS = ["MSFT", "AAPL", "META"]
+
+
+class TestSQLiteUniversePriceRepository:
+    """Test the SQLite Price Repository adapter that stores all the symbols in one database."""
+
+    @pytest.fixture
+    def repository(self, sqlite_path: str):
+        with SQLiteUniversePriceRepository(Broker.ALPACA) as repository:
+            for symbol in SYMBOLS:
+                repository.save_historical(
+                    SaveHistoricalParams(
+                        symbol, TFPreset.Tf_1m, make_bars(symbol, "2023-01-02 14:30", 120, "1min")
+                    )
+                )
+            yield repository
+
+    def load(self, repository: SQLiteUniversePriceRepository, **kwargs) -> BarDataFrame:
+        return repository.load_historical(
+            LoadHistoricalParams(symbol="META", timeframe=TFPreset.Tf_1m, **kwargs)
+        )
+
+    def test_single_file(self, repository: SQLiteUniversePriceRepository, tmp_path):
+        assert [f for f in os.listdir(tmp_path / "Alpaca") if f.endswith(".db")] == ["tf_1m.db"]
+        assert repository.load_symbols(TFPreset.Tf_1m) == ["AAPL", "META", "MSFT"]
+
+    def test_load_historical(self, repository: SQLiteUniversePriceRepository):
+        bars = self.load(repository)
+
+        pd.testing.assert_frame_equal(
+            bars, make_bars("META", "2023-01-02 14:30", 120, "1min"), check_frame_type=False
+        )
+
+    def test_load_historical_range(self, repository: SQLiteUniversePriceRepository):
+        bars = self.load(
+            repository,
+            start=datetime(2023, 1, 2, 15, 0),
+            end=datetime(2023, 1, 2, 15, 9),
+            columns=["close"],
+        )
+
+        assert bars.shape[0] == 10
+        assert list(bars.columns) == ["symbol", "timestamp", "close"]
+        assert bars["timestamp"].iloc[0] == pd.Timestamp("2023-01-02 15:00", tz="UTC")
+        assert set(bars["symbol"]) == {"META"}
+
+    def test_load_historical_limit(self, repository: SQLiteUniversePriceRepository):
+        bars = self.load(repository, start=datetime(2023, 1, 2, 16, 0), limit=5)
+
+        assert bars.shape[0] == 5
+        assert bars["timestamp"].is_monotonic_increasing
+
+    def test_load_historical_unknown_symbol(self, repository: SQLiteUniversePriceRepository):
+        bars = repository.load_historical(LoadHistoricalParams("TSLA", TFPreset.Tf_1m))
+
+        assert bars.shape[0] == 0
+        assert str(bars["timestamp"].dtype) == "datetime64[ns, UTC]"
+
+    def test_load_historical_uses_index(self, repository: SQLiteUniversePriceRepository):
+        with repository._connect(TFPreset.Tf_1m) as con:
+            plan = con.execute(
+                "EXPLAIN QUERY PLAN SELECT * FROM bars WHERE symbol_id = ? AND timestamp >= ?",
+                (1, 0),
+            ).fetchall()
+
+        assert "USING PRIMARY KEY" in plan[0][-1]
+
+    def test_iter_historical(self, repository: SQLiteUniversePriceRepository):
+        params = LoadHistoricalParams("META", TFPreset.Tf_1m, start=datetime(2023, 1, 2, 15, 0))
+        chunks = list(repository.iter_historical(params, chunk_rows=40))
+
+        assert [c.shape[0] for c in chunks] == [40, 40, 10]
+        with pytest.raises(ValueError):
+            next(repository.iter_historical(params, chunk_rows=0))
+
+    def test_load_cross_section(self, repository: SQLiteUniversePriceRepository):
+        bars = repository.load_cross_section(
+            TFPreset.Tf_1m, datetime(2023, 1, 2, 15, 0), columns=["close"]
+        )
+
+        assert list(bars["symbol"]) == ["AAPL", "META", "MSFT"]
+        assert list(bars["close"]) == [130.0, 130.0, 130.0]
+        assert repository.load_cross_section(TFPreset.Tf_1m, datetime(2023, 1, 3)).empty
+
+    def test_load_cross_section_uses_index(self, repository: SQLiteUniversePriceRepository):
+        with repository._connect(TFPreset.Tf_1m) as con:
+            plan = con.execute("EXPLAIN QUERY PLAN SELECT * FROM bars WHERE timestamp = ?", (0,))
+
+            assert "bars_timestamp" in plan.fetchall()[0][-1]
+
+    def test_upsert(self, repository: SQLiteUniversePriceRepository):
+        bars = make_bars("META", "2023-01-02 14:30", 122, "1min")
+        bars.loc[0, "close"] = 1.0
+        result = repository.save_historical(
+            SaveHistoricalParams("META", TFPreset.Tf_1m, bars, mode="upsert")
+        )
+
+        assert result.status == "success"
+        assert result.rows_affected == 3
+        assert self.load(repository)["close"].iloc[0] == 1.0
+        assert self.load(repository).shape[0] == 122
+
+    def test_replace_keeps_other_symbols(self, repository: SQLiteUniversePriceRepository):
+        bars = make_bars("META", "2023-02-01", 3)
+        result = repository.save_historical(SaveHistoricalParams("META", TFPreset.Tf_1m, bars))
+
+        assert result.rows_affected == 3
+        assert self.load(repository).shape[0] == 3
+        aapl = repository.load_historical(LoadHistoricalParams("AAPL", TFPreset.Tf_1m))
+        assert aapl.shape[0] == 120
+
+    def test_save_historical_many(self, repository: SQLiteUniversePriceRepository):
+        bars = pd.concat(
+            [make_bars(symbol, "2023-01-02 16:30", 2, "1min") for symbol in ["AAPL", "TSLA"]],
+            ignore_index=True,
+        )
+        result = repository.save_historical_many(TFPreset.Tf_1m, bars)
+
+        assert result.status == "success"
+        assert result.rows_affected == 4
+        assert repository.load_symbols(TFPreset.Tf_1m) == ["AAPL", "META", "MSFT", "TSLA"]
+        cross_section = repository.load_cross_section(TFPreset.Tf_1m, datetime(2023, 1, 2, 16, 30))
+        assert list(cross_section["symbol"]) == ["AAPL", "TSLA"]
+
+    def test_failed_save_rolls_back_ids(self, repository: SQLiteUniversePriceRepository):
+        bars = make_bars("TSLA", "2023-01-02", 2).drop(columns=["vwap"])
+
+        single = repository.save_historical(SaveHistoricalParams("TSLA", TFPreset.Tf_1m, bars))
+        many = repository.save_historical_many(TFPreset.Tf_1m, bars)
+
+        assert (single.status, many.status) == ("error", "error")
+        assert repository.load_symbols(TFPreset.Tf_1m) == ["AAPL", "META", "MSFT"]
+        with repository._connect(TFPreset.Tf_1m) as con:
+            assert repository._symbol_id(con, TFPreset.Tf_1m, "TSLA") is None
+
+    def test_load_coverage(self, repository: SQLiteUniversePriceRepository):
+        bars = make_bars("META", "2023-01-02 17:00", 5, "1min")
+        repository.save_historical(SaveHistoricalParams("META", TFPreset.Tf_1m, bars, "upsert"))
+
+        coverage = repository.load_coverage(
+            LoadCoverageParams("META", TFPreset.Tf_1m, max_gap=timedelta(minutes=1))
+        )
+        empty = repository.load_coverage(LoadCoverageParams("TSLA", TFPreset.Tf_1m))
+
+        assert coverage.first == pd.Timestamp("2023-01-02 14:30", tz="UTC")
+        assert coverage.last == pd.Timestamp("2023-01-02 17:04", tz="UTC")
+        assert coverage.rows == 125
+        assert coverage.gaps == [
+            (pd.Timestamp("2023-01-02 16:29", tz="UTC"), pd.Timestamp("2023-01-02 17:00", tz="UTC"))
+        ]
+        assert (empty.first, empty.rows) == (None, 0)
+        assert repository.load_coverage(LoadCoverageParams("AAPL", TFPreset.Tf_1m)).gaps == []
+
+    def test_assets(self, repository: SQLiteUniversePriceRepository):
+        result = repository.save_assets(make_assets(["AAPL", "META"]))
+
+        assert result.rows_affected == 2
+        assert list(repository.load_assets()["symbol"]) == ["AAPL", "META"]
+        with SQLitePriceRepository(Broker.ALPACA) as other:
+            assert list(other.load_assets()["symbol"]) == ["AAPL", "META"]
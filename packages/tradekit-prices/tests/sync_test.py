@@ -0,0 +1,176 @@
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from prices.adapters.sqlite_repository import SQLitePriceRepository
+from prices.core.bar import BarDataFrame
+from prices.core.timeframe import TFPreset
+from prices.core.timestamp import to_epoch_ns
+from prices.ports.price_fetcher import HistoricalPriceParams
+from prices.ports.price_repository import (
+    LoadCoverageParams,
+    LoadHistoricalParams,
+    SaveHistoricalParams,
+)
+from prices.services.backfill import Backfill
+from prices.services.sync import PriceSync, SyncParams
+from tests.helpers import StubPriceFetcher, make_bars
+
+
+class WindowPriceFetcher(StubPriceFetcher):
+    """A price fetcher that returns the daily bars of January 2024 within the requested window."""
+
+    def __init__(self):
+        super().__init__()
+        self.requests = []
+
+    def historical(self, params: HistoricalPriceParams) -> BarDataFrame:
+        self.requests.append((params.start, params.end))
+        bars = make_bars(params.symbol, "2024-01-01", 31)
+        timestamps = bars["timestamp"].astype("int64")
+        mask = timestamps >= to_epoch_ns(params.start)
+        if params.end is not None:
+            mask &= timestamps <= to_epoch_ns(params.end)
+        return BarDataFrame(bars[mask].reset_index(drop=True))
+
+
+class TestPriceSync:
+    """Test the Price Sync service."""
+
+    @pytest.fixture
+    def repository(self, repository: SQLitePriceRepository) -> SQLitePriceRepository:
+        # Stored bars from the 5th to the 20th of January, without the 10th to the 14th.
+        bars = make_bars("AAPL", "2024-01-01", 31)
+        days = bars["timestamp"].dt.day
+        bars = bars[days.between(5, 20) & ~days.between(10, 14)].reset_index(drop=True)
+        repository.save_historical(SaveHistoricalParams("AAPL", TFPreset.Tf_D, BarDataFrame(bars)))
+        return repository
+
+    @pytest.fixture
+    def fetcher(self) -> WindowPriceFetcher:
+        return WindowPriceFetcher()
+
+    def params(self, **kwargs) -> SyncParams:
+        return SyncParams(
+            symbols=["AAPL"],
+            timeframe=TFPreset.Tf_D,
+            start=datetime(2024, 1, 1),
+            end=datetime(2024, 1, 31),
+            **kwargs,
+        )
+
+    def test_load_coverage(self, repository: SQLitePriceRepository):
+        coverage = repository.load_coverage(
+            LoadCoverageParams("AAPL", TFPreset.Tf_D, max_gap=timedelta(days=3))
+        )
+
+        assert coverage.rows == 11
+        assert coverage.first.day == 5 and coverage.last.day == 20
+        assert [(a.day, b.day) for a, b in coverage.gaps] == [(9, 15)]
+
+    def test_load_coverage_default(self, repository: SQLitePriceRepository):
+        bars = repository.load_historical(LoadHistoricalParams("AAPL", TFPreset.Tf_D))
+        coverage = super(SQLitePriceRepository, repository).load_coverage(
+            LoadCoverageParams("AAPL", TFPreset.Tf_D, max_gap=timedelta(days=3))
+        )
+
+        assert coverage.rows == bars.shape[0]
+        assert [(a.day, b.day) for a, b in coverage.gaps] == [(9, 15)]
+
+    def test_load_coverage_without_bars(self, repository: SQLitePriceRepository):
+        coverage = repository.load_coverage(LoadCoverageParams("META", TFPreset.Tf_D))
+        assert coverage.rows == 0 and coverage.last is None
+
+    def test_missing_windows(self, repository, fetcher: WindowPriceFetcher):
+        sync = PriceSync(Backfill(fetcher, repository))
+
+        requests = sync.missing("AAPL", self.params(max_gap=timedelta(days=3)))
+
+        assert [(r.start.day, r.end.day) for r in requests] == [(1, 5), (9, 15), (20, 31)]
+
+    def test_missing_windows_clipped(self, repository, fetcher: WindowPriceFetcher):
+        sync = PriceSync(Backfill(fetcher, repository))
+
+        requests = sync.missing(
+            "AAPL",
+            SyncParams(
+                ["AAPL"],
+                TFPreset.Tf_D,
+                datetime(2024, 1, 7),
+                datetime(2024, 1, 12),
+                max_gap=timedelta(days=3),
+            ),
+        )
+
+        assert [(r.start.day, r.end.day) for r in requests] == [(9, 12)]
+
+    def test_missing_windows_before_bars(self, repository, fetcher: WindowPriceFetcher):
+        sync = PriceSync(Backfill(fetcher, repository))
+
+        [request] = sync.missing(
+            "AAPL", SyncParams(["AAPL"], TFPreset.Tf_D, datetime(2024, 1, 1), datetime(2024, 1, 3))
+        )
+
+        assert (request.start.day, request.end.day) == (1, 3)
+
+    def test_missing_windows_after_bars(self, repository, fetcher: WindowPriceFetcher):
+        sync = PriceSync(Backfill(fetcher, repository))
+
+        requests = sync.missing(
+            "AAPL",
+            SyncParams(
+                ["AAPL"],
+                TFPreset.Tf_D,
+                datetime(2024, 2, 1),
+                datetime(2024, 2, 10),
+                max_gap=timedelta(days=3),
+            ),
+        )
+        [tail] = sync.missing("AAPL", SyncParams(["AAPL"], TFPreset.Tf_D, datetime(2024, 2, 1)))
+
+        assert [(r.start, r.end) for r in requests] == [
+            (datetime(2024, 2, 1, tzinfo=timezone.utc), datetime(2024, 2, 10, tzinfo=timezone.utc))
+        ]
+        assert (tail.start, tail.end) == (datetime(2024, 2, 1, tzinfo=timezone.utc), None)
+
+    def test_missing_windows_without_bars(self, repository, fetcher: WindowPriceFetcher):
+        sync = PriceSync(Backfill(fetcher, repository))
+
+        [request] = sync.missing("META", self.params())
+
+        assert (request.start, request.end) == (
+            datetime(2024, 1, 1, tzinfo=timezone.utc),
+            datetime(2024, 1, 31, tzinfo=timezone.utc),
+        )
+
+    def test_run(self, repository, fetcher: WindowPriceFetcher):
+        sync = PriceSync(Backfill(fetcher, repository, max_workers=1))
+
+        results = list(sync.run(self.params(max_gap=timedelta(days=3))))
+
+        assert sum(r.rows_affected for r in results) == 20
+        bars = repository.load_historical(LoadHistoricalParams("AAPL", TFPreset.Tf_D))
+        assert bars.shape[0] == 31
+
+        # Once synced, nothing is missing up to the end, and the last bar is fetched again after.
+        assert sync.missing("AAPL", self.params(max_gap=timedelta(days=3))) == []
+
+        [request] = sync.missing("AAPL", SyncParams(["AAPL"], TFPreset.Tf_D, datetime(2024, 1, 1)))
+        assert request.start == datetime(2024, 1, 31, tzinfo=timezone.utc)
+        assert request.end is None
+
+    @pytest.mark.usefixtures("west_of_utc")
+    def test_missing_tail_west_of_utc(self, repository, fetcher: WindowPriceFetcher):
+        # The last stored bar is a minute old, which is hours ahead of the local wall clock.
+        now = datetime.now(timezone.utc)
+        bars = make_bars("MSFT", str(now.replace(tzinfo=None) - timedelta(minutes=3)), 3, "1min")
+        repository.save_historical(SaveHistoricalParams("MSFT", TFPreset.Tf_1m, bars))
+        sync = PriceSync(Backfill(fetcher, repository))
+
+        params = SyncParams(
+            ["MSFT"], TFPreset.Tf_1m, now.replace(tzinfo=None) - timedelta(hours=1), end=now
+        )
+        [tail] = sync.missing("MSFT", params)[-1:]
+
+        assert tail.start == bars["timestamp"].iloc[-1]
+        assert tail.start < tail.end <= datetime.now(timezone.utc)
@@ -0,0 +1,108 @@
+import asyncio
+import threading
+
+import numpy as np
+import pandas as pd
+import pytest
+from pandera.errors import SchemaError
+
+from prices.core.asset import validate_assets
+from prices.core.bar import validate_bars
+from prices.core.validation import (
+    SAMPLE_ROWS,
+    ValidationPolicy,
+    get_validation_policy,
+    validation_policy,
+)
+from tests.helpers import make_bars
+
+
+def make_assets(rows: int, invalid_row: int) -> pd.DataFrame:
+    """Builds `rows` assets, where the one at `invalid_row` has an unknown broker."""
+    df = pd.DataFrame(
+        {
+            "name": "Meta Platforms Inc.",
+            "symbol": [f"S{i}" for i in range(rows)],
+            "exchange": "NASDAQ",
+            "broker": "Alpaca",
+            "asset_class": "Equity",
+            "tradable": True,
+            "status": "Active",
+            "url_logo": None,
+            "pairs": None,
+        }
+    )
+    df.loc[invalid_row, "broker"] = "Unknown"
+    return df
+
+
+class TestValidation:
+    """Test the validation policies."""
+
+    def test_default_policies(self):
+        assert get_validation_policy() == ValidationPolicy.FULL
+        assert get_validation_policy(trusted=True) == ValidationPolicy.SCHEMA_ONLY
+
+    def test_full_checks_every_row(self):
+        with pytest.raises(SchemaError):
+            validate_assets(make_assets(SAMPLE_ROWS * 2, SAMPLE_ROWS + 10))
+
+    def test_sample_checks_first_rows(self):
+        with validation_policy(ValidationPolicy.SAMPLE):
+            assert validate_assets(make_assets(SAMPLE_ROWS * 2, SAMPLE_ROWS + 10)).shape[0] == 200
+            with pytest.raises(SchemaError):
+                validate_assets(make_assets(SAMPLE_ROWS * 2, 10))
+
+    def test_schema_only_checks_dtypes(self):
+        assert validate_assets(make_assets(10, 5), trusted=True).shape[0] == 10
+
+        bars = make_bars("META", "2023-01-01", 5)
+        bars["close"] = bars["close"].astype(str)
+        with pytest.raises(SchemaError):
+            validate_bars(bars, trusted=True)
+
+    def test_off(self):
+        bars = make_bars("META", "2023-01-01", 5).drop(columns=["symbol"])
+
+        with validation_policy(ValidationPolicy.OFF, trusted=ValidationPolicy.OFF):
+            assert validate_bars(bars).shape[0] == 5
+            assert validate_bars(bars, trusted=True).shape[0] == 5
+
+    def test_policy_is_restored(self):
+        with pytest.raises(RuntimeError):
+            with validation_policy(trusted=ValidationPolicy.FULL):
+                assert get_validation_policy(trusted=True) == ValidationPolicy.FULL
+                raise RuntimeError()
+
+        assert get_validation_policy() == ValidationPolicy.FULL
+        assert get_validation_policy(trusted=True) == ValidationPolicy.SCHEMA_ONLY
+
+    def test_policy_is_local_to_task(self):
+        async def policy_in_block(policy: ValidationPolicy) -> ValidationPolicy:
+            with validation_policy(policy):
+                await asyncio.sleep(0)
+                return get_validation_policy()
+
+        async def main():
+            return await asyncio.gather(
+                policy_in_block(ValidationPolicy.SAMPLE), policy_in_block(ValidationPolicy.OFF)
+            )
+
+        assert asyncio.run(main()) == [ValidationPolicy.SAMPLE, ValidationPolicy.OFF]
+
+    def test_policy_is_local_to_thread(self):
+        policies = []
+        with validation_policy(ValidationPolicy.OFF):
+            thread = threading.Thread(target=lambda: policies.append(get_validation_policy()))
+            thread.start()
+            thread.join()
+
+            assert get_validation_policy() == ValidationPolicy.OFF
+        assert policies == [ValidationPolicy.FULL]
+
+    def test_validate_does_not_copy(self):
+        bars = pd.DataFrame(make_bars("META", "2023-01-01", 5))
+
+        validated = validate_bars(bars)
+
+        assert np.shares_memory(validated["close"].to_numpy(), bars["close"].to_numpy())
@@ -0,0 +1,61 @@
+"""
+Measures the throughput of the event-driven backtest engine, in bars replayed per second.
+
+Run it from the package directory with `poetry run python -m benchmarks.backtest_benchmark`.
+"""
+
+import os
+import tempfile
+import time
+
+from prices.adapters.sqlite_repository import SQLitePriceRepository
+from prices.core.broker import Broker
+from prices.core.timeframe import TFPreset
+from prices.ports.price_repository import LoadHistoricalParams, SaveHistoricalParams
+from trading.backtest.engine import BacktestEngine, BacktestParams, Strategy
+from trading.backtest.feed import bar_chunks, merge_streams
+from benchmarks.bars import random_bars
+
+SYMBOLS = 20
+"""The number of symbols of the benchmark."""
+
+BARS = 100_000
+"""The number of bars of each symbol."""
+
+
+def main():
+    with tempfile.TemporaryDirectory() as path:
+        os.environ["SQLITE_PATH"] = path
+        with SQLitePriceRepository(Broker.ALPACA) as repository:
+            symbols = [f"S{i:02}" for i in range(SYMBOLS)]
+            for i, symbol in enumerate(symbols):
+                bars = random_bars(symbol, BARS, seed=i)
+                repository.save_historical(SaveHistoricalParams(symbol, TFPreset.Tf_1m, bars))
+
+            start = time.perf_counter()
+            chunks = [
+                list(bar_chunks(repository, LoadHistoricalParams(symbol, TFPreset.Tf_1m)))
+                for symbol in symbols
+            ]
+            read_time = time.perf_counter() - start
+
+            # The chunks are merged from memory, to measure the merge without the reads.
+            start = time.perf_counter()
+            blocks = merge_streams([iter(symbol_chunks) for symbol_chunks in chunks])
+            merged = sum(len(block.timestamps) for block in blocks)
+            merge_time = time.perf_counter() - start
+
+            start = time.perf_counter()
+            result = BacktestEngine(repository).run(
+                Strategy(), BacktestParams(symbols, TFPreset.Tf_1m)
+            )
+            run_time = time.perf_counter() - start
+
+    print(f"{'stage':<10}{'bars':>12}{'seconds':>10}{'bars/s':>14}")
+    print(f"{'read':<10}{merged:>12}{read_time:>10.2f}{merged / read_time:>14,.0f}")
+    print(f"{'merge':<10}{merged:>12}{merge_time:>10.2f}{merged / merge_time:>14,.0f}")
+    print(f"{'run':<10}{result.bars:>12}{run_time:>10.2f}{result.bars / run_time:>14,.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,27 @@
+"""Builds the synthetic bars of the benchmarks, which the unit tests also use."""
+
+import numpy as np
+import pandas as pd
+
+from prices.core.bar import BarDataFrame
+
+
+def random_bars(symbol: str, periods: int, seed: int = 0, freq: str = "1min") -> BarDataFrame:
+    """Builds `periods` bars of a random walk for `symbol`, starting on 2024-01-02 (UTC)."""
+    rng = np.random.default_rng(seed)
+    close = 100 + np.cumsum(rng.normal(0, 0.5, periods))
+    open_ = np.concatenate(([100.0], close[:-1]))
+    spread = rng.uniform(0.1, 1.0, periods)
+    df = pd.DataFrame(
+        {
+            "symbol": symbol,
+            "timestamp": pd.date_range("2024-01-02", periods=periods, freq=freq, tz="UTC"),
+            "open": open_,
+            "high": np.maximum(open_, close) + spread,
+            "low": np.minimum(open_, close) - spread,
+            "close": close,
+            "volume": rng.integers(100, 10_000, periods).astype(float),
+            "vwap": (open_ + close) / 2,
+        }
+    )
+    return BarDataFrame(df)
@@ -0,0 +1,59 @@
+"""
+Compares the batch indicators with the naive `rolling().apply()` versions they replace.
+
+Run it from the package directory with `poetry run python -m benchmarks.indicators_benchmark`.
+"""
+
+import timeit
+
+import numpy as np
+
+from trading.indicators.moving_average import sma, wma
+from trading.indicators.volatility import bollinger, zscore
+from benchmarks.bars import random_bars
+
+BARS = 100_000
+"""The number of bars of the benchmark."""
+
+PERIOD = 20
+"""The period of the indicators."""
+
+
+def main():
+    close = random_bars("META", BARS)["close"]
+    weights = np.arange(1, PERIOD + 1)
+
+    cases = {
+        "sma": (
+            lambda: close.rolling(PERIOD).apply(np.mean, raw=True),
+            lambda: sma(close, PERIOD),
+        ),
+        "wma": (
+            lambda: close.rolling(PERIOD).apply(lambda w: w @ weights / weights.sum(), raw=True),
+            lambda: wma(close, PERIOD),
+        ),
+        "bollinger": (
+            lambda: (
+                close.rolling(PERIOD).apply(np.mean, raw=True),
+                close.rolling(PERIOD).apply(np.std, raw=True),
+            ),
+            lambda: bollinger(close, PERIOD),
+        ),
+        "zscore": (
+            lambda: close.rolling(PERIOD).apply(lambda w: (w[-1] - w.mean()) / w.std(), raw=True),
+            lambda: zscore(close, PERIOD),
+        ),
+    }
+
+    print(f"{'indicator':<12}{'rolling.apply':>16}{'vectorized':>14}{'speedup':>10}")
+    for name, (naive, vectorized) in cases.items():
+        naive_time = min(timeit.repeat(naive, number=1, repeat=3))
+        vectorized_time = min(timeit.repeat(vectorized, number=1, repeat=3))
+        print(
+            f"{name:<12}{naive_time * 1000:>14.1f}ms{vectorized_time * 1000:>12.2f}ms"
+            f"{naive_time / vectorized_time:>9.0f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
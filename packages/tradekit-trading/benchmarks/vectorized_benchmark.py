@@ -0,0 +1,71 @@
+"""
+Compares the vectorized backtest with the event-driven engine, on the same signals.
+
+Run it from the package directory with `poetry run python -m benchmarks.vectorized_benchmark`.
+"""
+
+import os
+import tempfile
+import timeit
+
+from prices.adapters.sqlite_repository import SQLitePriceRepository
+from prices.core.broker import Broker
+from prices.core.timeframe import TFPreset
+from prices.ports.price_repository import SaveHistoricalParams
+from trading.backtest.engine import BacktestEngine, BacktestParams, Strategy
+from trading.backtest.vectorized import backtest_signals
+from trading.indicators.moving_average import sma
+from benchmarks.bars import random_bars
+
+BARS = 100_000
+"""The number of bars of the benchmark."""
+
+
+class SignalReplay(Strategy):
+    """Replays arrays of signals through the event-driven engine."""
+
+    def __init__(self, entries, exits):
+        self.entries, self.exits = entries, exits
+
+    def on_start(self, context):
+        self.i, self.long = 0, False
+
+    def on_bar(self, context, bar):
+        if not self.long and self.entries[self.i]:
+            context.order(bar.symbol, 1)
+            self.long = True
+        elif self.long and self.exits[self.i]:
+            context.order_target(bar.symbol, 0)
+            self.long = False
+        self.i += 1
+
+
+def main():
+    bars = random_bars("META", BARS)
+    fast, slow = sma(bars["close"], 10), sma(bars["close"], 50)
+    entries, exits = fast > slow, fast < slow
+
+    with tempfile.TemporaryDirectory() as path:
+        os.environ["SQLITE_PATH"] = path
+        with SQLitePriceRepository(Broker.ALPACA) as repository:
+            repository.save_historical(SaveHistoricalParams("META", TFPreset.Tf_1m, bars))
+            engine = BacktestEngine(repository)
+            params = BacktestParams(["META"], TFPreset.Tf_1m)
+            strategy = SignalReplay(entries.tolist(), exits.tolist())
+            event_time = min(
+                timeit.repeat(lambda: engine.run(strategy, params), number=1, repeat=3)
+            )
+
+    vectorized_time = min(
+        timeit.repeat(lambda: backtest_signals(bars, entries, exits), number=1, repeat=3)
+    )
+    trades = len(backtest_signals(bars, entries, exits).trades)
+
+    print(f"{BARS} bars, {trades} trades")
+    print(f"{'event-driven':<14}{event_time * 1000:>10.1f}ms")
+    print(f"{'vectorized':<14}{vectorized_time * 1000:>10.1f}ms")
+    print(f"{'speedup':<14}{event_time / vectorized_time:>10.0f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,17 @@
+"""Fixtures shared by the unit tests."""
+
+from typing import Iterator
+
+import pytest
+
+from prices.adapters.config import SqlLiteConfig
+from prices.adapters.sqlite_repository import SQLitePriceRepository
+from prices.core.broker import Broker
+
+
+@pytest.fixture
+def repository(tmp_path, monkeypatch) -> Iterator[SQLitePriceRepository]:
+    """An empty SQLite price repository, which the tests seed with the bars they need."""
+    monkeypatch.setattr(SqlLiteConfig, "SQLITE_PATH", str(tmp_path))
+    with SQLitePriceRepository(Broker.ALPACA) as repository:
+        yield repository
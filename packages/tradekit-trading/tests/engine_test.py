@@ -0,0 +1,143 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from prices.adapters.sqlite_repository import SQLitePriceRepository
+from prices.core.timeframe import TFPreset
+from prices.ports.price_repository import SaveHistoricalParams
+from trading.backtest.engine import BacktestEngine, BacktestParams, Strategy
+from trading.backtest.models import FixedSlippage, PerShareCommission
+from trading.indicators.moving_average import SMA
+from benchmarks.bars import random_bars
+
+
+class Recorder(Strategy):
+    def __init__(self):
+        self.bars = []
+
+    def on_bar(self, context, bar):
+        self.bars.append((bar.timestamp, bar.symbol))
+
+
+class BuyFirstBar(Strategy):
+    """Buys 10 shares of each symbol on its first bar, and sells them on its 5th one."""
+
+    def __init__(self):
+        self.seen = {}
+
+    def on_bar(self, context, bar):
+        self.seen[bar.symbol] = self.seen.get(bar.symbol, 0) + 1
+        if self.seen[bar.symbol] == 1:
+            context.order(bar.symbol, 10)
+        elif self.seen[bar.symbol] == 5:
+            context.order_target(bar.symbol, 0)
+
+
+class TestBacktestEngine:
+    """Test the event-driven backtest engine."""
+
+    @pytest.fixture
+    def repository(self, repository: SQLitePriceRepository) -> SQLitePriceRepository:
+        repository.save_historical(
+            SaveHistoricalParams("META", TFPreset.Tf_1m, random_bars("META", 300, seed=1))
+        )
+        aapl = random_bars("AAPL", 200, seed=2, freq="2min")
+        repository.save_historical(SaveHistoricalParams("AAPL", TFPreset.Tf_1m, aapl))
+        return repository
+
+    def test_replays_bars_in_time_order(self, repository):
+        strategy = Recorder()
+        engine = BacktestEngine(repository, chunk_rows=64)
+
+        result = engine.run(strategy, BacktestParams(["META", "AAPL"], TFPreset.Tf_1m))
+
+        assert result.bars == 500
+        assert strategy.bars == sorted(strategy.bars, key=lambda b: (b[0], b[1] != "META"))
+        # The equity is recorded once per timestamp: the 300 minutes of META, and the 50 bars of
+        # AAPL after them.
+        assert len(result.equity) == 350
+        assert (result.equity == 100_000.0).all()
+        assert result.fills.empty
+
+    def test_fills_at_next_open_with_costs(self, repository):
+        engine = BacktestEngine(
+            repository, slippage=FixedSlippage(10), commission=PerShareCommission(0.01, 1.0)
+        )
+
+        result = engine.run(BuyFirstBar(), BacktestParams(["META"], TFPreset.Tf_1m, cash=10_000))
+
+        bars = random_bars("META", 300, seed=1)
+        buy, sell = bars["open"].iloc[1] * 1.001, bars["open"].iloc[5] * 0.999
+        assert result.fills["quantity"].tolist() == [10, -10]
+        assert result.fills["price"].to_numpy() == pytest.approx([buy, sell])
+        assert result.fills["timestamp"].tolist() == bars["timestamp"].iloc[[1, 5]].tolist()
+        assert result.fills["commission"].tolist() == [1.0, 1.0]
+        assert result.positions == {}
+        assert result.cash == pytest.approx(10_000 + 10 * (sell - buy) - 2)
+        # While the position is open, the equity follows the close.
+        assert result.equity.iloc[2] == pytest.approx(
+            10_000 - 10 * buy - 1 + 10 * bars["close"].iloc[2]
+        )
+        assert result.equity.iloc[-1] == pytest.approx(result.cash)
+
+    def test_range_and_indicators(self, repository):
+        class Crossover(Strategy):
+            def on_start(self, context):
+                self.fast, self.slow = SMA(5), SMA(20)
+
+            def on_bar(self, context, bar):
+                fast, slow = self.fast.update(bar), self.slow.update(bar)
+                if not np.isnan(slow):
+                    context.order_target(bar.symbol, 10 if fast > slow else -10)
+
+        params = BacktestParams(
+            ["META"],
+            TFPreset.Tf_1m,
+            start=pd.Timestamp("2024-01-02 01:00", tz="UTC"),
+            end=pd.Timestamp("2024-01-02 02:59", tz="UTC"),
+        )
+        result = BacktestEngine(repository).run(Crossover(), params)
+
+        assert result.bars == 120
+        assert result.equity.index[0] == params.start
+        assert abs(result.fills["quantity"].iloc[0]) == 10
+        assert set(result.fills["quantity"].iloc[1:].abs()) <= {20}
+        assert result.positions["META"] in (10, -10)
+
+    def test_context_and_cancelled_orders(self, repository):
+        class Netting(Strategy):
+            def on_start(self, context):
+                self.equity = []
+
+            def on_bar(self, context, bar):
+                # The orders of the same bar are netted, so they are never filled.
+                context.order(bar.symbol, 5)
+                context.order(bar.symbol, -5)
+                self.equity.append((context.cash, context.equity, context.position(bar.symbol)))
+
+        strategy = Netting()
+        result = BacktestEngine(repository).run(
+            strategy, BacktestParams(["META"], TFPreset.Tf_1m, cash=500)
+        )
+
+        assert result.fills.empty
+        assert set(strategy.equity) == {(500, 500, 0)}
+
+    def test_no_bars(self, repository):
+        params = BacktestParams(
+            ["META"], TFPreset.Tf_1m, start=pd.Timestamp("2025-01-01", tz="UTC")
+        )
+        result = BacktestEngine(repository).run(Strategy(), params)
+
+        assert result.bars == 0
+        assert result.equity.empty
+        assert result.fills.empty
+
+    def test_default_strategy(self, repository):
+        params = BacktestParams(["META"], TFPreset.Tf_1m)
+
+        result = BacktestEngine(repository).run(Strategy(), params)
+
+        assert result.bars == 300
+        assert (result.equity == 100_000.0).all()
+        assert result.fills.empty
@@ -0,0 +1,39 @@
+import numpy as np
+
+from trading.backtest.feed import merge_streams
+
+
+def _stream(timestamps, chunk_rows):
+    timestamps = np.asarray(timestamps, dtype=np.int64)
+    values = np.column_stack([timestamps.astype(float)] * 6)
+    for i in range(0, len(timestamps), chunk_rows):
+        yield timestamps[i:i + chunk_rows], values[i:i + chunk_rows]
+
+
+class TestMergeStreams:
+    """Test the k-way merge of the chunks of bars."""
+
+    def test_merges_in_time_order(self):
+        streams = [
+            _stream([1, 4, 5, 9, 12], 2),
+            _stream([2, 3, 4, 10], 3),
+            _stream([0, 11], 1),
+        ]
+
+        blocks = list(merge_streams(streams))
+        timestamps = np.concatenate([b.timestamps for b in blocks])
+        symbols = np.concatenate([b.symbols for b in blocks])
+        values = np.concatenate([b.values for b in blocks])
+
+        assert timestamps.tolist() == [0, 1, 2, 3, 4, 4, 5, 9, 10, 11, 12]
+        # Ties are ordered by stream.
+        assert symbols.tolist() == [2, 0, 1, 1, 0, 1, 0, 0, 1, 2, 0]
+        assert (values[:, 0] == timestamps).all()
+
+    def test_empty_streams(self):
+        streams = [_stream([], 2), _stream([3, 7], 1), iter([])]
+
+        blocks = list(merge_streams(streams))
+
+        assert np.concatenate([b.timestamps for b in blocks]).tolist() == [3, 7]
+        assert list(merge_streams([])) == []
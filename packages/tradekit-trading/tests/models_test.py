@@ -0,0 +1,38 @@
+import pytest
+
+from trading.backtest.models import (
+    CommissionModel,
+    FixedSlippage,
+    NoCommission,
+    NoSlippage,
+    PercentCommission,
+    PerShareCommission,
+    SlippageModel,
+)
+
+
+class TestModels:
+    """Test the slippage and commission models."""
+
+    def test_slippage(self):
+        assert NoSlippage().fill_price(100, 10) == 100
+        assert FixedSlippage(25).fill_price(100, 10) == pytest.approx(100.25)
+        assert FixedSlippage(25).fill_price(100, -10) == pytest.approx(99.75)
+
+    def test_commission(self):
+        assert NoCommission().commission(10, 100) == 0
+        assert PerShareCommission(0.01, 1.0).commission(-50, 100) == 1.0
+        assert PerShareCommission(0.01, 1.0).commission(500, 100) == pytest.approx(5.0)
+        assert PercentCommission(0.001).commission(-10, 100) == pytest.approx(1.0)
+
+    def test_negative_costs(self):
+        with pytest.raises(ValueError):
+            FixedSlippage(-1)
+        with pytest.raises(ValueError):
+            PerShareCommission(0.01, -1)
+        with pytest.raises(ValueError):
+            PercentCommission(-0.1)
+
+    def test_abstract_methods(self):
+        assert SlippageModel.fill_price(NoSlippage(), 100, 10) is None
+        assert CommissionModel.commission(NoCommission(), 10, 100) is None
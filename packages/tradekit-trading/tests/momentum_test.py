@@ -0,0 +1,70 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from prices.core.bar import BarDataFrame, to_records
+from trading.indicators.momentum import MACD, RSI, macd, rsi
+from benchmarks.bars import random_bars
+
+
+@pytest.fixture
+def bars() -> BarDataFrame:
+    return random_bars("META", 300)
+
+
+class TestMomentum:
+    """Test the batch and incremental momentum indicators."""
+
+    def test_rsi(self, bars: BarDataFrame):
+        delta = bars["close"].diff()
+        gain = delta.clip(lower=0).ewm(alpha=1 / 14, adjust=False).mean()
+        loss = (-delta).clip(lower=0).ewm(alpha=1 / 14, adjust=False).mean()
+        expected = 100 - 100 / (1 + gain / loss)
+        expected[:14] = np.nan
+
+        np.testing.assert_allclose(rsi(bars["close"]), expected)
+
+    def test_rsi_without_losses(self):
+        values = rsi(np.array([1.0, 2.0, 3.0, 3.0]), 2)
+        flat = rsi(np.array([1.0, 1.0, 1.0]), 2)
+
+        assert values[2:].tolist() == [100.0, 100.0]
+        assert flat[2] == 50.0
+
+    def test_rsi_short_series(self):
+        assert np.isnan(rsi(np.array([1.0]), 2)).all()
+        assert rsi(np.array([]), 2).size == 0
+
+    def test_macd(self, bars: BarDataFrame):
+        close = bars["close"]
+        line = close.ewm(span=12, adjust=False).mean() - close.ewm(span=26, adjust=False).mean()
+        signal = line.ewm(span=9, adjust=False).mean()
+
+        values = macd(close)
+
+        np.testing.assert_allclose(values.macd[25:], line[25:])
+        np.testing.assert_allclose(values.signal[33:], signal[33:])
+        np.testing.assert_allclose(values.histogram[33:], (line - signal)[33:])
+        assert np.isnan(values.macd[:25]).all()
+        assert np.isnan(values.signal[:33]).all()
+
+    def test_macd_invalid_periods(self):
+        with pytest.raises(ValueError):
+            macd(pd.Series([1.0]), fast=26, slow=12)
+
+    def test_incremental_rsi(self, bars: BarDataFrame):
+        indicator = RSI()
+
+        values = [indicator.update(bar) for bar in to_records(bars)]
+
+        np.testing.assert_allclose(values, rsi(bars["close"]))
+
+    def test_incremental_macd(self, bars: BarDataFrame):
+        indicator = MACD()
+
+        values = np.array([indicator.update(bar) for bar in to_records(bars)])
+        expected = macd(bars["close"])
+
+        np.testing.assert_allclose(values[:, 0], expected.macd)
+        np.testing.assert_allclose(values[:, 1], expected.signal)
+        np.testing.assert_allclose(values[:, 2], expected.histogram)
@@ -0,0 +1,95 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from prices.core.bar import BarDataFrame, to_records
+from trading.indicators.base import Indicator, SeriesIndicator
+from trading.indicators.moving_average import EMA, SMA, WMA, ema, sma, wma
+from benchmarks.bars import random_bars
+
+
+@pytest.fixture
+def bars() -> BarDataFrame:
+    return random_bars("META", 300)
+
+
+class TestMovingAverages:
+    """Test the batch and incremental moving averages."""
+
+    def test_sma(self, bars: BarDataFrame):
+        expected = bars["close"].rolling(20).apply(np.mean, raw=True)
+        np.testing.assert_allclose(sma(bars["close"], 20), expected)
+
+    def test_ema(self, bars: BarDataFrame):
+        expected = bars["close"].ewm(span=20, adjust=False).mean()
+        expected[:19] = np.nan
+
+        np.testing.assert_allclose(ema(bars["close"], 20), expected)
+
+    def test_wma(self, bars: BarDataFrame):
+        weights = np.arange(1, 21)
+        expected = bars["close"].rolling(20).apply(lambda w: w @ weights / weights.sum(), raw=True)
+
+        np.testing.assert_allclose(wma(bars["close"], 20), expected)
+
+    def test_wma_short_series(self):
+        assert np.isnan(wma(np.array([1.0, 2.0]), 3)).all()
+
+    @pytest.mark.parametrize(
+        "batch, incremental", [(sma, SMA), (ema, EMA), (wma, WMA)]
+    )
+    def test_incremental_matches_batch(self, bars: BarDataFrame, batch, incremental):
+        indicator = incremental(20)
+
+        values = [indicator.update(bar) for bar in to_records(bars)]
+
+        np.testing.assert_allclose(values, batch(bars["close"], 20))
+
+    @pytest.mark.parametrize("batch, incremental", [(sma, SMA), (wma, WMA)])
+    def test_incremental_matches_batch_with_nans(self, batch, incremental):
+        values = np.array([1, 2, np.nan, 4, 5, 6, 7, 8, np.nan, np.nan, 11, 12, 13, 14, 15])
+        indicator = incremental(3)
+
+        pushed = [indicator.push(value) for value in values]
+
+        np.testing.assert_allclose(pushed, batch(values, 3))
+        # A NaN only makes the windows that hold it NaN.
+        assert not np.isnan(pushed[5:8]).any()
+
+    @pytest.mark.parametrize("batch, incremental", [(sma, SMA), (wma, WMA)])
+    @pytest.mark.parametrize("period", [2, 3, 5])
+    def test_incremental_precision(self, batch, incremental, period: int):
+        # The small values after a large one are not lost once it leaves the window.
+        values = np.array([1e16, 1, 1, 1, 1, 1e16, 2, 3, 4, 5, 6, 7, 8, 9])
+        indicator = incremental(period)
+
+        pushed = [indicator.push(value) for value in values]
+
+        np.testing.assert_allclose(pushed, batch(values, period), rtol=1e-12)
+
+    def test_incremental_wma_long_series(self):
+        # The weighted sums don't drift as the number of values pushed grows.
+        values = 100 + np.cumsum(np.random.default_rng(0).normal(0, 0.5, 100_000))
+        indicator = WMA(20)
+
+        pushed = [indicator.push(value) for value in values]
+
+        np.testing.assert_allclose(pushed, wma(values, 20), rtol=1e-12)
+
+    def test_source(self, bars: BarDataFrame):
+        indicator = SMA(5, source="volume")
+
+        values = [indicator.update(bar) for bar in to_records(bars)]
+
+        np.testing.assert_allclose(values, sma(bars["volume"], 5))
+
+    @pytest.mark.parametrize("indicator", [sma, ema, wma])
+    def test_invalid_period(self, indicator):
+        with pytest.raises(ValueError):
+            indicator(pd.Series([1.0]), 0)
+
+    def test_abstract_methods(self, bars: BarDataFrame):
+        bar = to_records(bars)[0]
+
+        assert Indicator.update(SMA(5), bar) is None
+        assert SeriesIndicator.push(SMA(5), 1.0) is None
@@ -0,0 +1,107 @@
+import gc
+from multiprocessing.shared_memory import SharedMemory
+
+import pandas as pd
+import pytest
+
+from prices.adapters.sqlite_repository import SQLitePriceRepository
+from prices.core.timeframe import TFPreset
+from prices.ports.price_repository import SaveHistoricalParams
+from trading.backtest.models import PercentCommission
+from trading.backtest.sweep import (
+    SweepParams,
+    SweepRunner,
+    _init_worker,
+    _run_point,
+    _share,
+    _worker,
+    grid_points,
+)
+from trading.backtest.vectorized import backtest_signals
+from trading.indicators.moving_average import sma
+from benchmarks.bars import random_bars
+
+
+def crossover(bars, fast, slow):
+    fast, slow = sma(bars["close"], fast), sma(bars["close"], slow)
+    return fast > slow, fast < slow
+
+
+class TestSweepRunner:
+    """Test the parameter sweep runner."""
+
+    @pytest.fixture
+    def repository(self, repository: SQLitePriceRepository) -> SQLitePriceRepository:
+        for seed, symbol in enumerate(["META", "AAPL"]):
+            bars = random_bars(symbol, 3000, seed=seed)
+            repository.save_historical(SaveHistoricalParams(symbol, TFPreset.Tf_1m, bars))
+        return repository
+
+    def test_grid_points(self):
+        points = grid_points({"fast": [5, 10], "slow": [20], "stop_loss": [None, 0.01]})
+
+        assert points == [
+            {"fast": 5, "slow": 20, "stop_loss": None},
+            {"fast": 5, "slow": 20, "stop_loss": 0.01},
+            {"fast": 10, "slow": 20, "stop_loss": None},
+            {"fast": 10, "slow": 20, "stop_loss": 0.01},
+        ]
+
+    def test_run_matches_backtests(self, repository, monkeypatch):
+        shared = []
+        monkeypatch.setattr(
+            "trading.backtest.sweep.SharedMemory",
+            lambda *args, **kwargs: shared.append(SharedMemory(*args, **kwargs)) or shared[-1],
+        )
+        params = SweepParams(
+            ["META", "AAPL"],
+            TFPreset.Tf_1m,
+            grid={"fast": [5, 10], "slow": [20, 50], "stop_loss": [None, 0.01]},
+            cash=10_000,
+            commission=PercentCommission(0.001),
+        )
+
+        records = list(SweepRunner(repository, processes=2).run(crossover, params))
+
+        assert len(records) == 16
+        for record in records:
+            bars = random_bars(record.symbol, 3000, seed=["META", "AAPL"].index(record.symbol))
+            entries, exits = crossover(bars, record.params["fast"], record.params["slow"])
+            result = backtest_signals(
+                bars,
+                entries,
+                exits,
+                stop_loss=record.params["stop_loss"],
+                cash=10_000,
+                commission=PercentCommission(0.001),
+            )
+            assert record.total_return == pytest.approx(result.equity.iloc[-1] / 10_000 - 1)
+            assert record.max_drawdown == pytest.approx(result.max_drawdown)
+            assert record.trades == len(result.trades)
+
+        # The shared memory is released after the run.
+        assert len(shared) == 2
+        for block in shared:
+            with pytest.raises(FileNotFoundError):
+                SharedMemory(name=block.name)
+
+    def test_worker_attaches_to_shared_bars(self):
+        bars = random_bars("META", 500)
+        block, spec = _share("META", bars)
+        params = SweepParams(["META"], TFPreset.Tf_1m, grid={}, cash=1000)
+        _init_worker([spec], crossover, params)
+
+        record = _run_point(("META", {"fast": 5, "slow": 20, "size": 2}))
+
+        pd.testing.assert_frame_equal(_worker["bars"]["META"], bars, check_frame_type=False)
+        expected = backtest_signals(bars, *crossover(bars, 5, 20), size=2, cash=1000)
+        assert record.trades == len(expected.trades)
+        assert record.total_return == pytest.approx(expected.equity.iloc[-1] / 1000 - 1)
+
+        # The views of the blocks must be released before they are closed.
+        blocks = _worker["blocks"]
+        _worker.clear()
+        gc.collect()
+        for attached in blocks + [block]:
+            attached.close()
+        block.unlink()
@@ -0,0 +1,181 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from prices.adapters.config import SqlLiteConfig
+from prices.adapters.sqlite_repository import SQLitePriceRepository
+from prices.core.bar import BarDataFrame
+from prices.core.broker import Broker
+from prices.core.timeframe import TFPreset
+from prices.ports.price_repository import SaveHistoricalParams
+from trading.backtest.engine import BacktestEngine, BacktestParams, Strategy
+from trading.backtest.models import FixedSlippage, PercentCommission
+from trading.backtest.vectorized import backtest_signals
+from trading.indicators.moving_average import sma
+from benchmarks.bars import random_bars
+
+
+def _bars(prices) -> BarDataFrame:
+    """Builds bars from (open, high, low, close) tuples, one minute apart."""
+    open_, high, low, close = map(np.array, zip(*prices))
+    df = pd.DataFrame(
+        {
+            "symbol": "META",
+            "timestamp": pd.date_range("2024-01-02", periods=len(prices), freq="1min", tz="UTC"),
+            "open": open_.astype(float),
+            "high": high.astype(float),
+            "low": low.astype(float),
+            "close": close.astype(float),
+            "volume": 1000.0,
+            "vwap": close.astype(float),
+        }
+    )
+    return BarDataFrame(df)
+
+
+def _signals(n, entries=(), exits=()):
+    entry, exit_ = np.zeros(n, dtype=bool), np.zeros(n, dtype=bool)
+    entry[list(entries)] = True
+    exit_[list(exits)] = True
+    return entry, exit_
+
+
+class SignalReplay(Strategy):
+    """Replays arrays of signals through the event-driven engine."""
+
+    def __init__(self, entries, exits, size):
+        self.entries, self.exits, self.size = entries, exits, size
+        self.i, self.long = 0, False
+
+    def on_bar(self, context, bar):
+        if not self.long and self.entries[self.i]:
+            context.order(bar.symbol, self.size)
+            self.long = True
+        elif self.long and context.position(bar.symbol) and self.exits[self.i]:
+            context.order_target(bar.symbol, 0)
+            self.long = False
+        self.i += 1
+
+
+class TestBacktestSignals:
+    """Test the vectorized backtest."""
+
+    def test_matches_event_engine(self, tmp_path, monkeypatch):
+        bars = random_bars("META", 2000, seed=3)
+        fast, slow = sma(bars["close"], 5), sma(bars["close"], 20)
+        entries, exits = fast > slow, fast < slow
+        # The last position is closed before the end, as the engine leaves it open.
+        entries[-30:], exits[-30:] = False, True
+        slippage, commission = FixedSlippage(5), PercentCommission(0.001)
+
+        result = backtest_signals(
+            bars, entries, exits, size=10, slippage=slippage, commission=commission
+        )
+
+        monkeypatch.setattr(SqlLiteConfig, "SQLITE_PATH", str(tmp_path))
+        with SQLitePriceRepository(Broker.ALPACA) as repository:
+            repository.save_historical(SaveHistoricalParams("META", TFPreset.Tf_1m, bars))
+            expected = BacktestEngine(repository, slippage, commission).run(
+                SignalReplay(entries, exits, 10), BacktestParams(["META"], TFPreset.Tf_1m)
+            )
+
+        assert len(result.trades) > 10
+        assert (result.trades["reason"] == "signal").all()
+        fills = expected.fills
+        assert result.trades["entry_price"].to_numpy() == pytest.approx(fills["price"][::2])
+        assert result.trades["exit_price"].to_numpy() == pytest.approx(fills["price"][1::2])
+        assert result.trades["entry_time"].tolist() == fills["timestamp"][::2].tolist()
+        assert result.equity.to_numpy() == pytest.approx(expected.equity.to_numpy())
+        assert result.position.iloc[-1] == 0
+
+    def test_no_signals(self):
+        bars = random_bars("META", 50)
+
+        result = backtest_signals(bars, *_signals(50), cash=1000)
+
+        assert result.trades.empty
+        assert (result.equity == 1000).all()
+        assert result.max_drawdown == 0
+
+    def test_positions_equity_and_drawdown(self):
+        bars = _bars([(10, 10, 10, 10), (10, 12, 9, 12), (12, 12, 8, 8), (9, 11, 9, 11)])
+
+        result = backtest_signals(bars, *_signals(4, entries=[0], exits=[2]), size=2, cash=100)
+
+        assert result.position.tolist() == [0, 2, 2, 0]
+        assert result.equity.tolist() == [100, 104, 96, 98]
+        assert result.drawdown.to_numpy() == pytest.approx([0, 0, -8 / 104, -6 / 104])
+        trade = result.trades.iloc[0]
+        assert (trade["entry_price"], trade["exit_price"], trade["pnl"]) == (10, 9, -2)
+        assert (trade["bars"], trade["reason"]) == (2, "signal")
+
+    @pytest.mark.parametrize(
+        "prices,reason,price",
+        [
+            ([(100, 101, 96, 97), (97, 98, 94, 95)], "stop", 95),
+            ([(100, 101, 96, 97), (90, 92, 88, 91)], "stop", 90),
+            ([(100, 111, 99, 108), (108, 109, 107, 108)], "take_profit", 110),
+            ([(100, 101, 96, 97), (112, 113, 111, 112)], "take_profit", 112),
+            ([(100, 111, 94, 100), (100, 101, 99, 100)], "stop", 95),
+            ([(100, 101, 99, 100), (100, 101, 99, 100)], "end", 100),
+        ],
+    )
+    def test_stop_and_take_profit(self, prices, reason, price):
+        bars = _bars([(100, 100, 100, 100)] + prices)
+
+        result = backtest_signals(
+            bars, *_signals(len(bars), entries=[0]), stop_loss=0.05, take_profit=0.1
+        )
+
+        trade = result.trades.iloc[0]
+        assert trade["reason"] == reason
+        assert trade["exit_price"] == pytest.approx(price)
+        assert result.position.iloc[-1] == 0
+
+    @pytest.mark.parametrize(
+        "hits,reason,bars_held",
+        [
+            ({255: (100, 101, 94, 95)}, "stop", 255),
+            ({256: (100, 101, 94, 95)}, "stop", 256),
+            ({900: (100, 111, 99, 110), 1000: (100, 101, 94, 95)}, "take_profit", 900),
+            ({1000: (100, 101, 94, 95), 1001: (100, 111, 99, 110)}, "stop", 1000),
+            ({}, "signal", 1200),
+        ],
+    )
+    def test_stops_beyond_first_window(self, hits, reason, bars_held):
+        prices = [(100, 101, 99, 100)] * 1500
+        for i, bar in hits.items():
+            prices[i + 1] = bar
+        bars = _bars(prices)
+
+        result = backtest_signals(
+            bars, *_signals(len(bars), entries=[0], exits=[1200]), stop_loss=0.05, take_profit=0.1
+        )
+
+        trade = result.trades.iloc[0]
+        assert (trade["reason"], trade["bars"]) == (reason, bars_held)
+
+    def test_short_stop_and_reentry(self):
+        bars = _bars(
+            [(100, 100, 100, 100), (100, 104, 99, 103), (103, 106, 102, 105)]
+            + [(105, 105, 105, 105)] * 3
+        )
+        entries, exits = _signals(len(bars), entries=[0, 1, 2, 3])
+
+        result = backtest_signals(bars, entries, exits, direction=-1, stop_loss=0.05)
+
+        # The stop is hit on bar 2, so the entry signal of bar 2 opens a new short on bar 3.
+        assert result.trades["reason"].tolist() == ["stop", "end"]
+        assert result.trades["exit_price"].tolist() == [105, 105]
+        assert result.trades["pnl"].tolist() == [-5, 0]
+        assert result.position.tolist() == [0, -1, 0, -1, -1, 0]
+
+    def test_validation(self):
+        bars = random_bars("META", 10)
+        with pytest.raises(ValueError):
+            backtest_signals(bars, *_signals(9))
+        with pytest.raises(ValueError):
+            backtest_signals(bars, *_signals(10), direction=2)
+        both = pd.concat([bars, random_bars("AAPL", 10)], ignore_index=True)
+        with pytest.raises(ValueError):
+            backtest_signals(BarDataFrame(both), *_signals(20))
@@ -0,0 +1,96 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from prices.core.bar import BarDataFrame, to_records
+from trading.indicators.volatility import (
+    ATR,
+    Bollinger,
+    ZScore,
+    atr,
+    bollinger,
+    zscore,
+)
+from benchmarks.bars import random_bars
+
+
+@pytest.fixture
+def bars() -> BarDataFrame:
+    return random_bars("META", 300)
+
+
+class TestVolatility:
+    """Test the batch and incremental volatility indicators."""
+
+    def test_atr(self, bars: BarDataFrame):
+        previous = bars["close"].shift()
+        true_range = pd.concat(
+            [
+                bars["high"] - bars["low"],
+                (bars["high"] - previous).abs(),
+                (bars["low"] - previous).abs(),
+            ],
+            axis=1,
+        ).max(axis=1)
+        expected = true_range.ewm(alpha=1 / 14, adjust=False).mean()
+        expected[:13] = np.nan
+
+        np.testing.assert_allclose(atr(bars), expected)
+
+    def test_atr_short_series(self, bars: BarDataFrame):
+        first = bars.iloc[:1]
+
+        np.testing.assert_allclose(atr(first, 1), first["high"] - first["low"])
+        assert np.isnan(atr(first, 2)).all()
+
+    def test_bollinger(self, bars: BarDataFrame):
+        close = bars["close"]
+        middle = close.rolling(20).apply(np.mean, raw=True)
+        std = close.rolling(20).apply(np.std, raw=True)
+
+        bands = bollinger(close)
+
+        np.testing.assert_allclose(bands.middle, middle)
+        np.testing.assert_allclose(bands.upper, middle + 2 * std)
+        np.testing.assert_allclose(bands.lower, middle - 2 * std)
+
+    def test_zscore(self, bars: BarDataFrame):
+        expected = bars["close"].rolling(30).apply(lambda w: (w[-1] - w.mean()) / w.std(), raw=True)
+        np.testing.assert_allclose(zscore(bars["close"], 30), expected)
+
+    def test_zscore_of_constant_values(self):
+        assert zscore(np.ones(5), 3)[2:].tolist() == [0.0, 0.0, 0.0]
+
+    def test_incremental_atr(self, bars: BarDataFrame):
+        indicator = ATR()
+        values = [indicator.update(bar) for bar in to_records(bars)]
+        np.testing.assert_allclose(values, atr(bars))
+
+    def test_incremental_bollinger(self, bars: BarDataFrame):
+        indicator = Bollinger()
+
+        values = np.array([indicator.update(bar) for bar in to_records(bars)])
+
+        np.testing.assert_allclose(values.T, np.array(bollinger(bars["close"])))
+
+    def test_incremental_zscore(self, bars: BarDataFrame):
+        indicator = ZScore(30)
+        values = [indicator.update(bar) for bar in to_records(bars)]
+        np.testing.assert_allclose(values, zscore(bars["close"], 30))
+
+    def test_incremental_zscore_of_constant_values(self):
+        indicator = ZScore(3)
+        assert [indicator.push(1.0) for _ in range(4)][2:] == [0.0, 0.0]
+
+    def test_incremental_matches_batch_with_nans(self, bars: BarDataFrame):
+        close = bars["close"].to_numpy().copy()
+        close[[25, 100, 101, 180]] = np.nan
+        bands, scores = Bollinger(), ZScore(30)
+
+        pushed_bands = np.array([bands.push(value) for value in close])
+        pushed_scores = [scores.push(value) for value in close]
+
+        np.testing.assert_allclose(pushed_bands.T, np.array(bollinger(close)))
+        np.testing.assert_allclose(pushed_scores, zscore(close, 30))
+        assert np.isnan(pushed_scores[100:131]).all()
+        assert not np.isnan(pushed_scores[131:180]).any()
@@ -0,0 +1,53 @@
+import numpy as np
+import pytest
+
+from prices.core.bar import BarDataFrame, to_records
+from trading.indicators.volume import VWAPBands, vwap_bands
+from benchmarks.bars import random_bars
+
+
+@pytest.fixture
+def bars() -> BarDataFrame:
+    return random_bars("META", 300)
+
+
+class TestVolume:
+    """Test the batch and incremental volume indicators."""
+
+    def test_vwap_bands(self, bars: BarDataFrame):
+        price, volume = bars["vwap"].to_numpy(), bars["volume"].to_numpy()
+        middle = np.full(len(bars), np.nan)
+        std = np.full(len(bars), np.nan)
+        for i in range(19, len(bars)):
+            p, v = price[i - 19:i + 1], volume[i - 19:i + 1]
+            middle[i] = np.average(p, weights=v)
+            std[i] = np.sqrt(np.average((p - middle[i]) ** 2, weights=v))
+
+        bands = vwap_bands(bars)
+
+        np.testing.assert_allclose(bands.middle, middle)
+        np.testing.assert_allclose(bands.upper, middle + 2 * std)
+
+    def test_vwap_bands_without_volume(self, bars: BarDataFrame):
+        bars["volume"] = 0.0
+
+        assert np.isnan(vwap_bands(bars, 5).middle).all()
+        indicator = VWAPBands(5)
+        assert all(np.isnan(indicator.update(bar).middle) for bar in to_records(bars.iloc[:6]))
+
+    def test_incremental_vwap_bands(self, bars: BarDataFrame):
+        indicator = VWAPBands()
+
+        values = np.array([indicator.update(bar) for bar in to_records(bars)])
+
+        np.testing.assert_allclose(values.T, np.array(vwap_bands(bars)))
+
+    def test_incremental_vwap_bands_with_nans(self, bars: BarDataFrame):
+        bars.loc[[25, 100], "vwap"] = np.nan
+        bars.loc[150, "volume"] = np.nan
+        indicator = VWAPBands()
+
+        values = np.array([indicator.update(bar) for bar in to_records(bars)])
+
+        np.testing.assert_allclose(values.T, np.array(vwap_bands(bars)))
+        assert not np.isnan(values[170:, 1]).any()
@@ -0,0 +1 @@
+"""Backtesting engines, which simulate trading strategies over historical bars."""
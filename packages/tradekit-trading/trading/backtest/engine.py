@@ -0,0 +1,202 @@
+"""Defines the event-driven backtest engine, which replays bars through a strategy."""
+
+from abc import ABC
+from dataclasses import dataclass, field
+from typing import Dict, List, NamedTuple, Optional
+
+import numpy as np
+import pandas as pd
+
+from prices.core.timeframe import TimeFrame
+from prices.ports.price_repository import LoadHistoricalParams, PriceRepository
+from trading.backtest.feed import bar_chunks, merge_streams
+from trading.backtest.models import CommissionModel, NoCommission, NoSlippage, SlippageModel
+from trading.backtest.portfolio import Portfolio
+
+
+class BarEvent(NamedTuple):
+    """
+    A bar replayed by the engine. It has the same fields as a Bar, so it can update the
+    incremental indicators, but its timestamp is in nanoseconds since the Unix epoch.
+    """
+
+    symbol: str
+    timestamp: int
+    open: float
+    high: float
+    low: float
+    close: float
+    volume: float
+    vwap: float
+
+
+class Context:
+    """The view of a running backtest given to a strategy, through which it places orders."""
+
+    def __init__(self, portfolio: Portfolio) -> None:
+        self.portfolio = portfolio
+        self.timestamp = 0
+        self._indexes = {symbol: i for i, symbol in enumerate(portfolio.symbols)}
+        self._pending: Dict[int, float] = {}
+
+    @property
+    def cash(self) -> float:
+        return self.portfolio.cash
+
+    @property
+    def equity(self) -> float:
+        return self.portfolio.equity
+
+    def position(self, symbol: str) -> float:
+        """Returns the quantity held of a symbol."""
+        return self.portfolio.quantities.get(self._indexes[symbol], 0.0)
+
+    def order(self, symbol: str, quantity: float):
+        """
+        Places a market order of `quantity`, negative to sell. It is filled at the open of the
+        next bar of the symbol, so a strategy never trades at a price it has not seen yet.
+        """
+        index = self._indexes[symbol]
+        self._pending[index] = self._pending.get(index, 0.0) + quantity
+
+    def order_target(self, symbol: str, quantity: float):
+        """Places the market order that brings the position of a symbol to `quantity`."""
+        index = self._indexes[symbol]
+        current = self.portfolio.quantities.get(index, 0.0) + self._pending.get(index, 0.0)
+        if quantity != current:
+            self.order(symbol, quantity - current)
+
+
+class Strategy(ABC):
+    """Base class of the strategies, which react to each bar replayed by the engine."""
+
+    def on_start(self, context: Context):
+        """Called before the first bar."""
+        pass
+
+    def on_bar(self, context: Context, bar: BarEvent):
+        """Called for each bar, in timestamp order, and in the order of the symbols for ties."""
+        pass
+
+    def on_end(self, context: Context):
+        """Called after the last bar."""
+        pass
+
+
+@dataclass
+class BacktestParams:
+    symbols: List[str]
+    timeframe: TimeFrame
+    start: Optional[pd.Timestamp] = None
+    end: Optional[pd.Timestamp] = None
+
+    cash: float = 100_000.0
+    """The cash at the start of the backtest."""
+
+
+@dataclass
+class BacktestResult:
+    equity: pd.Series
+    """The equity after each timestamp with bars, indexed by timestamp."""
+
+    fills: pd.DataFrame
+    """The orders filled, with a row per fill."""
+
+    cash: float
+    """The cash at the end of the backtest."""
+
+    positions: Dict[str, float] = field(default_factory=dict)
+    """The quantities held at the end of the backtest, by symbol."""
+
+    bars: int = 0
+    """The number of bars replayed."""
+
+
+class BacktestEngine:
+    """
+    Replays the bars of many symbols from a repository, in timestamp order, through a strategy.
+    The history of each symbol is read in chunks of `chunk_rows` bars and merged as NumPy arrays,
+    so the memory used does not grow with the length of the history.
+    """
+
+    def __init__(
+        self,
+        repository: PriceRepository,
+        slippage: SlippageModel = NoSlippage(),
+        commission: CommissionModel = NoCommission(),
+        chunk_rows: int = 10_000,
+    ) -> None:
+        self.repository = repository
+        self.slippage = slippage
+        self.commission = commission
+        self.chunk_rows = chunk_rows
+
+    def run(self, strategy: Strategy, params: BacktestParams) -> BacktestResult:
+        """Runs a backtest of a strategy, returning its equity curve and fills."""
+        portfolio = Portfolio(params.symbols, params.cash)
+        context = Context(portfolio)
+        pending = context._pending
+        streams = [
+            bar_chunks(
+                self.repository,
+                LoadHistoricalParams(symbol, params.timeframe, params.start, params.end),
+                self.chunk_rows,
+            )
+            for symbol in params.symbols
+        ]
+
+        names = np.array(portfolio.symbols, dtype=object)
+        prices = portfolio.prices
+        on_bar = strategy.on_bar
+        make_event = BarEvent._make
+        count = 0
+        last = None
+
+        strategy.on_start(context)
+        for block in merge_streams(streams):
+            count += len(block.timestamps)
+            # The columns are converted to Python scalars at once, which is much faster than
+            # reading NumPy scalars one bar at a time.
+            timestamps = block.timestamps.tolist()
+            columns = block.values.T.tolist()
+            events = map(make_event, zip(names[block.symbols].tolist(), timestamps, *columns))
+            for timestamp, symbol, bar in zip(timestamps, block.symbols.tolist(), events):
+                if timestamp != last:
+                    if last is not None:
+                        portfolio.record(last)
+                    context.timestamp = last = timestamp
+
+                if pending and symbol in pending:
+                    self._fill(portfolio, pending, timestamp, symbol, bar.open)
+
+                prices[symbol] = bar.close
+                on_bar(context, bar)
+
+        if last is not None:
+            portfolio.record(last)
+        strategy.on_end(context)
+
+        return BacktestResult(
+            equity=portfolio.equity_curve(),
+            fills=portfolio.fills_frame(),
+            cash=portfolio.cash,
+            positions=portfolio.positions(),
+            bars=count,
+        )
+
+    def _fill(
+        self,
+        portfolio: Portfolio,
+        pending: Dict[int, float],
+        timestamp: int,
+        symbol: int,
+        price: float,
+    ):
+        """Fills the pending order of a symbol at the open of its bar."""
+        quantity = pending.pop(symbol)
+        if quantity == 0:
+            return
+
+        price = self.slippage.fill_price(price, quantity)
+        commission = self.commission.commission(quantity, price)
+        portfolio.fill(timestamp, symbol, quantity, price, commission)
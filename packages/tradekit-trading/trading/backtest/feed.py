@@ -0,0 +1,79 @@
+"""Defines the feed of bars of a backtest, which merges many symbols into a single time order."""
+
+import heapq
+from dataclasses import dataclass
+from typing import Iterator, List, Sequence, Tuple
+
+import numpy as np
+
+from prices.core.bar import BAR_VALUE_COLUMNS
+from prices.ports.price_repository import LoadHistoricalParams, PriceRepository
+
+Chunk = Tuple[np.ndarray, np.ndarray]
+"""A chunk of bars sorted by time: their timestamps, in nanoseconds since the Unix epoch, and
+their values, with a row per bar and a column per value of `BAR_VALUE_COLUMNS`."""
+
+
+@dataclass
+class Block:
+    """A block of bars of many symbols, sorted by time, and by symbol for the same time."""
+
+    timestamps: np.ndarray
+    """The timestamps of the bars, in nanoseconds since the Unix epoch."""
+
+    symbols: np.ndarray
+    """The index of the symbol, or stream, of each bar."""
+
+    values: np.ndarray
+    """The values of the bars, with a row per bar and a column per value of BAR_VALUE_COLUMNS."""
+
+
+def bar_chunks(
+    repository: PriceRepository, params: LoadHistoricalParams, chunk_rows: int = 10_000
+) -> Iterator[Chunk]:
+    """Yields the bars of a symbol from a repository as chunks of NumPy arrays."""
+    for bars in repository.iter_historical(params, chunk_rows):
+        timestamps = bars["timestamp"].astype("int64").to_numpy()
+        yield timestamps, bars[BAR_VALUE_COLUMNS].to_numpy(dtype=np.float64)
+
+
+def merge_streams(streams: Sequence[Iterator[Chunk]]) -> Iterator[Block]:
+    """
+    Merges streams of chunks, each sorted by time, into blocks sorted by time. A heap keeps the
+    current chunk of each stream by its last timestamp, so each block holds all the bars up to
+    the earliest of them, which no chunk read later can precede. Bars with the same timestamp are
+    ordered by the index of their stream.
+    """
+    current: List[Chunk] = [(np.empty(0, np.int64), np.empty((0, 0)))] * len(streams)
+    offsets = [0] * len(streams)
+    heap: List[Tuple[int, int]] = []
+
+    def advance(i: int):
+        for timestamps, values in streams[i]:
+            if len(timestamps):
+                current[i], offsets[i] = (timestamps, values), 0
+                heapq.heappush(heap, (int(timestamps[-1]), i))
+                return
+
+    for i in range(len(streams)):
+        advance(i)
+
+    while heap:
+        horizon = heap[0][0]
+        parts = []
+        for i in sorted(i for _, i in heap):
+            timestamps, values = current[i]
+            end = int(np.searchsorted(timestamps, horizon, side="right"))
+            if end > offsets[i]:
+                parts.append((i, timestamps[offsets[i]:end], values[offsets[i]:end]))
+                offsets[i] = end
+
+        timestamps = np.concatenate([p[1] for p in parts])
+        order = np.argsort(timestamps, kind="stable")
+        symbols = np.concatenate([np.full(len(p[1]), p[0]) for p in parts])
+        yield Block(timestamps[order], symbols[order], np.concatenate([p[2] for p in parts])[order])
+
+        # The chunks that end at the horizon were fully merged.
+        while heap and heap[0][0] <= horizon:
+            _, i = heapq.heappop(heap)
+            advance(i)
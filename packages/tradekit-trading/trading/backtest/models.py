@@ -0,0 +1,73 @@
+"""Defines the models of the costs of trading in a backtest: slippage and commissions."""
+
+from abc import ABC, abstractmethod
+
+
+class SlippageModel(ABC):
+    """Models the difference between the price of a bar and the price an order is filled at."""
+
+    @abstractmethod
+    def fill_price(self, price: float, quantity: float) -> float:
+        """Returns the price an order of `quantity`, negative to sell, is filled at."""
+        ...
+
+
+class NoSlippage(SlippageModel):
+    """Fills orders at the price of the bar."""
+
+    def fill_price(self, price: float, quantity: float) -> float:
+        return price
+
+
+class FixedSlippage(SlippageModel):
+    """Fills orders at a fixed fraction, in basis points, above the price to buy, below to sell."""
+
+    def __init__(self, bps: float) -> None:
+        if bps < 0:
+            raise ValueError("The slippage must be a non-negative value.")
+        self.bps = bps
+
+    def fill_price(self, price: float, quantity: float) -> float:
+        slippage = price * self.bps / 10_000
+        return price + slippage if quantity > 0 else price - slippage
+
+
+class CommissionModel(ABC):
+    """Models the commission charged for a fill."""
+
+    @abstractmethod
+    def commission(self, quantity: float, price: float) -> float:
+        """Returns the commission of a fill of `quantity`, negative to sell, at `price`."""
+        ...
+
+
+class NoCommission(CommissionModel):
+    """Charges no commission."""
+
+    def commission(self, quantity: float, price: float) -> float:
+        return 0.0
+
+
+class PerShareCommission(CommissionModel):
+    """Charges a commission per share, with a minimum per fill."""
+
+    def __init__(self, per_share: float, minimum: float = 0.0) -> None:
+        if per_share < 0 or minimum < 0:
+            raise ValueError("The commission must be a non-negative value.")
+        self.per_share = per_share
+        self.minimum = minimum
+
+    def commission(self, quantity: float, price: float) -> float:
+        return max(abs(quantity) * self.per_share, self.minimum)
+
+
+class PercentCommission(CommissionModel):
+    """Charges a fraction of the value of each fill."""
+
+    def __init__(self, rate: float) -> None:
+        if rate < 0:
+            raise ValueError("The commission must be a non-negative value.")
+        self.rate = rate
+
+    def commission(self, quantity: float, price: float) -> float:
+        return abs(quantity) * price * self.rate
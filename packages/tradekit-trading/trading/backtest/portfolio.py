@@ -0,0 +1,87 @@
+"""Defines the accounting of the cash and positions of a backtest."""
+
+from dataclasses import dataclass
+from typing import Dict, List, Sequence
+
+import numpy as np
+import pandas as pd
+
+
+@dataclass
+class Fill:
+    """An order filled during a backtest."""
+
+    timestamp: int
+    """The timestamp of the bar the order was filled on, in nanoseconds since the Unix epoch."""
+
+    symbol: str
+
+    quantity: float
+    """The quantity filled, negative for a sale."""
+
+    price: float
+    """The price of the fill, after slippage."""
+
+    commission: float
+
+
+class Portfolio:
+    """
+    Tracks the cash and positions of a backtest, by the index of their symbol. Only the open
+    positions are kept, so the equity is computed from them, at the last price of their symbol.
+    """
+
+    def __init__(self, symbols: Sequence[str], cash: float) -> None:
+        self.symbols = list(symbols)
+        self.cash = cash
+        self.quantities: Dict[int, float] = {}
+        """The quantities of the open positions, by the index of their symbol."""
+        self.prices = [0.0] * len(self.symbols)
+        """The last price of each symbol, updated by the engine as bars are replayed."""
+        self.fills: List[Fill] = []
+        self._equity_timestamps: List[int] = []
+        self._equity_values: List[float] = []
+
+    @property
+    def equity(self) -> float:
+        """The cash plus the market value of the positions, at their last prices."""
+        prices = self.prices
+        return self.cash + sum(q * prices[i] for i, q in self.quantities.items())
+
+    def fill(self, timestamp: int, symbol: int, quantity: float, price: float, commission: float):
+        """Records a fill, updating the cash and the position of its symbol."""
+        self.cash -= quantity * price + commission
+        position = self.quantities.get(symbol, 0.0) + quantity
+        if position == 0:
+            self.quantities.pop(symbol, None)
+        else:
+            self.quantities[symbol] = position
+        self.fills.append(Fill(timestamp, self.symbols[symbol], quantity, price, commission))
+
+    def record(self, timestamp: int):
+        """Records the equity at a timestamp."""
+        self._equity_timestamps.append(timestamp)
+        self._equity_values.append(self.equity)
+
+    def positions(self) -> Dict[str, float]:
+        """Returns the quantities of the open positions, by symbol."""
+        return {self.symbols[i]: q for i, q in self.quantities.items()}
+
+    def equity_curve(self) -> pd.Series:
+        """Returns the equity recorded, indexed by timestamp."""
+        index = pd.DatetimeIndex(
+            np.array(self._equity_timestamps, dtype=np.int64).view("M8[ns]"), tz="UTC"
+        )
+        return pd.Series(self._equity_values, index=index, name="equity", dtype=np.float64)
+
+    def fills_frame(self) -> pd.DataFrame:
+        """Returns the fills as a DataFrame, with a row per fill."""
+        return pd.DataFrame(
+            {
+                "timestamp": pd.to_datetime([f.timestamp for f in self.fills], unit="ns", utc=True),
+                "symbol": [f.symbol for f in self.fills],
+                "quantity": np.array([f.quantity for f in self.fills], dtype=np.float64),
+                "price": np.array([f.price for f in self.fills], dtype=np.float64),
+                "commission": np.array([f.commission for f in self.fills], dtype=np.float64),
+            }
+        )
@@ -0,0 +1,184 @@
+"""
+Defines the parameter sweep, which backtests a signal strategy over a grid of parameters on a
+pool of processes.
+"""
+
+import itertools
+from dataclasses import dataclass, field
+from datetime import datetime
+from multiprocessing import Pool
+from multiprocessing.shared_memory import SharedMemory
+from typing import Any, Callable, Dict, Iterator, List, NamedTuple, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+from prices.core.bar import BAR_VALUE_COLUMNS, BarDataFrame, validate_bars
+from prices.core.timeframe import TimeFrame
+from prices.core.timestamp import Timestamp
+from prices.ports.price_repository import LoadHistoricalParams, PriceRepository
+from trading.backtest.models import CommissionModel, NoCommission, NoSlippage, SlippageModel
+from trading.backtest.vectorized import backtest_signals
+
+SignalFunction = Callable[..., Tuple[np.ndarray, np.ndarray]]
+"""A strategy given as a function of the bars of a symbol and of its parameters, as keyword
+arguments, that returns its arrays of entry and exit signals. It must be defined at the top level
+of a module, so the worker processes can import it."""
+
+BACKTEST_PARAMS = ("size", "direction", "stop_loss", "take_profit")
+"""The parameters of a grid that are given to `backtest_signals` instead of the strategy."""
+
+
+@dataclass
+class SweepParams:
+    symbols: List[str]
+    timeframe: TimeFrame
+
+    grid: Dict[str, Sequence[Any]]
+    """The values of each parameter. Every combination of them is backtested on every symbol."""
+
+    start: Optional[datetime] = None
+    end: Optional[datetime] = None
+    cash: float = 100_000.0
+    slippage: SlippageModel = field(default_factory=NoSlippage)
+    commission: CommissionModel = field(default_factory=NoCommission)
+
+
+class SweepRecord(NamedTuple):
+    """The summary of a backtest of a sweep, small enough to be streamed back from a worker."""
+
+    symbol: str
+    params: Dict[str, Any]
+    total_return: float
+    max_drawdown: float
+    trades: int
+
+    win_rate: float
+    """The fraction of the trades with a profit, or 0 without trades."""
+
+
+class _SharedBars(NamedTuple):
+    """The location of the bars of a symbol in shared memory."""
+
+    symbol: str
+
+    name: str
+    """The name of the shared memory block, which holds the int64 timestamps in nanoseconds and
+    then each value column as a float64 array, in the order of `BAR_VALUE_COLUMNS`."""
+
+    rows: int
+
+
+def _share(symbol: str, bars: BarDataFrame) -> Tuple[SharedMemory, _SharedBars]:
+    """Copies the bars of a symbol to a new shared memory block."""
+    rows = len(bars)
+    block = SharedMemory(create=True, size=max(1, rows * 8 * (1 + len(BAR_VALUE_COLUMNS))))
+    timestamps, values = _views(block, rows)
+    timestamps[:] = bars["timestamp"].astype("int64").to_numpy()
+    values[:] = bars[BAR_VALUE_COLUMNS].to_numpy(dtype=np.float64).T
+    return block, _SharedBars(symbol, block.name, rows)
+
+
+def _views(block: SharedMemory, rows: int) -> Tuple[np.ndarray, np.ndarray]:
+    """Returns the timestamps and the values of a shared memory block of bars."""
+    timestamps = np.ndarray((rows,), np.int64, block.buf)
+    values = np.ndarray((len(BAR_VALUE_COLUMNS), rows), np.float64, block.buf, offset=rows * 8)
+    return timestamps, values
+
+
+_worker: Dict[str, Any] = {}
+"""The state of a worker process: its strategy, its parameters, and the bars it attached to."""
+
+
+def _init_worker(shared: List[_SharedBars], signals: SignalFunction, params: SweepParams):
+    """Attaches a worker process to the shared bars, wrapping them as BarDataFrames."""
+    _worker.update(signals=signals, params=params, blocks=[], bars={})
+    for symbol, name, rows in shared:
+        block = SharedMemory(name=name)
+        # The block must stay open, as the columns of the bars are views of it.
+        _worker["blocks"].append(block)
+        timestamps, values = _views(block, rows)
+        data = {
+            "symbol": np.full(rows, symbol, dtype=object),
+            "timestamp": pd.array(timestamps.view("M8[ns]"), copy=False).view(Timestamp()),
+        }
+        for i, c in enumerate(BAR_VALUE_COLUMNS):
+            data[c] = values[i]
+        # The bars were validated when they were loaded from the repository.
+        _worker["bars"][symbol] = validate_bars(pd.DataFrame(data, copy=False), trusted=True)
+
+
+def _run_point(task: Tuple[str, Dict[str, Any]]) -> SweepRecord:
+    """Backtests a combination of parameters on a symbol, in a worker process."""
+    symbol, point = task
+    params: SweepParams = _worker["params"]
+    bars = _worker["bars"][symbol]
+
+    strategy_params = {k: v for k, v in point.items() if k not in BACKTEST_PARAMS}
+    backtest_params = {k: v for k, v in point.items() if k in BACKTEST_PARAMS}
+    entries, exits = _worker["signals"](bars, **strategy_params)
+    result = backtest_signals(
+        bars,
+        entries,
+        exits,
+        cash=params.cash,
+        slippage=params.slippage,
+        commission=params.commission,
+        **backtest_params,
+    )
+
+    pnl = result.trades["pnl"].to_numpy()
+    final = float(result.equity.iloc[-1]) if len(result.equity) else params.cash
+    return SweepRecord(
+        symbol=symbol,
+        params=point,
+        total_return=final / params.cash - 1,
+        max_drawdown=result.max_drawdown,
+        trades=len(pnl),
+        win_rate=float((pnl > 0).mean()) if len(pnl) else 0.0,
+    )
+
+
+def grid_points(grid: Dict[str, Sequence[Any]]) -> List[Dict[str, Any]]:
+    """Returns every combination of the values of a grid of parameters."""
+    keys = list(grid)
+    return [dict(zip(keys, values)) for values in itertools.product(*grid.values())]
+
+
+class SweepRunner:
+    """
+    Backtests a signal strategy over every combination of a grid of parameters, on a pool of
+    `processes` workers, one per CPU by default. The bars of each symbol are loaded once from the
+    repository and copied to shared memory, which the workers attach to without copying,
+    validating or unpickling them, so the memory used does not grow with the number of workers.
+    """
+
+    def __init__(
+        self, repository: PriceRepository, processes: Optional[int] = None, chunksize: int = 1
+    ) -> None:
+        self.repository = repository
+        self.processes = processes
+        self.chunksize = chunksize
+
+    def run(self, signals: SignalFunction, params: SweepParams) -> Iterator[SweepRecord]:
+        """
+        Runs the backtests of a sweep, yielding their records as soon as they complete, in no
+        particular order. The workers and the shared memory are released once all the records are
+        consumed, or the iterator is closed.
+        """
+        blocks: List[SharedMemory] = []
+        try:
+            shared = []
+            for symbol in params.symbols:
+                load = LoadHistoricalParams(symbol, params.timeframe, params.start, params.end)
+                block, spec = _share(symbol, self.repository.load_historical(load))
+                blocks.append(block)
+                shared.append(spec)
+
+            tasks = [(s, point) for s in params.symbols for point in grid_points(params.grid)]
+            with Pool(self.processes, _init_worker, (shared, signals, params)) as pool:
+                yield from pool.imap_unordered(_run_point, tasks, self.chunksize)
+        finally:
+            for block in blocks:
+                block.close()
+                block.unlink()
@@ -0,0 +1,211 @@
+"""Defines the vectorized backtest, which simulates strategies given as arrays of signals."""
+
+from dataclasses import dataclass
+from typing import List, Literal, Optional
+
+import numpy as np
+import pandas as pd
+
+from prices.core.bar import BarDataFrame
+from trading.backtest.models import CommissionModel, NoCommission, NoSlippage, SlippageModel
+
+_FIRST_WINDOW = 256
+"""The number of bars of the first window scanned for the stops of a trade."""
+
+ExitReason = Literal["signal", "stop", "take_profit", "end"]
+"""Why a trade was closed: an exit signal, its stop, its take-profit, or the end of the bars."""
+
+
+@dataclass
+class VectorizedResult:
+    position: pd.Series
+    """The quantity held at the close of each bar, negative for a short position."""
+
+    equity: pd.Series
+    """The equity at the close of each bar."""
+
+    drawdown: pd.Series
+    """The drawdown at the close of each bar, as a non-positive fraction of the peak equity."""
+
+    trades: pd.DataFrame
+    """The trades, with a row per trade from its entry to its exit."""
+
+    @property
+    def max_drawdown(self) -> float:
+        """The largest drawdown, as a non-positive fraction of the peak equity."""
+        return float(self.drawdown.min()) if len(self.drawdown) else 0.0
+
+
+def _next_signals(signals: np.ndarray) -> np.ndarray:
+    """
+    Returns, for each bar, the index of the first signal at it or after it, or the number of bars
+    if there is none, so the next signal after any bar is found in O(1).
+    """
+    n = len(signals)
+    indexes = np.where(signals, np.arange(n), n)
+    return np.append(np.minimum.accumulate(indexes[::-1])[::-1], n)
+
+
+def _first(mask: np.ndarray) -> Optional[int]:
+    """Returns the index of the first True value of a mask, or None if there is none."""
+    index = int(np.argmax(mask)) if len(mask) else 0
+    return index if len(mask) and mask[index] else None
+
+
+def backtest_signals(
+    bars: BarDataFrame,
+    entries: np.ndarray,
+    exits: np.ndarray,
+    size: float = 1.0,
+    direction: Literal[1, -1] = 1,
+    stop_loss: Optional[float] = None,
+    take_profit: Optional[float] = None,
+    cash: float = 100_000.0,
+    slippage: SlippageModel = NoSlippage(),
+    commission: CommissionModel = NoCommission(),
+) -> VectorizedResult:
+    """
+    Backtests a strategy given as boolean arrays of entry and exit signals, aligned with the bars
+    of a single symbol. Like the event-driven engine, a signal is seen at the close of its bar and
+    is filled at the open of the next one. While flat, an entry signal opens a position of `size`,
+    long or short as given by `direction`; while in a position, the first exit signal closes it,
+    and entry signals are ignored.
+
+    A `stop_loss` or `take_profit` closes a position as soon as the low or high of a bar crosses
+    it, at its level, or at the open if the bar gaps past it. They are fractions of the entry
+    price, so 0.02 is 2% away from it. When both are crossed in the same bar, the stop is assumed
+    to be hit first. A position still open after the last bar is closed at its close.
+
+    The bars are scanned with array operations, one trade at a time, and the stops of a trade only
+    up to its exit, so the cost grows with the number of bars, not with bars times trades, and
+    without a loop over the bars.
+    """
+    n = len(bars)
+    entries = np.asarray(entries, dtype=bool)
+    exits = np.asarray(exits, dtype=bool)
+    if len(entries) != n or len(exits) != n:
+        raise ValueError("The signals must have the same length as the bars.")
+    symbols = bars["symbol"].to_numpy()
+    if n and (symbols != symbols[0]).any():
+        raise ValueError("The bars must be of a single symbol.")
+    if direction not in (1, -1):
+        raise ValueError("The direction must be 1, to buy, or -1, to sell short.")
+
+    open_ = bars["open"].to_numpy(dtype=np.float64)
+    high = bars["high"].to_numpy(dtype=np.float64)
+    low = bars["low"].to_numpy(dtype=np.float64)
+    close = bars["close"].to_numpy(dtype=np.float64)
+    timestamps = bars["timestamp"]
+
+    # The entry signals of the last bar have no next bar to be filled on.
+    next_entry = _next_signals(np.append(entries[:-1], False))
+    next_exit = _next_signals(exits)
+    quantity = size * direction
+
+    # For a long position, the stop is crossed by the lows and the take-profit by the highs, and
+    # a gap fills at the lower, or higher, of the open and the level. The other way around for a
+    # short position.
+    stop_prices, target_prices = (low, high) if direction == 1 else (high, low)
+    worse, better = (min, max) if direction == 1 else (max, min)
+
+    trades: List[tuple] = []
+    flat_from = 0
+    while True:
+        entry = int(next_entry[flat_from])
+        if entry >= n:
+            break
+
+        first = entry + 1
+        entry_price = slippage.fill_price(open_[first], quantity)
+
+        # The position is exposed to its stops up to the bar of its exit signal, included.
+        signal = int(next_exit[first]) if next_exit[first] < n else None
+        last = signal if signal is not None else n - 1
+
+        if stop_loss is not None:
+            stop_level = entry_price * (1 - direction * stop_loss)
+        if take_profit is not None:
+            target_level = entry_price * (1 + direction * take_profit)
+
+        # The bars are scanned in windows that double in size, up to the first one where a level
+        # is crossed, so a trade costs about the bars it is held for, not all the bars left.
+        stop = target = None
+        start, window = first, _FIRST_WINDOW
+        while start <= last and stop is None and target is None:
+            end = min(start + window, last + 1)
+            if stop_loss is not None:
+                hit = _first(direction * (stop_prices[start:end] - stop_level) <= 0)
+                stop = None if hit is None else start - first + hit
+            if take_profit is not None:
+                hit = _first(direction * (target_prices[start:end] - target_level) >= 0)
+                target = None if hit is None else start - first + hit
+            start, window = end, window * 2
+
+        reason: ExitReason
+        if stop is not None and (target is None or stop <= target):
+            exit_bar, reason = first + stop, "stop"
+            price = stop_level if stop == 0 else worse(open_[exit_bar], stop_level)
+        elif target is not None:
+            exit_bar, reason = first + target, "take_profit"
+            price = target_level if target == 0 else better(open_[exit_bar], target_level)
+        elif signal is not None and signal + 1 < n:
+            exit_bar, reason, price = signal + 1, "signal", open_[signal + 1]
+        else:
+            exit_bar, reason, price = n - 1, "end", close[n - 1]
+
+        exit_price = slippage.fill_price(price, -quantity)
+        trades.append((first, exit_bar, entry_price, exit_price, reason))
+        flat_from = exit_bar
+
+    return _result(timestamps, close, trades, quantity, cash, commission)
+
+
+def _result(
+    timestamps: pd.Series,
+    close: np.ndarray,
+    trades: List[tuple],
+    quantity: float,
+    cash: float,
+    commission: CommissionModel,
+) -> VectorizedResult:
+    """Builds the positions, equity and trades of a backtest from the bars of its trades."""
+    n = len(close)
+    first = np.array([t[0] for t in trades], dtype=np.int64)
+    exit_bar = np.array([t[1] for t in trades], dtype=np.int64)
+    entry_price = np.array([t[2] for t in trades], dtype=np.float64)
+    exit_price = np.array([t[3] for t in trades], dtype=np.float64)
+    entry_fees = np.array([commission.commission(quantity, p) for p in entry_price])
+    exit_fees = np.array([commission.commission(-quantity, p) for p in exit_price])
+
+    # A position is held from the close of its entry bar to the close before its exit bar.
+    position = np.zeros(n)
+    np.add.at(position, first, quantity)
+    np.add.at(position, exit_bar, -quantity)
+    position = np.cumsum(position)
+
+    flows = np.zeros(n)
+    np.add.at(flows, first, -(quantity * entry_price + entry_fees))
+    np.add.at(flows, exit_bar, quantity * exit_price - exit_fees)
+    equity = cash + np.cumsum(flows) + position * close
+    drawdown = equity / np.maximum.accumulate(equity) - 1
+
+    pnl = quantity * (exit_price - entry_price) - entry_fees - exit_fees
+    index = pd.DatetimeIndex(timestamps)
+    return VectorizedResult(
+        position=pd.Series(position, index=index, name="position"),
+        equity=pd.Series(equity, index=index, name="equity"),
+        drawdown=pd.Series(drawdown, index=index, name="drawdown"),
+        trades=pd.DataFrame(
+            {
+                "entry_time": index[first],
+                "exit_time": index[exit_bar],
+                "quantity": np.full(len(trades), quantity, dtype=np.float64),
+                "entry_price": entry_price,
+                "exit_price": exit_price,
+                "pnl": pnl,
+                "return": pnl / np.abs(quantity * entry_price),
+                "bars": exit_bar - first,
+                "reason": pd.Series([t[4] for t in trades], dtype=object),
+            }
+        ),
+    )
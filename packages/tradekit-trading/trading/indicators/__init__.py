@@ -0,0 +1,4 @@
+"""
+Technical indicators, with a batch API that computes them over whole histories with vectorized
+operations, and an incremental API that updates them one bar at a time.
+"""
@@ -0,0 +1,167 @@
+"""Defines the base classes of the incremental indicators, and the helpers of the batch ones."""
+
+import math
+from abc import ABC, abstractmethod
+from collections import deque
+from typing import Generic, Iterable, Literal, Tuple, TypeVar, Union
+
+import numpy as np
+import pandas as pd
+
+from prices.core.bar import Bar
+
+T = TypeVar("T")
+
+Values = Union[np.ndarray, pd.Series]
+"""A series of values, such as a column of a BarDataFrame."""
+
+Value = Union[np.ndarray, float]
+"""The output of an indicator: an array of values in the batch API, or a single value in the
+incremental API."""
+
+Source = Literal["open", "high", "low", "close", "volume", "vwap"]
+"""The column of a bar that a series indicator is computed on."""
+
+
+class Indicator(ABC, Generic[T]):
+    """
+    Base class of the incremental indicators. They are updated one bar at a time, in O(1), and
+    return the same values as their batch versions. Values are NaN until enough bars were seen.
+    """
+
+    @abstractmethod
+    def update(self, bar: Bar) -> T:
+        """Adds a bar, returning the value of the indicator after it."""
+        ...
+
+
+class SeriesIndicator(Indicator[T]):
+    """Base class of the incremental indicators computed on a single column of the bars."""
+
+    def __init__(self, source: Source = "close") -> None:
+        self.source = source
+
+    def update(self, bar: Bar) -> T:
+        return self.push(getattr(bar, self.source))
+
+    @abstractmethod
+    def push(self, value: float) -> T:
+        """Adds a value, returning the value of the indicator after it."""
+        ...
+
+
+class RollingSums:
+    """
+    The sums of each column of the last `period` rows of values, updated in O(1) with the Kahan
+    compensations of the rolling sums of pandas, so they match the batch API: the small values
+    added after a large one are not lost when it is removed. Rows with a NaN are counted instead
+    of summed, since the batch API is NaN while a window holds any.
+    """
+
+    def __init__(self, period: int, columns: int = 1) -> None:
+        validate_period(period)
+        self.period = period
+        self.sums = [0.0] * columns
+        """The sums of the columns, where the rows with a NaN count as 0."""
+        self._added = [0.0] * columns
+        """The rounding errors of the last row added, taken off the next one."""
+        self._removed = [0.0] * columns
+        """The rounding errors of the last row removed, taken off the next one."""
+        self._window: deque[Tuple[float, ...]] = deque()
+        self._nans = 0
+
+    @property
+    def ready(self) -> bool:
+        """Whether the window is full, without any NaN."""
+        return len(self._window) == self.period and self._nans == 0
+
+    @property
+    def rows(self) -> Iterable[Tuple[float, ...]]:
+        """The rows of the window, from the oldest."""
+        return self._window
+
+    def replace(self, rows: Iterable[Tuple[float, ...]]):
+        """Replaces the rows of the window, computing their sums again."""
+        self._window = deque(rows)
+        summed = [row for row in self._window if not math.isnan(sum(row))]
+        self._nans = len(self._window) - len(summed)
+        self.sums = [math.fsum(row[i] for row in summed) for i in range(len(self.sums))]
+        self._added = [0.0] * len(self.sums)
+        self._removed = [0.0] * len(self.sums)
+
+    def push(self, *row: float):
+        """Adds a row of values. Once the window is full, the oldest row is removed first."""
+        window, sums = self._window, self.sums
+        cancelled = False
+        if len(window) == self.period:
+            oldest = window.popleft()
+            if math.isnan(sum(oldest)):
+                self._nans -= 1
+            else:
+                removed = self._removed
+                for i, value in enumerate(oldest):
+                    compensated = -value - removed[i]
+                    total = sums[i] + compensated
+                    removed[i] = (total - sums[i]) - compensated
+                    sums[i] = total
+                    cancelled = cancelled or abs(value) > 1e8 * abs(total)
+
+        window.append(row)
+        # The sum of a row is NaN if any of its values is.
+        if math.isnan(sum(row)):
+            self._nans += 1
+        else:
+            added = self._added
+            for i, value in enumerate(row):
+                compensated = value - added[i]
+                total = sums[i] + compensated
+                added[i] = (total - sums[i]) - compensated
+                sums[i] = total
+
+        # When a row much larger than the sums left is removed, such as a spike, the compensations
+        # can't hold all the digits lost while it was in the window, so the sums are computed again.
+        if cancelled:
+            self.replace(window)
+
+
+def as_values(values: Values) -> np.ndarray:
+    """Returns a series of values as a float64 array, without copying it if possible."""
+    return np.asarray(values, dtype=np.float64)
+
+
+def validate_period(period: int):
+    """Validates the number of values in the window of an indicator."""
+    if period <= 0:
+        raise ValueError("The period must be a positive integer value.")
+
+
+def rolling_sum(values: np.ndarray, period: int) -> np.ndarray:
+    """Returns the sums of each window of `period` values. The first `period - 1` are NaN."""
+    return pd.Series(values).rolling(period).sum().to_numpy()
+
+
+def rolling_mean(values: np.ndarray, period: int) -> np.ndarray:
+    """Returns the means of each window of `period` values. The first `period - 1` are NaN."""
+    return pd.Series(values).rolling(period).mean().to_numpy()
+
+
+def rolling_std(values: np.ndarray, period: int) -> np.ndarray:
+    """
+    Returns the population standard deviations of each window of `period` values. The first
+    `period - 1` are NaN.
+    """
+    return pd.Series(values).rolling(period).std(ddof=0).to_numpy()
+
+
+def ewm(values: np.ndarray, alpha: float) -> np.ndarray:
+    """
+    Returns the exponentially weighted means of the values, with the smoothing factor `alpha`.
+    The first mean is the first value, and each one after is `alpha * value + (1 - alpha) * mean`.
+    """
+    return pd.Series(values).ewm(alpha=alpha, adjust=False).mean().to_numpy()
+
+
+def warm_up(values: np.ndarray, count: int) -> np.ndarray:
+    """Sets the first `count` values to NaN, as they are computed from too few values."""
+    values[:count] = np.nan
+    return values
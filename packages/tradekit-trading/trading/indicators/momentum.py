@@ -0,0 +1,142 @@
+"""Defines the momentum indicators: the relative strength index and the MACD."""
+
+from typing import NamedTuple, TypeVar
+
+import numpy as np
+
+from trading.indicators.base import (
+    SeriesIndicator,
+    Source,
+    Value,
+    Values,
+    as_values,
+    ewm,
+    validate_period,
+    warm_up,
+)
+
+T = TypeVar("T", float, np.ndarray)
+
+
+def _rsi(gain: T, loss: T) -> T:
+    """Returns the RSI of the mean gains and losses. Without losses, it is 100, or 50 if flat."""
+    with np.errstate(divide="ignore", invalid="ignore"):
+        rsi = 100 - 100 / (1 + np.divide(gain, loss))
+    return np.where(loss == 0, np.where(gain == 0, 50.0, 100.0), rsi)
+
+
+def rsi(close: Values, period: int = 14) -> np.ndarray:
+    """
+    Returns the relative strength index of the closes, with the mean gains and losses smoothed
+    by Wilder's method, an exponential mean with a smoothing factor of `1 / period`. The first
+    `period` values are NaN.
+    """
+    validate_period(period)
+    close = as_values(close)
+    out = np.full(len(close), np.nan)
+    if len(close) > 1:
+        delta = np.diff(close)
+        gain = ewm(np.maximum(delta, 0), 1 / period)
+        loss = ewm(np.maximum(-delta, 0), 1 / period)
+        out[1:] = _rsi(gain, loss)
+    return warm_up(out, period)
+
+
+class MACDValues(NamedTuple):
+    """The values of the MACD indicator."""
+
+    macd: Value
+    """The difference between the fast and the slow exponential moving averages."""
+
+    signal: Value
+    """The exponential moving average of the MACD."""
+
+    histogram: Value
+    """The difference between the MACD and its signal."""
+
+
+def macd(close: Values, fast: int = 12, slow: int = 26, signal: int = 9) -> MACDValues:
+    """
+    Returns the moving average convergence divergence of the closes. The first `slow - 1` values
+    of the MACD are NaN, and the first `slow + signal - 2` of the signal and the histogram.
+    """
+    _validate_macd(fast, slow, signal)
+    close = as_values(close)
+    line = ewm(close, 2 / (fast + 1)) - ewm(close, 2 / (slow + 1))
+    signal_line = ewm(line, 2 / (signal + 1))
+
+    warm_up(line, slow - 1)
+    warm_up(signal_line, slow + signal - 2)
+    return MACDValues(line, signal_line, line - signal_line)
+
+
+def _validate_macd(fast: int, slow: int, signal: int):
+    """Validates the periods of the MACD indicator."""
+    for period in (fast, slow, signal):
+        validate_period(period)
+    if fast >= slow:
+        raise ValueError("The fast period must be shorter than the slow period.")
+
+
+class RSI(SeriesIndicator[float]):
+    """Incremental relative strength index."""
+
+    def __init__(self, period: int = 14, source: Source = "close") -> None:
+        super().__init__(source)
+        validate_period(period)
+        self.period = period
+        self._previous = np.nan
+        self._gain = 0.0
+        self._loss = 0.0
+        self._count = 0
+
+    def push(self, value: float) -> float:
+        if self._count == 0 and np.isnan(self._previous):
+            self._previous = value
+            return np.nan
+
+        delta = value - self._previous
+        self._previous = value
+        gain, loss = max(delta, 0.0), max(-delta, 0.0)
+        self._count += 1
+        if self._count == 1:
+            self._gain, self._loss = gain, loss
+        else:
+            self._gain += (gain - self._gain) / self.period
+            self._loss += (loss - self._loss) / self.period
+
+        if self._count < self.period:
+            return np.nan
+        return float(_rsi(self._gain, self._loss))
+
+
+class MACD(SeriesIndicator[MACDValues]):
+    """Incremental moving average convergence divergence."""
+
+    def __init__(
+        self, fast: int = 12, slow: int = 26, signal: int = 9, source: Source = "close"
+    ) -> None:
+        super().__init__(source)
+        _validate_macd(fast, slow, signal)
+        self.fast, self.slow, self.signal = fast, slow, signal
+        self._alphas = (2 / (fast + 1), 2 / (slow + 1), 2 / (signal + 1))
+        self._means = [np.nan, np.nan, np.nan]
+        self._count = 0
+
+    def push(self, value: float) -> MACDValues:
+        self._count += 1
+        fast_alpha, slow_alpha, signal_alpha = self._alphas
+        fast, slow, signal = self._means
+        if self._count == 1:
+            fast, slow = value, value
+            signal = 0.0
+        else:
+            fast += fast_alpha * (value - fast)
+            slow += slow_alpha * (value - slow)
+            signal += signal_alpha * (fast - slow - signal)
+        self._means = [fast, slow, signal]
+
+        line = fast - slow if self._count >= self.slow else np.nan
+        if self._count < self.slow + self.signal - 1:
+            return MACDValues(line, np.nan, np.nan)
+        return MACDValues(line, signal, line - signal)
@@ -0,0 +1,106 @@
+"""Defines the simple, exponential and weighted moving averages."""
+
+import numpy as np
+
+from trading.indicators.base import (
+    RollingSums,
+    SeriesIndicator,
+    Source,
+    Values,
+    as_values,
+    ewm,
+    rolling_mean,
+    validate_period,
+    warm_up,
+)
+
+
+def sma(values: Values, period: int) -> np.ndarray:
+    """Returns the simple moving average of the values over `period` values."""
+    validate_period(period)
+    return rolling_mean(as_values(values), period)
+
+
+def ema(values: Values, period: int) -> np.ndarray:
+    """
+    Returns the exponential moving average of the values, with a smoothing factor of
+    `2 / (period + 1)`. It starts at the first value, and the first `period - 1` are NaN.
+    """
+    validate_period(period)
+    return warm_up(ewm(as_values(values), 2 / (period + 1)), period - 1)
+
+
+def wma(values: Values, period: int) -> np.ndarray:
+    """
+    Returns the weighted moving average of the values over `period` values, where the weights
+    decrease linearly from `period`, for the latest value, to 1, for the oldest.
+    """
+    validate_period(period)
+    values = as_values(values)
+    out = np.full(len(values), np.nan)
+    if len(values) >= period:
+        weights = np.arange(period, 0, -1, dtype=np.float64)
+        out[period - 1:] = np.convolve(values, weights, "valid") / weights.sum()
+    return out
+
+
+class SMA(SeriesIndicator[float]):
+    """Incremental simple moving average."""
+
+    def __init__(self, period: int, source: Source = "close") -> None:
+        super().__init__(source)
+        validate_period(period)
+        self.period = period
+        self._sums = RollingSums(period)
+
+    def push(self, value: float) -> float:
+        self._sums.push(value)
+        return self._sums.sums[0] / self.period if self._sums.ready else np.nan
+
+
+class EMA(SeriesIndicator[float]):
+    """Incremental exponential moving average."""
+
+    def __init__(self, period: int, source: Source = "close") -> None:
+        super().__init__(source)
+        validate_period(period)
+        self.period = period
+        self.alpha = 2 / (period + 1)
+        self._mean = np.nan
+        self._count = 0
+
+    def push(self, value: float) -> float:
+        self._count += 1
+        self._mean = value if self._count == 1 else self._mean + self.alpha * (value - self._mean)
+        return self._mean if self._count >= self.period else np.nan
+
+
+class WMA(SeriesIndicator[float]):
+    """
+    Incremental weighted moving average. The weighted sum is computed from the rolling sums of the
+    values and of the values times their index: with the last index `n`, the value of index `i`
+    has the weight `i - (n - period)`.
+    """
+
+    def __init__(self, period: int, source: Source = "close") -> None:
+        super().__init__(source)
+        validate_period(period)
+        self.period = period
+        self._sums = RollingSums(period, columns=2)
+        self._count = 0
+
+    def push(self, value: float) -> float:
+        if self._count == 2 * self.period:
+            # The indexes start again every `period` values, so the sum of the values times their
+            # index stays small and keeps its precision.
+            self._count = self.period
+            self._sums.replace((v, i * v) for i, (v, _) in enumerate(self._sums.rows, 1))
+
+        self._count += 1
+        self._sums.push(value, self._count * value)
+        if not self._sums.ready:
+            return np.nan
+
+        total, indexed = self._sums.sums
+        weighted = indexed - (self._count - self.period) * total
+        return weighted / (self.period * (self.period + 1) / 2)
@@ -0,0 +1,188 @@
+"""Defines the volatility indicators: the average true range, Bollinger bands and z-scores."""
+
+import math
+from collections import deque
+from typing import NamedTuple, Optional, Tuple
+
+import numpy as np
+
+from prices.core.bar import Bar, BarDataFrame
+from trading.indicators.base import (
+    Indicator,
+    SeriesIndicator,
+    Source,
+    Value,
+    Values,
+    as_values,
+    ewm,
+    rolling_mean,
+    rolling_std,
+    validate_period,
+    warm_up,
+)
+
+
+class Bands(NamedTuple):
+    """The values of an indicator made of bands around a middle line."""
+
+    lower: Value
+    """The lower band."""
+
+    middle: Value
+    """The middle line."""
+
+    upper: Value
+    """The upper band."""
+
+
+def atr(bars: BarDataFrame, period: int = 14) -> np.ndarray:
+    """
+    Returns the average true range of the bars, smoothed by Wilder's method, an exponential mean
+    with a smoothing factor of `1 / period`. The first `period - 1` values are NaN.
+    """
+    validate_period(period)
+    high, low, close = (as_values(bars[c]) for c in ("high", "low", "close"))
+    true_range = high - low
+    if len(close) > 1:
+        previous = close[:-1]
+        true_range[1:] = np.maximum.reduce(
+            [true_range[1:], np.abs(high[1:] - previous), np.abs(low[1:] - previous)]
+        )
+    return warm_up(ewm(true_range, 1 / period), period - 1)
+
+
+def bollinger(values: Values, period: int = 20, k: float = 2.0) -> Bands:
+    """
+    Returns the Bollinger bands of the values: their simple moving average over `period` values,
+    and the bands `k` population standard deviations away from it.
+    """
+    validate_period(period)
+    values = as_values(values)
+    middle = rolling_mean(values, period)
+    width = k * rolling_std(values, period)
+    return Bands(middle - width, middle, middle + width)
+
+
+def zscore(values: Values, period: int) -> np.ndarray:
+    """
+    Returns the rolling z-score of the values: how many population standard deviations of the
+    last `period` values each one is away from their mean. It is 0 when all of them are equal.
+    """
+    validate_period(period)
+    values = as_values(values)
+    deviation = values - rolling_mean(values, period)
+    std = rolling_std(values, period)
+    # The windows that hold a NaN are NaN.
+    out = np.where(np.isnan(std), np.nan, 0.0)
+    np.divide(deviation, std, out=out, where=std > 0)
+    return warm_up(out, period - 1)
+
+
+class _RollingMoments:
+    """
+    The mean and the population standard deviation of a sliding window of values. They are
+    updated in O(1), and computed again from the window every `period` values, so rounding errors
+    do not build up, and after a NaN leaves the window.
+    """
+
+    def __init__(self, period: int) -> None:
+        validate_period(period)
+        self.period = period
+        self._window: deque[float] = deque()
+        self._nans = 0
+        self._mean = 0.0
+        self._m2 = 0.0
+        self._updates: Optional[int] = None
+        """The number of updates since the moments were computed, or None if they are outdated."""
+
+    def push(self, value: float) -> Optional[Tuple[float, float]]:
+        """
+        Adds a value, returning the mean and deviation, or None until the window is full and
+        while it holds a NaN.
+        """
+        self._window.append(value)
+        self._nans += math.isnan(value)
+        if len(self._window) < self.period:
+            return None
+
+        oldest = math.nan
+        if len(self._window) > self.period:
+            oldest = self._window.popleft()
+            self._nans -= math.isnan(oldest)
+
+        if self._nans:
+            self._updates = None
+            return None
+
+        if self._updates is None or self._updates == self.period:
+            self._mean = math.fsum(self._window) / self.period
+            self._m2 = math.fsum((v - self._mean) ** 2 for v in self._window)
+            self._updates = 0
+        else:
+            previous_mean = self._mean
+            self._mean += (value - oldest) / self.period
+            self._m2 += (value - oldest) * (value - self._mean + oldest - previous_mean)
+            self._updates += 1
+
+        return self._mean, math.sqrt(max(self._m2, 0.0) / self.period)
+
+
+class ATR(Indicator[float]):
+    """Incremental average true range."""
+
+    def __init__(self, period: int = 14) -> None:
+        validate_period(period)
+        self.period = period
+        self._previous_close = np.nan
+        self._mean = np.nan
+        self._count = 0
+
+    def update(self, bar: Bar) -> float:
+        true_range = bar.high - bar.low
+        if self._count > 0:
+            true_range = max(
+                true_range,
+                abs(bar.high - self._previous_close),
+                abs(bar.low - self._previous_close),
+            )
+        self._previous_close = bar.close
+
+        self._count += 1
+        if self._count == 1:
+            self._mean = true_range
+        else:
+            self._mean += (true_range - self._mean) / self.period
+        return self._mean if self._count >= self.period else np.nan
+
+
+class Bollinger(SeriesIndicator[Bands]):
+    """Incremental Bollinger bands."""
+
+    def __init__(self, period: int = 20, k: float = 2.0, source: Source = "close") -> None:
+        super().__init__(source)
+        self.k = k
+        self._moments = _RollingMoments(period)
+
+    def push(self, value: float) -> Bands:
+        moments = self._moments.push(value)
+        if moments is None:
+            return Bands(np.nan, np.nan, np.nan)
+
+        mean, std = moments
+        return Bands(mean - self.k * std, mean, mean + self.k * std)
+
+
+class ZScore(SeriesIndicator[float]):
+    """Incremental rolling z-score."""
+
+    def __init__(self, period: int, source: Source = "close") -> None:
+        super().__init__(source)
+        self._moments = _RollingMoments(period)
+
+    def push(self, value: float) -> float:
+        moments = self._moments.push(value)
+        if moments is None:
+            return np.nan
+
+        mean, std = moments
+        return (value - mean) / std if std > 0 else 0.0
@@ -0,0 +1,55 @@
+"""Defines the volume indicators: the rolling VWAP and its bands."""
+
+import math
+
+import numpy as np
+
+from prices.core.bar import Bar, BarDataFrame
+from trading.indicators.base import (
+    Indicator,
+    RollingSums,
+    as_values,
+    rolling_sum,
+    validate_period,
+)
+from trading.indicators.volatility import Bands
+
+
+def vwap_bands(bars: BarDataFrame, period: int = 20, k: float = 2.0) -> Bands:
+    """
+    Returns the VWAP of the last `period` bars, computed from the vwap and volume of each bar, and
+    the bands `k` volume-weighted standard deviations away from it. Windows without volume are
+    NaN, as are the first `period - 1` values.
+    """
+    validate_period(period)
+    price = as_values(bars["vwap"])
+    volume = as_values(bars["volume"])
+
+    total_volume = rolling_sum(volume, period)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        middle = rolling_sum(price * volume, period) / total_volume
+        variance = rolling_sum(price * price * volume, period) / total_volume - middle**2
+    width = k * np.sqrt(np.maximum(variance, 0))
+    middle[total_volume == 0] = np.nan
+    return Bands(middle - width, middle, middle + width)
+
+
+class VWAPBands(Indicator[Bands]):
+    """Incremental rolling VWAP bands."""
+
+    def __init__(self, period: int = 20, k: float = 2.0) -> None:
+        validate_period(period)
+        self.period = period
+        self.k = k
+        self._sums = RollingSums(period, columns=3)
+
+    def update(self, bar: Bar) -> Bands:
+        price, volume = bar.vwap, bar.volume
+        self._sums.push(volume, price * volume, price * price * volume)
+        volume, weighted, weighted_squares = self._sums.sums
+        if not self._sums.ready or volume <= 0:
+            return Bands(np.nan, np.nan, np.nan)
+
+        middle = weighted / volume
+        width = self.k * math.sqrt(max(weighted_squares / volume - middle**2, 0.0))
+        return Bands(middle - width, middle, middle + width)